@@ -159,6 +159,9 @@ register("behavior.do-not-show-previously-seen-addon-updates", True)
 register("behavior.date-about-range", 50)
 register("behavior.date-after-range", 50)
 register("behavior.date-before-range", 50)
+register("behavior.export-compress-level", 6)
+register("behavior.export-processes", 1)
+register("behavior.filter-processes", 1)
 register("behavior.generation-depth", 15)
 register("behavior.max-age-prob-alive", 110)
 register("behavior.max-sib-age-diff", 20)
@@ -195,9 +198,17 @@ register("csv.dialect", "excel")
 register("csv.delimiter", ",")
 
 register("database.backend", "sqlite")
+register("database.batch-size", 5000)
+register("database.blob-codec", "pickle")
+register("database.compress-blobs", False)
+register("database.read-connections", 4)
+register("database.undo-cache-size", 4194304)
+register("database.text-index", True)
+register("database.closure-table", False)
 register("database.compress-backup", True)
 register("database.backup-path", USER_HOME)
 register("database.backup-on-exit", True)
+register("database.backup-full-interval", 10)
 register("database.autobackup", 0)
 register("database.path", os.path.join(USER_DATA, "grampsdb"))
 register("database.host", "")
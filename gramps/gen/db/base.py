@@ -46,8 +46,11 @@ from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 from ..lib.childreftype import ChildRefType
 from ..lib.childref import ChildRef
+from ..lib.date import gregorian
 from .txn import DbTxn
+from .pedigree import get_pedigree_graph
 from .exceptions import DbTransactionCancel, DbException
+from ..errors import HandleError
 
 _LOG = logging.getLogger(DBLOGNAME)
 
@@ -130,6 +133,254 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def can_fork_readers(self):
+        """
+        Return True if a forked process can read the database through a
+        connection of its own, opened with :meth:`reopen_reader`.
+
+        This is the case for a database stored in a file, outside of a
+        transaction.
+        """
+        return False
+
+    def reopen_reader(self):
+        """
+        Replace the connection inherited by a forked process, which it must
+        not use, with a read-only connection of its own to the database.
+
+        The forked process must not write to the database afterwards.  Only
+        available when :meth:`can_fork_readers` returns True.
+        """
+        raise NotImplementedError
+
+    def get_change_counter(self, obj_class):
+        """
+        Return a number which increases whenever an object of a class is
+        added, changed or removed, or None if the database does not track
+        its changes.
+
+        :param obj_class: name of the class of the objects.
+        :type obj_class: str
+        """
+        return None
+
+    def get_changed_handles(self, obj_class, since):
+        """
+        Return the set of handles of the objects of a class which were
+        added, changed or removed after the change counter of the class was
+        read as since, or None if they are no longer known.
+
+        :param obj_class: name of the class of the objects.
+        :type obj_class: str
+        :param since: a value returned by :meth:`get_change_counter`.
+        :type since: int
+        """
+        return None
+
+    def has_sql_select(self):
+        """
+        Return True if the objects of the database can be selected with SQL
+        predicates over their tables, with :meth:`select_handles`.
+        """
+        return False
+
+    def select_handles(self, obj_class, where, args=None):
+        """
+        Return the list of handles of the objects of a class matching an SQL
+        predicate.
+
+        :param obj_class: name of the class of the objects.
+        :type obj_class: str
+        :param where: the predicate, written over the columns of the table
+                      of the class: the handle, the secondary fields and the
+                      derived columns.  It may query the reference table,
+                      whose columns are obj_class, obj_handle, ref_class and
+                      ref_handle.
+        :type where: str
+        :param args: the parameters of the predicate.
+        :type args: list
+        :returns: the handles of the matching objects.
+        :rtype: list
+
+        Only available when :meth:`has_sql_select` returns True.
+        """
+        raise NotImplementedError
+
+    def has_text_index(self):
+        """
+        Return True if the database keeps a full-text index of the text of
+        its objects, which can be searched with :meth:`find_text`.
+        """
+        return False
+
+    def find_text(self, obj_class, field, text):
+        """
+        Return the set of handles of the objects of a class having a value
+        of a field which contains a substring, ignoring case.
+
+        :param obj_class: name of the class of the objects.
+        :type obj_class: str
+        :param field: name of the indexed field.
+        :type field: str
+        :param text: the substring to search for.
+        :type text: str
+        :returns: the handles of the matching objects.
+        :rtype: set
+
+        The indexed fields are:
+
+        ========  =====  ==================================================
+        Note      text   the text of the note
+        Person    name   the first name, primary surname, suffix, title,
+                         nickname, family nickname and call name of all
+                         the names of the person
+        Place     name   all the names of the place
+        Source    title  the title of the source
+        Citation  page   the volume/page of the citation
+        ========  =====  ==================================================
+
+        Only available when :meth:`has_text_index` returns True.
+        """
+        raise NotImplementedError
+
+    def has_date_index(self):
+        """
+        Return True if the database keeps indexed copies of the event dates,
+        which make the date queries below cheaper than a scan of the events.
+        """
+        return False
+
+    def find_events_matching_date(self, date):
+        """
+        Return the set of handles of the events whose date matches a date,
+        as tested by :meth:`.Date.match`.
+
+        :param date: the date to match.
+        :type date: :class:`.Date`
+        :returns: the handles of the matching events.
+        :rtype: set
+
+        This default implementation scans all the events.
+        """
+        return {
+            event.handle
+            for event in self.iter_events()
+            if event.get_date_object().match(date)
+        }
+
+    def find_events_in_date_range(self, start=None, stop=None):
+        """
+        Return the handles of the dated events whose date lies, at least in
+        part, between two dates, ordered by date.
+
+        :param start: the first date of the range, or None for no limit.
+        :type start: :class:`.Date`
+        :param stop: the last date of the range, or None for no limit.
+        :type stop: :class:`.Date`
+        :returns: the handles of the matching events.
+        :rtype: list
+
+        The dates are compared on their sort values.  This default
+        implementation scans all the events.
+        """
+        low = start.get_sort_value() if start else None
+        high = stop.get_sort_value() if stop else None
+        events = []
+        for event in self.iter_events():
+            date = event.get_date_object()
+            if date.sortval == 0:
+                continue
+            if (low is None or date.get_stop_sort_value() >= low) and (
+                high is None or date.sortval <= high
+            ):
+                events.append((date.sortval, event.handle))
+        events.sort()
+        return [handle for sortval, handle in events]
+
+    def find_events_on_day(self, month, day=0):
+        """
+        Return the set of handles of the events which happened on a day of
+        the year, whatever the year, in the Gregorian calendar.
+
+        :param month: the month, from 1 to 12.
+        :type month: int
+        :param day: the day of the month, or 0 for the whole month.
+        :type day: int
+        :returns: the handles of the matching events.
+        :rtype: set
+
+        This default implementation scans all the events.
+        """
+        handles = set()
+        for event in self.iter_events():
+            date = event.get_date_object()
+            if date.sortval == 0:
+                continue
+            date = gregorian(date)
+            if date.get_month() == month and (not day or date.get_day() == day):
+                handles.add(event.handle)
+        return handles
+
+    def get_person_date_sortvals(self):
+        """
+        Return a dictionary of the sort values of the birth and death dates
+        of all the people, as {handle: (birth_sortval, death_sortval)}.
+
+        A sort value is 0 when the person has no birth (or death) event, or
+        when its date is empty, and None when the event cannot be found.
+        This default implementation reads the events of all the people.
+        """
+        result = {}
+        for person in self.iter_people():
+            values = []
+            for ref in (person.get_birth_ref(), person.get_death_ref()):
+                sortval = 0
+                if ref:
+                    try:
+                        event = self.get_event_from_handle(ref.ref)
+                    except HandleError:
+                        event = None
+                    sortval = event.get_date_object().sortval if event else None
+                values.append(sortval)
+            result[person.handle] = tuple(values)
+        return result
+
+    def has_closure_table(self):
+        """
+        Return True if the database keeps a table of the ancestors of every
+        person with their generation distance, which answers the queries
+        below without walking the family tree.
+        """
+        return False
+
+    def get_ancestor_handles(self, handle, min_generation=0, max_generation=None):
+        """
+        Return the set of handles of the ancestors of a person, through the
+        main parent family of each person, who are between min_generation
+        and max_generation generations away along some line.
+
+        The person is generation 0, the parents generation 1.  There is no
+        upper limit if max_generation is None.  This default implementation
+        walks the pedigree graph of the database.
+        """
+        return get_pedigree_graph(self).get_ancestors_between(
+            handle, min_generation, max_generation
+        )
+
+    def get_descendant_handles(self, handle, min_generation=0, max_generation=None):
+        """
+        Return the set of handles of the descendants of a person, through
+        all the families, who are between min_generation and max_generation
+        generations away along some line.
+
+        The person is generation 0, the children generation 1.  There is no
+        upper limit if max_generation is None.  This default implementation
+        walks the pedigree graph of the database.
+        """
+        return get_pedigree_graph(self).get_descendants_between(
+            handle, min_generation, max_generation
+        )
+
     def get_child_reference_types(self):
         """
         Return a list of all child reference types associated with Family
@@ -347,6 +598,76 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def get_place_ancestry(self, handles):
+        """
+        Return a list of the places with the passed handles, together with
+        all the places which enclose them, directly or through other places.
+        Every place reference is followed, whatever its date.
+
+        :param handles: handles of the places to start from.
+        :type handles: list
+
+        The places may come in any order.  This default implementation
+        fetches the places one at a time.  Backends can override it to
+        walk the hierarchy in a single query.
+        """
+        return self._walk_place_ancestry(handles, self.get_place_from_handle)
+
+    def get_place_subtree(self, handles):
+        """
+        Return a list of the places with the passed handles, together with
+        all the places which they enclose, directly or through other places.
+
+        :param handles: handles of the places to start from.
+        :type handles: list
+
+        The places may come in any order.  This default implementation
+        fetches the places one at a time.  Backends can override it to
+        walk the hierarchy in a single query.
+        """
+        places = []
+        visited = set()
+        todo = list(handles)
+        while todo:
+            handle = todo.pop()
+            if handle in visited:
+                continue
+            visited.add(handle)
+            try:
+                place = self.get_place_from_handle(handle)
+            except HandleError:
+                continue
+            if place is None:
+                continue
+            places.append(place)
+            for dummy, child_handle in self.find_backlink_handles(handle, ["Place"]):
+                todo.append(child_handle)
+        return places
+
+    @staticmethod
+    def _walk_place_ancestry(handles, get_place):
+        """
+        Helper function to walk up the place hierarchy with a function
+        which returns a place from its handle, or None.
+        """
+        places = []
+        visited = set()
+        todo = list(handles)
+        while todo:
+            handle = todo.pop()
+            if handle in visited:
+                continue
+            visited.add(handle)
+            try:
+                place = get_place(handle)
+            except HandleError:
+                continue
+            if place is None:
+                continue
+            places.append(place)
+            todo.extend(placeref.ref for placeref in place.get_placeref_list())
+        return places
+
     def get_repository_cursor(self):
         """
         Return a reference to a cursor over Repository objects.  Example use::
@@ -606,6 +927,146 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def get_citation_from_handles(self, handles):
+        """
+        Return a list of Citation objects in the database from the passed handles,
+        in the same order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If a Citation does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned in place of a Citation which is filtered out.
+        """
+        return [self.get_citation_from_handle(handle) for handle in handles]
+
+    def get_event_from_handles(self, handles):
+        """
+        Return a list of Event objects in the database from the passed handles,
+        in the same order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If a Event does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned in place of a Event which is filtered out.
+        """
+        return [self.get_event_from_handle(handle) for handle in handles]
+
+    def get_family_from_handles(self, handles):
+        """
+        Return a list of Family objects in the database from the passed handles,
+        in the same order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If a Family does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned in place of a Family which is filtered out.
+        """
+        return [self.get_family_from_handle(handle) for handle in handles]
+
+    def get_media_from_handles(self, handles):
+        """
+        Return a list of Media objects in the database from the passed handles,
+        in the same order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If a Media does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned in place of a Media which is filtered out.
+        """
+        return [self.get_media_from_handle(handle) for handle in handles]
+
+    def get_note_from_handles(self, handles):
+        """
+        Return a list of Note objects in the database from the passed handles,
+        in the same order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If a Note does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned in place of a Note which is filtered out.
+        """
+        return [self.get_note_from_handle(handle) for handle in handles]
+
+    def get_person_from_handles(self, handles):
+        """
+        Return a list of Person objects in the database from the passed handles,
+        in the same order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If a Person does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned in place of a Person which is filtered out.
+        """
+        return [self.get_person_from_handle(handle) for handle in handles]
+
+    def get_place_from_handles(self, handles):
+        """
+        Return a list of Place objects in the database from the passed handles,
+        in the same order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If a Place does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned in place of a Place which is filtered out.
+        """
+        return [self.get_place_from_handle(handle) for handle in handles]
+
+    def get_repository_from_handles(self, handles):
+        """
+        Return a list of Repository objects in the database from the passed handles,
+        in the same order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If a Repository does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned in place of a Repository which is filtered out.
+        """
+        return [self.get_repository_from_handle(handle) for handle in handles]
+
+    def get_source_from_handles(self, handles):
+        """
+        Return a list of Source objects in the database from the passed handles,
+        in the same order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If a Source does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned in place of a Source which is filtered out.
+        """
+        return [self.get_source_from_handle(handle) for handle in handles]
+
+    def get_tag_from_handles(self, handles):
+        """
+        Return a list of Tag objects in the database from the passed handles,
+        in the same order.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If a Tag does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned in place of a Tag which is filtered out.
+        """
+        return [self.get_tag_from_handle(handle) for handle in handles]
+
     def get_citation_handles(self, sort_handles=False, locale=glocale):
         """
         Return a list of database handles, one handle for each Citation in
@@ -992,6 +1453,99 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def iter_raw_citation_data(self, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the Citation objects
+        with the passed handles.  Handles which are not found are skipped,
+        and the tuples may come in any order.
+        """
+        return self._iter_raw_data_from_handles(self.get_raw_citation_data, handles)
+
+    def iter_raw_event_data(self, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the Event objects
+        with the passed handles.  Handles which are not found are skipped,
+        and the tuples may come in any order.
+        """
+        return self._iter_raw_data_from_handles(self.get_raw_event_data, handles)
+
+    def iter_raw_family_data(self, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the Family objects
+        with the passed handles.  Handles which are not found are skipped,
+        and the tuples may come in any order.
+        """
+        return self._iter_raw_data_from_handles(self.get_raw_family_data, handles)
+
+    def iter_raw_media_data(self, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the Media objects
+        with the passed handles.  Handles which are not found are skipped,
+        and the tuples may come in any order.
+        """
+        return self._iter_raw_data_from_handles(self.get_raw_media_data, handles)
+
+    def iter_raw_note_data(self, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the Note objects
+        with the passed handles.  Handles which are not found are skipped,
+        and the tuples may come in any order.
+        """
+        return self._iter_raw_data_from_handles(self.get_raw_note_data, handles)
+
+    def iter_raw_person_data(self, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the Person objects
+        with the passed handles.  Handles which are not found are skipped,
+        and the tuples may come in any order.
+        """
+        return self._iter_raw_data_from_handles(self.get_raw_person_data, handles)
+
+    def iter_raw_place_data(self, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the Place objects
+        with the passed handles.  Handles which are not found are skipped,
+        and the tuples may come in any order.
+        """
+        return self._iter_raw_data_from_handles(self.get_raw_place_data, handles)
+
+    def iter_raw_repository_data(self, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the Repository objects
+        with the passed handles.  Handles which are not found are skipped,
+        and the tuples may come in any order.
+        """
+        return self._iter_raw_data_from_handles(self.get_raw_repository_data, handles)
+
+    def iter_raw_source_data(self, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the Source objects
+        with the passed handles.  Handles which are not found are skipped,
+        and the tuples may come in any order.
+        """
+        return self._iter_raw_data_from_handles(self.get_raw_source_data, handles)
+
+    def iter_raw_tag_data(self, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the Tag objects
+        with the passed handles.  Handles which are not found are skipped,
+        and the tuples may come in any order.
+        """
+        return self._iter_raw_data_from_handles(self.get_raw_tag_data, handles)
+
+    def _iter_raw_data_from_handles(self, get_raw_data, handles):
+        """
+        Helper function to return raw data one handle at a time, for
+        databases which cannot fetch many objects at once.
+        """
+        for handle in handles:
+            try:
+                data = get_raw_data(handle)
+            except HandleError:
+                continue
+            if data:
+                yield (handle, data)
+
     def get_researcher(self):
         """
         Return the Researcher instance, providing information about the owner
@@ -1793,6 +2347,17 @@ class DbWriteBase(DbReadBase):
         """
         raise NotImplementedError
 
+    def start_bulk_load(self):
+        """
+        Load the objects committed for the rest of the current batch
+        transaction in bulk, deferring the references, the secondary indices
+        and other derived data until the transaction is committed.  The final
+        content of the database is the same.
+
+        Return True if the database loads the objects in bulk.
+        """
+        return False
+
     def undo(self, update_history=True):
         """
         Undo last transaction.
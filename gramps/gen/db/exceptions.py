@@ -180,6 +180,30 @@ class DbUpgradeRequiredError(Exception):
         }
 
 
+class DbRecordFormatError(DbUpgradeRequiredError):
+    """
+    Error used to report that the records of a database are to be converted
+    to the record format set in the preferences before it can be used.
+    """
+
+    def __str__(self):
+        return _(
+            "The records of the Family Tree you are trying to load are "
+            "stored in the %(oldschema)s format. Your preferences ask for "
+            "the %(newschema)s format. Therefore you cannot load this Family "
+            "Tree without converting all its records.\n\n"
+            "Previous versions of Gramps only read Family Trees whose records "
+            "are in the uncompressed pickle format, and will refuse to open "
+            "the converted Family Tree otherwise.\n\n"
+            "To keep the present format, set the database.blob-codec and "
+            "database.compress-blobs preferences back and load the Family "
+            "Tree again."
+        ) % {
+            "oldschema": self.oldschema,
+            "newschema": self.newschema,
+        }
+
+
 class DbConnectionError(Exception):
     """
     Error used to report that a database connection failed.
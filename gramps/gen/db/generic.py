@@ -35,6 +35,9 @@ import ast
 import sys
 import datetime
 import glob
+import sqlite3
+import zlib
+from collections import OrderedDict
 from pathlib import Path
 
 # ------------------------------------------------------------------------
@@ -66,6 +69,7 @@ from . import (
     DBMODE_R,
     DBMODE_W,
 )
+from .dbconst import ARRAYSIZE
 from .utils import write_lock_file, clear_lock_file
 from .exceptions import DbVersionError, DbUpgradeRequiredError
 from ..errors import HandleError
@@ -88,6 +92,7 @@ from ..lib import (
     Note,
     NameOriginType,
 )
+from ..lib.date import gregorian
 from ..lib.genderstats import GenderStats
 from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
@@ -112,50 +117,160 @@ SIGBASE = (
 
 
 class DbGenericUndo(DbUndo):
+    """
+    The undo log of a database.
+
+    For a database in a directory, the records are zlib compressed and
+    written to an SQLite file in that directory.  Only the most recently used
+    records are kept in memory, up to "database.undo-cache-size" bytes, and
+    the others are read back when a transaction is undone or redone.  The
+    records of an in-memory or read-only database are kept in a list.
+    """
+
     def __init__(self, grampsdb, path):
         super(DbGenericUndo, self).__init__(grampsdb)
         self.undodb = []
+        self.path = path
+        self.connection = None
+        self.cache = OrderedDict()
+        self.cache_size = 0
+        self.cache_limit = config.get("database.undo-cache-size")
+        self.pending = []
+        self.count = 0
 
     def open(self, value=None):
         """
-        Open the backing storage.  Needs to be overridden in the derived
-        class.
+        Open the backing storage.
+
+        The undo queue does not outlive a session, so the records left by a
+        previous session are discarded.
         """
-        pass
+        if self.path is None or self.db.readonly:
+            return
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.connection = sqlite3.connect(self.path)
+            # The log is scratch data: it needs no journal nor syncing.
+            self.connection.execute("PRAGMA journal_mode = OFF;")
+            self.connection.execute("PRAGMA synchronous = OFF;")
+            self.connection.execute(
+                "CREATE TABLE undo (recno INTEGER PRIMARY KEY, data BLOB)"
+            )
+        except (OSError, sqlite3.Error) as err:
+            LOG.warning("unable to open undo log %s: %s", self.path, err)
+            self.connection = None
 
     def close(self):
         """
-        Close the backing storage.  Needs to be overridden in the derived
-        class.
+        Close the backing storage, and remove the undo log.
         """
-        pass
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self.undodb = []
+        self.cache.clear()
+        self.cache_size = 0
+        self.pending = []
+        self.count = 0
 
     def append(self, value):
         """
-        Add a new entry on the end.  Needs to be overridden in the derived
-        class.
+        Add a new entry on the end, and return its index.
         """
-        self.undodb.append(value)
+        index = self.count
+        self.count += 1
+        if self.connection is None:
+            self.undodb.append(value)
+            return index
+        self.pending.append((index, zlib.compress(value)))
+        self.__cache(index, value)
+        if len(self.pending) >= ARRAYSIZE:
+            self.__flush()
+        return index
 
     def __getitem__(self, index):
         """
-        Returns an entry by index number.  Needs to be overridden in the
-        derived class.
-        """
-        return self.undodb[index]
+        Returns an entry by index number.
+        """
+        if self.connection is None:
+            return self.undodb[index]
+        if index < 0:
+            index += self.count
+        value = self.cache.get(index)
+        if value is not None:
+            self.cache.move_to_end(index)
+            return value
+        self.__flush()
+        row = self.connection.execute(
+            "SELECT data FROM undo WHERE recno = ?", (index,)
+        ).fetchone()
+        if row is None:
+            raise IndexError(index)
+        value = zlib.decompress(row[0])
+        self.__cache(index, value)
+        return value
 
     def __setitem__(self, index, value):
         """
-        Set an entry to a value.  Needs to be overridden in the derived class.
+        Set an entry to a value.
         """
-        self.undodb[index] = value
+        if self.connection is None:
+            self.undodb[index] = value
+            return
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        self.__flush()
+        self.connection.execute(
+            "UPDATE undo SET data = ? WHERE recno = ?", (zlib.compress(value), index)
+        )
+        self.connection.commit()
+        self.__uncache(index)
+        self.__cache(index, value)
 
     def __len__(self):
         """
-        Returns the number of entries.  Needs to be overridden in the derived
-        class.
+        Returns the number of entries.
         """
-        return len(self.undodb)
+        return self.count
+
+    def _after_commit(self, transaction):
+        """
+        Write the records of the transaction to the undo log.
+        """
+        self.__flush()
+
+    def __flush(self):
+        """
+        Write the pending records to the undo log.
+        """
+        if self.pending:
+            self.connection.executemany(
+                "INSERT INTO undo (recno, data) VALUES (?, ?)", self.pending
+            )
+            self.connection.commit()
+            self.pending = []
+
+    def __cache(self, index, value):
+        """
+        Keep a record in memory, forgetting the least recently used records
+        beyond the size limit.
+        """
+        self.cache[index] = value
+        self.cache_size += len(value)
+        while self.cache_size > self.cache_limit and len(self.cache) > 1:
+            self.cache_size -= len(self.cache.popitem(last=False)[1])
+
+    def __uncache(self, index):
+        value = self.cache.pop(index, None)
+        if value is not None:
+            self.cache_size -= len(value)
 
     def _redo(self, update_history):
         """
@@ -175,7 +290,7 @@ class DbGenericUndo(DbUndo):
             self.db._txn_begin()
             for record_id in subitems:
                 (key, trans_type, handle, old_data, new_data) = pickle.loads(
-                    self.undodb[record_id]
+                    self[record_id]
                 )
 
                 if key == REFERENCE_KEY:
@@ -224,7 +339,7 @@ class DbGenericUndo(DbUndo):
             self.db._txn_begin()
             for record_id in subitems:
                 (key, trans_type, handle, old_data, new_data) = pickle.loads(
-                    self.undodb[record_id]
+                    self[record_id]
                 )
 
                 if key == REFERENCE_KEY:
@@ -648,7 +763,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
         if not self._schema_exists():
             self._create_schema()
-            self._set_metadata("version", str(self.VERSION[0]))
+            self.set_schema_version(self.VERSION[0])
+        self._check_schema()
 
         # Load metadata
         self.name_formats = self._get_metadata("name_formats")
@@ -714,7 +830,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.db_is_open = True
 
         # Check on db version to see if we need upgrade or too new
-        dbversion = int(self._get_metadata("version", default="0"))
+        dbversion = self.get_schema_version()
         if dbversion > self.VERSION[0]:
             self.close()
             raise DbVersionError(dbversion, 18, self.VERSION[0])
@@ -729,6 +845,14 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
                 self.close()
                 raise DbUpgradeRequiredError(dbversion, self.VERSION[0])
 
+    def _check_schema(self):
+        """
+        Read what the backend needs to know about the tables of a database
+        before they are read.  The schema version is not checked yet, so
+        the tables must not be changed.  Backends override this as needed.
+        """
+        pass
+
     def _create_undo_manager(self):
         """
         Create the undo manager.
@@ -809,6 +933,9 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             except IOError:
                 pass
 
+        if self.undodb is not None:
+            self.undodb.close()
+            self.undodb = None
         self.db_is_open = False
         self._directory = None
 
@@ -1370,6 +1497,53 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
     def get_tag_from_handle(self, handle):
         return self._get_from_handle(TAG_KEY, Tag, handle)
 
+    ################################################################
+    #
+    # get_*_from_handles methods
+    #
+    ################################################################
+
+    def _get_from_handles(self, obj_key, obj_class, handles):
+        handles = list(handles)
+        data_map = dict(self._iter_raw_data_from_keys(obj_key, handles))
+        objects = []
+        for handle in handles:
+            data = data_map.get(handle)
+            if not data:
+                raise HandleError("Handle %s not found" % handle)
+            objects.append(obj_class.create(data))
+        return objects
+
+    def get_event_from_handles(self, handles):
+        return self._get_from_handles(EVENT_KEY, Event, handles)
+
+    def get_family_from_handles(self, handles):
+        return self._get_from_handles(FAMILY_KEY, Family, handles)
+
+    def get_repository_from_handles(self, handles):
+        return self._get_from_handles(REPOSITORY_KEY, Repository, handles)
+
+    def get_person_from_handles(self, handles):
+        return self._get_from_handles(PERSON_KEY, Person, handles)
+
+    def get_place_from_handles(self, handles):
+        return self._get_from_handles(PLACE_KEY, Place, handles)
+
+    def get_citation_from_handles(self, handles):
+        return self._get_from_handles(CITATION_KEY, Citation, handles)
+
+    def get_source_from_handles(self, handles):
+        return self._get_from_handles(SOURCE_KEY, Source, handles)
+
+    def get_note_from_handles(self, handles):
+        return self._get_from_handles(NOTE_KEY, Note, handles)
+
+    def get_media_from_handles(self, handles):
+        return self._get_from_handles(MEDIA_KEY, Media, handles)
+
+    def get_tag_from_handles(self, handles):
+        return self._get_from_handles(TAG_KEY, Tag, handles)
+
     ################################################################
     #
     # get_*_from_gramps_id methods
@@ -1760,6 +1934,51 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
     def get_raw_tag_data(self, handle):
         return self._get_raw_data(TAG_KEY, handle)
 
+    ################################################################
+    #
+    # iter_raw_*_data methods
+    #
+    ################################################################
+
+    def _iter_raw_data_from_keys(self, obj_key, handles):
+        """
+        Return an iterator over (handle, raw data) tuples for the objects of
+        a class with the given handles.
+        """
+        return self._iter_raw_data_from_handles(
+            lambda handle: self._get_raw_data(obj_key, handle), handles
+        )
+
+    def iter_raw_person_data(self, handles):
+        return self._iter_raw_data_from_keys(PERSON_KEY, handles)
+
+    def iter_raw_family_data(self, handles):
+        return self._iter_raw_data_from_keys(FAMILY_KEY, handles)
+
+    def iter_raw_source_data(self, handles):
+        return self._iter_raw_data_from_keys(SOURCE_KEY, handles)
+
+    def iter_raw_citation_data(self, handles):
+        return self._iter_raw_data_from_keys(CITATION_KEY, handles)
+
+    def iter_raw_event_data(self, handles):
+        return self._iter_raw_data_from_keys(EVENT_KEY, handles)
+
+    def iter_raw_media_data(self, handles):
+        return self._iter_raw_data_from_keys(MEDIA_KEY, handles)
+
+    def iter_raw_place_data(self, handles):
+        return self._iter_raw_data_from_keys(PLACE_KEY, handles)
+
+    def iter_raw_repository_data(self, handles):
+        return self._iter_raw_data_from_keys(REPOSITORY_KEY, handles)
+
+    def iter_raw_note_data(self, handles):
+        return self._iter_raw_data_from_keys(NOTE_KEY, handles)
+
+    def iter_raw_tag_data(self, handles):
+        return self._iter_raw_data_from_keys(TAG_KEY, handles)
+
     ################################################################
     #
     # get_raw_*_from_id_data methods
@@ -2605,6 +2824,38 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             break
         return enclosed_by
 
+    def _get_person_event_data(self, person):
+        """
+        Given a Person, return the handles of its birth and death events.
+        """
+        birth_ref = person.get_birth_ref()
+        death_ref = person.get_death_ref()
+        return (
+            birth_ref.ref if birth_ref else None,
+            death_ref.ref if death_ref else None,
+        )
+
+    def _get_event_data(self, event):
+        """
+        Given an Event, return the sort values of the start and the end of
+        its date, its quality and modifier, and the year, month and day of
+        its start in the Gregorian calendar.
+        """
+        date = event.get_date_object()
+        year = month = day = 0
+        if date.sortval:
+            greg = gregorian(date)
+            year, month, day = greg.get_year(), greg.get_month(), greg.get_day()
+        return (
+            date.sortval,
+            date.get_stop_sort_value(),
+            date.get_quality(),
+            date.get_modifier(),
+            year,
+            month,
+            day,
+        )
+
     def _gramps_upgrade(self, version, directory, callback=None):
         """
         Here we do the calls for stepwise schema upgrades.
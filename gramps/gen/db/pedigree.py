@@ -0,0 +1,817 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Compact in-memory index of the family links of a database.
+
+The :py:class:`PedigreeGraph` keeps the parent, child and spouse links of
+all the people of a database as integer-indexed arrays, loaded from the raw
+person and family data in one scan. Filters, tools and reports that walk
+the family tree use it instead of unserializing a person and a family for
+every step of the walk.
+
+Use :py:func:`get_pedigree_graph` to get the graph of a database. It is
+built on first use, kept up to date from the commit signals of the database
+and rebuilt when the database was changed without them.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+from array import array
+from collections import deque
+import logging
+import weakref
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..utils.callback import Callback
+
+LOG = logging.getLogger(".db.pedigree")
+
+# -------------------------------------------------------------------------
+#
+# Constants
+#
+# -------------------------------------------------------------------------
+# Indexes into the serialized person and family data
+PERSON_GENDER = 2
+PERSON_FAMILIES = 8
+PERSON_PARENT_FAMILIES = 9
+FAMILY_FATHER = 2
+FAMILY_MOTHER = 3
+FAMILY_CHILDREN = 4
+CHILD_HANDLE = 3
+CHILD_FATHER_REL = 4
+CHILD_MOTHER_REL = 5
+
+NONE = -1
+
+# The tables whose commits are tracked to tell signalled from silent changes
+SIGNAL_TABLES = (
+    "person",
+    "family",
+    "source",
+    "citation",
+    "event",
+    "media",
+    "place",
+    "repository",
+    "note",
+    "tag",
+)
+
+_GRAPHS = weakref.WeakKeyDictionary()
+
+
+def get_pedigree_graph(db):
+    """
+    Return the :py:class:`PedigreeGraph` of a database.
+
+    The graph is shared by all the users of the database, built the first
+    time it is needed and refreshed when the database has changed since.
+    A :py:class:`.CacheProxyDb` shares the graph of its database.
+    """
+    from ..proxy.cache import CacheProxyDb
+
+    while isinstance(db, CacheProxyDb):
+        db = db.db
+    try:
+        graph = _GRAPHS.get(db)
+    except TypeError:
+        # Databases that can not be weakly referenced are not cached
+        return PedigreeGraph(db)
+    if graph is None:
+        graph = _GRAPHS[db] = PedigreeGraph(db)
+    graph.refresh()
+    return graph
+
+
+# -------------------------------------------------------------------------
+#
+# PedigreeGraph
+#
+# -------------------------------------------------------------------------
+class PedigreeGraph:
+    """
+    Integer-indexed adjacency of the people and families of a database.
+
+    People and families are numbered in the order they are first seen.
+    References to people or families that are not in the database get a
+    number too, but are marked as absent and are never walked through.
+    """
+
+    def __init__(self, db):
+        self._db = weakref.ref(db)
+        self._changed = None
+        self._dirty = True
+        # Change counter the database is to have after the commit whose
+        # signals updated the graph.
+        self._expected = None
+        # Incremented on every change, for the users who keep results
+        # computed from the graph.
+        self.version = 0
+        self._clear()
+        if isinstance(db, Callback):
+            # Proxies forward connect to the database they wrap, but their
+            # graph must be rebuilt through the proxy.
+            self._connect_signals(db)
+
+    def _clear(self):
+        self.person_index = {}
+        self.person_handles = []
+        self.person_present = bytearray()
+        self.gender = array("b")
+        self.families = []
+        self.parent_families = []
+        self.family_index = {}
+        self.family_handles = []
+        self.family_present = bytearray()
+        self.father = array("l")
+        self.mother = array("l")
+        self.children = []
+        self.child_rels = []
+
+    # ---------------------------------------------------------------------
+    # Maintenance
+    # ---------------------------------------------------------------------
+    def _connect_signals(self, db):
+        """
+        Follow the changes of a database that emits signals.
+
+        The signal callbacks only hold a weak reference to the graph, so
+        that a graph nobody uses does not stay connected.
+        """
+        ref = weakref.ref(self)
+
+        def callback(method):
+            def call(*args):
+                graph = ref()
+                if graph is not None:
+                    getattr(graph, method)(*args)
+
+            return call
+
+        db.connect("person-add", callback("_update_people"))
+        db.connect("person-update", callback("_update_people"))
+        db.connect("person-delete", callback("_delete_people"))
+        db.connect("family-add", callback("_update_families"))
+        db.connect("family-update", callback("_update_families"))
+        db.connect("family-delete", callback("_delete_families"))
+        for table in SIGNAL_TABLES:
+            db.connect(table + "-rebuild", callback("_rebuild"))
+            if table not in ("person", "family"):
+                for action in ("add", "update", "delete"):
+                    db.connect("%s-%s" % (table, action), callback("_signal"))
+
+    def refresh(self):
+        """
+        Rebuild the graph if the database has changed without telling it.
+
+        Commits of normal transactions emit signals that update the graph.
+        Batch transactions and imports run with signals disabled only show
+        in the change counter of the database, and rebuild the graph.
+        """
+        db = self._db()
+        if db is None:
+            return
+        changed = getattr(db, "has_changed", None)
+        if self._dirty or changed not in (self._changed, self._expected):
+            self._build(db)
+        self._changed = changed
+        self._expected = None
+
+    def _build(self, db):
+        """
+        Load the graph from the raw data of all the people and families.
+        """
+        self._clear()
+        with db.get_person_cursor() as cursor:
+            for handle, data in cursor:
+                self._set_person(handle, data)
+        with db.get_family_cursor() as cursor:
+            for handle, data in cursor:
+                self._set_family(handle, data)
+        self._dirty = False
+        self.version += 1
+        LOG.debug(
+            "pedigree graph: %d people, %d families",
+            len(self.person_handles),
+            len(self.family_handles),
+        )
+
+    def _signal(self, *args):
+        """
+        Record the change counter the database is to have once the commit
+        emitting a signal is done, which does not rebuild the graph.
+
+        A commit increments the counter after emitting its signals, an undo
+        does not.  The graph is rebuilt if the counter has already moved
+        past what the signals told, by changes made without signals.
+        """
+        db = self._db()
+        changed = getattr(db, "has_changed", None)
+        if changed not in (self._changed, self._expected):
+            self._dirty = True
+        if changed is not None and getattr(db, "transaction", None) is not None:
+            changed += 1
+        self._expected = changed
+
+    def _rebuild(self, *args):
+        self._dirty = True
+
+    def _update_people(self, handles):
+        self._signal()
+        if self._dirty:
+            return
+        self.version += 1
+        db = self._db()
+        for handle in handles:
+            data = db.get_raw_person_data(handle)
+            if data:
+                self._set_person(handle, data)
+            else:
+                self._delete_people([handle])
+
+    def _delete_people(self, handles):
+        self._signal()
+        self.version += 1
+        for handle in handles:
+            index = self.person_index.get(handle)
+            if index is not None:
+                self.person_present[index] = 0
+                self.gender[index] = NONE
+                self.families[index] = ()
+                self.parent_families[index] = ()
+
+    def _update_families(self, handles):
+        self._signal()
+        if self._dirty:
+            return
+        self.version += 1
+        db = self._db()
+        for handle in handles:
+            data = db.get_raw_family_data(handle)
+            if data:
+                self._set_family(handle, data)
+            else:
+                self._delete_families([handle])
+
+    def _delete_families(self, handles):
+        self._signal()
+        self.version += 1
+        for handle in handles:
+            index = self.family_index.get(handle)
+            if index is not None:
+                self.family_present[index] = 0
+                self.father[index] = NONE
+                self.mother[index] = NONE
+                self.children[index] = ()
+                self.child_rels[index] = ()
+
+    def _person_id(self, handle):
+        index = self.person_index.get(handle)
+        if index is None:
+            index = self.person_index[handle] = len(self.person_handles)
+            self.person_handles.append(handle)
+            self.person_present.append(0)
+            self.gender.append(NONE)
+            self.families.append(())
+            self.parent_families.append(())
+        return index
+
+    def _family_id(self, handle):
+        index = self.family_index.get(handle)
+        if index is None:
+            index = self.family_index[handle] = len(self.family_handles)
+            self.family_handles.append(handle)
+            self.family_present.append(0)
+            self.father.append(NONE)
+            self.mother.append(NONE)
+            self.children.append(())
+            self.child_rels.append(())
+        return index
+
+    def _set_person(self, handle, data):
+        index = self._person_id(handle)
+        self.person_present[index] = 1
+        self.gender[index] = data[PERSON_GENDER]
+        self.families[index] = tuple(
+            self._family_id(family) for family in data[PERSON_FAMILIES]
+        )
+        self.parent_families[index] = tuple(
+            self._family_id(family) for family in data[PERSON_PARENT_FAMILIES]
+        )
+
+    def _set_family(self, handle, data):
+        index = self._family_id(handle)
+        self.family_present[index] = 1
+        father = data[FAMILY_FATHER]
+        mother = data[FAMILY_MOTHER]
+        self.father[index] = self._person_id(father) if father else NONE
+        self.mother[index] = self._person_id(mother) if mother else NONE
+        self.children[index] = tuple(
+            self._person_id(ref[CHILD_HANDLE]) for ref in data[FAMILY_CHILDREN]
+        )
+        self.child_rels[index] = tuple(
+            (ref[CHILD_FATHER_REL][0], ref[CHILD_MOTHER_REL][0])
+            for ref in data[FAMILY_CHILDREN]
+        )
+
+    # ---------------------------------------------------------------------
+    # Integer primitives
+    # ---------------------------------------------------------------------
+    def _ids(self, handles):
+        """
+        Return the numbers of the people of a list of handles that exist.
+        """
+        ids = []
+        for handle in handles:
+            index = self.person_index.get(handle)
+            if index is not None and self.person_present[index]:
+                ids.append(index)
+        return ids
+
+    def _handles(self, ids):
+        person_handles = self.person_handles
+        return {person_handles[index] for index in ids}
+
+    def _family_parents(self, family):
+        """
+        Return the numbers of the parents of a family that exist.
+        """
+        parents = []
+        for parent in (self.father[family], self.mother[family]):
+            if parent != NONE and self.person_present[parent]:
+                parents.append(parent)
+        return parents
+
+    def _family_children(self, family):
+        present = self.person_present
+        return [child for child in self.children[family] if present[child]]
+
+    def _walk(self, start, neighbours):
+        """
+        Return the numbers of all the people reached from the start people.
+        """
+        seen = set(start)
+        queue = deque(start)
+        while queue:
+            for other in neighbours(queue.popleft()):
+                if other not in seen:
+                    seen.add(other)
+                    queue.append(other)
+        return seen
+
+    def _main_parents(self, index):
+        families = self.parent_families[index]
+        if families and self.family_present[families[0]]:
+            return self._family_parents(families[0])
+        return ()
+
+    def _all_parents(self, index):
+        parents = []
+        for family in self.parent_families[index]:
+            if self.family_present[family]:
+                parents.extend(self._family_parents(family))
+        return parents
+
+    def _all_children(self, index):
+        children = []
+        for family in self.families[index]:
+            if self.family_present[family]:
+                children.extend(self._family_children(family))
+        return children
+
+    def _relatives(self, index):
+        """
+        Return the numbers of the other members of the families of a person.
+        """
+        relatives = []
+        for family in self.families[index] + self.parent_families[index]:
+            if self.family_present[family]:
+                relatives.extend(self._family_parents(family))
+                relatives.extend(self._family_children(family))
+        return [other for other in relatives if other != index]
+
+    # ---------------------------------------------------------------------
+    # Handle primitives
+    # ---------------------------------------------------------------------
+    def has_person(self, handle):
+        """
+        Return True if the person is in the database.
+        """
+        index = self.person_index.get(handle)
+        return index is not None and bool(self.person_present[index])
+
+    def get_gender(self, handle):
+        """
+        Return the gender of a person, or None if the person is unknown.
+        """
+        index = self.person_index.get(handle)
+        if index is None or not self.person_present[index]:
+            return None
+        return self.gender[index]
+
+    def get_family_handles(self, handle):
+        """
+        Return the handles of the families where a person is a parent.
+        """
+        index = self.person_index.get(handle)
+        if index is None:
+            return []
+        return [self.family_handles[family] for family in self.families[index]]
+
+    def get_parent_family_handles(self, handle):
+        """
+        Return the handles of the families where a person is a child, the
+        main family first.
+        """
+        index = self.person_index.get(handle)
+        if index is None:
+            return []
+        return [self.family_handles[family] for family in self.parent_families[index]]
+
+    def has_family(self, handle):
+        """
+        Return True if the family is in the database.
+        """
+        index = self.family_index.get(handle)
+        return index is not None and bool(self.family_present[index])
+
+    def get_father_mother_handles(self, family_handle):
+        """
+        Return the handles of the father and the mother of a family, None
+        for a missing parent.
+        """
+        index = self.family_index.get(family_handle)
+        if index is None:
+            return (None, None)
+        return tuple(
+            self.person_handles[parent] if parent != NONE else None
+            for parent in (self.father[index], self.mother[index])
+        )
+
+    def get_child_refs(self, family_handle):
+        """
+        Return the children of a family as a list of (handle, father
+        relation, mother relation) tuples, the relations being the values
+        of :py:class:`.ChildRefType`.
+        """
+        index = self.family_index.get(family_handle)
+        if index is None:
+            return []
+        return [
+            (self.person_handles[child], frel, mrel)
+            for child, (frel, mrel) in zip(self.children[index], self.child_rels[index])
+        ]
+
+    def get_parent_links(self, handle):
+        """
+        Return the families where a person is a child, the main family
+        first, as a list of (family handle, father handle, mother handle,
+        child relations) tuples, None for a family not in the database.
+
+        The child relations are the (father relation, mother relation) of
+        the person in the family, or () if the family does not list the
+        person; a missing parent is None.
+        """
+        index = self.person_index.get(handle)
+        if index is None:
+            return []
+        person_handles = self.person_handles
+        links = []
+        for family in self.parent_families[index]:
+            if not self.family_present[family]:
+                links.append(None)
+                continue
+            rels = ()
+            for child, child_rels in zip(
+                self.children[family], self.child_rels[family]
+            ):
+                if child == index:
+                    rels = child_rels
+                    break
+            father = self.father[family]
+            mother = self.mother[family]
+            links.append(
+                (
+                    self.family_handles[family],
+                    person_handles[father] if father != NONE else None,
+                    person_handles[mother] if mother != NONE else None,
+                    rels,
+                )
+            )
+        return links
+
+    def get_parents(self, handle, main_only=False):
+        """
+        Return the handles of the parents of a person, from the main parent
+        family only or from all of them.
+        """
+        ids = self._ids([handle])
+        if not ids:
+            return []
+        if main_only:
+            parents = self._main_parents(ids[0])
+        else:
+            parents = self._all_parents(ids[0])
+        return [self.person_handles[parent] for parent in parents]
+
+    def get_children(self, handle):
+        """
+        Return the handles of the children of a person in all families.
+        """
+        ids = self._ids([handle])
+        if not ids:
+            return []
+        return [self.person_handles[child] for child in self._all_children(ids[0])]
+
+    def get_spouses(self, handle):
+        """
+        Return the handles of the spouses of a person.
+        """
+        ids = self._ids([handle])
+        if not ids:
+            return []
+        spouses = []
+        for family in self.families[ids[0]]:
+            if self.family_present[family]:
+                for parent in self._family_parents(family):
+                    if parent != ids[0]:
+                        spouses.append(self.person_handles[parent])
+        return spouses
+
+    def get_ancestors(self, handles, main_only=True, inclusive=False):
+        """
+        Return the set of handles of the ancestors of some people.
+
+        :param main_only: only follow the main parent family of each person.
+        :param inclusive: include the starting people.
+        """
+        parents = self._main_parents if main_only else self._all_parents
+        return self._handles(self._reach(self._ids(handles), parents, inclusive))
+
+    def get_descendants(self, handles, inclusive=False):
+        """
+        Return the set of handles of the descendants of some people through
+        all their families.
+
+        :param inclusive: include the starting people.
+        """
+        return self._handles(
+            self._reach(self._ids(handles), self._all_children, inclusive)
+        )
+
+    def _reach(self, start, neighbours, inclusive):
+        """
+        Return the numbers of the people reached from the start people, who
+        are only included if inclusive or reached again through a loop.
+        """
+        if inclusive:
+            return self._walk(start, neighbours)
+        return self._walk(
+            {other for index in start for other in neighbours(index)}, neighbours
+        )
+
+    def get_ancestors_between(
+        self, handle, min_generation=0, max_generation=None, main_only=True
+    ):
+        """
+        Return the set of handles of the ancestors of a person reached by a
+        line of between min_generation and max_generation generations.
+
+        The person is generation 0 and the parents generation 1; there is
+        no upper limit if max_generation is None.
+        """
+        parents = self._main_parents if main_only else self._all_parents
+        return self._handles(
+            self._generations(handle, parents, min_generation, max_generation)
+        )
+
+    def get_descendants_between(self, handle, min_generation=0, max_generation=None):
+        """
+        Return the set of handles of the descendants of a person, through
+        all the families, reached by a line of between min_generation and
+        max_generation generations.
+
+        The person is generation 0 and the children generation 1; there is
+        no upper limit if max_generation is None.
+        """
+        return self._handles(
+            self._generations(
+                handle, self._all_children, min_generation, max_generation
+            )
+        )
+
+    def _generations(self, handle, neighbours, min_generation, max_generation):
+        """
+        Return the numbers of the people reached from a person by a walk
+        whose length is between min_generation and max_generation.
+
+        Without an upper limit the lengths are counted up to min_generation
+        only, so that the walk ends even if the links have loops.
+        """
+        found = set()
+        start = [(index, 0) for index in self._ids([handle])]
+        seen = set(start)
+        queue = deque(start)
+        while queue:
+            index, generation = queue.popleft()
+            if generation >= min_generation:
+                found.add(index)
+            if max_generation is None:
+                generation = min(generation + 1, max(min_generation, 0))
+            elif generation < max_generation:
+                generation += 1
+            else:
+                continue
+            for other in neighbours(index):
+                if (other, generation) not in seen:
+                    seen.add((other, generation))
+                    queue.append((other, generation))
+        return found
+
+    def get_common_ancestor_matches(self, handles):
+        """
+        Return the set of handles of the people who share an ancestor with
+        any of some people.
+
+        Every person counts as their own ancestor, and a parent family
+        without parents counts as a common ancestor of its children.
+        """
+        start = self._ids(handles)
+        ancestors = self._walk(start, self._all_parents)
+        lines = set(ancestors)
+        for index in ancestors:
+            for family in self.parent_families[index]:
+                if self.family_present[family] and not self._family_parents(family):
+                    lines.update(self._family_children(family))
+        return self._handles(self._walk(lines, self._all_children))
+
+    def get_changed_people(self, changes):
+        """
+        Return the set of handles of the people whose links may have changed
+        when some objects changed: the people changed and the members of the
+        families changed.
+
+        Return None if the changes of the people or of the families are not
+        known, or if some of them were removed, whose links are lost.
+
+        :param changes: the sets of handles of the objects changed, keyed by
+                        the names of their classes.
+        """
+        person_handles = changes.get("Person")
+        family_handles = changes.get("Family")
+        if person_handles is None or family_handles is None:
+            return None
+        people = set()
+        for handle in person_handles:
+            if not self.has_person(handle):
+                return None
+            people.add(handle)
+        for handle in family_handles:
+            if not self.has_family(handle):
+                return None
+            family = self.family_index[handle]
+            people.update(self._handles(self._family_parents(family)))
+            people.update(self._handles(self._family_children(family)))
+        return people
+
+    def get_relatives(self, handles):
+        """
+        Return the set of handles of the people connected to some people by
+        any chain of parent, child and spouse links, the people included.
+        """
+        return self._handles(self._walk(self._ids(handles), self._relatives))
+
+    def find_relation_paths(self, handle, targets, step=None):
+        """
+        Return the set of handles of the people on the shortest relation
+        paths from a person to a set of target people.
+
+        A relation path goes through the parents, children and spouses of
+        each person. Targets that can not be reached are ignored.
+
+        :param step: called with no arguments for every person visited.
+        """
+        ids = self._ids([handle])
+        if not ids:
+            return set()
+        targets = set(self._ids(targets))
+        found = set()
+        previous = {ids[0]: None}
+        queue = deque(ids)
+        while queue and targets:
+            index = queue.popleft()
+            if step:
+                step()
+            if index in targets:
+                targets.discard(index)
+                other = index
+                while other is not None:
+                    found.add(other)
+                    other = previous[other]
+            for other in self._relatives(index):
+                if other not in previous:
+                    previous[other] = index
+                    queue.append(other)
+        return self._handles(found)
+
+    def find_loops(self, handles=None, step=None):
+        """
+        Yield the loops in the descendant links of the database.
+
+        A loop is a list of (parent handle, child handle, family handle)
+        links; the first one is the link that closes the loop, followed by
+        the links around it starting from the child of the closing link.
+
+        :param handles: the people to start the walks from, all by default.
+        :param step: called with no arguments every time the descendants of
+            a person are known to be free of loops.
+        """
+        if handles is None:
+            start = [
+                index for index, present in enumerate(self.person_present) if present
+            ]
+        else:
+            start = self._ids(handles)
+        person_handles = self.person_handles
+        family_handles = self.family_handles
+        done = set()
+        for root in start:
+            if root in done:
+                continue
+            # Each frame is a person, the links left to follow, the family
+            # of the link being followed and whether a loop was found
+            path = {root: 0}
+            stack = [[root, self._child_links(root), None, False]]
+            while stack:
+                frame = stack[-1]
+                link = next(frame[1], None)
+                if link is None:
+                    stack.pop()
+                    del path[frame[0]]
+                    if frame[3]:
+                        if stack:
+                            stack[-1][3] = True
+                    else:
+                        done.add(frame[0])
+                        if step:
+                            step()
+                    continue
+                family, child = link
+                frame[2] = family
+                if child in done:
+                    continue
+                if child in path:
+                    frame[3] = True
+                    loop = [
+                        (
+                            person_handles[frame[0]],
+                            person_handles[child],
+                            family_handles[family],
+                        )
+                    ]
+                    for parent, next_frame in zip(
+                        stack[path[child] :], stack[path[child] + 1 :]
+                    ):
+                        loop.append(
+                            (
+                                person_handles[parent[0]],
+                                person_handles[next_frame[0]],
+                                family_handles[parent[2]],
+                            )
+                        )
+                    yield loop
+                    continue
+                path[child] = len(stack)
+                stack.append([child, self._child_links(child), None, False])
+
+    def _child_links(self, index):
+        for family in self.families[index]:
+            if self.family_present[family]:
+                for child in self._family_children(family):
+                    yield family, child
@@ -0,0 +1,241 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for the pedigree graph"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn, get_pedigree_graph
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import ChildRef, ChildRefType, Family, Person
+from gramps.gen.proxy import PrivateProxyDb
+
+
+# -------------------------------------------------------------------------
+#
+# PedigreeGraphTest class
+#
+# -------------------------------------------------------------------------
+class PedigreeGraphTest(unittest.TestCase):
+    """
+    Tests of the pedigree graph of a small tree.
+
+    The grandparents gf and gm have a son fa, who has the children a and b
+    with mo. a has the child c with sp. x and y are the children of a family
+    without parents and z has no family at all.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def setUp(self):
+        with DbTxn("Add tree", self.db) as trans:
+            for name, gender in (
+                ("gf", Person.MALE),
+                ("gm", Person.FEMALE),
+                ("fa", Person.MALE),
+                ("mo", Person.FEMALE),
+                ("a", Person.MALE),
+                ("b", Person.FEMALE),
+                ("sp", Person.FEMALE),
+                ("c", Person.MALE),
+                ("x", Person.MALE),
+                ("y", Person.FEMALE),
+                ("z", Person.UNKNOWN),
+            ):
+                person = Person()
+                person.set_gender(gender)
+                setattr(self, name, self.db.add_person(person, trans))
+            self.fam0 = self.add_family(self.gf, self.gm, [self.fa], trans)
+            self.fam1 = self.add_family(self.fa, self.mo, [self.a, self.b], trans)
+            self.fam2 = self.add_family(self.a, self.sp, [self.c], trans)
+            self.fam3 = self.add_family(None, None, [self.x, self.y], trans)
+        self.graph = get_pedigree_graph(self.db)
+
+    def tearDown(self):
+        with DbTxn("Remove tree", self.db) as trans:
+            for handle in self.db.get_family_handles():
+                self.db.remove_family(handle, trans)
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+
+    def add_family(self, father, mother, children, trans):
+        family = Family()
+        family.set_father_handle(father)
+        family.set_mother_handle(mother)
+        for child in children:
+            ref = ChildRef()
+            ref.set_reference_handle(child)
+            family.add_child_ref(ref)
+        handle = self.db.add_family(family, trans)
+        for parent in (father, mother):
+            if parent:
+                person = self.db.get_person_from_handle(parent)
+                person.add_family_handle(handle)
+                self.db.commit_person(person, trans)
+        for child in children:
+            person = self.db.get_person_from_handle(child)
+            person.add_parent_family_handle(handle)
+            self.db.commit_person(person, trans)
+        return handle
+
+    def test_links(self):
+        self.assertEqual(self.graph.get_parents(self.a), [self.fa, self.mo])
+        self.assertEqual(self.graph.get_children(self.fa), [self.a, self.b])
+        self.assertEqual(self.graph.get_spouses(self.a), [self.sp])
+        self.assertEqual(self.graph.get_parents(self.x), [])
+        self.assertEqual(self.graph.get_gender(self.gm), Person.FEMALE)
+        self.assertEqual(
+            self.graph.get_father_mother_handles(self.fam1), (self.fa, self.mo)
+        )
+        self.assertEqual(self.graph.get_parent_family_handles(self.c), [self.fam2])
+        birth = (ChildRefType.BIRTH, ChildRefType.BIRTH)
+        self.assertEqual(
+            self.graph.get_parent_links(self.c), [(self.fam2, self.a, self.sp, birth)]
+        )
+        self.assertEqual(
+            self.graph.get_parent_links(self.x), [(self.fam3, None, None, birth)]
+        )
+
+    def test_ancestors(self):
+        ancestors = {self.a, self.sp, self.fa, self.mo, self.gf, self.gm}
+        self.assertEqual(self.graph.get_ancestors([self.c]), ancestors)
+        self.assertEqual(
+            self.graph.get_ancestors([self.c], inclusive=True), ancestors | {self.c}
+        )
+        self.assertEqual(
+            self.graph.get_descendants([self.gf]), {self.fa, self.a, self.b, self.c}
+        )
+
+    def test_generations(self):
+        self.assertEqual(
+            self.graph.get_ancestors_between(self.c, 2),
+            {self.fa, self.mo, self.gf, self.gm},
+        )
+        self.assertEqual(
+            self.graph.get_ancestors_between(self.c, 0, 1), {self.c, self.a, self.sp}
+        )
+        self.assertEqual(
+            self.graph.get_descendants_between(self.gf, 2, 2), {self.a, self.b}
+        )
+        self.assertEqual(self.graph.get_descendants_between(self.gf, 4), set())
+        with DbTxn("Add loop", self.db) as trans:
+            self.add_family(self.c, None, [self.gf], trans)
+        self.assertEqual(
+            get_pedigree_graph(self.db).get_descendants_between(self.gf, 4),
+            {self.gf, self.fa, self.a, self.b, self.c},
+        )
+
+    def test_common_ancestor(self):
+        family = {self.gf, self.gm, self.fa, self.mo, self.a, self.b}
+        self.assertEqual(
+            self.graph.get_common_ancestor_matches([self.b]), family | {self.c}
+        )
+        self.assertEqual(
+            self.graph.get_common_ancestor_matches([self.c]),
+            family | {self.c, self.sp},
+        )
+        self.assertEqual(
+            self.graph.get_common_ancestor_matches([self.x]), {self.x, self.y}
+        )
+        self.assertEqual(self.graph.get_common_ancestor_matches([self.z]), {self.z})
+
+    def test_relatives(self):
+        self.assertEqual(
+            self.graph.get_relatives([self.b]),
+            {self.gf, self.gm, self.fa, self.mo, self.a, self.b, self.sp, self.c},
+        )
+        self.assertEqual(
+            self.graph.find_relation_paths(self.b, [self.c, self.z]),
+            {self.b, self.a, self.c},
+        )
+
+    def test_loops(self):
+        self.assertEqual(list(self.graph.find_loops()), [])
+        with DbTxn("Add loop", self.db) as trans:
+            family = self.add_family(self.c, None, [self.gf], trans)
+        graph = get_pedigree_graph(self.db)
+        loops = list(graph.find_loops([self.gf]))
+        self.assertEqual(
+            loops,
+            [
+                [
+                    (self.c, self.gf, family),
+                    (self.gf, self.fa, self.fam0),
+                    (self.fa, self.a, self.fam1),
+                    (self.a, self.c, self.fam2),
+                ]
+            ],
+        )
+
+    def test_update(self):
+        version = self.graph.version
+        with DbTxn("Add family", self.db) as trans:
+            self.add_family(self.z, self.y, [], trans)
+        graph = get_pedigree_graph(self.db)
+        self.assertIs(graph, self.graph)
+        self.assertGreater(graph.version, version)
+        self.assertEqual(graph.get_spouses(self.z), [self.y])
+        with DbTxn("Remove person", self.db) as trans:
+            self.db.remove_person(self.y, trans)
+        graph = get_pedigree_graph(self.db)
+        self.assertFalse(graph.has_person(self.y))
+        self.assertEqual(graph.get_spouses(self.z), [])
+
+    def test_batch(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            handle = self.db.add_person(Person(), trans)
+        self.assertTrue(get_pedigree_graph(self.db).has_person(handle))
+
+    def test_signal_then_batch(self):
+        with DbTxn("Add person", self.db) as trans:
+            first = self.db.add_person(Person(), trans)
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            second = self.db.add_person(Person(), trans)
+        graph = get_pedigree_graph(self.db)
+        self.assertTrue(graph.has_person(first))
+        self.assertTrue(graph.has_person(second))
+
+    def test_proxy(self):
+        person = self.db.get_person_from_handle(self.a)
+        person.set_privacy(True)
+        with DbTxn("Set private", self.db) as trans:
+            self.db.commit_person(person, trans)
+        proxy = PrivateProxyDb(self.db)
+        graph = get_pedigree_graph(proxy)
+        self.assertFalse(graph.has_person(self.a))
+        self.assertEqual(graph.get_descendants([self.fa]), {self.b})
+        self.assertTrue(get_pedigree_graph(self.db).has_person(self.a))
+
+
+if __name__ == "__main__":
+    unittest.main()
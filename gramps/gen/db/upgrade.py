@@ -50,6 +50,7 @@ from .dbconst import (
     SOURCE_KEY,
     NOTE_KEY,
     TAG_KEY,
+    KEY_TO_CLASS_MAP,
 )
 from ..const import GRAMPS_LOCALE as glocale
 
@@ -58,6 +59,48 @@ _ = glocale.translation.gettext
 LOG = logging.getLogger(".upgrade")
 
 
+def gramps_upgrade_codec(self, record_format):
+    """
+    Rewrite every primary object record with the codec of a record format,
+    and store the new record format in the metadata.
+
+    The backend must provide set_record_format, which sets the codec of a
+    record format, and _commit_raw, which writes a record with it.  Records
+    are self-describing, so this can run on a tree holding a mix of record
+    formats.
+    """
+    keys = (
+        PERSON_KEY,
+        FAMILY_KEY,
+        EVENT_KEY,
+        PLACE_KEY,
+        REPOSITORY_KEY,
+        SOURCE_KEY,
+        CITATION_KEY,
+        MEDIA_KEY,
+        NOTE_KEY,
+        TAG_KEY,
+    )
+    # Previous versions of Gramps must refuse the tree while some of its
+    # records may not be uncompressed pickles, so the format is stored
+    # before the records are converted, or after if it is that one.
+    plain = list(record_format) == ["pickle", False]
+    self.set_record_format(record_format, store=not plain)
+    length = sum(self._get_number_of(obj_key) for obj_key in keys)
+    self.set_total(length)
+    self._txn_begin()
+
+    for obj_key in keys:
+        handles_func = self._get_table_func(KEY_TO_CLASS_MAP[obj_key], "handles_func")
+        for handle in handles_func():
+            self._commit_raw(self._get_raw_data(obj_key, handle), obj_key)
+            self.update()
+
+    self._txn_commit()
+    if plain:
+        self.set_record_format(record_format)
+
+
 def gramps_upgrade_20(self):
     """
     Placeholder update.
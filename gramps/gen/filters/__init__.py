@@ -33,6 +33,7 @@ from ._genericfilter import (
     DeferredFamilyFilter,
 )
 from ._paramfilter import ParamFilter
+from ._filterresultcache import FilterResultCache
 from ._searchfilter import SearchFilter, ExactSearchFilter
 
 
@@ -0,0 +1,177 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Cache of the results of filters, invalidated by the changes of the database.
+"""
+
+# ------------------------------------------------------------------------
+#
+# Python modules
+#
+# ------------------------------------------------------------------------
+from collections import OrderedDict, abc
+import weakref
+
+# ------------------------------------------------------------------------
+#
+# Gramps imports
+#
+# ------------------------------------------------------------------------
+from ..db.dbconst import KEY_TO_CLASS_MAP
+
+# Number of filter results kept by default.
+CACHE_SIZE = 10
+
+
+def _get_database(db):
+    """
+    Return the database whose tables a database reads, through the caching
+    proxies which share its change counters.
+    """
+    from ..proxy.cache import CacheProxyDb
+
+    while isinstance(db, CacheProxyDb):
+        db = db.db
+    return db
+
+
+# -------------------------------------------------------------------------
+#
+# FilterResultCache
+#
+# -------------------------------------------------------------------------
+class FilterResultCache:
+    """
+    Keep the objects matched by the last filters applied to the databases,
+    with the change counters of its tables when they were applied.
+
+    The results of a filter are reused as long as no table changed.  When
+    the rules of a filter are all local, only the objects of its class
+    changed since then are tested again, and the objects which then match
+    come last.  When some rules follow the links between the people, the
+    people those links reach from the changed objects are tested again
+    too.  Databases which do not track their changes, such as the proxies,
+    are not cached.
+    """
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        # {(database id, filter key, tree):
+        #  (database reference, counters, matches, set of matches)}
+        self._entries = OrderedDict()
+
+    def clear(self):
+        """
+        Forget all the results.
+        """
+        self._entries.clear()
+
+    def get_counters(self, db):
+        """
+        Return the change counters of the tables of a database, or None if
+        it does not track its changes.
+        """
+        counters = {}
+        for obj_class in KEY_TO_CLASS_MAP.values():
+            counters[obj_class] = db.get_change_counter(obj_class)
+            if counters[obj_class] is None:
+                return None
+        return counters
+
+    def apply(self, filter_, db, id_list=None, tupleind=None, user=None, tree=False):
+        """
+        Apply a filter as :meth:`.GenericFilter.apply` does, reusing its
+        last results when possible.
+
+        Return None if the results cannot be cached: the database does not
+        track its changes, a rule cannot give a cache key, or the id_list
+        is shorter than the table, with no results to reuse.
+        """
+        if id_list is not None and not isinstance(id_list, abc.Sized):
+            return None
+        counters = self.get_counters(db)
+        if counters is None:
+            return None
+        key = filter_.get_cache_key(db)
+        if key is None:
+            return None
+        database = _get_database(db)
+        try:
+            database_ref = weakref.ref(database)
+        except TypeError:
+            return None
+        tree = tree and filter_.has_tree_order()
+        # The id of a database may be reused once it is gone, which its weak
+        # reference tells.
+        key = (id(database), key, tree)
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry[0]() is database:
+            entry = self.update(entry[1:], filter_, db, counters, tree)
+        else:
+            entry = None
+        if entry is None:
+            if id_list is not None and len(id_list) < filter_.get_number(db):
+                return None
+            matches = filter_.apply_rules(db, user=user, tree=tree)
+            entry = (counters, matches, set(matches))
+        self._entries[key] = (database_ref,) + entry
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+        dummy, matches, matched = entry
+        if id_list is None:
+            return list(matches)
+        if tupleind is None:
+            return [item for item in id_list if item in matched]
+        return [item for item in id_list if item[tupleind] in matched]
+
+    def update(self, entry, filter_, db, counters, tree):
+        """
+        Bring the results of a filter up to date with the database, testing
+        again the objects whose match may have changed.
+
+        Return None if the filter must be applied to all the objects.
+        """
+        old_counters, matches, matched = entry
+        if counters == old_counters:
+            return entry
+        if tree:
+            return None
+        obj_class = filter_.make_obj().__class__.__name__
+        if filter_.is_local():
+            handles = db.get_changed_handles(obj_class, old_counters[obj_class])
+        else:
+            changes = {
+                name: db.get_changed_handles(name, since)
+                for name, since in old_counters.items()
+            }
+            handles = filter_.get_affected_handles(db, changes)
+        if handles is None:
+            return None
+        has_handle = db.method("has_%s_handle", obj_class)
+        present = [handle for handle in handles if has_handle(handle)]
+        found = set(filter_.apply_rules(db, present)) if present else set()
+        matches = [
+            handle for handle in matches if handle not in handles or handle in found
+        ]
+        found -= matched
+        matches.extend(handle for handle in present if handle in found)
+        return (counters, matches, set(matches))
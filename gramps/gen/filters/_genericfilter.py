@@ -24,6 +24,15 @@
 Package providing filtering framework for Gramps.
 """
 
+# ------------------------------------------------------------------------
+#
+# Python modules
+#
+# ------------------------------------------------------------------------
+import multiprocessing
+from collections import abc
+from itertools import islice
+
 # ------------------------------------------------------------------------
 #
 # Gramps imports
@@ -39,10 +48,105 @@ from ..lib.repo import Repository
 from ..lib.media import Media
 from ..lib.note import Note
 from ..lib.tag import Tag
+from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
+from ._filterresultcache import FilterResultCache
+from ._ruleplanner import RulePlanner
 
 _ = glocale.translation.gettext
 
+# Number of objects loaded at once when a filter is applied to an id_list.
+CHUNK_SIZE = 500
+
+# Smallest number of objects for which a filter is applied by several
+# processes, and number of chunks of the objects given to each process.
+PARALLEL_SIZE = 5000
+PARALLEL_CHUNKS = 8
+
+# The filter, database and tuple index of the pool of processes applying a
+# filter, set before the processes are forked.
+_pool_task = None
+
+
+def _init_worker():
+    """
+    Give a process of the pool its own connection to the database.
+    """
+    _pool_task[1].reopen_reader()
+
+
+def _check_chunk(chunk):
+    """
+    Return the items of a chunk of an id_list matching the filter.
+    """
+    filter_, db, tupleind = _pool_task
+    return filter_.get_check_func()(db, chunk, None, tupleind)
+
+
+def _xor(values):
+    test = False
+    for value in values:
+        test = test ^ value
+    return test
+
+
+def _one(values):
+    found_one = False
+    for value in values:
+        if value:
+            if found_one:
+                return False  # There can be only one!
+            found_one = True
+    return found_one
+
+
+# The tests of the logical operators over the values of the rules.
+LOGICAL_TESTS = {"and": all, "or": any, "xor": _xor, "one": _one}
+
+
+def _sql_predicate(rule):
+    """
+    Return the SQL predicate of a rule, or None if it has none or if its
+    apply method is not given by the class which gives the predicate.
+    """
+    if "apply" in vars(rule):
+        return None
+    mro = type(rule).__mro__
+    owner = next(cls for cls in mro if "sql_predicate" in vars(cls))
+    if owner is not next(cls for cls in mro if "apply" in vars(cls)):
+        return None
+    return rule.sql_predicate()
+
+
+def _is_local(rule):
+    """
+    Return True if a rule is local, and its apply method is given by the
+    class which declares it local.
+    """
+    if "apply" in vars(rule):
+        return False
+    mro = type(rule).__mro__
+    owner = next(cls for cls in mro if "local" in vars(cls))
+    if owner is not next(cls for cls in mro if "apply" in vars(cls)):
+        return False
+    return rule.local
+
+
+def _affected_handles(rule, db, changes):
+    """
+    Return the handles of the objects whose match of a rule may change when
+    some objects change, or None if the rule cannot tell or if its prepare
+    or apply method is not given by the class which tells.
+    """
+    if "prepare" in vars(rule) or "apply" in vars(rule):
+        return None
+    mro = type(rule).__mro__
+    owner = next(cls for cls in mro if "affected_handles" in vars(cls))
+    for method in ("prepare", "apply"):
+        if owner is not next(cls for cls in mro if method in vars(cls)):
+            return None
+    return rule.affected_handles(db, changes)
+
 
 # -------------------------------------------------------------------------
 #
@@ -53,6 +157,9 @@ class GenericFilter:
     """Filter class that consists of several rules."""
 
     logical_functions = ["or", "and", "xor", "one"]
+    # The results of the filters, shared by all of them, or None to apply
+    # the filters without caching their results.
+    result_cache = FilterResultCache()
 
     def __init__(self, source=None):
         if source:
@@ -135,9 +242,15 @@ class GenericFilter:
     def find_from_handle(self, db, handle):
         return db.get_person_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_person_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_people()
 
+    def iter_handles(self, db):
+        return db.iter_person_handles()
+
     def check_func(self, db, id_list, task, user=None, tupleind=None, tree=False):
         final_list = []
         if user:
@@ -152,12 +265,7 @@ class GenericFilter:
                     if task(db, person) != self.invert:
                         final_list.append(handle)
         else:
-            for data in id_list:
-                if tupleind is None:
-                    handle = data
-                else:
-                    handle = data[tupleind]
-                person = self.find_from_handle(db, handle)
+            for data, person in self.iter_from_id_list(db, id_list, tupleind):
                 if user:
                     user.step_progress()
                 if task(db, person) != self.invert:
@@ -166,9 +274,41 @@ class GenericFilter:
             user.end_progress()
         return final_list
 
+    def iter_from_id_list(self, db, id_list, tupleind=None):
+        """
+        Return an iterator over (item, object) tuples for the items of an
+        id_list, loading the objects in chunks of handles.
+        """
+        id_list = iter(id_list)
+        while True:
+            chunk = list(islice(id_list, CHUNK_SIZE))
+            if not chunk:
+                break
+            if tupleind is None:
+                handles = chunk
+            else:
+                handles = [data[tupleind] for data in chunk]
+            yield from zip(chunk, self.find_from_handles(db, handles))
+
     def check_and(self, db, id_list, user=None, tupleind=None, tree=False):
+        return self.check_planned(db, id_list, all, user, tupleind, tree)
+
+    def check_or(self, db, id_list, user=None, tupleind=None, tree=False):
+        return self.check_planned(db, id_list, any, user, tupleind, tree)
+
+    def check_planned(self, db, id_list, test, user=None, tupleind=None, tree=False):
+        """
+        Apply the rules combined with "and" (test is all) or "or" (test is
+        any), in the order planned by a :class:`.RulePlanner`.
+        """
+        if id_list is None:
+            size = self.get_number(db)
+        elif isinstance(id_list, abc.Sized):
+            size = len(id_list)
+        else:
+            size = None
+        planner = RulePlanner(self.flist, test, size)
         final_list = []
-        flist = self.flist
         if user:
             user.begin_progress(_("Filter"), _("Applying ..."), self.get_number(db))
         if id_list is None:
@@ -178,28 +318,19 @@ class GenericFilter:
                     person.unserialize(data)
                     if user:
                         user.step_progress()
-                    val = all(rule.apply(db, person) for rule in flist)
-                    if val != self.invert:
+                    if planner.check(db, person) != self.invert:
                         final_list.append(handle)
         else:
-            for data in id_list:
-                if tupleind is None:
-                    handle = data
-                else:
-                    handle = data[tupleind]
-                person = self.find_from_handle(db, handle)
+            for data, person in self.iter_from_id_list(db, id_list, tupleind):
                 if user:
                     user.step_progress()
-                val = all(rule.apply(db, person) for rule in flist if person)
-                if val != self.invert:
+                if planner.check(db, person) != self.invert:
                     final_list.append(data)
         if user:
             user.end_progress()
+        planner.report()
         return final_list
 
-    def check_or(self, db, id_list, user=None, tupleind=None, tree=False):
-        return self.check_func(db, id_list, self.or_test, user, tupleind, tree=False)
-
     def check_one(self, db, id_list, user=None, tupleind=None, tree=False):
         return self.check_func(db, id_list, self.one_test, user, tupleind, tree=False)
 
@@ -234,6 +365,215 @@ class GenericFilter:
     def check(self, db, handle):
         return self.get_check_func()(db, [handle])
 
+    def get_cache_key(self, db):
+        """
+        Return a value identifying the objects matched by the filter while
+        the database is unchanged, or None if its results cannot be reused.
+        """
+        keys = [rule.cache_key(db) for rule in self.flist]
+        if None in keys:
+            return None
+        key = (type(self), self.logical_op, self.invert, tuple(keys))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def is_local(self):
+        """
+        Return True if whether the filter matches an object or not only
+        depends on the object.
+        """
+        return all(_is_local(rule) for rule in self.flist)
+
+    def get_affected_handles(self, db, changes):
+        """
+        Return the set of handles of the objects whose match of the filter
+        may have changed when some objects changed, or None if the match of
+        any object may have.
+
+        :param changes: the sets of handles of the objects changed, keyed by
+                        the names of their classes, None when not known.
+        """
+        affected = changes[self.make_obj().__class__.__name__]
+        if affected is None:
+            return None
+        affected = set(affected)
+        for rule in self.flist:
+            if _is_local(rule):
+                continue
+            handles = _affected_handles(rule, db, changes)
+            if handles is None:
+                return None
+            affected.update(handles)
+        return affected
+
+    def has_tree_order(self):
+        """
+        Return True if the tree cursor gives the objects in another order
+        than the cursor.
+        """
+        return type(self).get_tree_cursor is not GenericFilter.get_tree_cursor
+
+    def get_sql_predicate(self):
+        """
+        Return an SQL predicate matching the objects matched by the filter,
+        as a (where, args) tuple, or None if some of its rules can only be
+        applied in Python.
+        """
+        predicates = [_sql_predicate(rule) for rule in self.flist]
+        if not predicates or None in predicates:
+            return None
+        return self.combine_sql(predicates, self.invert)
+
+    def combine_sql(self, predicates, invert=False):
+        """
+        Combine the SQL predicates of some rules with the logical operator
+        of the filter.
+        """
+        wheres = ["(%s)" % where for where, dummy in predicates]
+        args = [arg for dummy, rule_args in predicates for arg in rule_args]
+        if self.logical_op == "or":
+            where = " OR ".join(wheres)
+        elif self.logical_op == "xor":
+            where = "(%s) %% 2 = 1" % " + ".join(wheres)
+        elif self.logical_op == "one":
+            where = "(%s) = 1" % " + ".join(wheres)
+        else:
+            where = " AND ".join(wheres)
+        if invert:
+            where = "NOT (%s)" % where
+        return (where, args)
+
+    def check_sql(self, db, user=None, tree=False):
+        """
+        Apply the filter to all the objects of the database, selecting them
+        with the SQL predicates of its rules.  The other rules are applied
+        in Python, to the objects which the predicates leave undecided.
+
+        Return None if no rule has an SQL predicate.
+        """
+        obj_class = self.make_obj().__class__.__name__
+        predicates = []
+        rules = []
+        for rule in self.flist:
+            predicate = _sql_predicate(rule)
+            if predicate is None:
+                rules.append(rule)
+            else:
+                predicates.append(predicate)
+        if not predicates:
+            return None
+        if not tree and not rules:
+            where, args = self.combine_sql(predicates, self.invert)
+            return db.select_handles(obj_class, where, args)
+        if not tree and self.get_check_func() == self.check_and and not self.invert:
+            # Only the objects matching all the predicates are loaded.
+            where, args = self.combine_sql(predicates)
+            handles = db.select_handles(obj_class, where, args)
+            final_list = self.check_parallel(db, handles, user)
+            if final_list is not None:
+                return final_list
+            final_list = []
+            planner = RulePlanner(rules, all, len(handles))
+            if user:
+                user.begin_progress(_("Filter"), _("Applying ..."), len(handles))
+            for handle, obj in self.iter_from_id_list(db, handles):
+                if user:
+                    user.step_progress()
+                if obj and planner.check(db, obj):
+                    final_list.append(handle)
+            if user:
+                user.end_progress()
+            planner.report()
+            return final_list
+
+        # Otherwise the objects are read with the cursor, in its order.
+        if rules:
+            test = LOGICAL_TESTS.get(self.logical_op, all)
+        else:
+            test = all
+            predicates = [self.combine_sql(predicates)]
+        matches = [
+            set(db.select_handles(obj_class, where, args)) for where, args in predicates
+        ]
+        final_list = []
+        if user:
+            user.begin_progress(_("Filter"), _("Applying ..."), self.get_number(db))
+        with self.get_tree_cursor(db) if tree else self.get_cursor(db) as cursor:
+            for handle, data in cursor:
+                if user:
+                    user.step_progress()
+                values = self.iter_values(db, handle, data, matches, rules)
+                if test(values) != self.invert:
+                    final_list.append(handle)
+        if user:
+            user.end_progress()
+        return final_list
+
+    def iter_values(self, db, handle, data, matches, rules):
+        """
+        Return an iterator over the values of the rules for an object: first
+        its membership of the sets of handles matching the SQL predicates,
+        then the values of the other rules.  The object is only created if
+        these are needed.
+        """
+        for handles in matches:
+            yield handle in handles
+        obj = self.make_obj()
+        obj.unserialize(data)
+        for rule in rules:
+            yield rule.apply(db, obj)
+
+    def check_parallel(self, db, id_list, user=None, tupleind=None, tree=False):
+        """
+        Apply the filter with a pool of processes, as set in the preferences,
+        each reading the database through a connection of its own.
+
+        The processes are forked once the rules are prepared, and check the
+        objects in chunks.  The matching items are returned in the order of
+        the id_list, or of the handles of the database if there is none.
+
+        Return None if the filter is to be applied by the calling process.
+        """
+        global _pool_task
+        processes = config.get("behavior.filter-processes")
+        if processes <= 1 or tree or not db.can_fork_readers():
+            return None
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            return None
+        if id_list is None:
+            if self.get_number(db) < PARALLEL_SIZE:
+                return None
+            id_list = list(self.iter_handles(db))
+        else:
+            id_list = list(id_list)
+            if len(id_list) < PARALLEL_SIZE:
+                return self.get_check_func()(db, id_list, user, tupleind)
+        size = max(CHUNK_SIZE, -(-len(id_list) // (processes * PARALLEL_CHUNKS)))
+        chunks = [
+            id_list[start : start + size] for start in range(0, len(id_list), size)
+        ]
+        final_list = []
+        if user:
+            user.begin_progress(_("Filter"), _("Applying ..."), len(id_list))
+        _pool_task = (self, db, tupleind)
+        try:
+            with context.Pool(min(processes, len(chunks)), _init_worker) as pool:
+                for chunk, result in zip(chunks, pool.imap(_check_chunk, chunks)):
+                    final_list.extend(result)
+                    if user:
+                        for dummy in chunk:
+                            user.step_progress()
+        finally:
+            _pool_task = None
+        if user:
+            user.end_progress()
+        return final_list
+
     def apply(self, db, id_list=None, tupleind=None, user=None, tree=False):
         """
         Apply the filter using db.
@@ -250,11 +590,31 @@ class GenericFilter:
                 do not match the filter, filtered out.
                 if id_list not given, all items in the database that
                 match the filter are returned as a list of handles
+
+        The results are kept in the result cache, and reused as long as the
+        database is unchanged.
+        """
+        if self.result_cache is not None:
+            res = self.result_cache.apply(self, db, id_list, tupleind, user, tree)
+            if res is not None:
+                return res
+        return self.apply_rules(db, id_list, tupleind, user, tree)
+
+    def apply_rules(self, db, id_list=None, tupleind=None, user=None, tree=False):
+        """
+        Apply the rules of the filter using db, as :meth:`apply` does,
+        without the result cache.
         """
         m = self.get_check_func()
         for rule in self.flist:
             rule.requestprepare(db, user)
-        res = m(db, id_list, user, tupleind, tree)
+        res = None
+        if id_list is None and db.has_sql_select():
+            res = self.check_sql(db, user, tree)
+        if res is None:
+            res = self.check_parallel(db, id_list, user, tupleind, tree)
+        if res is None:
+            res = m(db, id_list, user, tupleind, tree)
         for rule in self.flist:
             rule.requestreset()
         return res
@@ -273,9 +633,15 @@ class GenericFamilyFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_family_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_family_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_families()
 
+    def iter_handles(self, db):
+        return db.iter_family_handles()
+
 
 class GenericEventFilter(GenericFilter):
     def __init__(self, source=None):
@@ -290,9 +656,15 @@ class GenericEventFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_event_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_event_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_events()
 
+    def iter_handles(self, db):
+        return db.iter_event_handles()
+
 
 class GenericSourceFilter(GenericFilter):
     def __init__(self, source=None):
@@ -307,9 +679,15 @@ class GenericSourceFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_source_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_source_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_sources()
 
+    def iter_handles(self, db):
+        return db.iter_source_handles()
+
 
 class GenericCitationFilter(GenericFilter):
     def __init__(self, source=None):
@@ -327,9 +705,15 @@ class GenericCitationFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_citation_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_citation_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_citations()
 
+    def iter_handles(self, db):
+        return db.iter_citation_handles()
+
 
 class GenericPlaceFilter(GenericFilter):
     def __init__(self, source=None):
@@ -347,9 +731,15 @@ class GenericPlaceFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_place_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_place_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_places()
 
+    def iter_handles(self, db):
+        return db.iter_place_handles()
+
 
 class GenericMediaFilter(GenericFilter):
     def __init__(self, source=None):
@@ -364,9 +754,15 @@ class GenericMediaFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_media_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_media_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_media()
 
+    def iter_handles(self, db):
+        return db.iter_media_handles()
+
 
 class GenericRepoFilter(GenericFilter):
     def __init__(self, source=None):
@@ -381,9 +777,15 @@ class GenericRepoFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_repository_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_repository_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_repositories()
 
+    def iter_handles(self, db):
+        return db.iter_repository_handles()
+
 
 class GenericNoteFilter(GenericFilter):
     def __init__(self, source=None):
@@ -398,9 +800,15 @@ class GenericNoteFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_note_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_note_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_notes()
 
+    def iter_handles(self, db):
+        return db.iter_note_handles()
+
 
 def GenericFilterFactory(namespace):
     if namespace == "Person":
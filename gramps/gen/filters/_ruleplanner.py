@@ -0,0 +1,141 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Order in which the rules of a filter are applied to the objects.
+"""
+
+# ------------------------------------------------------------------------
+#
+# Python modules
+#
+# ------------------------------------------------------------------------
+import logging
+from time import perf_counter
+
+LOG = logging.getLogger(".filter.planner")
+
+# Number of objects to which all the rules are applied and timed, before
+# they are ordered, and smallest number of objects for which this is done.
+SAMPLE_SIZE = 50
+PLAN_SIZE = 500
+
+
+# -------------------------------------------------------------------------
+#
+# RulePlanner
+#
+# -------------------------------------------------------------------------
+class RulePlanner:
+    """
+    Apply the rules of a filter combined with "and" or "or", in the order
+    which decides the objects at the least cost.
+
+    The rules are first ordered by their declared costs.  When enough
+    objects are to be tested, all the rules are applied to the first ones
+    and timed, and then ordered by their cost per object divided by the
+    rate at which they decide the result: the rate of misses for "and",
+    of hits for "or".  The result does not depend on the order.
+
+    When debug logging is enabled for the ".filter.planner" logger, every
+    rule is timed and a report is logged by :meth:`report`.
+    """
+
+    def __init__(self, rules, test, size=None):
+        """
+        :param rules: the rules of the filter.
+        :param test: all for "and", any for "or".
+        :param size: the number of objects to be tested, if known.
+        """
+        self.rules = sorted(rules, key=lambda rule: rule.cost)
+        self.test = test
+        self.debug = LOG.isEnabledFor(logging.DEBUG)
+        # Number of objects, hits and seconds of each rule.
+        self.stats = [[0, 0, 0.0] for rule in self.rules]
+        self.sample = 0
+        if len(self.rules) > 1 and size is not None and size >= PLAN_SIZE:
+            self.sample = SAMPLE_SIZE
+
+    def check(self, db, obj):
+        """
+        Return the value of the rules for an object.
+        """
+        if obj is None:
+            return self.test(())
+        if self.sample or self.debug:
+            return self.measure(db, obj)
+        return self.test(rule.apply(db, obj) for rule in self.rules)
+
+    def measure(self, db, obj):
+        """
+        Return the value of the rules for an object, timing them.  All the
+        rules are applied to the objects of the sample.
+        """
+        # The value deciding the result: a miss for "and", a hit for "or".
+        decisive = self.test is any
+        value = not decisive
+        for rule, stats in zip(self.rules, self.stats):
+            start = perf_counter()
+            hit = bool(rule.apply(db, obj))
+            stats[2] += perf_counter() - start
+            stats[0] += 1
+            stats[1] += hit
+            if hit is decisive:
+                value = decisive
+                if not self.sample:
+                    break
+        if self.sample:
+            self.sample -= 1
+            if not self.sample:
+                self.plan()
+        return value
+
+    def plan(self):
+        """
+        Order the rules by their cost per decided object.
+        """
+
+        def rank(index):
+            tests, hits, seconds = self.stats[index]
+            rate = hits / tests if self.test is any else 1 - hits / tests
+            return seconds / tests / rate if rate else float("inf")
+
+        order = sorted(range(len(self.rules)), key=rank)
+        self.rules = [self.rules[index] for index in order]
+        self.stats = [self.stats[index] for index in order]
+        if self.debug:
+            LOG.debug("Order: %s", ", ".join(rule.name for rule in self.rules))
+
+    def report(self):
+        """
+        Log the number of objects, the hit rate and the time of each rule,
+        when debug logging is enabled.
+        """
+        if not self.debug:
+            return
+        for rule, (tests, hits, seconds) in zip(self.rules, self.stats):
+            LOG.debug(
+                "%s %s: %d objects, %.1f%% hits, %.3f s",
+                rule.name,
+                rule.list,
+                tests,
+                100 * hits / tests if tests else 0,
+                seconds,
+            )
@@ -24,12 +24,16 @@ Package providing filtering framework for Gramps.
 
 
 class SearchFilter:
-    def __init__(self, func, text, invert):
+    def __init__(self, func, text, invert, handles=None):
         self.func = func
         self.text = text.upper()
         self.invert = invert
+        # The objects which may match, found in the full-text index.
+        self.handles = handles
 
     def match(self, handle, db):
+        if self.handles is not None and handle not in self.handles:
+            return self.invert
         return self.invert ^ (self.func(handle).upper().find(self.text) != -1)
 
 
@@ -58,6 +58,7 @@ class ChangedSinceBase(Rule):
         "date/time is given."
     )
     category = _("General filters")
+    local = True
 
     def add_time(self, date):
         if re.search(r"\d.*\s+\d{1,2}:\d{2}:\d{2}", date):
@@ -112,3 +113,12 @@ class ChangedSinceBase(Rule):
         if self.before:
             return obj_time < self.before
         return False
+
+    def sql_predicate(self):
+        if self.since:
+            if self.before:
+                return ("change >= ? AND change < ?", [self.since, self.before])
+            return ("change >= ?", [self.since])
+        if self.before:
+            return ("change < ?", [self.before])
+        return ("0", [])
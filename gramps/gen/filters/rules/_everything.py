@@ -46,9 +46,13 @@ class Everything(Rule):
     name = "Every object"
     category = _("General filters")
     description = "Matches every object in the database"
+    local = True
 
     def is_empty(self):
         return True
 
     def apply(self, db, obj):
         return True
+
+    def sql_predicate(self):
+        return ("1", [])
@@ -52,6 +52,7 @@ class HasAttributeBase(Rule):
     description = "Matches objects with the given attribute " "of a particular value"
     category = _("General filters")
     allow_regex = True
+    local = True
 
     def apply(self, db, obj):
         if not self.list[0]:
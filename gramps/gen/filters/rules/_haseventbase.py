@@ -52,6 +52,7 @@ class HasEventBase(Rule):
     description = "Matches events with particular parameters"
     category = _("Event filters")
     allow_regex = True
+    cost = 10
 
     def prepare(self, db, user):
         self.date = None
@@ -65,8 +66,15 @@ class HasEventBase(Rule):
                 self.date = parser.parse(self.list[1])
         except:
             pass
+        self.event_handles = self.find_events_matching_date(db, self.date)
+
+    def reset(self):
+        self.event_handles = None
 
     def apply(self, db, event):
+        if self.event_handles is not None:
+            if event.handle not in self.event_handles:
+                return False
         if self.etype:
             if self.etype.is_custom() and self.use_regex:
                 if self.regex[0].search(str(event.type)) is None:
@@ -77,7 +85,7 @@ class HasEventBase(Rule):
         if not self.match_substring(3, event.get_description()):
             return False
 
-        if self.date:
+        if self.date and self.event_handles is None:
             if not event.get_date_object().match(self.date):
                 return False
 
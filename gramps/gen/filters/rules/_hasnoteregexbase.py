@@ -50,8 +50,17 @@ class HasNoteRegexBase(Rule):
     )
     category = _("General filters")
     allow_regex = True
+    cost = 10
+
+    def prepare(self, db, user):
+        self.note_handles = self.find_text(db, "Note", "text")
+
+    def reset(self):
+        self.note_handles = None
 
     def apply(self, db, person):
+        if self.note_handles is not None:
+            return any(handle in self.note_handles for handle in person.get_note_list())
         for handle in person.get_note_list():
             note = db.get_note_from_handle(handle)
             if self.match_substring(0, note.get()):
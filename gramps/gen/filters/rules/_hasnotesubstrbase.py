@@ -45,9 +45,18 @@ class HasNoteSubstrBase(Rule):
     name = "Objects having notes containing <substring>"
     description = "Matches objects whose notes contain text matching a " "substring"
     category = _("General filters")
+    cost = 10
+
+    def prepare(self, db, user):
+        self.note_handles = self.find_text(db, "Note", "text")
+
+    def reset(self):
+        self.note_handles = None
 
     def apply(self, db, person):
         notelist = person.get_note_list()
+        if self.note_handles is not None:
+            return any(handle in self.note_handles for handle in notelist)
         for notehandle in notelist:
             note = db.get_note_from_handle(notehandle)
             n = note.get()
@@ -50,8 +50,17 @@ class HasSourceBase(Rule):
     category = _("Citation/source filters")
     allow_regex = True
 
+    def prepare(self, db, user):
+        self.handles = self.find_text(db, "Source", "title")
+
+    def reset(self):
+        self.handles = None
+
     def apply(self, db, source):
-        if not self.match_substring(0, source.get_title()):
+        if self.handles is not None:
+            if source.handle not in self.handles:
+                return False
+        elif not self.match_substring(0, source.get_title()):
             return False
 
         if not self.match_substring(1, source.get_author()):
@@ -69,3 +69,14 @@ class HasTagBase(Rule):
         if self.tag_handle is None:
             return False
         return self.tag_handle in obj.get_tag_list()
+
+    def sql_predicate(self):
+        """
+        Select the objects which refer to the tag.
+        """
+        if self.tag_handle is None:
+            return ("0", [])
+        return (
+            "handle IN (SELECT obj_handle FROM reference WHERE ref_handle = ?)",
+            [self.tag_handle],
+        )
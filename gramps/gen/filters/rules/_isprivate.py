@@ -42,6 +42,10 @@ class IsPrivate(Rule):
     name = "Objects marked private"
     description = "Matches objects that are indicated as private"
     category = _("General filters")
+    local = True
 
     def apply(self, db, obj):
         return obj.get_privacy()
+
+    def sql_predicate(self):
+        return ("private = 1", [])
@@ -39,6 +39,10 @@ class IsPublic(Rule):
     name = "Objects not marked private"
     description = "Matches objects that are not indicated as private"
     category = _("General filters")
+    local = True
 
     def apply(self, db, obj):
         return not obj.get_privacy()
+
+    def sql_predicate(self):
+        return ("private = 0", [])
@@ -27,6 +27,9 @@ import logging
 
 LOG = logging.getLogger(".filter")
 
+# The filters whose cache key is being built, to detect loops.
+_KEYED_FILTERS = set()
+
 # -------------------------------------------------------------------------
 #
 # Gramps modules
@@ -60,6 +63,14 @@ class MatchesFilterBase(Rule):
     description = "Matches objects matched by the specified filter name"
     category = _("General filters")
 
+    @property
+    def local(self):
+        """
+        The rule is local when all the rules of the selected filter are.
+        """
+        filt = self.find_filter()
+        return filt is None or filt.is_local()
+
     def prepare(self, db, user):
         if gramps.gen.filters.CustomFilters:
             filters = gramps.gen.filters.CustomFilters.get_filters_dict(self.namespace)
@@ -93,6 +104,34 @@ class MatchesFilterBase(Rule):
                 return filt.check(db, obj.handle)
         return False
 
+    def sql_predicate(self):
+        """
+        Use the predicate of the filter, if all its rules have one.
+        """
+        filt = self.find_filter()
+        if filt is None:
+            return ("0", [])
+        return filt.get_sql_predicate()
+
+    def cache_key(self, db):
+        """
+        Add the definition of the selected filter, which may be edited, or
+        return None if the filter references itself.
+        """
+        filt = self.find_filter()
+        if filt is None:
+            return Rule.cache_key(self, db)
+        if filt in _KEYED_FILTERS:
+            return None
+        _KEYED_FILTERS.add(filt)
+        try:
+            key = filt.get_cache_key(db)
+        finally:
+            _KEYED_FILTERS.discard(filt)
+        if key is None:
+            return None
+        return (Rule.cache_key(self, db), key)
+
     def find_filter(self):
         """
         Return the selected filter or None.
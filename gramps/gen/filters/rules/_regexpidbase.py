@@ -55,6 +55,10 @@ class RegExpIdBase(Rule):
     )
     category = _("General filters")
     allow_regex = True
+    local = True
 
     def apply(self, db, obj):
         return self.match_substring(0, obj.gramps_id)
+
+    def sql_predicate(self):
+        return self.sql_match_substring(0, "gramps_id")
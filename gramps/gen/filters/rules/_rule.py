@@ -58,6 +58,12 @@ class Rule:
     category = _("Miscellaneous filters")
     description = _("No description")
     allow_regex = False
+    # Whether the rule matches an object or not only depends on the object,
+    # so that changes to other objects cannot change it.
+    local = False
+    # Estimated cost of applying the rule to an object, relative to a test
+    # of the object itself: the rules reading other objects cost more.
+    cost = 1
 
     def __init__(self, arg, use_regex=False, use_case=False):
         self.list = []
@@ -199,3 +205,84 @@ class Rule:
             return False
         else:
             return True
+
+    def sql_match_substring(self, param_index, column):
+        """
+        Return an SQL predicate testing a text column as
+        :meth:`match_substring` tests a value, as a (where, args) tuple, or
+        None if SQL cannot fold the case of the text in the same way.
+        """
+        text = self.list[param_index]
+        if not text:
+            return ("1", [])
+        if self.use_regex:
+            regex = self.regex[param_index]
+            pattern = regex.pattern
+            if regex.flags & re.IGNORECASE:
+                pattern = "(?i)" + pattern
+            return ("COALESCE(%s, '') REGEXP ?" % column, [pattern])
+        if not text.isascii():
+            return None
+        return ("instr(upper(COALESCE(%s, '')), ?) > 0" % column, [text.upper()])
+
+    def find_text(self, db, obj_class, field, param_index=0):
+        """
+        Return the handles of the objects whose field contains the substring
+        given by param_index, looked up in the full-text index of the
+        database.
+
+        Return None when the index cannot be used: the database has none,
+        the value is empty or a regular expression is used.  The index holds
+        the fields listed in :meth:`~.db.base.DbReadBase.find_text`.
+        """
+        if self.use_regex or not self.list[param_index] or not db.has_text_index():
+            return None
+        return db.find_text(obj_class, field, self.list[param_index])
+
+    def find_events_matching_date(self, db, date):
+        """
+        Return the handles of the events whose date matches a date, looked
+        up in the date columns of the database.
+
+        Return None when there is no date or the database has no date index.
+        """
+        if date is None or not db.has_date_index():
+            return None
+        return db.find_events_matching_date(date)
+
+    def cache_key(self, db):
+        """
+        Return a value identifying the objects matched by the rule while the
+        database is unchanged.
+
+        A subclass whose matches also depend on values which are not kept
+        in the tables of the objects, as the bookmarks, adds them to the
+        value.
+        """
+        return (type(self), tuple(self.list), self.use_regex, self.use_case)
+
+    def sql_predicate(self):
+        """
+        Return an SQL predicate matching the same objects as :meth:`apply`,
+        as a (where, args) tuple, or None if the rule can only be applied in
+        Python.
+
+        The predicate is written over the table of the objects, as described
+        in :meth:`~.db.base.DbReadBase.select_handles`, and must evaluate to
+        0 or 1, never to NULL.  It is asked for once the rule is prepared,
+        and is not used by a subclass which overrides :meth:`apply`.
+        """
+        return None
+
+    def affected_handles(self, db, changes):
+        """
+        Return the set of handles of the objects whose match may change when
+        some objects change, or None if the match of any object may change.
+
+        changes maps the names of the classes of the objects to the sets of
+        handles of the objects of the class which changed, or to None when
+        they are not known.  It is asked for before the rule is prepared,
+        and is not used by a subclass which overrides :meth:`prepare` or
+        :meth:`apply`.
+        """
+        return None
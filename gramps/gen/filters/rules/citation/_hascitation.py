@@ -54,6 +54,7 @@ class HasCitation(Rule):
     allow_regex = True
 
     def prepare(self, db, user):
+        self.handles = self.find_text(db, "Citation", "page")
         self.date = None
         try:
             if self.list[1]:
@@ -61,8 +62,14 @@ class HasCitation(Rule):
         except:
             pass
 
+    def reset(self):
+        self.handles = None
+
     def apply(self, dbase, citation):
-        if not self.match_substring(0, citation.get_page()):
+        if self.handles is not None:
+            if citation.handle not in self.handles:
+                return False
+        elif not self.match_substring(0, citation.get_page()):
             return False
 
         if self.date:
@@ -49,6 +49,14 @@ class MatchesPageSubstringOf(Rule):
     category = _("General filters")
     allow_regex = True
 
+    def prepare(self, db, user):
+        self.handles = self.find_text(db, "Citation", "page")
+
+    def reset(self):
+        self.handles = None
+
     def apply(self, db, object):
         """Apply the filter"""
+        if self.handles is not None:
+            return object.handle in self.handles
         return self.match_substring(0, object.get_page())
@@ -62,13 +62,26 @@ class HasData(Rule):
 
         if self.date:
             self.date = parser.parse(self.date)
+        self.event_handles = self.find_events_matching_date(db, self.date or None)
+
+    def reset(self):
+        self.event_handles = None
 
     def apply(self, db, event):
+        if self.event_handles is not None:
+            if event.handle not in self.event_handles:
+                # No match
+                return False
+
         if self.event_type and event.get_type() != self.event_type:
             # No match
             return False
 
-        if self.date and not event.get_date_object().match(self.date):
+        if (
+            self.date
+            and self.event_handles is None
+            and not event.get_date_object().match(self.date)
+        ):
             # No match
             return False
 
@@ -60,6 +60,11 @@ class HasEvent(HasEventBase):
         for event_ref in family.get_event_ref_list():
             if not event_ref:
                 continue
+            if (
+                self.event_handles is not None
+                and event_ref.ref not in self.event_handles
+            ):
+                continue
             event = dbase.get_event_from_handle(event_ref.ref)
             if HasEventBase.apply(self, dbase, event):
                 return True
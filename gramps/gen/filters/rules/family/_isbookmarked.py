@@ -52,3 +52,9 @@ class IsBookmarked(Rule):
 
     def apply(self, db, family):
         return family.get_handle() in self.bookmarks
+
+    def cache_key(self, db):
+        """
+        Add the bookmarks, which are not kept in the tables.
+        """
+        return (Rule.cache_key(self, db), tuple(db.get_family_bookmarks().get()))
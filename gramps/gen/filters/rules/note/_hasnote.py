@@ -54,14 +54,21 @@ class HasNote(Rule):
     allow_regex = True
 
     def prepare(self, db, user):
+        self.handles = self.find_text(db, "Note", "text")
         if self.list[1]:
             self.ntype = NoteType()
             self.ntype.set_from_xml_str(self.list[1])
         else:
             self.ntype = None
 
+    def reset(self):
+        self.handles = None
+
     def apply(self, db, note):
-        if not self.match_substring(0, note.get()):
+        if self.handles is not None:
+            if note.handle not in self.handles:
+                return False
+        elif not self.match_substring(0, note.get()):
             return False
 
         if self.ntype:
@@ -47,8 +47,16 @@ class MatchesSubstringOf(Rule):
     description = _("Matches notes that contain text " "which matches a substring")
     category = _("General filters")
 
+    def prepare(self, db, user):
+        self.handles = self.find_text(db, "Note", "text")
+
+    def reset(self):
+        self.handles = None
+
     def apply(self, db, note):
         """Apply the filter"""
+        if self.handles is not None:
+            return note.handle in self.handles
         text = note.get()
         if text.upper().find(self.list[0].upper()) != -1:
             return True
@@ -46,9 +46,13 @@ class Everyone(Rule):
     name = _("Everyone")
     category = _("General filters")
     description = _("Matches everyone in the database")
+    local = True
 
     def is_empty(self):
         return True
 
     def apply(self, db, person):
         return True
+
+    def sql_predicate(self):
+        return ("1", [])
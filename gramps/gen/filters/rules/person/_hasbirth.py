@@ -52,12 +52,17 @@ class HasBirth(Rule):
     description = _("Matches people with birth data of a particular value")
     category = _("Event filters")
     allow_regex = True
+    cost = 10
 
     def prepare(self, db, user):
         if self.list[0]:
             self.date = parser.parse(self.list[0])
         else:
             self.date = None
+        self.event_handles = self.find_events_matching_date(db, self.date)
+
+    def reset(self):
+        self.event_handles = None
 
     def apply(self, db, person):
         for event_ref in person.get_event_ref_list():
@@ -66,6 +71,12 @@ class HasBirth(Rule):
             elif event_ref.role != EventRoleType.PRIMARY:
                 # Only match primaries, no witnesses
                 continue
+            elif (
+                self.event_handles is not None
+                and event_ref.ref not in self.event_handles
+            ):
+                # No match: wrong date
+                continue
             event = db.get_event_from_handle(event_ref.ref)
             if event.get_type() != EventType.BIRTH:
                 # No match: wrong type
@@ -73,7 +84,7 @@ class HasBirth(Rule):
             if not self.match_substring(2, event.get_description()):
                 # No match: wrong description
                 continue
-            if self.date:
+            if self.date and self.event_handles is None:
                 if not event.get_date_object().match(self.date):
                     # No match: wrong date
                     continue
@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from ....utils.db import for_each_ancestor
+from ....db.pedigree import get_pedigree_graph
 from .. import Rule
 
 
@@ -53,61 +53,37 @@ class HasCommonAncestorWith(Rule):
 
     def prepare(self, db, user):
         self.db = db
-        # For each(!) person we keep track of who their ancestors
-        # are, in a set(). So we only have to compute a person's
-        # ancestor list once.
-        # Start with filling the cache for root person (gramps_id in self.list[0])
-        self.ancestor_cache = {}
         root_person = db.get_person_from_gramps_id(self.list[0])
         if root_person:
-            self.add_ancs(db, root_person)
             self.with_people = [root_person.handle]
         else:
             self.with_people = []
+        self.init_matches(db)
 
-    def add_ancs(self, db, person):
-        if person and person.handle not in self.ancestor_cache:
-            self.ancestor_cache[person.handle] = set()
-            # We are going to compare ancestors of one person with that of
-            # another person; if that other person is an ancestor and itself
-            # has no ancestors is must be included, this is achieved by the
-            # little trick of making a person his own ancestor.
-            self.ancestor_cache[person.handle].add(person.handle)
-        else:
-            return
+    def init_matches(self, db):
+        """
+        Find everybody sharing an ancestor with the people in with_people.
 
-        for fam_handle in person.get_parent_family_handle_list():
-            parentless_fam = True
-            fam = db.get_family_from_handle(fam_handle)
-            if fam:
-                for par_handle in (fam.get_father_handle(), fam.get_mother_handle()):
-                    if par_handle:
-                        parentless_fam = False
-                        par = db.get_person_from_handle(par_handle)
-                        if par and par.handle not in self.ancestor_cache:
-                            self.add_ancs(db, par)
-                        if par:
-                            self.ancestor_cache[person.handle] |= self.ancestor_cache[
-                                par.handle
-                            ]
-                if parentless_fam:
-                    self.ancestor_cache[person.handle].add(fam_handle)
+        Rather than comparing the ancestors of every person with those of
+        with_people, the matches are the descendants of those ancestors.
+        """
+        self.matches = get_pedigree_graph(db).get_common_ancestor_matches(
+            self.with_people
+        )
 
     def reset(self):
-        self.ancestor_cache = {}
-
-    def has_common_ancestor(self, other):
-        for handle in self.with_people:
-            if (handle in self.ancestor_cache and self.ancestor_cache[handle]) & (
-                other
-                and other.handle in self.ancestor_cache
-                and self.ancestor_cache[other.handle]
-            ):
-                return True
-        return False
+        self.matches = set()
 
     def apply(self, db, person):
-        if person and person.handle not in self.ancestor_cache:
-            self.add_ancs(db, person)
+        return person.handle in self.matches
 
-        return self.has_common_ancestor(person)
+    def affected_handles(self, db, changes):
+        """
+        The people whose common ancestors with others may have changed share
+        an ancestor with the people whose links changed.
+        """
+        graph = get_pedigree_graph(db)
+        people = graph.get_changed_people(changes)
+        if people is None:
+            return None
+        return graph.get_common_ancestor_matches(people)
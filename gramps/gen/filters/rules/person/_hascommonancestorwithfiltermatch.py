@@ -32,7 +32,6 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from ....utils.db import for_each_ancestor
 from ._hascommonancestorwith import HasCommonAncestorWith
 from ._matchesfilter import MatchesFilter
 
@@ -55,15 +54,10 @@ class HasCommonAncestorWithFilterMatch(HasCommonAncestorWith):
 
     def __init__(self, list, use_regex=False):
         HasCommonAncestorWith.__init__(self, list, use_regex)
-        self.ancestor_cache = {}
+        self.matches = set()
 
     def prepare(self, db, user):
         self.db = db
-        # For each(!) person we keep track of who their ancestors
-        # are, in a set(). So we only have to compute a person's
-        # ancestor list once.
-        # Start with filling the cache for root person (gramps_id in self.list[0])
-        self.ancestor_cache = {}
         self.with_people = []
         self.filt = MatchesFilter(self.list)
         self.filt.requestprepare(db, user)
@@ -80,12 +74,10 @@ class HasCommonAncestorWithFilterMatch(HasCommonAncestorWith):
             if person and self.filt.apply(db, person):
                 # store all people in the filter so as to compare later
                 self.with_people.append(person.handle)
-                # fill list of ancestor of person if not present yet
-                if handle not in self.ancestor_cache:
-                    self.add_ancs(db, person)
+        self.init_matches(db)
         if user:
             user.end_progress()
 
     def reset(self):
         self.filt.requestreset()
-        self.ancestor_cache = {}
+        self.matches = set()
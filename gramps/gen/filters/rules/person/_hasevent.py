@@ -65,6 +65,11 @@ class HasEvent(HasEventBase):
             if int(self.list[5]) and event_ref.role != EventRoleType.PRIMARY:
                 # Only match primaries, no witnesses
                 continue
+            if (
+                self.event_handles is not None
+                and event_ref.ref not in self.event_handles
+            ):
+                continue
             event = dbase.get_event_from_handle(event_ref.ref)
             if HasEventBase.apply(self, dbase, event):
                 return True
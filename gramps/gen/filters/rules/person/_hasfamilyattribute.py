@@ -48,6 +48,7 @@ class HasFamilyAttribute(Rule):
     description = _("Matches people with the family attribute " "of a particular value")
     category = _("General filters")
     allow_regex = True
+    cost = 10
 
     def apply(self, db, person):
         if not self.list[0]:
@@ -52,6 +52,7 @@ class HasFamilyEvent(Rule):
     description = _("Matches people with a family event of a particular value")
     category = _("Event filters")
     allow_regex = True
+    cost = 10
 
     def prepare(self, db, user):
         self.date = None
@@ -60,6 +61,10 @@ class HasFamilyEvent(Rule):
                 self.date = parser.parse(self.list[1])
         except:
             pass
+        self.event_handles = self.find_events_matching_date(db, self.date)
+
+    def reset(self):
+        self.event_handles = None
 
     def apply(self, db, person):
         for f_id in person.get_family_handle_list():
@@ -70,6 +75,11 @@ class HasFamilyEvent(Rule):
                 if not event_ref:
                     continue
                 event_handle = event_ref.ref
+                if (
+                    self.event_handles is not None
+                    and event_handle not in self.event_handles
+                ):
+                    continue
                 event = db.get_event_from_handle(event_handle)
                 val = 1
                 if self.list[0]:
@@ -80,7 +90,7 @@ class HasFamilyEvent(Rule):
                 if self.list[3]:
                     if not self.match_substring(3, event.get_description()):
                         val = 0
-                if self.date:
+                if self.date and self.event_handles is None:
                     if not event.get_date_object().match(self.date):
                         val = 0
                 if self.list[2]:
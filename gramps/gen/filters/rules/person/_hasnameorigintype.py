@@ -49,6 +49,7 @@ class HasNameOriginType(Rule):
     name = _("People with the <Surname origin type>")
     description = _("Matches people with a surname origin")
     category = _("General filters")
+    local = True
 
     def apply(self, db, person):
         if not self.list[0]:
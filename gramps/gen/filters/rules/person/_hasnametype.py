@@ -49,6 +49,7 @@ class HasNameType(Rule):
     name = _("People with the <Name type>")
     description = _("Matches people with a type of name")
     category = _("General filters")
+    local = True
 
     def apply(self, db, person):
         if not self.list[0]:
@@ -52,6 +52,7 @@ class HasRelationship(Rule):
     name = _("People with the <relationships>")
     description = _("Matches people with a particular relationship")
     category = _("Family filters")
+    cost = 10
 
     def apply(self, db, person):
         rel_type = 0
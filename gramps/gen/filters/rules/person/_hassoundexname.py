@@ -48,6 +48,7 @@ class HasSoundexName(Rule):
     )
     category = _("General filters")
     allow_regex = False
+    local = True
 
     def apply(self, db, person):
         self.sndx = soundex(self.list[0])
@@ -47,6 +47,10 @@ class HasUnknownGender(Rule):
     name = _("People with unknown gender")
     category = _("General filters")
     description = _("Matches all people with unknown gender")
+    local = True
 
     def apply(self, db, person):
         return person.gender == Person.UNKNOWN
+
+    def sql_predicate(self):
+        return ("gender = ?", [Person.UNKNOWN])
@@ -32,6 +32,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from ....db.pedigree import get_pedigree_graph
 from .. import Rule
 
 
@@ -58,7 +59,8 @@ class IsAncestorOf(Rule):
             first = 1
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_ancestor_list(db, root_person, first)
+            if root_person:
+                self.init_ancestor_list(db, [root_person.handle], first)
         except:
             pass
 
@@ -68,21 +70,19 @@ class IsAncestorOf(Rule):
     def apply(self, db, person):
         return person.handle in self.map
 
-    def init_ancestor_list(self, db, person, first):
-        if not person:
-            return
-        if person.handle in self.map:
-            return
-        if not first:
-            self.map.add(person.handle)
-        fam_id = person.get_main_parents_family_handle()
-        if fam_id:
-            fam = db.get_family_from_handle(fam_id)
-            if fam:
-                f_id = fam.get_father_handle()
-                m_id = fam.get_mother_handle()
+    def affected_handles(self, db, changes):
+        """
+        The people whose descendants may have changed are the ancestors of
+        the people whose links changed.
+        """
+        graph = get_pedigree_graph(db)
+        people = graph.get_changed_people(changes)
+        if people is None:
+            return None
+        return graph.get_ancestors(people, main_only=False, inclusive=True)
 
-                if f_id:
-                    self.init_ancestor_list(db, db.get_person_from_handle(f_id), 0)
-                if m_id:
-                    self.init_ancestor_list(db, db.get_person_from_handle(m_id), 0)
+    def init_ancestor_list(self, db, handles, first):
+        """Add the ancestors along the main parent families of some people"""
+        self.map.update(
+            get_pedigree_graph(db).get_ancestors(handles, inclusive=not first)
+        )
@@ -71,11 +71,13 @@ class IsAncestorOfFilterMatch(IsAncestorOf):
                 _("Retrieving all sub-filter matches"),
                 db.get_number_of_people(),
             )
+        handles = []
         for person in db.iter_people():
             if user:
                 user.step_progress()
             if self.filt.apply(db, person):
-                self.init_ancestor_list(db, person, first)
+                handles.append(person.handle)
+        self.init_ancestor_list(db, handles, first)
         if user:
             user.end_progress()
 
@@ -53,3 +53,17 @@ class IsBookmarked(Rule):
 
     def apply(self, db, person):
         return person.handle in self.bookmarks
+
+    def sql_predicate(self):
+        if not self.bookmarks:
+            return ("0", [])
+        return (
+            "handle IN (%s)" % ", ".join("?" * len(self.bookmarks)),
+            list(self.bookmarks),
+        )
+
+    def cache_key(self, db):
+        """
+        Add the bookmarks, which are not kept in the tables.
+        """
+        return (Rule.cache_key(self, db), tuple(db.get_bookmarks().get()))
@@ -57,3 +57,9 @@ class IsDefaultPerson(Rule):
 
     def apply_real(self, db, person):
         return person.handle == self.def_handle
+
+    def cache_key(self, db):
+        """
+        Add the Home Person, who is not kept in the tables.
+        """
+        return (Rule.cache_key(self, db), db.get_default_handle())
@@ -32,6 +32,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from ....db.pedigree import get_pedigree_graph
 from .. import Rule
 
 
@@ -58,7 +59,8 @@ class IsDescendantOf(Rule):
             first = True
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_list(root_person, first)
+            if root_person:
+                self.init_list([root_person.handle], first)
         except:
             pass
 
@@ -68,15 +70,19 @@ class IsDescendantOf(Rule):
     def apply(self, db, person):
         return person.handle in self.map
 
-    def init_list(self, person, first):
-        if not person or person.handle in self.map:
-            # if we have been here before, skip
-            return
-        if not first:
-            self.map.add(person.handle)
+    def affected_handles(self, db, changes):
+        """
+        The people whose ancestors may have changed are the descendants of
+        the people whose links changed.
+        """
+        graph = get_pedigree_graph(db)
+        people = graph.get_changed_people(changes)
+        if people is None:
+            return None
+        return graph.get_descendants(people, inclusive=True)
 
-        for fam_id in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_id)
-            if fam:
-                for child_ref in fam.get_child_ref_list():
-                    self.init_list(self.db.get_person_from_handle(child_ref.ref), 0)
+    def init_list(self, handles, first):
+        """Add the descendants of some people through all their families"""
+        self.map.update(
+            get_pedigree_graph(self.db).get_descendants(handles, inclusive=not first)
+        )
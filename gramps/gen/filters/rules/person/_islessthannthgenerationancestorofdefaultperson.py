@@ -64,32 +64,20 @@ class IsLessThanNthGenerationAncestorOfDefaultPerson(Rule):
             self.apply = lambda db, p: False
 
     def init_ancestor_list(self, handle, gen):
-        #        if p.get_handle() in self.map:
-        #            loop_error(self.orig,p)
-        if not handle or handle in self.map:
-            # if we have been here before, skip
-            return
-        if gen:
-            self.map.add(handle)
-            if gen >= int(self.list[0]):
-                return
-
-        p = self.db.get_person_from_handle(handle)
-        fam_id = p.get_main_parents_family_handle()
-        if not fam_id:
-            return
-        fam = self.db.get_family_from_handle(fam_id)
-        if fam:
-            f_id = fam.get_father_handle()
-            m_id = fam.get_mother_handle()
-
-            if f_id:
-                self.init_ancestor_list(f_id, gen + 1)
-            if m_id:
-                self.init_ancestor_list(m_id, gen + 1)
+        # the person is generation gen of the N generations
+        if handle:
+            self.map.update(
+                self.db.get_ancestor_handles(handle, 0, max(int(self.list[0]) - gen, 0))
+            )
 
     def apply_real(self, db, person):
         return person.handle in self.map
 
     def reset(self):
         self.map.clear()
+
+    def cache_key(self, db):
+        """
+        Add the Home Person, who is not kept in the tables.
+        """
+        return (Rule.cache_key(self, db), db.get_default_handle())
@@ -47,6 +47,7 @@ class IsWitness(Rule):
     name = _("Witnesses")
     description = _("Matches people who are witnesses in any event")
     category = _("Event filters")
+    cost = 10
 
     def apply(self, db, person):
         for event_ref in person.event_ref_list:
@@ -49,6 +49,7 @@ class MissingParent(Rule):
         " or are not children in any family."
     )
     category = _("Family filters")
+    cost = 10
 
     def apply(self, db, person):
         families = person.get_parent_family_handle_list()
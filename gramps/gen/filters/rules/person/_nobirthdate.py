@@ -44,8 +44,23 @@ class NoBirthdate(Rule):
     name = _("People without a known birth date")
     description = _("Matches people without a known birthdate")
     category = _("General filters")
+    cost = 10
+
+    def prepare(self, db, user):
+        self.handles = None
+        if db.has_date_index():
+            self.handles = {
+                handle
+                for handle, sortvals in db.get_person_date_sortvals().items()
+                if sortvals[0] == 0
+            }
+
+    def reset(self):
+        self.handles = None
 
     def apply(self, db, person):
+        if self.handles is not None:
+            return person.handle in self.handles
         birth_ref = person.get_birth_ref()
         if not birth_ref:
             return True
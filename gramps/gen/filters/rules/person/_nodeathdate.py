@@ -44,8 +44,23 @@ class NoDeathdate(Rule):
     name = _("People without a known death date")
     description = _("Matches people without a known deathdate")
     category = _("General filters")
+    cost = 10
+
+    def prepare(self, db, user):
+        self.handles = None
+        if db.has_date_index():
+            self.handles = {
+                handle
+                for handle, sortvals in db.get_person_date_sortvals().items()
+                if sortvals[1] == 0
+            }
+
+    def reset(self):
+        self.handles = None
 
     def apply(self, db, person):
+        if self.handles is not None:
+            return person.handle in self.handles
         death_ref = person.get_death_ref()
         if not death_ref:
             return True
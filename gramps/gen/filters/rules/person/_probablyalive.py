@@ -23,6 +23,8 @@
 # Standard Python modules
 #
 # -------------------------------------------------------------------------
+import time
+
 from ....const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
@@ -32,7 +34,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from ....utils.alive import probably_alive
+from ....utils.alive import get_probably_alive_ranges
 from .. import Rule
 from ....datehandler import parser
 
@@ -53,6 +55,16 @@ class ProbablyAlive(Rule):
             self.current_date = parser.parse(str(self.list[0]))
         except:
             self.current_date = None
+        self.ranges = get_probably_alive_ranges(db)
+
+    def reset(self):
+        self.ranges = None
 
     def apply(self, db, person):
-        return probably_alive(person, db, self.current_date)
+        return self.ranges.probably_alive(person, self.current_date)
+
+    def cache_key(self, db):
+        """
+        Add the current day, which is used when no date is given.
+        """
+        return (Rule.cache_key(self, db), time.strftime("%Y-%m-%d"))
@@ -52,8 +52,17 @@ class RegExpName(Rule):
     )
     category = _("General filters")
     allow_regex = True
+    local = True
+
+    def prepare(self, db, user):
+        self.handles = self.find_text(db, "Person", "name")
+
+    def reset(self):
+        self.handles = None
 
     def apply(self, db, person):
+        if self.handles is not None:
+            return person.handle in self.handles
         for name in [person.get_primary_name()] + person.get_alternate_names():
             for field in [
                 name.first_name,
@@ -168,3 +168,9 @@ class RelationshipPathBetweenBookmarks(Rule):
 
     def apply(self, db, person):
         return person.handle in self.map
+
+    def cache_key(self, db):
+        """
+        Add the bookmarks, which are not kept in the tables.
+        """
+        return (Rule.cache_key(self, db), tuple(db.get_bookmarks().get()))
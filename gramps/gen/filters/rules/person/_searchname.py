@@ -48,8 +48,17 @@ class SearchName(Rule):
     name = _("People matching the <name>")
     description = _("Matches people with a specified (partial) name")
     category = _("General filters")
+    local = True
+
+    def prepare(self, db, user):
+        self.handles = self.find_text(db, "Person", "name")
+
+    def reset(self):
+        self.handles = None
 
     def apply(self, db, person):
+        if self.handles is not None:
+            return person.handle in self.handles
         src = self.list[0].upper()
         if not src:
             return False
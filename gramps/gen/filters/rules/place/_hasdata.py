@@ -58,14 +58,21 @@ class HasData(Rule):
     allow_regex = True
 
     def prepare(self, db, user):
+        self.handles = self.find_text(db, "Place", "name")
         self.place_type = self.list[1]
 
         if self.place_type:
             self.place_type = PlaceType()
             self.place_type.set_from_xml_str(self.list[1])
 
+    def reset(self):
+        self.handles = None
+
     def apply(self, db, place):
-        if not self.match_name(place):
+        if self.handles is not None:
+            if place.handle not in self.handles:
+                return False
+        elif not self.match_name(place):
             return False
 
         if self.place_type and place.get_type() != self.place_type:
@@ -47,6 +47,14 @@ class MatchesTitleSubstringOf(Rule):
     category = _("General filters")
     allow_regex = True
 
+    def prepare(self, db, user):
+        self.handles = self.find_text(db, "Source", "title")
+
+    def reset(self):
+        self.handles = None
+
     def apply(self, db, source):
         """Apply the filter"""
+        if self.handles is not None:
+            return source.handle in self.handles
         return self.match_substring(0, source.get_title())
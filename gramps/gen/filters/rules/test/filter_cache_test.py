@@ -0,0 +1,168 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest that tests the cache of the results of filters
+"""
+import unittest
+import os
+from unittest import mock
+
+from ....db import DbTxn
+from ....db.utils import import_as_dict, make_database
+from ....filters import FilterResultCache, GenericFilter
+from ....const import DATA_DIR
+from ....lib import Person
+from ....proxy import PrivateProxyDb
+from ....user import User
+
+from ..person import IsAncestorOf, IsBookmarked, IsMale, SearchName
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class FilterResultCacheTest(unittest.TestCase):
+    """
+    Filters applied with the result cache match the same objects as when
+    their rules are applied.
+    """
+
+    def setUp(self):
+        self.db = import_as_dict(EXAMPLE, User())
+        self.cache = FilterResultCache()
+        patcher = mock.patch.object(GenericFilter, "result_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_filter(self, rules):
+        filter_ = GenericFilter()
+        filter_.set_rules(rules)
+        return filter_
+
+    def check_filter(self, filter_, applied):
+        """
+        Apply a filter, checking whether its rules were applied.
+        """
+        with mock.patch.object(
+            filter_, "apply_rules", wraps=filter_.apply_rules
+        ) as apply_rules:
+            results = filter_.apply(self.db)
+        self.assertEqual(apply_rules.called, applied)
+        self.assertEqual(set(results), set(filter_.apply_rules(self.db)))
+        return results
+
+    def rename(self, gramps_id, first_name):
+        person = self.db.get_person_from_gramps_id(gramps_id)
+        person.get_primary_name().set_first_name(first_name)
+        with DbTxn("Rename", self.db) as trans:
+            self.db.commit_person(person, trans)
+        return person.handle
+
+    def test_reuse(self):
+        results = self.check_filter(self.make_filter([SearchName(["Garner"])]), True)
+        filter_ = self.make_filter([SearchName(["Garner"])])
+        self.assertEqual(self.check_filter(filter_, False), results)
+        handles = list(self.db.iter_person_handles())
+        self.assertEqual(
+            filter_.apply(self.db, handles),
+            [handle for handle in handles if handle in results],
+        )
+        self.check_filter(self.make_filter([SearchName(["Garner"]), IsMale([])]), True)
+
+    def test_local(self):
+        filter_ = self.make_filter([SearchName(["Qwerty"])])
+        self.assertEqual(self.check_filter(filter_, True), [])
+        handle = self.rename("I0044", "Qwerty")
+        with mock.patch.object(filter_, "apply_rules", return_value=[handle]) as rules:
+            self.assertEqual(filter_.apply(self.db), [handle])
+        rules.assert_called_once_with(self.db, [handle])
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_person(handle, trans)
+        self.assertEqual(filter_.apply(self.db), [])
+
+    def test_not_local(self):
+        filter_ = self.make_filter([IsAncestorOf(["I0044", "1"])])
+        self.check_filter(filter_, True)
+        self.check_filter(filter_, False)
+        self.rename("I0001", "Qwerty")
+        self.check_filter(filter_, True)
+
+    def test_pedigree(self):
+        filter_ = self.make_filter([IsAncestorOf(["I0044", "1"])])
+        results = self.check_filter(filter_, True)
+        person = self.db.get_person_from_gramps_id("I0044")
+        family = self.db.get_family_from_handle(person.get_main_parents_family_handle())
+        father = self.db.get_person_from_handle(family.get_father_handle())
+        family.set_father_handle(None)
+        father.remove_family_handle(family.handle)
+        with DbTxn("Remove father", self.db) as trans:
+            self.db.commit_family(family, trans)
+            self.db.commit_person(father, trans)
+        with mock.patch.object(
+            filter_, "apply_rules", wraps=filter_.apply_rules
+        ) as apply_rules:
+            matches = filter_.apply(self.db)
+        dummy, handles = apply_rules.call_args[0]
+        self.assertIn(father.handle, handles)
+        self.assertLess(len(handles), self.db.get_number_of_people())
+        self.assertEqual(set(matches), set(filter_.apply_rules(self.db)))
+        self.assertLess(len(matches), len(results))
+
+    def test_bookmarks(self):
+        filter_ = self.make_filter([IsBookmarked([])])
+        self.check_filter(filter_, True)
+        self.check_filter(filter_, False)
+        person = self.db.get_person_from_gramps_id("I0044")
+        self.db.get_bookmarks().append(person.handle)
+        self.check_filter(filter_, True)
+
+    def test_proxy(self):
+        filter_ = self.make_filter([SearchName(["Garner"])])
+        with mock.patch.object(
+            filter_, "apply_rules", wraps=filter_.apply_rules
+        ) as apply_rules:
+            proxy = PrivateProxyDb(self.db)
+            filter_.apply(proxy)
+            filter_.apply(proxy)
+        self.assertEqual(apply_rules.call_count, 2)
+
+    def make_database(self, gender, number):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        self.addCleanup(db.close)
+        with DbTxn("Add", db) as trans:
+            for dummy in range(number):
+                person = Person()
+                person.set_gender(gender)
+                db.add_person(person, trans)
+        return db
+
+    def test_databases(self):
+        db_a = self.make_database(Person.FEMALE, 1)
+        db_b = self.make_database(Person.MALE, 5)
+        filter_ = self.make_filter([IsMale([])])
+        self.assertEqual(len(filter_.apply(db_b)), 5)
+        self.assertEqual(filter_.apply(db_a), [])
+        self.assertEqual(len(filter_.apply(db_b)), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest that tests filters applied by a pool of processes
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ....config import config
+from ....db.utils import make_database
+from ....filters import GenericFilter
+from ....filters import _genericfilter
+from ....const import DATA_DIR
+from ....proxy import LivingProxyDb
+from ....user import User
+
+from ..person import HasBirth, IsAncestorOf, IsMale, SearchName
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class ProgressUser(User):
+    """
+    A user counting the steps of the progress.
+    """
+
+    def __init__(self):
+        User.__init__(self)
+        self.steps = 0
+
+    def begin_progress(self, title, message, steps):
+        pass
+
+    def step_progress(self):
+        self.steps += 1
+
+    def end_progress(self):
+        pass
+
+
+@unittest.skipUnless(
+    "fork" in multiprocessing.get_all_start_methods(), "needs forked processes"
+)
+class ParallelFilterTest(unittest.TestCase):
+    """
+    Filters applied by several processes match the same objects, in the
+    same order, as when applied by one.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database into a database file.
+        """
+        from gramps.plugins.importer.importxml import importData
+
+        cls.directory = tempfile.mkdtemp()
+        cls.db = make_database("sqlite")
+        cls.db.load(cls.directory)
+        importData(cls.db, EXAMPLE, User())
+        cls.processes = config.get("behavior.filter-processes")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.directory)
+        config.set("behavior.filter-processes", cls.processes)
+
+    def apply(self, filter_, db, id_list=None, processes=1, user=None):
+        config.set("behavior.filter-processes", processes)
+        with mock.patch.object(_genericfilter, "PARALLEL_SIZE", 100):
+            return filter_.apply_rules(db, id_list, user=user)
+
+    def check_filter(self, rules, logical_op="and", db=None):
+        db = db or self.db
+        filter_ = GenericFilter()
+        filter_.set_rules(rules)
+        filter_.set_logical_op(logical_op)
+        handles = list(db.iter_person_handles())
+        expected = self.apply(filter_, db, handles)
+        user = ProgressUser()
+        self.assertEqual(self.apply(filter_, db, handles, 3, user), expected)
+        self.assertEqual(user.steps, len(handles))
+        self.assertEqual(sorted(self.apply(filter_, db, None, 3)), sorted(expected))
+
+    def test_parallel(self):
+        self.assertTrue(self.db.can_fork_readers())
+        self.check_filter([SearchName(["a"])])
+        self.check_filter([IsAncestorOf(["I0044", "0"]), SearchName(["e"])], "or")
+        self.check_filter([HasBirth(["", "", ""]), IsMale([])])
+
+    def test_proxy(self):
+        proxy = LivingProxyDb(self.db, LivingProxyDb.MODE_INCLUDE_LAST_NAME_ONLY)
+        self.assertTrue(proxy.can_fork_readers())
+        self.check_filter([SearchName(["Living"])], db=proxy)
+
+    def test_memory(self):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        self.assertFalse(db.can_fork_readers())
+        db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
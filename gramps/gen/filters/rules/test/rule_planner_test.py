@@ -0,0 +1,110 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest that tests the order in which the rules of filters are applied
+"""
+import unittest
+import os
+
+from ....db.utils import import_as_dict
+from ....filters import GenericFilter
+from ....filters._ruleplanner import RulePlanner, SAMPLE_SIZE
+from ....const import DATA_DIR
+from ....user import User
+
+from ..person import (
+    HasBirth,
+    HasTextMatchingSubstringOf,
+    HasUnknownGender,
+    IsMale,
+    SearchName,
+)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class RulePlannerTest(unittest.TestCase):
+    """
+    Filters match the same objects whatever the order of their rules.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database.
+        """
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.people = list(cls.db.iter_people())
+
+    def plan(self, rules, test):
+        """
+        Apply the rules to the sample and return the planned order.
+        """
+        for rule in rules:
+            rule.requestprepare(self.db, None)
+        planner = RulePlanner(rules, test, len(self.people))
+        for person in self.people[:SAMPLE_SIZE]:
+            planner.check(self.db, person)
+        for rule in rules:
+            rule.requestreset()
+        return planner.rules
+
+    def test_declared_cost(self):
+        rules = [HasTextMatchingSubstringOf(["x", "0"]), IsMale([])]
+        planner = RulePlanner(rules, all)
+        self.assertEqual(planner.rules, rules[::-1])
+
+    def test_plan(self):
+        unknown = HasUnknownGender([])
+        name = SearchName(["e"])
+        self.assertEqual(self.plan([name, unknown], all), [unknown, name])
+        self.assertEqual(self.plan([unknown, name], any), [name, unknown])
+
+    def test_results(self):
+        handles = [person.handle for person in self.people]
+        for logical_op in ("and", "or"):
+            for invert in (False, True):
+                rules = [
+                    HasBirth(["", "", ""]),
+                    SearchName(["a"]),
+                    IsMale([]),
+                    HasTextMatchingSubstringOf(["Garner", "0"]),
+                ]
+                filter_ = GenericFilter()
+                filter_.set_rules(rules)
+                filter_.set_logical_op(logical_op)
+                filter_.set_invert(invert)
+                test = all if logical_op == "and" else any
+                for rule in rules:
+                    rule.requestprepare(self.db, None)
+                expected = [
+                    person.handle
+                    for person in self.people
+                    if test(rule.apply(self.db, person) for rule in rules) != invert
+                ]
+                self.assertEqual(filter_.apply_rules(self.db, handles), expected)
+                for rule in rules:
+                    rule.requestreset()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest that tests the filters applied with the SQL predicates of rules
+"""
+import unittest
+import os
+
+from ....db.utils import import_as_dict
+from ....filters import GenericFilter, GenericFilterFactory
+from ....const import DATA_DIR
+from ....user import User
+
+from ..person import (
+    ChangedSince,
+    HasIdOf,
+    HasTag,
+    IsFemale,
+    IsMale,
+    PeoplePublic,
+    RegExpIdOf,
+    SearchName,
+)
+from ..family import FatherHasIdOf
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class SqlPredicateTest(unittest.TestCase):
+    """
+    Filters applied with SQL predicates match the same objects as when all
+    their rules are applied in Python.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database.
+        """
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def check_filter(self, filter_, tree=False):
+        """
+        Apply a filter with and without the SQL predicates of its rules.
+        """
+        self.assertTrue(self.db.has_sql_select())
+        results = filter_.apply(self.db, tree=tree)
+        for rule in filter_.flist:
+            rule.requestprepare(self.db, None)
+        expected = filter_.get_check_func()(self.db, None, tree=tree)
+        for rule in filter_.flist:
+            rule.requestreset()
+        if tree:
+            self.assertEqual(results, expected)
+        else:
+            self.assertEqual(set(results), set(expected))
+        return set(results)
+
+    def make_filter(self, rules, logical_op="and", invert=False):
+        filter_ = GenericFilter()
+        filter_.set_rules(rules)
+        filter_.set_logical_op(logical_op)
+        filter_.set_invert(invert)
+        return filter_
+
+    def test_predicates(self):
+        """
+        Filters whose rules all have a predicate.
+        """
+        for logical_op in GenericFilter.logical_functions:
+            for invert in (False, True):
+                filter_ = self.make_filter(
+                    [IsFemale([]), RegExpIdOf(["I00[0-4]"], use_regex=True)],
+                    logical_op,
+                    invert,
+                )
+                self.check_filter(filter_)
+        filter_ = self.make_filter([HasIdOf(["I0044"])])
+        self.assertEqual(len(self.check_filter(filter_)), 1)
+        filter_ = self.make_filter([HasTag(["ToDo"]), PeoplePublic([])])
+        self.check_filter(filter_)
+        filter_ = self.make_filter([ChangedSince(["2009-01-01", ""])], invert=True)
+        self.check_filter(filter_, tree=True)
+
+    def test_mixed(self):
+        """
+        Filters whose rules are partly applied in Python.
+        """
+        for logical_op in GenericFilter.logical_functions:
+            for invert in (False, True):
+                filter_ = self.make_filter(
+                    [IsMale([]), SearchName(["Garner"]), RegExpIdOf(["i01"])],
+                    logical_op,
+                    invert,
+                )
+                self.check_filter(filter_)
+        filter_ = self.make_filter([IsMale([]), SearchName(["Garner"])])
+        self.check_filter(filter_, tree=True)
+
+    def test_overridden_apply(self):
+        """
+        A rule which overrides apply does not use the predicate of its base.
+        """
+        filter_ = GenericFilterFactory("Family")()
+        filter_.add_rule(FatherHasIdOf(["I004"]))
+        self.assertIsNone(filter_.get_sql_predicate())
+        self.assertTrue(self.check_filter(filter_))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1216,6 +1216,21 @@ class Date:
         """
         return self.sortval
 
+    def get_stop_sort_value(self):
+        """
+        Return the sort value of the second half of a compound date.
+
+        For other dates, the sort value of the date is returned.
+        """
+        if not self.is_compound() or self.sortval == 0:
+            return self.sortval
+        year, month, day = self._zero_adjust_ymd(
+            self.dateval[Date._POS_RYR],
+            self.dateval[Date._POS_RMON],
+            self.dateval[Date._POS_RDAY],
+        )
+        return Date._calendar_convert[self.calendar](year, month, day)
+
     def get_modifier(self):
         """
         Return an integer indicating the calendar selected.
@@ -27,3 +27,4 @@ from .living import LivingProxyDb
 from .private import PrivateProxyDb
 from .referencedbyselection import ReferencedBySelectionProxyDb
 from .cache import CacheProxyDb
+from .export import ExportProxyDb
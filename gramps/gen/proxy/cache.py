@@ -156,3 +156,81 @@ class CacheProxyDb:
         if handle not in self.cache_handle:
             self.cache_handle[handle] = self.db.get_tag_from_handle(handle)
         return self.cache_handle[handle]
+
+    def __get_from_handles(self, get_objects, handles):
+        """
+        Gets the items found in the cache, and the others from the
+        database in one call.
+        """
+        handles = list(handles)
+        found = {}
+        missing = []
+        for handle in handles:
+            if handle in self.cache_handle:
+                found[handle] = self.cache_handle[handle]
+            else:
+                missing.append(handle)
+        if missing:
+            for handle, obj in zip(missing, get_objects(missing)):
+                self.cache_handle[handle] = found[handle] = obj
+        return [found[handle] for handle in handles]
+
+    def get_person_from_handles(self, handles):
+        """
+        Gets items from cache if they exist, else from the database.
+        """
+        return self.__get_from_handles(self.db.get_person_from_handles, handles)
+
+    def get_event_from_handles(self, handles):
+        """
+        Gets items from cache if they exist, else from the database.
+        """
+        return self.__get_from_handles(self.db.get_event_from_handles, handles)
+
+    def get_family_from_handles(self, handles):
+        """
+        Gets items from cache if they exist, else from the database.
+        """
+        return self.__get_from_handles(self.db.get_family_from_handles, handles)
+
+    def get_repository_from_handles(self, handles):
+        """
+        Gets items from cache if they exist, else from the database.
+        """
+        return self.__get_from_handles(self.db.get_repository_from_handles, handles)
+
+    def get_place_from_handles(self, handles):
+        """
+        Gets items from cache if they exist, else from the database.
+        """
+        return self.__get_from_handles(self.db.get_place_from_handles, handles)
+
+    def get_citation_from_handles(self, handles):
+        """
+        Gets items from cache if they exist, else from the database.
+        """
+        return self.__get_from_handles(self.db.get_citation_from_handles, handles)
+
+    def get_source_from_handles(self, handles):
+        """
+        Gets items from cache if they exist, else from the database.
+        """
+        return self.__get_from_handles(self.db.get_source_from_handles, handles)
+
+    def get_note_from_handles(self, handles):
+        """
+        Gets items from cache if they exist, else from the database.
+        """
+        return self.__get_from_handles(self.db.get_note_from_handles, handles)
+
+    def get_media_from_handles(self, handles):
+        """
+        Gets items from cache if they exist, else from the database.
+        """
+        return self.__get_from_handles(self.db.get_media_from_handles, handles)
+
+    def get_tag_from_handles(self, handles):
+        """
+        Gets items from cache if they exist, else from the database.
+        """
+        return self.__get_from_handles(self.db.get_tag_from_handles, handles)
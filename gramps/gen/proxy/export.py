@@ -0,0 +1,531 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Proxy class for the Gramps databases. Computes what a stack of proxies
+includes once, and caches the objects they return.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Gramps libraries
+#
+# -------------------------------------------------------------------------
+from ..utils.lru import LRU
+from .proxybase import ProxyDbBase
+
+# Number of objects of each class which are cached, as in CacheProxyDb.
+CACHE_SIZE = 131071
+
+OBJECT_NAMES = (
+    "person",
+    "family",
+    "event",
+    "place",
+    "source",
+    "citation",
+    "media",
+    "repository",
+    "note",
+    "tag",
+)
+
+
+# -------------------------------------------------------------------------
+#
+# ExportProxyDb
+#
+# -------------------------------------------------------------------------
+class ExportProxyDb(ProxyDbBase):
+    """
+    A read-only view of a database through a stack of proxies, such as the
+    privacy, living, filter and reference proxies applied by exporters and
+    reports.
+
+    The handles of the objects included by the stack are computed once for
+    each class, when first needed.  Each included object is then fetched
+    and sanitized through the stack at most once, and objects left out are
+    not fetched at all.  The view gives the same objects as the stack, in
+    the order of their handles.
+
+    Like :class:`.CacheProxyDb`, it does not notice the changes of the
+    database, and the objects it returns must not be changed.
+    """
+
+    def __init__(self, db):
+        """
+        Create a view of a database, usually a proxy.
+        """
+        ProxyDbBase.__init__(self, db)
+        # {object name: (list of included handles, set of the same)}
+        self.__included = {}
+        self.__objects = {obj_name: LRU(CACHE_SIZE) for obj_name in OBJECT_NAMES}
+
+    def clear_cache(self):
+        """
+        Forget the included handles and the cached objects.
+        """
+        self.__included.clear()
+        for objects in self.__objects.values():
+            objects.clear()
+
+    def __get_included(self, obj_name):
+        """
+        Return the list and the set of the handles included by the proxies
+        for a class of objects.
+        """
+        if obj_name not in self.__included:
+            iter_handles = getattr(self.db, "iter_%s_handles" % obj_name)
+            handles = list(iter_handles())
+            self.__included[obj_name] = (handles, set(handles))
+        return self.__included[obj_name]
+
+    def __get_from_handle(self, obj_name, handle):
+        """
+        Return an object from the cache, else from the proxies if they
+        include it.  Unknown handles are left to the proxies.
+        """
+        objects = self.__objects[obj_name]
+        if handle in objects:
+            return objects[handle]
+        if handle in self.__get_included(obj_name)[1]:
+            obj = getattr(self.db, "get_%s_from_handle" % obj_name)(handle)
+        elif getattr(self.basedb, "has_%s_handle" % obj_name)(handle):
+            obj = None
+        else:
+            return getattr(self.db, "get_%s_from_handle" % obj_name)(handle)
+        objects[handle] = obj
+        return obj
+
+    def __from_base(self, obj_name, obj):
+        """
+        Return the object of the view for an object of the base database.
+        """
+        if obj is None:
+            return None
+        return self.__get_from_handle(obj_name, obj.handle)
+
+    def __iter_objects(self, obj_name):
+        """
+        Return an iterator over the objects included for a class.
+        """
+        for handle in self.__get_included(obj_name)[0]:
+            yield self.__get_from_handle(obj_name, handle)
+
+    def find_backlink_handles(self, handle, include_classes=None):
+        """
+        Find all objects that hold a reference to the object handle, as the
+        proxies do.  Returns an iterator over (class_name, handle) tuples.
+        """
+        return self.db.find_backlink_handles(handle, include_classes)
+
+    def get_person_from_handle(self, handle):
+        """
+        Finds a Person in the database from the passed Gramps handle.
+        If no such Person exists, None is returned.
+        """
+        return self.__get_from_handle("person", handle)
+
+    def get_person_from_gramps_id(self, val):
+        """
+        Finds a Person in the database from the passed Gramps ID.
+        If no such Person exists, None is returned.
+        """
+        return self.__from_base("person", self.basedb.get_person_from_gramps_id(val))
+
+    def has_person_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Person database.
+        """
+        return handle in self.__get_included("person")[1]
+
+    def iter_person_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Person
+        in the database.
+        """
+        return iter(self.__get_included("person")[0])
+
+    def iter_people(self):
+        """
+        Return an iterator over Person objects in the database
+        """
+        return self.__iter_objects("person")
+
+    def get_number_of_people(self):
+        """
+        Return the number of people currently in the database.
+        """
+        return len(self.__get_included("person")[0])
+
+    def get_family_from_handle(self, handle):
+        """
+        Finds a Family in the database from the passed Gramps handle.
+        If no such Family exists, None is returned.
+        """
+        return self.__get_from_handle("family", handle)
+
+    def get_family_from_gramps_id(self, val):
+        """
+        Finds a Family in the database from the passed Gramps ID.
+        If no such Family exists, None is returned.
+        """
+        return self.__from_base("family", self.basedb.get_family_from_gramps_id(val))
+
+    def has_family_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Family database.
+        """
+        return handle in self.__get_included("family")[1]
+
+    def iter_family_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Family
+        in the database.
+        """
+        return iter(self.__get_included("family")[0])
+
+    def iter_families(self):
+        """
+        Return an iterator over Family objects in the database
+        """
+        return self.__iter_objects("family")
+
+    def get_number_of_families(self):
+        """
+        Return the number of families currently in the database.
+        """
+        return len(self.__get_included("family")[0])
+
+    def get_event_from_handle(self, handle):
+        """
+        Finds an Event in the database from the passed Gramps handle.
+        If no such Event exists, None is returned.
+        """
+        return self.__get_from_handle("event", handle)
+
+    def get_event_from_gramps_id(self, val):
+        """
+        Finds an Event in the database from the passed Gramps ID.
+        If no such Event exists, None is returned.
+        """
+        return self.__from_base("event", self.basedb.get_event_from_gramps_id(val))
+
+    def has_event_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Event database.
+        """
+        return handle in self.__get_included("event")[1]
+
+    def iter_event_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Event
+        in the database.
+        """
+        return iter(self.__get_included("event")[0])
+
+    def iter_events(self):
+        """
+        Return an iterator over Event objects in the database
+        """
+        return self.__iter_objects("event")
+
+    def get_number_of_events(self):
+        """
+        Return the number of events currently in the database.
+        """
+        return len(self.__get_included("event")[0])
+
+    def get_place_from_handle(self, handle):
+        """
+        Finds a Place in the database from the passed Gramps handle.
+        If no such Place exists, None is returned.
+        """
+        return self.__get_from_handle("place", handle)
+
+    def get_place_from_gramps_id(self, val):
+        """
+        Finds a Place in the database from the passed Gramps ID.
+        If no such Place exists, None is returned.
+        """
+        return self.__from_base("place", self.basedb.get_place_from_gramps_id(val))
+
+    def has_place_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Place database.
+        """
+        return handle in self.__get_included("place")[1]
+
+    def iter_place_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Place
+        in the database.
+        """
+        return iter(self.__get_included("place")[0])
+
+    def iter_places(self):
+        """
+        Return an iterator over Place objects in the database
+        """
+        return self.__iter_objects("place")
+
+    def get_number_of_places(self):
+        """
+        Return the number of places currently in the database.
+        """
+        return len(self.__get_included("place")[0])
+
+    def get_source_from_handle(self, handle):
+        """
+        Finds a Source in the database from the passed Gramps handle.
+        If no such Source exists, None is returned.
+        """
+        return self.__get_from_handle("source", handle)
+
+    def get_source_from_gramps_id(self, val):
+        """
+        Finds a Source in the database from the passed Gramps ID.
+        If no such Source exists, None is returned.
+        """
+        return self.__from_base("source", self.basedb.get_source_from_gramps_id(val))
+
+    def has_source_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Source database.
+        """
+        return handle in self.__get_included("source")[1]
+
+    def iter_source_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Source
+        in the database.
+        """
+        return iter(self.__get_included("source")[0])
+
+    def iter_sources(self):
+        """
+        Return an iterator over Source objects in the database
+        """
+        return self.__iter_objects("source")
+
+    def get_number_of_sources(self):
+        """
+        Return the number of sources currently in the database.
+        """
+        return len(self.__get_included("source")[0])
+
+    def get_citation_from_handle(self, handle):
+        """
+        Finds a Citation in the database from the passed Gramps handle.
+        If no such Citation exists, None is returned.
+        """
+        return self.__get_from_handle("citation", handle)
+
+    def get_citation_from_gramps_id(self, val):
+        """
+        Finds a Citation in the database from the passed Gramps ID.
+        If no such Citation exists, None is returned.
+        """
+        return self.__from_base(
+            "citation", self.basedb.get_citation_from_gramps_id(val)
+        )
+
+    def has_citation_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Citation database.
+        """
+        return handle in self.__get_included("citation")[1]
+
+    def iter_citation_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Citation
+        in the database.
+        """
+        return iter(self.__get_included("citation")[0])
+
+    def iter_citations(self):
+        """
+        Return an iterator over Citation objects in the database
+        """
+        return self.__iter_objects("citation")
+
+    def get_number_of_citations(self):
+        """
+        Return the number of citations currently in the database.
+        """
+        return len(self.__get_included("citation")[0])
+
+    def get_media_from_handle(self, handle):
+        """
+        Finds a Media in the database from the passed Gramps handle.
+        If no such Media exists, None is returned.
+        """
+        return self.__get_from_handle("media", handle)
+
+    def get_media_from_gramps_id(self, val):
+        """
+        Finds a Media in the database from the passed Gramps ID.
+        If no such Media exists, None is returned.
+        """
+        return self.__from_base("media", self.basedb.get_media_from_gramps_id(val))
+
+    def has_media_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Media database.
+        """
+        return handle in self.__get_included("media")[1]
+
+    def iter_media_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Media
+        in the database.
+        """
+        return iter(self.__get_included("media")[0])
+
+    def iter_media(self):
+        """
+        Return an iterator over Media objects in the database
+        """
+        return self.__iter_objects("media")
+
+    def get_number_of_media(self):
+        """
+        Return the number of media objects currently in the database.
+        """
+        return len(self.__get_included("media")[0])
+
+    def get_repository_from_handle(self, handle):
+        """
+        Finds a Repository in the database from the passed Gramps handle.
+        If no such Repository exists, None is returned.
+        """
+        return self.__get_from_handle("repository", handle)
+
+    def get_repository_from_gramps_id(self, val):
+        """
+        Finds a Repository in the database from the passed Gramps ID.
+        If no such Repository exists, None is returned.
+        """
+        return self.__from_base(
+            "repository", self.basedb.get_repository_from_gramps_id(val)
+        )
+
+    def has_repository_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Repository database.
+        """
+        return handle in self.__get_included("repository")[1]
+
+    def iter_repository_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Repository
+        in the database.
+        """
+        return iter(self.__get_included("repository")[0])
+
+    def iter_repositories(self):
+        """
+        Return an iterator over Repository objects in the database
+        """
+        return self.__iter_objects("repository")
+
+    def get_number_of_repositories(self):
+        """
+        Return the number of repositories currently in the database.
+        """
+        return len(self.__get_included("repository")[0])
+
+    def get_note_from_handle(self, handle):
+        """
+        Finds a Note in the database from the passed Gramps handle.
+        If no such Note exists, None is returned.
+        """
+        return self.__get_from_handle("note", handle)
+
+    def get_note_from_gramps_id(self, val):
+        """
+        Finds a Note in the database from the passed Gramps ID.
+        If no such Note exists, None is returned.
+        """
+        return self.__from_base("note", self.basedb.get_note_from_gramps_id(val))
+
+    def has_note_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Note database.
+        """
+        return handle in self.__get_included("note")[1]
+
+    def iter_note_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Note
+        in the database.
+        """
+        return iter(self.__get_included("note")[0])
+
+    def iter_notes(self):
+        """
+        Return an iterator over Note objects in the database
+        """
+        return self.__iter_objects("note")
+
+    def get_number_of_notes(self):
+        """
+        Return the number of notes currently in the database.
+        """
+        return len(self.__get_included("note")[0])
+
+    def get_tag_from_handle(self, handle):
+        """
+        Finds a Tag in the database from the passed Gramps handle.
+        If no such Tag exists, None is returned.
+        """
+        return self.__get_from_handle("tag", handle)
+
+    def get_tag_from_name(self, val):
+        """
+        Finds a Tag in the database from the passed name.
+        If no such Tag exists, None is returned.
+        """
+        return self.__from_base("tag", self.basedb.get_tag_from_name(val))
+
+    def has_tag_handle(self, handle):
+        """
+        Returns True if the handle exists in the current Tag database.
+        """
+        return handle in self.__get_included("tag")[1]
+
+    def iter_tag_handles(self):
+        """
+        Return an iterator over database handles, one handle for each Tag
+        in the database.
+        """
+        return iter(self.__get_included("tag")[0])
+
+    def iter_tags(self):
+        """
+        Return an iterator over Tag objects in the database
+        """
+        return self.__iter_objects("tag")
+
+    def get_number_of_tags(self):
+        """
+        Return the number of tags currently in the database.
+        """
+        return len(self.__get_included("tag")[0])
@@ -45,7 +45,7 @@ from ..lib import (
     Note,
     Tag,
 )
-from ..utils.alive import probably_alive
+from ..utils.alive import get_probably_alive_ranges
 from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 
@@ -258,10 +258,20 @@ class LivingProxyDb(ProxyDbBase):
         """
         person_handle = person.get_handle()
         unfil_person = self.get_unfiltered_person(person_handle)
-        return probably_alive(
-            unfil_person, self.db, self.current_date, self.years_after_death
+        return get_probably_alive_ranges(self.db).probably_alive(
+            unfil_person, self.current_date, self.years_after_death
         )
 
+    def __has_living(self, handle):
+        """
+        Return True if the proxied database has the person of a handle, and
+        the person is considered living.  The person is not fetched with
+        the changes made by the proxied database, which are not needed.
+        """
+        if not self.db.has_person_handle(handle):
+            return False
+        return self.__is_living(self.get_unfiltered_person(handle))
+
     def __remove_living_from_family(self, family):
         """
         Remove information from a family that pertains to living people.
@@ -274,20 +284,16 @@ class LivingProxyDb(ProxyDbBase):
         parent_is_living = False
 
         father_handle = family.get_father_handle()
-        if father_handle:
-            father = self.db.get_person_from_handle(father_handle)
-            if father and self.__is_living(father):
-                parent_is_living = True
-                if self.mode == self.MODE_EXCLUDE_ALL:
-                    family.set_father_handle(None)
+        if father_handle and self.__has_living(father_handle):
+            parent_is_living = True
+            if self.mode == self.MODE_EXCLUDE_ALL:
+                family.set_father_handle(None)
 
         mother_handle = family.get_mother_handle()
-        if mother_handle:
-            mother = self.db.get_person_from_handle(mother_handle)
-            if mother and self.__is_living(mother):
-                parent_is_living = True
-                if self.mode == self.MODE_EXCLUDE_ALL:
-                    family.set_mother_handle(None)
+        if mother_handle and self.__has_living(mother_handle):
+            parent_is_living = True
+            if self.mode == self.MODE_EXCLUDE_ALL:
+                family.set_mother_handle(None)
 
         if parent_is_living:
             # Clear all events for families where a parent is living.
@@ -295,9 +301,7 @@ class LivingProxyDb(ProxyDbBase):
 
         if self.mode == self.MODE_EXCLUDE_ALL:
             for child_ref in family.get_child_ref_list():
-                child_handle = child_ref.get_reference_handle()
-                child = self.db.get_person_from_handle(child_handle)
-                if child and self.__is_living(child):
+                if self.__has_living(child_ref.get_reference_handle()):
                     family.remove_child_ref(child_ref)
 
         return family
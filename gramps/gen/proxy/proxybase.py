@@ -49,6 +49,7 @@ from ..lib import (
     Tag,
 )
 from ..const import GRAMPS_LOCALE as glocale
+from ..errors import HandleError
 
 
 class ProxyCursor:
@@ -145,6 +146,20 @@ class ProxyDbBase(DbReadBase):
         """
         return self.db.is_open()
 
+    def can_fork_readers(self):
+        """
+        Return True if a forked process can read the database through a
+        connection of its own.
+        """
+        return self.basedb.can_fork_readers()
+
+    def reopen_reader(self):
+        """
+        Give a forked process a read-only connection of its own to the
+        database.
+        """
+        self.basedb.reopen_reader()
+
     def get_researcher(self):
         """returns the Researcher instance, providing information about
         the owner of the database"""
@@ -567,6 +582,130 @@ class ProxyDbBase(DbReadBase):
         """
         return self.gfilter(self.include_tag, self.db.get_tag_from_handle(handle))
 
+    def __filters_only(self, obj_name):
+        """
+        Return True if the proxy selects the objects of a class with its
+        include predicate only, and returns them unchanged.
+        """
+        method = "get_%s_from_handle" % obj_name
+        return getattr(type(self), method) is getattr(ProxyDbBase, method)
+
+    def __get_from_handles(self, obj_name, handles):
+        """
+        Helper function to return a list of objects from their handles.
+
+        Objects are fetched from the database in bulk, unless the proxy
+        alters them one at a time.
+        """
+        if not self.__filters_only(obj_name):
+            get_object = getattr(self, "get_%s_from_handle" % obj_name)
+            return [get_object(handle) for handle in handles]
+        include = getattr(self, "include_" + obj_name)
+        get_objects = getattr(self.db, "get_%s_from_handles" % obj_name)
+        return [self.gfilter(include, obj) for obj in get_objects(handles)]
+
+    def __iter_raw_data(self, obj_name, handles):
+        """
+        Helper function to return an iterator over raw data from handles.
+        """
+        if not self.__filters_only(obj_name):
+            get_object = getattr(self, "get_%s_from_handle" % obj_name)
+            for handle in handles:
+                try:
+                    obj = get_object(handle)
+                except HandleError:
+                    continue
+                if obj is not None:
+                    yield (handle, obj.serialize())
+            return
+        include = getattr(self, "include_" + obj_name)
+        iter_raw = getattr(self.db, "iter_raw_%s_data" % obj_name)
+        for handle, data in iter_raw(handles):
+            if include is None or include(handle):
+                yield (handle, data)
+
+    def get_person_from_handles(self, handles):
+        """
+        Finds the Person objects in the database from the passed gramps handles.
+        None is returned in place of each Person which is filtered out.
+        """
+        return self.__get_from_handles("person", handles)
+
+    def get_family_from_handles(self, handles):
+        """
+        Finds the Family objects in the database from the passed gramps handles.
+        None is returned in place of each Family which is filtered out.
+        """
+        return self.__get_from_handles("family", handles)
+
+    def get_event_from_handles(self, handles):
+        """
+        Finds the Event objects in the database from the passed gramps handles.
+        None is returned in place of each Event which is filtered out.
+        """
+        return self.__get_from_handles("event", handles)
+
+    def get_source_from_handles(self, handles):
+        """
+        Finds the Source objects in the database from the passed gramps handles.
+        None is returned in place of each Source which is filtered out.
+        """
+        return self.__get_from_handles("source", handles)
+
+    def get_citation_from_handles(self, handles):
+        """
+        Finds the Citation objects in the database from the passed gramps handles.
+        None is returned in place of each Citation which is filtered out.
+        """
+        return self.__get_from_handles("citation", handles)
+
+    def get_place_from_handles(self, handles):
+        """
+        Finds the Place objects in the database from the passed gramps handles.
+        None is returned in place of each Place which is filtered out.
+        """
+        return self.__get_from_handles("place", handles)
+
+    def get_media_from_handles(self, handles):
+        """
+        Finds the Media objects in the database from the passed gramps handles.
+        None is returned in place of each Media which is filtered out.
+        """
+        return self.__get_from_handles("media", handles)
+
+    def get_repository_from_handles(self, handles):
+        """
+        Finds the Repository objects in the database from the passed gramps handles.
+        None is returned in place of each Repository which is filtered out.
+        """
+        return self.__get_from_handles("repository", handles)
+
+    def get_note_from_handles(self, handles):
+        """
+        Finds the Note objects in the database from the passed gramps handles.
+        None is returned in place of each Note which is filtered out.
+        """
+        return self.__get_from_handles("note", handles)
+
+    def get_tag_from_handles(self, handles):
+        """
+        Finds the Tag objects in the database from the passed gramps handles.
+        None is returned in place of each Tag which is filtered out.
+        """
+        return self.__get_from_handles("tag", handles)
+
+    def get_place_ancestry(self, handles):
+        """
+        Return a list of the places with the passed handles, together with
+        all the visible places which enclose them.
+        """
+        if not self.__filters_only("place"):
+            return DbReadBase.get_place_ancestry(self, handles)
+        places = {place.handle: place for place in self.db.get_place_ancestry(handles)}
+        return self._walk_place_ancestry(
+            handles, lambda handle: self.gfilter(self.include_place, places.get(handle))
+        )
+
     def get_person_from_gramps_id(self, val):
         """
         Finds a Person in the database from the passed Gramps ID.
@@ -838,6 +977,36 @@ class ProxyDbBase(DbReadBase):
     def get_raw_tag_data(self, handle):
         return self.get_tag_from_handle(handle).serialize()
 
+    def iter_raw_person_data(self, handles):
+        return self.__iter_raw_data("person", handles)
+
+    def iter_raw_family_data(self, handles):
+        return self.__iter_raw_data("family", handles)
+
+    def iter_raw_event_data(self, handles):
+        return self.__iter_raw_data("event", handles)
+
+    def iter_raw_source_data(self, handles):
+        return self.__iter_raw_data("source", handles)
+
+    def iter_raw_citation_data(self, handles):
+        return self.__iter_raw_data("citation", handles)
+
+    def iter_raw_place_data(self, handles):
+        return self.__iter_raw_data("place", handles)
+
+    def iter_raw_media_data(self, handles):
+        return self.__iter_raw_data("media", handles)
+
+    def iter_raw_repository_data(self, handles):
+        return self.__iter_raw_data("repository", handles)
+
+    def iter_raw_note_data(self, handles):
+        return self.__iter_raw_data("note", handles)
+
+    def iter_raw_tag_data(self, handles):
+        return self.__iter_raw_data("tag", handles)
+
     def has_person_handle(self, handle):
         """
         Returns True if the handle exists in the current Person database.
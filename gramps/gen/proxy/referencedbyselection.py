@@ -31,6 +31,7 @@ a person.
 #
 # -------------------------------------------------------------------------
 from .proxybase import ProxyDbBase
+from .export import ExportProxyDb
 from ..lib import (
     Person,
     Family,
@@ -61,8 +62,11 @@ class ReferencedBySelectionProxyDb(ProxyDbBase):
                            if False, get all people that are connected to
                            something, and all of items they link to.
         :type all_people: boolean
+
+        The objects are followed through a view of the database, so that
+        each one is fetched from it once.
         """
-        ProxyDbBase.__init__(self, dbase)
+        ProxyDbBase.__init__(self, ExportProxyDb(dbase))
         self.reset_references()
         # If restricted_to["Person"] is a set, restrict process to
         # them, and do not process others outside of them
@@ -0,0 +1,112 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest that tests the view of a database through a stack of proxies
+"""
+import unittest
+import os
+from unittest import mock
+
+from ...db.utils import import_as_dict
+from ...filters import GenericFilter
+from ...filters.rules.person import IsDescendantOf
+from ...const import DATA_DIR
+from ...user import User
+from .. import (
+    ExportProxyDb,
+    FilterProxyDb,
+    LivingProxyDb,
+    PrivateProxyDb,
+    ReferencedBySelectionProxyDb,
+)
+from ..export import OBJECT_NAMES
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class ExportProxyDbTest(unittest.TestCase):
+    """
+    The view gives the same objects as the stack of proxies.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database.
+        """
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def make_stack(self, mode):
+        person_filter = GenericFilter()
+        person_filter.add_rule(IsDescendantOf(["I0044", "1"]))
+        dbase = LivingProxyDb(PrivateProxyDb(self.db), mode)
+        dbase = FilterProxyDb(dbase, person_filter)
+        return ReferencedBySelectionProxyDb(dbase, all_people=True)
+
+    def check_view(self, dbase):
+        view = ExportProxyDb(dbase)
+        for obj_name in OBJECT_NAMES:
+            handles = list(dbase.method("iter_%s_handles", obj_name)())
+            self.assertEqual(list(view.method("iter_%s_handles", obj_name)()), handles)
+            for handle in self.db.method("iter_%s_handles", obj_name)():
+                obj = dbase.method("get_%s_from_handle", obj_name)(handle)
+                view_obj = view.method("get_%s_from_handle", obj_name)(handle)
+                if obj is None:
+                    self.assertIsNone(view_obj)
+                else:
+                    self.assertEqual(view_obj.serialize(), obj.serialize())
+                self.assertEqual(
+                    view.method("has_%s_handle", obj_name)(handle), obj is not None
+                )
+        people = {person.handle for person in dbase.iter_people()}
+        self.assertEqual({person.handle for person in view.iter_people()}, people)
+        self.assertEqual(view.get_number_of_people(), len(people))
+        person = self.db.get_person_from_gramps_id("I0044")
+        self.assertIs(
+            view.get_person_from_gramps_id("I0044"),
+            view.get_person_from_handle(person.handle),
+        )
+
+    def test_private(self):
+        self.check_view(PrivateProxyDb(self.db))
+
+    def test_living(self):
+        self.check_view(LivingProxyDb(self.db, LivingProxyDb.MODE_EXCLUDE_ALL))
+
+    def test_stack(self):
+        self.check_view(self.make_stack(LivingProxyDb.MODE_EXCLUDE_ALL))
+        self.check_view(self.make_stack(LivingProxyDb.MODE_INCLUDE_LAST_NAME_ONLY))
+
+    def test_fetch_once(self):
+        dbase = self.make_stack(LivingProxyDb.MODE_EXCLUDE_ALL)
+        view = ExportProxyDb(dbase)
+        with mock.patch.object(
+            dbase, "get_person_from_handle", wraps=dbase.get_person_from_handle
+        ) as get_person:
+            for handle in self.db.iter_person_handles():
+                view.get_person_from_handle(handle)
+                view.get_person_from_handle(handle)
+        self.assertEqual(get_person.call_count, dbase.get_number_of_people())
+
+
+if __name__ == "__main__":
+    unittest.main()
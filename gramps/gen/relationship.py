@@ -26,7 +26,9 @@ Classes for relationships.
 # Python modules
 #
 # -------------------------------------------------------------------------
+from collections import OrderedDict
 import logging
+import weakref
 
 # -------------------------------------------------------------------------
 #
@@ -34,6 +36,7 @@ import logging
 #
 # -------------------------------------------------------------------------
 from .lib import Person, ChildRefType, EventType, FamilyRelType
+from .db.pedigree import get_pedigree_graph
 from .plug import PluginRegister, BasePluginManager
 from .const import GRAMPS_LOCALE as glocale
 
@@ -46,6 +49,10 @@ UNKNOWN = Person.UNKNOWN
 LOG = logging.getLogger("gen.relationship")
 LOG.addHandler(logging.StreamHandler())
 
+# Number of ancestor maps of the first people of the relationships searched,
+# kept for each pedigree graph.
+ANCESTOR_MAPS = 16
+
 # -------------------------------------------------------------------------
 #
 #
@@ -945,9 +952,9 @@ class RelationshipCalculator:
         self.state_signal_key = None
         self.storemap = False
         self.dirtymap = True
-        self.stored_map = None
-        self.map_handle = None
-        self.map_meta = None
+        # {pedigree graph: {(handle, all families, only birth, depth):
+        #                   (graph version, ancestor map, search state)}}
+        self.__ancestor_maps = weakref.WeakKeyDictionary()
         self.__db_connected = False
         self.depth = 15
         try:
@@ -1378,49 +1385,52 @@ class RelationshipCalculator:
         first_map = {}
         second_map = {}
         rank = 9999999
+        graph = get_pedigree_graph(db)
+        key = (
+            orig_person and orig_person.handle,
+            all_families,
+            only_birth,
+            self.__max_depth,
+        )
 
         try:
-            if (
-                self.storemap
-                and self.stored_map is not None
-                and self.map_handle == orig_person.handle
-                and not self.dirtymap
-            ):
-                first_map = self.stored_map
+            # The ancestors of the first person are searched once, and the
+            # search from the other person stops at the common ancestors.
+            stored = self.__get_ancestor_map(graph, key)
+            if stored is not None:
+                first_map, meta = stored
                 (
                     self.__max_depth_reached,
                     self.__loop_detected,
-                    self.__all_families,
-                    self.__all_dist,
-                    self.__only_birth,
                     self.__crosslinks,
                     self.__msg,
-                ) = self.map_meta
+                ) = meta
                 self.__msg = list(self.__msg)
             else:
-                self.__apply_filter(db, orig_person, "", [], first_map)
-                self.map_meta = (
+                self.__apply_filter(
+                    db, graph, orig_person and orig_person.handle, "", [], first_map
+                )
+                meta = (
                     self.__max_depth_reached,
                     self.__loop_detected,
-                    self.__all_families,
-                    self.__all_dist,
-                    self.__only_birth,
                     self.__crosslinks,
                     list(self.__msg),
                 )
+                self.__store_ancestor_map(graph, key, first_map, meta)
             self.__apply_filter(
-                db, other_person, "", [], second_map, stoprecursemap=first_map
+                db,
+                graph,
+                other_person and other_person.handle,
+                "",
+                [],
+                second_map,
+                stoprecursemap=first_map,
             )
         except RuntimeError:
             return (-1, None, -1, [], -1, []), [
                 _("Relationship loop detected")
             ] + self.__msg
 
-        if self.storemap:
-            self.stored_map = first_map
-            self.dirtymap = False
-            self.map_handle = orig_person.handle
-
         for person_handle in second_map:
             if person_handle in first_map:
                 com = []
@@ -1428,6 +1438,9 @@ class RelationshipCalculator:
                 for rel1, fam1 in zip(
                     first_map[person_handle][0], first_map[person_handle][1]
                 ):
+                    # the stored ancestor map must not be changed by the
+                    # callers of the results
+                    fam1 = [fam[:] if isinstance(fam, list) else fam for fam in fam1]
                     len1 = len(rel1)
                     for rel2, fam2 in zip(
                         second_map[person_handle][0], second_map[person_handle][1]
@@ -1519,10 +1532,41 @@ class RelationshipCalculator:
         else:
             return [(-1, None, "", [], "", [])], self.__msg
 
+    def __get_ancestor_map(self, graph, key):
+        """
+        Return the ancestor map and the search state stored for the first
+        person of a search, or None if the pedigree graph changed since.
+        """
+        if self.dirtymap:
+            self.__ancestor_maps.clear()
+            self.dirtymap = False
+        maps = self.__ancestor_maps.get(graph)
+        if maps is None or key not in maps:
+            return None
+        version, first_map, meta = maps[key]
+        if version != graph.version:
+            del maps[key]
+            return None
+        maps.move_to_end(key)
+        return first_map, meta
+
+    def __store_ancestor_map(self, graph, key, first_map, meta):
+        """
+        Store the ancestor map and the search state of the first person of
+        a search, to be reused until the pedigree graph changes.
+        """
+        maps = self.__ancestor_maps.setdefault(graph, OrderedDict())
+        maps[key] = (graph.version, first_map, meta)
+        while len(maps) > ANCESTOR_MAPS:
+            maps.popitem(last=False)
+
     def __apply_filter(
-        self, db, person, rel_str, rel_fam, pmap, depth=1, stoprecursemap=None
+        self, db, graph, handle, rel_str, rel_fam, pmap, depth=1, stoprecursemap=None
     ):
         """
+        Walk the ancestors of a person, given by handle, on the pedigree graph
+        of the database.
+
         Typically this method is called recursively in two ways:
         First method is stoprecursemap= None
         In this case a recursemap is builded by storing all data.
@@ -1535,7 +1579,7 @@ class RelationshipCalculator:
         will be looked up anyway an stored if common. At end the doubles
         are filtered out
         """
-        if person is None or not person.handle:
+        if not handle or not graph.has_person(handle):
             return
 
         if depth > self.__max_depth:
@@ -1550,23 +1594,23 @@ class RelationshipCalculator:
         store = True  # normally we store all parents
         if stoprecursemap:
             store = False  # but not if a stop map given
-            if person.handle in stoprecursemap:
+            if handle in stoprecursemap:
                 commonancestor = True
                 store = True
 
         # add person to the map, take into account that person can be obtained
         # from different sides
-        if person.handle in pmap:
+        if handle in pmap:
             # person is already a grandparent in another branch, we already have
             # had lookup of all parents, we call that a crosslink
             if not stoprecursemap:
                 self.__crosslinks = True
-            pmap[person.handle][0] += [rel_str]
-            pmap[person.handle][1] += [rel_fam]
+            pmap[handle][0] += [rel_str]
+            pmap[handle][1] += [rel_fam]
             # check if there is no loop father son of his son, ...
             # loop means person is twice reached, same rel_str in begin
-            for rel1 in pmap[person.handle][0]:
-                for rel2 in pmap[person.handle][0]:
+            for rel1 in pmap[handle][0]:
+                for rel2 in pmap[handle][0]:
                     if len(rel1) < len(rel2) and rel1 == rel2[: len(rel1)]:
                         # loop, keep one message in storage!
                         self.__loop_detected = True
@@ -1577,13 +1621,15 @@ class RelationshipCalculator:
                                 "Person %(person)s connects to himself via %(relation)s"
                             )
                             % {
-                                "person": person.get_primary_name().get_name(),
+                                "person": db.get_person_from_handle(handle)
+                                .get_primary_name()
+                                .get_name(),
                                 "relation": rel2[len(rel1) :],
                             }
                         ]
                         return
         elif store:
-            pmap[person.handle] = [[rel_str], [rel_fam]]
+            pmap[handle] = [[rel_str], [rel_fam]]
 
         # having added person to the pmap, we only look up recursively to
         # parents if this person is not common relative
@@ -1592,29 +1638,20 @@ class RelationshipCalculator:
             # don't continue search, great speedup!
             return
 
-        family_handles = []
-        main = person.get_main_parents_family_handle()
-        if main:
-            family_handles = [main]
-        if self.__all_families:
-            family_handles = person.get_parent_family_handle_list()
+        parent_links = graph.get_parent_links(handle)
+        if not self.__all_families:
+            parent_links = parent_links[:1]
 
         try:
             parentstodo = {}
             fam = 0
-            for family_handle in family_handles:
+            for link in parent_links:
                 rel_fam_new = rel_fam + [fam]
-                family = db.get_family_from_handle(family_handle)
-                if not family:
+                if link is None:
                     continue
+                family_handle, fhandle, mhandle, rels = link
                 # obtain childref for this person
-                childrel = [
-                    (ref.get_mother_relation(), ref.get_father_relation())
-                    for ref in family.get_child_ref_list()
-                    if ref.ref == person.handle
-                ]
-                fhandle = family.father_handle
-                mhandle = family.mother_handle
+                childrel = [(rels[1], rels[0])] if rels else []
                 for data in [
                     (
                         fhandle,
@@ -1630,7 +1667,6 @@ class RelationshipCalculator:
                     ),
                 ]:
                     if data[0] and data[0] not in parentstodo:
-                        persontodo = db.get_person_from_handle(data[0])
                         if data[3] == ChildRefType.BIRTH:
                             addstr = data[1]
                         elif not self.__only_birth:
@@ -1639,7 +1675,7 @@ class RelationshipCalculator:
                             addstr = ""
                         if addstr:
                             parentstodo[data[0]] = (
-                                persontodo,
+                                data[0],
                                 rel_str + addstr,
                                 rel_fam_new,
                             )
@@ -1661,9 +1697,9 @@ class RelationshipCalculator:
                     # other person has recusemap, and will stop when seeing
                     # the brother.
                     child_list = [
-                        ref.ref
-                        for ref in family.get_child_ref_list()
-                        if ref.ref != person.handle
+                        ref
+                        for ref, frel, mrel in graph.get_child_refs(family_handle)
+                        if ref != handle
                     ]
                     addstr = self.REL_SIBLING
                     for chandle in child_list:
@@ -1675,9 +1711,9 @@ class RelationshipCalculator:
                             pmap[chandle] = [[rel_str + addstr], [rel_fam_new]]
                 fam += 1
 
-            for handle, data in parentstodo.items():
+            for data in parentstodo.values():
                 self.__apply_filter(
-                    db, data[0], data[1], data[2], pmap, depth, stoprecursemap
+                    db, graph, data[0], data[1], data[2], pmap, depth, stoprecursemap
                 )
         except:
             import traceback
@@ -1921,6 +1957,56 @@ class RelationshipCalculator:
             else:
                 return rel_str
 
+        return self._get_blood_relationship(db, orig_person, other_person, extra_info)
+
+    def get_relationships(
+        self, db, orig_person, other_people, extra_info=False, olocale=glocale
+    ):
+        """
+        Return the most relevant relationship between a person and each of
+        a list of other people, as :meth:`get_one_relationship` does.
+
+        The ancestors of the first person are searched once for all the
+        other people, and only the partners of the first person are checked
+        for a partner relationship.
+
+        :param other_people: the people to relate to orig_person
+        :type other_people: list of Person Obj
+        :returns: the relation strings, or tuples if extra_info = True, in
+                  the order of other_people
+        """
+        if orig_person is None:
+            return [
+                self.get_one_relationship(
+                    db, orig_person, other, extra_info, olocale=olocale
+                )
+                for other in other_people
+            ]
+        self._locale = olocale
+        spouses = set(get_pedigree_graph(db).get_spouses(orig_person.handle))
+        results = []
+        for other_person in other_people:
+            if other_person.handle == orig_person.handle or (
+                other_person.handle in spouses
+            ):
+                results.append(
+                    self.get_one_relationship(
+                        db, orig_person, other_person, extra_info, olocale=olocale
+                    )
+                )
+            else:
+                results.append(
+                    self._get_blood_relationship(
+                        db, orig_person, other_person, extra_info
+                    )
+                )
+        return results
+
+    def _get_blood_relationship(self, db, orig_person, other_person, extra_info):
+        """
+        Return the most relevant relationship through common ancestors, as
+        :meth:`get_one_relationship` does for people who are not partners.
+        """
         data, msg = self.get_relationship_distance_new(
             db,
             orig_person,
@@ -2554,7 +2640,7 @@ class RelationshipCalculator:
         dbstate.disconnect(self.state_signal_key)
         list(map(dbstate.db.disconnect, self.signal_keys))
         self.storemap = False
-        self.stored_map = None
+        self.__ancestor_maps.clear()
 
     def _dbchange_callback(self, db):
         """
@@ -0,0 +1,104 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for relationship.py"""
+
+import os
+import unittest
+
+from ..const import DATA_DIR
+from ..db import DbTxn
+from ..db.utils import import_as_dict
+from ..lib import ChildRef, Family
+from ..relationship import RelationshipCalculator
+from ..user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class RelationshipCalculatorTest(unittest.TestCase):
+    """
+    Relationships found with the stored ancestor maps and the batch call are
+    the same as when each one is searched on its own.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.people = list(cls.db.iter_people())[:300]
+        cls.home = cls.db.get_person_from_gramps_id("I0044")
+
+    def relationships(self):
+        return [
+            RelationshipCalculator().get_one_relationship(
+                self.db, self.home, person, extra_info=True
+            )
+            for person in self.people
+        ]
+
+    def test_batch(self):
+        expected = self.relationships()
+        rel_calc = RelationshipCalculator()
+        self.assertEqual(
+            rel_calc.get_relationships(self.db, self.home, self.people, True),
+            expected,
+        )
+        self.assertEqual(
+            rel_calc.get_relationships(self.db, self.home, self.people, True),
+            expected,
+        )
+        self.assertEqual(
+            [
+                rel_calc.get_all_relationships(self.db, self.home, person)
+                for person in self.people[:50]
+            ],
+            [
+                RelationshipCalculator().get_all_relationships(
+                    self.db, self.home, person
+                )
+                for person in self.people[:50]
+            ],
+        )
+
+    def test_changed(self):
+        db = import_as_dict(EXAMPLE, User())
+        home = db.get_person_from_gramps_id("I0044")
+        other = db.get_person_from_gramps_id("I1370")
+        rel_calc = RelationshipCalculator()
+        self.assertEqual(rel_calc.get_one_relationship(db, home, other), "")
+        family = Family()
+        family.set_father_handle(other.handle)
+        ref = ChildRef()
+        ref.set_reference_handle(home.handle)
+        family.add_child_ref(ref)
+        with DbTxn("Add father", db) as trans:
+            db.add_family(family, trans)
+            other.add_family_handle(family.handle)
+            db.commit_person(other, trans)
+            home.set_parent_family_handle_list(
+                [family.handle] + home.get_parent_family_handle_list()
+            )
+            db.commit_person(home, trans)
+        self.assertEqual(rel_calc.get_one_relationship(db, home, other), "father")
+
+
+if __name__ == "__main__":
+    unittest.main()
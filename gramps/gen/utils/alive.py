@@ -31,6 +31,7 @@ privacy in reports and exports.
 #
 # -------------------------------------------------------------------------
 import logging
+import weakref
 
 LOG = logging.getLogger(".gen.utils.alive")
 
@@ -103,62 +104,9 @@ class ProbablyAlive:
         if person is None:
             return (None, None, "", None)
         self.pset = set()
-        birth_ref = person.get_birth_ref()
-        death_ref = person.get_death_ref()
-        death_date = None
-        birth_date = None
-        explain = ""
-        # If the recorded death year is before current year then
-        # things are simple.
-        if death_ref and death_ref.get_role().is_primary():
-            if death_ref:
-                death = self.db.get_event_from_handle(death_ref.ref)
-                if death:
-                    death_date = death.get_date_object()
-
-        # Look for Cause Of Death, Burial or Cremation events.
-        # These are fairly good indications that someone's not alive.
-        if not death_date:
-            for ev_ref in person.get_primary_event_ref_list():
-                if ev_ref:
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_death_fallback():
-                        death_date = ev.get_date_object()
-                        if not death_date.is_valid():
-                            death_date = Today()  # before today
-                            death_date.set_modifier(Date.MOD_BEFORE)
-
-        # If they were born within X years before current year then
-        # assume they are alive (we already know they are not dead).
-        if not birth_date:
-            if birth_ref and birth_ref.get_role().is_primary():
-                birth = self.db.get_event_from_handle(birth_ref.ref)
-                if birth and birth.get_date_object().get_start_date() != Date.EMPTY:
-                    birth_date = birth.get_date_object()
-
-        # Look for Baptism, etc events.
-        # These are fairly good indications that someone's birth.
-        if not birth_date:
-            for ev_ref in person.get_primary_event_ref_list():
-                ev = self.db.get_event_from_handle(ev_ref.ref)
-                if ev and ev.type.is_birth_fallback():
-                    birth_date = ev.get_date_object()
-
-        if not birth_date and death_date:
-            # person died more than MAX after current year
-            if death_date.is_valid():
-                birth_date = death_date.copy_offset_ymd(year=-self.MAX_AGE_PROB_ALIVE)
-            else:
-                birth_date = death_date
-            explain = _("death date")
-
-        if not death_date and birth_date:
-            # person died more than MAX after current year
-            death_date = birth_date.copy_offset_ymd(year=self.MAX_AGE_PROB_ALIVE)
-            explain = _("birth date")
-
-        if death_date and birth_date:
-            return (birth_date, death_date, explain, person)  # direct self evidence
+        direct = self._direct_range(person)
+        if direct:
+            return direct  # direct self evidence
 
         # Neither birth nor death events are available. Try looking
         # at siblings. If a sibling was born more than X years past,
@@ -171,95 +119,9 @@ class ProbablyAlive:
             family = self.db.get_family_from_handle(family_handle)
             if family is None:
                 continue
-            for child_ref in family.get_child_ref_list():
-                child_handle = child_ref.ref
-                child = self.db.get_person_from_handle(child_handle)
-                if child is None:
-                    continue
-                # Go through once looking for direct evidence:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling birth date
-                                return (
-                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling birth date"),
-                                    child,
-                                )
-                    elif ev and ev.type.is_death():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling death date
-                                return (
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling death date"),
-                                    child,
-                                )
-                # Go through again looking for fallback:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling birth date
-                                return (
-                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling birth-related date"),
-                                    child,
-                                )
-                    elif ev and ev.type.is_death_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling death date
-                                return (
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    Date().copy_ymd(
-                                        year
-                                        - self.MAX_SIB_AGE_DIFF
-                                        - self.MAX_AGE_PROB_ALIVE
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("sibling death-related date"),
-                                    child,
-                                )
+            sibling = self._sibling_range(family)
+            if sibling:
+                return sibling
 
         if not is_spouse:  # if you are not in recursion, let's recurse:
             for family_handle in person.get_family_handle_list():
@@ -361,90 +223,12 @@ class ProbablyAlive:
 
         # Try looking for descendants that were born more than a lifespan
         # ago.
-
-        def descendants_too_old(person, years):
-            if person.handle in self.pset:
-                return (None, None, "", None)
-            self.pset.add(person.handle)
-            for family_handle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(family_handle)
-                if not family:
-                    # can happen with LivingProxyDb(PrivateProxyDb(db))
-                    continue
-                for child_ref in family.get_child_ref_list():
-                    child_handle = child_ref.ref
-                    child = self.db.get_person_from_handle(child_handle)
-                    child_birth_ref = child.get_birth_ref()
-                    if child_birth_ref:
-                        child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
-                        dobj = child_birth.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            d = Date(dobj)
-                            val = d.get_start_date()
-                            val = d.get_year() - years
-                            d.set_year(val)
-                            return (
-                                d,
-                                d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                _("descendant birth date"),
-                                child,
-                            )
-                    child_death_ref = child.get_death_ref()
-                    if child_death_ref:
-                        child_death = self.db.get_event_from_handle(child_death_ref.ref)
-                        dobj = child_death.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            return (
-                                dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
-                                dobj.copy_offset_ymd(
-                                    -self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE
-                                ),
-                                _("descendant death date"),
-                                child,
-                            )
-                    date1, date2, explain, other = descendants_too_old(
-                        child, years + self.AVG_GENERATION_GAP
-                    )
-                    if date1 and date2:
-                        return date1, date2, explain, other
-                    # Check fallback data:
-                    for ev_ref in child.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
-                        if ev and ev.type.is_birth_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                d = Date(dobj)
-                                val = d.get_start_date()
-                                val = d.get_year() - years
-                                d.set_year(val)
-                                return (
-                                    d,
-                                    d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                    _("descendant birth-related date"),
-                                    child,
-                                )
-
-                        elif ev and ev.type.is_death_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (
-                                    dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
-                                    dobj.copy_offset_ymd(
-                                        -self.AVG_GENERATION_GAP
-                                        + self.MAX_AGE_PROB_ALIVE
-                                    ),
-                                    _("descendant death-related date"),
-                                    child,
-                                )
-
-            return (None, None, "", None)
-
         # If there are descendants that are too old for the person to have
         # been alive in the current year then they must be dead.
 
         date1, date2, explain, other = None, None, "", None
         try:
-            date1, date2, explain, other = descendants_too_old(
+            date1, date2, explain, other = self._descendants_range(
                 person, self.AVG_GENERATION_GAP
             )
         except RuntimeError:
@@ -634,6 +418,248 @@ class ProbablyAlive:
 
         return (None, None, "", None)
 
+    def _direct_range(self, person):
+        """
+        Return the range given by the birth, death and related events of a
+        person, or None.
+        """
+        birth_ref = person.get_birth_ref()
+        death_ref = person.get_death_ref()
+        death_date = None
+        birth_date = None
+        explain = ""
+        # If the recorded death year is before current year then
+        # things are simple.
+        if death_ref and death_ref.get_role().is_primary():
+            if death_ref:
+                death = self.db.get_event_from_handle(death_ref.ref)
+                if death:
+                    death_date = death.get_date_object()
+
+        # Look for Cause Of Death, Burial or Cremation events.
+        # These are fairly good indications that someone's not alive.
+        if not death_date:
+            for ev_ref in person.get_primary_event_ref_list():
+                if ev_ref:
+                    ev = self.db.get_event_from_handle(ev_ref.ref)
+                    if ev and ev.type.is_death_fallback():
+                        death_date = ev.get_date_object()
+                        if not death_date.is_valid():
+                            death_date = Today()  # before today
+                            death_date.set_modifier(Date.MOD_BEFORE)
+
+        # If they were born within X years before current year then
+        # assume they are alive (we already know they are not dead).
+        if not birth_date:
+            if birth_ref and birth_ref.get_role().is_primary():
+                birth = self.db.get_event_from_handle(birth_ref.ref)
+                if birth and birth.get_date_object().get_start_date() != Date.EMPTY:
+                    birth_date = birth.get_date_object()
+
+        # Look for Baptism, etc events.
+        # These are fairly good indications that someone's birth.
+        if not birth_date:
+            for ev_ref in person.get_primary_event_ref_list():
+                ev = self.db.get_event_from_handle(ev_ref.ref)
+                if ev and ev.type.is_birth_fallback():
+                    birth_date = ev.get_date_object()
+
+        if not birth_date and death_date:
+            # person died more than MAX after current year
+            if death_date.is_valid():
+                birth_date = death_date.copy_offset_ymd(year=-self.MAX_AGE_PROB_ALIVE)
+            else:
+                birth_date = death_date
+            explain = _("death date")
+
+        if not death_date and birth_date:
+            # person died more than MAX after current year
+            death_date = birth_date.copy_offset_ymd(year=self.MAX_AGE_PROB_ALIVE)
+            explain = _("birth date")
+
+        if death_date and birth_date:
+            return (birth_date, death_date, explain, person)  # direct self evidence
+        return None
+
+    def _sibling_range(self, family):
+        """
+        Return the range given by the first child of a family with a dated
+        birth or death, or related, event, or None.
+        """
+        for child_ref in family.get_child_ref_list():
+            child_handle = child_ref.ref
+            child = self.db.get_person_from_handle(child_handle)
+            if child is None:
+                continue
+            # Go through once looking for direct evidence:
+            for ev_ref in child.get_primary_event_ref_list():
+                ev = self.db.get_event_from_handle(ev_ref.ref)
+                if ev and ev.type.is_birth():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling birth date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling birth date
+                            return (
+                                Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    + self.MAX_AGE_PROB_ALIVE
+                                ),
+                                _("sibling birth date"),
+                                child,
+                            )
+                elif ev and ev.type.is_death():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling death date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling death date
+                            return (
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                ),
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                    + self.MAX_AGE_PROB_ALIVE
+                                ),
+                                _("sibling death date"),
+                                child,
+                            )
+            # Go through again looking for fallback:
+            for ev_ref in child.get_primary_event_ref_list():
+                ev = self.db.get_event_from_handle(ev_ref.ref)
+                if ev and ev.type.is_birth_fallback():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling birth date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling birth date
+                            return (
+                                Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    + self.MAX_AGE_PROB_ALIVE
+                                ),
+                                _("sibling birth-related date"),
+                                child,
+                            )
+                elif ev and ev.type.is_death_fallback():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling death date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling death date
+                            return (
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                ),
+                                Date().copy_ymd(
+                                    year
+                                    - self.MAX_SIB_AGE_DIFF
+                                    - self.MAX_AGE_PROB_ALIVE
+                                    + self.MAX_AGE_PROB_ALIVE
+                                ),
+                                _("sibling death-related date"),
+                                child,
+                            )
+        return None
+
+    def _descendants_range(self, person, years):
+        """
+        Return the range given by the first descendant of a person with a
+        dated birth or death, or related, event, looking down the children
+        of each child before its related events.
+        """
+        if person.handle in self.pset:
+            return (None, None, "", None)
+        self.pset.add(person.handle)
+        for family_handle in person.get_family_handle_list():
+            family = self.db.get_family_from_handle(family_handle)
+            if not family:
+                # can happen with LivingProxyDb(PrivateProxyDb(db))
+                continue
+            for child_ref in family.get_child_ref_list():
+                child = self.db.get_person_from_handle(child_ref.ref)
+                evidence = self._child_evidence(child)
+                if evidence:
+                    return self._descendant_range(evidence, years, child)
+                date1, date2, explain, other = self._descendants_range(
+                    child, years + self.AVG_GENERATION_GAP
+                )
+                if date1 and date2:
+                    return date1, date2, explain, other
+                # Check fallback data:
+                evidence = self._child_fallback_evidence(child)
+                if evidence:
+                    return self._descendant_range(evidence, years, child)
+        return (None, None, "", None)
+
+    def _child_evidence(self, child):
+        """
+        Return (is birth, date, explanation) for the dated birth, or else
+        death, of a descendant, or None.
+        """
+        child_birth_ref = child.get_birth_ref()
+        if child_birth_ref:
+            child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
+            dobj = child_birth.get_date_object()
+            if dobj.get_start_date() != Date.EMPTY:
+                return (True, dobj, _("descendant birth date"))
+        child_death_ref = child.get_death_ref()
+        if child_death_ref:
+            child_death = self.db.get_event_from_handle(child_death_ref.ref)
+            dobj = child_death.get_date_object()
+            if dobj.get_start_date() != Date.EMPTY:
+                return (False, dobj, _("descendant death date"))
+        return None
+
+    def _child_fallback_evidence(self, child):
+        """
+        Return (is birth, date, explanation) for the first dated birth or
+        death related event of a descendant, or None.
+        """
+        for ev_ref in child.get_primary_event_ref_list():
+            ev = self.db.get_event_from_handle(ev_ref.ref)
+            if ev and ev.type.is_birth_fallback():
+                dobj = ev.get_date_object()
+                if dobj.get_start_date() != Date.EMPTY:
+                    return (True, dobj, _("descendant birth-related date"))
+            elif ev and ev.type.is_death_fallback():
+                dobj = ev.get_date_object()
+                if dobj.get_start_date() != Date.EMPTY:
+                    return (False, dobj, _("descendant death-related date"))
+        return None
+
+    def _descendant_range(self, evidence, years, child):
+        """
+        Return the range of a person given by the evidence of a descendant,
+        a birth being years after the birth of the person.
+        """
+        is_birth, dobj, explain = evidence
+        if is_birth:
+            d = Date(dobj)
+            d.set_year(d.get_year() - years)
+            return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE), explain, child)
+        return (
+            dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP),
+            dobj.copy_offset_ymd(-self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
+            explain,
+            child,
+        )
+
 
 # -------------------------------------------------------------------------
 #
@@ -669,6 +695,18 @@ def probably_alive(
     birth, death, explain, relative = probably_alive_range(
         person, db, max_sib_age_diff, max_age_prob_alive, avg_generation_gap
     )
+    return _alive_on_date(
+        person, birth, death, explain, relative, current_date, limit, return_range
+    )
+
+
+def _alive_on_date(
+    person, birth, death, explain, relative, current_date, limit, return_range
+):
+    """
+    Return true if the estimated birth and death dates of a person include
+    current_date, as :func:`probably_alive` does.
+    """
     if current_date is None:
         current_date = Today()
     LOG.debug(
@@ -712,6 +750,215 @@ def probably_alive_range(
     return pb.probably_alive_range(person)
 
 
+class _DescendantLoop(Exception):
+    """
+    The descendants of a person lead back to the person.
+    """
+
+
+# -------------------------------------------------------------------------
+#
+# ProbablyAliveRanges class
+#
+# -------------------------------------------------------------------------
+class ProbablyAliveRanges(ProbablyAlive):
+    """
+    Estimate the birth and death dates of many people of a database, with
+    the same results as :meth:`ProbablyAlive.probably_alive_range` gives
+    for each of them.
+
+    The estimates of people and spouses, the sibling evidence of families
+    and the first dated descendant below each person are found once and
+    reused by all their relatives, the descendants being estimated before
+    the people above them. People whose descendants lead back to them are
+    estimated one at a time. Use :func:`get_probably_alive_ranges` to share
+    the estimates of a database until it changes.
+    """
+
+    def __init__(
+        self,
+        db,
+        max_sib_age_diff=None,
+        max_age_prob_alive=None,
+        avg_generation_gap=None,
+    ):
+        from ..proxy.cache import CacheProxyDb
+
+        ProbablyAlive.__init__(
+            self,
+            CacheProxyDb(db),
+            max_sib_age_diff,
+            max_age_prob_alive,
+            avg_generation_gap,
+        )
+        self.revision = _get_revision(db)
+        # {(handle, is_spouse): (range, estimated one at a time)}
+        self._ranges = {}
+        # {family handle: range}
+        self._siblings = {}
+        # {handle: ((is birth, date, explanation), descendant, generations)}
+        self._descendants = {}
+        self._walking = set()
+        self._loop_found = False
+
+    def get_params(self):
+        """
+        Return the parameters of the estimates.
+        """
+        return (self.MAX_SIB_AGE_DIFF, self.MAX_AGE_PROB_ALIVE, self.AVG_GENERATION_GAP)
+
+    def probably_alive(self, person, current_date=None, limit=0, return_range=False):
+        """
+        Return true if the person may be alive on current_date, as
+        :func:`probably_alive` does.
+        """
+        birth, death, explain, relative = self.probably_alive_range(person)
+        return _alive_on_date(
+            person, birth, death, explain, relative, current_date, limit, return_range
+        )
+
+    def probably_alive_range(self, person, is_spouse=False):
+        if person is None:
+            return (None, None, "", None)
+        key = (person.handle, is_spouse)
+        if key not in self._ranges:
+            self._ranges[key] = self._estimate(person, is_spouse)
+        result, single = self._ranges[key]
+        if single:
+            self._loop_found = True
+        return result
+
+    def get_ranges(self, handles=None):
+        """
+        Return a dictionary of the estimates of people, all by default.
+        """
+        if handles is None:
+            handles = self.db.iter_person_handles()
+        return {
+            handle: self.probably_alive_range(self.db.get_person_from_handle(handle))
+            for handle in handles
+        }
+
+    def _estimate(self, person, is_spouse):
+        """
+        Estimate a person, one at a time if a loop was found in the
+        descendants of the person or of a spouse.
+        """
+        outer = self._loop_found
+        self._loop_found = False
+        try:
+            result = ProbablyAlive.probably_alive_range(self, person, is_spouse)
+        except _DescendantLoop:
+            self._loop_found = True
+        single = self._loop_found
+        if single:
+            result = ProbablyAlive(self.db, *self.get_params()).probably_alive_range(
+                person, is_spouse
+            )
+        self._loop_found = outer
+        return result, single
+
+    def _sibling_range(self, family):
+        if family.handle not in self._siblings:
+            self._siblings[family.handle] = ProbablyAlive._sibling_range(self, family)
+        return self._siblings[family.handle]
+
+    def _descendants_range(self, person, years):
+        # the ancestors are not searched once the descendants were
+        self.pset.add(person.handle)
+        found = self._descendant_evidence(person)
+        if found is None:
+            return (None, None, "", None)
+        evidence, child, generations = found
+        return self._descendant_range(
+            evidence, years + generations * self.AVG_GENERATION_GAP, child
+        )
+
+    def _descendant_evidence(self, person):
+        """
+        Return the evidence of the first dated descendant of a person, in
+        the order of :meth:`ProbablyAlive._descendants_range`, or None.
+        """
+        handle = person.handle
+        if handle in self._descendants:
+            return self._descendants[handle]
+        if handle in self._walking:
+            raise _DescendantLoop()
+        self._walking.add(handle)
+        try:
+            found = self._find_descendant_evidence(person)
+        finally:
+            self._walking.discard(handle)
+        self._descendants[handle] = found
+        return found
+
+    def _find_descendant_evidence(self, person):
+        for family_handle in person.get_family_handle_list():
+            family = self.db.get_family_from_handle(family_handle)
+            if not family:
+                continue
+            for child_ref in family.get_child_ref_list():
+                child = self.db.get_person_from_handle(child_ref.ref)
+                evidence = self._child_evidence(child)
+                if evidence:
+                    return (evidence, child, 0)
+                found = self._descendant_evidence(child)
+                if found:
+                    return (found[0], found[1], found[2] + 1)
+                evidence = self._child_fallback_evidence(child)
+                if evidence:
+                    return (evidence, child, 0)
+        return None
+
+
+_RANGES = weakref.WeakKeyDictionary()
+
+
+def _get_revision(db):
+    """
+    Return the change counters of the people, families and events of a
+    database, or None if it does not track its changes.
+    """
+    revision = tuple(
+        db.get_change_counter(obj_class) for obj_class in ("Person", "Family", "Event")
+    )
+    if None in revision:
+        return None
+    return revision
+
+
+def get_probably_alive_ranges(
+    db, max_sib_age_diff=None, max_age_prob_alive=None, avg_generation_gap=None
+):
+    """
+    Return the :class:`ProbablyAliveRanges` of a database, shared until its
+    people, families or events change.
+    """
+    from ..proxy.proxybase import ProxyDbBase
+
+    basedb = db
+    while isinstance(basedb, ProxyDbBase):
+        basedb = basedb.db
+    params = (
+        _MAX_SIB_AGE_DIFF if max_sib_age_diff is None else max_sib_age_diff,
+        _MAX_AGE_PROB_ALIVE if max_age_prob_alive is None else max_age_prob_alive,
+        _AVG_GENERATION_GAP if avg_generation_gap is None else avg_generation_gap,
+    )
+    try:
+        ranges = _RANGES.get(basedb)
+    except TypeError:
+        # Databases that can not be weakly referenced are not shared
+        return ProbablyAliveRanges(basedb, *params)
+    if (
+        ranges is None
+        or ranges.revision is None
+        or ranges.revision != _get_revision(basedb)
+        or ranges.get_params() != params
+    ):
+        ranges = _RANGES[basedb] = ProbablyAliveRanges(basedb, *params)
+    return ranges
+
+
 def update_constants():
     """
     Used to update the constants that are cached in this module.
@@ -35,6 +35,7 @@ def get_location_list(db, place, date=None, lang=""):
     """
     if date is None:
         date = __get_latest_date(place)
+    places = __get_enclosing_places(db, place)
     visited = [place.handle]
     lines = [(__get_name(place, date, lang), place.get_type())]
     while True:
@@ -46,7 +47,7 @@ def get_location_list(db, place, date=None, lang=""):
                 break
         if handle is None or handle in visited:
             break
-        place = db.get_place_from_handle(handle)
+        place = places.get(handle)
         if place is None:
             break
         visited.append(handle)
@@ -54,6 +55,19 @@ def get_location_list(db, place, date=None, lang=""):
     return lines
 
 
+def __get_enclosing_places(db, place):
+    """
+    Return a dictionary of all the places enclosing a place, by handle.
+
+    The hierarchy is fetched in one go, starting from the place references
+    of the given place, which may not have been committed yet.
+    """
+    handles = [placeref.ref for placeref in place.get_placeref_list()]
+    if not handles:
+        return {}
+    return {parent.handle: parent for parent in db.get_place_ancestry(handles)}
+
+
 def __get_name(place, date, lang):
     endonym = None
     for place_name in place.get_all_names():
@@ -113,12 +127,13 @@ def get_locations(db, place):
     containing dictionaries of place types and names.
     """
     locations = []
+    places = __get_enclosing_places(db, place)
     todo = [(place, [(int(place.get_type()), __get_all_names(place))], [place.handle])]
     while len(todo):
         place, tree, visited = todo.pop()
         for parent in place.get_placeref_list():
             if parent.ref not in visited:
-                parent_place = db.get_place_from_handle(parent.ref)
+                parent_place = places.get(parent.ref)
                 if parent_place is not None:
                     parent_tree = tree + [
                         (int(parent_place.get_type()), __get_all_names(parent_place))
@@ -145,15 +160,4 @@ def located_in(db, handle1, handle2):
     identified by handle2.
     """
     place = db.get_place_from_handle(handle1)
-    todo = [(place, [handle1])]
-    while len(todo):
-        place, visited = todo.pop()
-        for parent in place.get_placeref_list():
-            if parent.ref == handle2:
-                return True
-            if parent.ref not in visited:
-                parent_place = db.get_place_from_handle(parent.ref)
-                if parent_place is not None:
-                    parent_visited = visited + [parent.ref]
-                    todo.append((parent_place, parent_visited))
-    return False
+    return handle2 in __get_enclosing_places(db, place)
@@ -0,0 +1,99 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""Unittest for alive.py"""
+
+import os
+import unittest
+
+from ...const import DATA_DIR
+from ...db import DbTxn
+from ...db.utils import import_as_dict
+from ...lib import ChildRef, Family, Person
+from ...user import User
+from ..alive import (
+    ProbablyAliveRanges,
+    get_probably_alive_ranges,
+    probably_alive_range,
+)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class ProbablyAliveRangesTest(unittest.TestCase):
+    """
+    The estimates of all the people at once are those of each person alone.
+    """
+
+    def setUp(self):
+        self.db = import_as_dict(EXAMPLE, User())
+
+    def check_ranges(self, ranges):
+        for person in self.db.iter_people():
+            expected = probably_alive_range(person, self.db)
+            result = ranges.probably_alive_range(person)
+            self.assertEqual(
+                [str(date) for date in result[:2]] + [result[2]],
+                [str(date) for date in expected[:2]] + [expected[2]],
+            )
+            self.assertEqual(
+                result[3] and result[3].handle, expected[3] and expected[3].handle
+            )
+
+    def test_ranges(self):
+        self.check_ranges(ProbablyAliveRanges(self.db))
+
+    def test_loop(self):
+        with DbTxn("Add loop", self.db) as trans:
+            first = self.db.add_person(Person(), trans)
+            second = self.db.add_person(Person(), trans)
+            self.add_family(first, second, trans)
+            self.add_family(second, first, trans)
+        ranges = ProbablyAliveRanges(self.db)
+        self.check_ranges(ranges)
+        self.assertTrue(ranges._ranges[(first, False)][1])
+
+    def add_family(self, father, child, trans):
+        family = Family()
+        family.set_father_handle(father)
+        ref = ChildRef()
+        ref.set_reference_handle(child)
+        family.add_child_ref(ref)
+        self.db.add_family(family, trans)
+        person = self.db.get_person_from_handle(father)
+        person.add_family_handle(family.handle)
+        self.db.commit_person(person, trans)
+        person = self.db.get_person_from_handle(child)
+        person.add_parent_family_handle(family.handle)
+        self.db.commit_person(person, trans)
+
+    def test_shared(self):
+        ranges = get_probably_alive_ranges(self.db)
+        self.assertIs(get_probably_alive_ranges(self.db), ranges)
+        self.assertIsNot(get_probably_alive_ranges(self.db, 10), ranges)
+        person = self.db.get_person_from_gramps_id("I0044")
+        with DbTxn("Change person", self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.assertIsNot(get_probably_alive_ranges(self.db), ranges)
+
+
+if __name__ == "__main__":
+    unittest.main()
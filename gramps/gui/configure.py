@@ -2292,6 +2292,14 @@ class GrampsPreferences(ConfigureDialog):
         lwidget = BasicLabel(_("%s: ") % _("Autobackup"))
         grid.attach(lwidget, 1, row, 1, 1)
         grid.attach(obox, 2, row, 1, 1)
+        row += 1
+        self.add_spinner(
+            grid,
+            _("Incremental backups between full backups"),
+            row,
+            "database.backup-full-interval",
+            (0, 100),
+        )
 
         row += 1
         label = self.add_text(
@@ -47,7 +47,9 @@ from gramps.gen.proxy import (
     LivingProxyDb,
     FilterProxyDb,
     ReferencedBySelectionProxyDb,
+    ExportProxyDb,
 )
+from gramps.gen.proxy.proxybase import ProxyDbBase
 
 # -------------------------------------------------------------------------
 #
@@ -618,6 +620,9 @@ class WriterOptionBox:
                         "{number_of} Person", "{number_of} People", people_count
                     ).format(number_of=people_count)
                 )
+        if isinstance(dbase, ProxyDbBase):
+            # Fetch each object through the proxies at most once.
+            dbase = ExportProxyDb(dbase)
         return dbase
 
     def apply_proxy(self, proxy_name, dbase, progress=None):
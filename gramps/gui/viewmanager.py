@@ -1300,19 +1300,17 @@ class ViewManager(CLIManager):
 
     def __backup(self):
         """
-        Backup database to a Gramps XML file.
+        Backup database to a Gramps XML file, or to a delta of the changes
+        since the previous backup.
         """
-        from gramps.plugins.export.exportxml import XmlWriter
+        from gramps.plugins.lib.libbackup import write_backup
 
-        backup_path = config.get("database.backup-path")
-        compress = config.get("database.compress-backup")
-        writer = XmlWriter(
-            self.dbstate.db, self.user, strip_photos=0, compress=compress
+        write_backup(
+            self.dbstate.db,
+            config.get("database.backup-path"),
+            self.user,
+            compress=config.get("database.compress-backup"),
         )
-        timestamp = "{0:%Y-%m-%d-%H-%M-%S}".format(datetime.datetime.now())
-        backup_name = "%s-%s.gramps" % (self.dbstate.db.get_dbname(), timestamp)
-        filename = os.path.join(backup_path, backup_name)
-        writer.write(filename)
 
     def reports_clicked(self, *obj):
         """
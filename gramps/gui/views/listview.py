@@ -86,6 +86,19 @@ TEXT = 1
 MARKUP = 2
 ICON = 3
 
+# Types of the objects whose changes are signalled by the database.
+RELATED_TYPES = (
+    "person",
+    "family",
+    "event",
+    "place",
+    "source",
+    "citation",
+    "repository",
+    "media",
+    "note",
+)
+
 
 # ----------------------------------------------------------------
 #
@@ -349,6 +362,7 @@ class ListView(NavigationView):
                     search=filter_info,
                     sort_map=self.column_order(),
                 )
+                self.model.filter_callback = self.filter_updated
             else:
                 # the entire data to show is already in memory.
                 # run only the part that determines what to show
@@ -804,6 +818,7 @@ class ListView(NavigationView):
                 search=filter_info,
                 sort_map=self.column_order(),
             )
+            self.model.filter_callback = self.filter_updated
 
             self.list.set_model(self.model)
 
@@ -838,6 +853,13 @@ class ListView(NavigationView):
         for sig in self.signal_map:
             self.callman.add_db_signal(sig, self.signal_map[sig])
         self.callman.add_db_signal("tag-update", self.tag_updated)
+        # The rules of the filter of the sidebar may depend on the objects
+        # of other types, such as the families of the people.
+        for obj_type in RELATED_TYPES:
+            for action in ("add", "update", "delete"):
+                sig = "%s-%s" % (obj_type, action)
+                if sig not in self.signal_map:
+                    self.callman.add_db_signal(sig, self.filter_update)
 
     def change_db(self, db):
         """
@@ -958,6 +980,7 @@ class ListView(NavigationView):
                     # Allow active changed on last item deleted
                     self.model.dont_change_active = False
                 self.model.delete_row_by_handle(hndl)
+            self.model.update_filter(related=True)
             LOG.debug(
                 "   "
                 + self.__class__.__name__
@@ -972,6 +995,26 @@ class ListView(NavigationView):
         else:
             self.dirty = True
 
+    def filter_update(self, handle_list):
+        """
+        Called when an object of another type is changed, which the filter
+        of the sidebar may depend on.
+        """
+        if self.active or (not self.dirty and not self._dirty_on_change_inactive):
+            self.model.update_filter(related=True)
+        elif self.model and self.model.filter_matches is not None:
+            self.dirty = True
+
+    def filter_updated(self):
+        """
+        Called when the rows whose match of the filter of the sidebar changed
+        are shown and hidden.
+        """
+        if self.active:
+            self.uistate.show_filter_results(
+                self.dbstate, self.model.displayed(), self.model.total()
+            )
+
     def object_build(self, *args):
         """
         Called when the tree must be rebuilt and bookmarks redrawn.
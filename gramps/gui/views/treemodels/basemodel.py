@@ -20,6 +20,13 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
 
+# -------------------------------------------------------------------------
+#
+# GNOME/GTK modules
+#
+# -------------------------------------------------------------------------
+from gi.repository import GLib
+
 # -------------------------------------------------------------------------
 #
 # Gramps modules
@@ -36,11 +43,17 @@ class BaseModel:
     def __init__(self):
         self.lru_data = LRU(BaseModel._CACHE_SIZE)
         self.lru_path = LRU(BaseModel._CACHE_SIZE)
+        # The idle source updating the rows of the filter of the sidebar, and
+        # the function called once they are updated.
+        self._filter_source = None
+        self.filter_callback = None
 
     def destroy(self):
         """
         Destroy the items in memory.
         """
+        self.cancel_filter_update()
+        self.filter_callback = None
         self.lru_data = None
         self.lru_path = None
 
@@ -99,3 +112,52 @@ class BaseModel:
         Clear path cache for all.
         """
         self.lru_path.clear()
+
+    def get_filter(self):
+        """
+        Return the filter of the sidebar the rows are shown with.
+        """
+        raise NotImplementedError
+
+    def update_filter(self, related=False):
+        """
+        Show and hide the rows whose match of the filter of the sidebar
+        changed since it was applied, as the database changed.
+
+        The filter is applied again once the pending changes are handled, so
+        that a batch of changes applies it once.  When related is True, only
+        objects of other types changed, which a filter whose rules are all
+        local does not depend on.
+        """
+        if self.filter_matches is None or self._filter_source is not None:
+            return
+        if related and self.get_filter().is_local():
+            return
+        self._filter_source = GLib.idle_add(self._idle_update_filter)
+
+    def cancel_filter_update(self):
+        """
+        Cancel the pending update of the rows of the filter of the sidebar.
+        """
+        if self._filter_source is not None:
+            GLib.source_remove(self._filter_source)
+            self._filter_source = None
+
+    def _idle_update_filter(self):
+        """
+        Update the rows of the filter of the sidebar, when the main loop is
+        idle.
+        """
+        self._filter_source = None
+        if self.filter_matches is not None and self.db.is_open():
+            self.update_filter_rows()
+            if self.filter_callback:
+                self.filter_callback()
+        return False
+
+    def update_filter_rows(self):
+        """
+        Apply the filter of the sidebar again, and show and hide the rows
+        whose match changed.
+        """
+        raise NotImplementedError
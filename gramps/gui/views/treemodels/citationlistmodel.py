@@ -59,6 +59,8 @@ class CitationListModel(CitationBaseModel, FlatBaseModel):
     Flat citation model.  (Original code in CitationBaseModel).
     """
 
+    text_index_columns = {0: ("Citation", "page")}
+
     def __init__(
         self,
         db,
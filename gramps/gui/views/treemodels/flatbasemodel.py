@@ -388,6 +388,21 @@ class FlatNodeMap:
             if allkeyonly:
                 # key is not part of the view
                 return None
+        return self.show(srtkey_hndl)
+
+    def show(self, srtkey_hndl):
+        """
+        Show a node of the full list in the view. Given is a tuple (sortkey,
+        handle), and this is added in the correct place, while the
+        hndl2index map is updated.
+        Returns the path of the shown row
+
+        :param srtkey_hndl: the (sortkey, handle) tuple that must be shown
+        :type srtkey_hndl: sortkey key already transformed by self.sort_func, object handle
+
+        :Returns: path of the row inserted in the treeview
+        :Returns type: Gtk.TreePath or None
+        """
         insert_pos = bisect.bisect_left(self._index2hndl, srtkey_hndl)
         self._index2hndl.insert(insert_pos, srtkey_hndl)
         # make sure the index map is updated
@@ -415,10 +430,23 @@ class FlatNodeMap:
         # remove it from the full list first
         if not self._identical:
             for indx, hndle in enumerate(self._fullhndl):
-                if self.hndle[1] == handle:
+                if hndle[1] == handle:
                     del self._fullhndl[indx]
                     break
-        # now remove it from the index maps
+        return self.hide(handle)
+
+    def hide(self, handle):
+        """
+        Hide the row with the given (handle) from the view, keeping it in
+        the full list.
+        This then rebuilds the hndl2index, subtracting one from each item
+        greater than the hidden index.
+        path of hidden row is returned
+        If handle is not shown, None is returned
+
+        :Returns: path of the row deleted from the treeview
+        :Returns type: Gtk.TreePath or None
+        """
         try:
             index = self._hndl2index[handle]
         except KeyError:
@@ -449,6 +477,10 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             so as to have localized sort
     """
 
+    # Columns showing the values of a field of the full-text index of the
+    # database, as {column: (class name, field)}.
+    text_index_columns = {}
+
     def __init__(
         self,
         db,
@@ -486,6 +518,10 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         self.sort_col = scol
         self.skip = skip
         self._in_build = False
+        # The handles matching the filter of the sidebar, kept up to date
+        # with the database, and the key of the filter they were built with.
+        self.filter_matches = None
+        self.filter_key = None
 
         self.node_map = FlatNodeMap()
         self.set_search(search)
@@ -519,12 +555,14 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # you reattach the model to the treeview so that the treeview updates
           with the new entries
         """
+        self.cancel_filter_update()
         if search:
             if search[0]:
                 # following is None if no data given in filter sidebar
                 self.search = search[1]
                 self.rebuild_data = self._rebuild_filter
             else:
+                self.filter_matches = self.filter_key = None
                 if search[1]:  # Search from topbar in columns
                     # we have search[1] = (index, text_unicode, inversion)
                     col = search[1][0]
@@ -534,14 +572,31 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                     if search[2]:
                         self.search = ExactSearchFilter(func, text, inv)
                     else:
-                        self.search = SearchFilter(func, text, inv)
+                        self.search = SearchFilter(
+                            func, text, inv, self.find_text(col, text)
+                        )
                 else:
                     self.search = None
                 self.rebuild_data = self._rebuild_search
         else:
+            self.filter_matches = self.filter_key = None
             self.search = None
             self.rebuild_data = self._rebuild_search
 
+    def find_text(self, col, text):
+        """
+        Return the handles of the objects which may show the text in a
+        column, looked up in the full-text index of the database, or None if
+        the index cannot tell.
+
+        A column may show its value with other spacing or cut short, so only
+        plain words are looked up.
+        """
+        field = self.text_index_columns.get(col)
+        if field is None or not text.isalnum() or not self.db.has_text_index():
+            return None
+        return self.db.find_text(field[0], field[1], text)
+
     def total(self):
         """
         Total number of items that maximally can be shown
@@ -616,7 +671,20 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
     def _rebuild_filter(self, ignore=None):
         """function called when view must be build, given filter options
         in the filter sidebar
-        """
+
+        When the filter has not changed since the view was built, only the
+        rows whose match changed are shown or hidden.
+        """
+        filter_key = None
+        if self.search and ignore is None and self.db is not None:
+            filter_key = self.search.get_cache_key(self.db)
+        self.cancel_filter_update()
+        if filter_key is not None and filter_key == self.filter_key:
+            if self.filter_matches is not None and self.db.is_open():
+                self.update_filter_rows()
+                return
+        self.filter_matches = None
+        self.filter_key = filter_key
         self.clear_cache()
         self._in_build = True
         if (self.db is not None) and self.db.is_open():
@@ -628,6 +696,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                 ident = False
                 if ignore is None:
                     dlist = self.search.apply(cdb, allkeys, tupleind=1, user=self.user)
+                    self.filter_matches = {key[1] for key in dlist}
                 else:
                     dlist = self.search.apply(
                         cdb, [k for k in allkeys if k[1] != ignore], tupleind=1
@@ -645,6 +714,32 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             self.node_map.clear_map()
         self._in_build = False
 
+    def get_filter(self):
+        """
+        Return the filter of the sidebar the rows are shown with.
+        """
+        return self.search
+
+    def update_filter_rows(self):
+        """
+        Apply the filter of the sidebar again, and show and hide the rows
+        whose match changed.
+        """
+        matches = set(self.search.apply(CacheProxyDb(self.db), user=self.user))
+        for handle in self.filter_matches - matches:
+            path = self.node_map.hide(handle)
+            if path is not None:
+                self.clear_cache(handle)
+                self.row_deleted(path)
+        for handle in matches - self.filter_matches:
+            if handle in self.skip:
+                continue
+            if self.node_map.get_path_from_handle(handle) is not None:
+                continue
+            path = self.node_map.show((self.sort_func(self.map(handle)), handle))
+            self.row_inserted(path, self.do_get_iter(path)[1])
+        self.filter_matches = matches
+
     def add_row_by_handle(self, handle):
         """
         Add a row. This is called after object with handle is created.
@@ -655,7 +750,11 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             return  # row is already displayed
         data = self.map(handle)
         insert_val = (self.sort_func(data), handle)
-        if not self.search or (self.search and self.search.match(handle, self.db)):
+        if self.filter_matches is not None:
+            # the row is shown by the update of the filter if it matches
+            self.node_map.insert(insert_val, allkeyonly=True)
+            self.update_filter()
+        elif not self.search or (self.search and self.search.match(handle, self.db)):
             # row needs to be added to the model
             insert_path = self.node_map.insert(insert_val)
 
@@ -669,6 +768,8 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Delete a row, called after the object with handle is deleted
         """
+        if self.filter_matches is not None:
+            self.filter_matches.discard(handle)
         delete_path = self.node_map.delete(handle)
         # delete_path is an integer from 0 to n-1
         if delete_path is not None:
@@ -679,6 +780,9 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Update a row, called after the object with handle is changed
         """
+        if self.filter_matches is not None:
+            # rows whose match changed are shown or hidden
+            self.update_filter()
         if self.node_map.get_path_from_handle(handle) is None:
             return  # row is not currently displayed
         self.clear_cache(handle)
@@ -54,6 +54,8 @@ from gramps.gen.lib import Note, NoteType, StyledText
 class NoteModel(FlatBaseModel):
     """ """
 
+    text_index_columns = {0: ("Note", "text")}
+
     def __init__(
         self,
         db,
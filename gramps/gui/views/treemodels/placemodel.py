@@ -265,6 +265,8 @@ class PlaceListModel(PlaceBaseModel, FlatBaseModel):
     Flat place model.  (Original code in PlaceBaseModel).
     """
 
+    text_index_columns = {0: ("Place", "name")}
+
     def __init__(
         self,
         db,
@@ -50,6 +50,8 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # -------------------------------------------------------------------------
 class SourceModel(FlatBaseModel):
+    text_index_columns = {0: ("Source", "title")}
+
     def __init__(
         self,
         db,
@@ -0,0 +1,52 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+import unittest
+from ..flatbasemodel import FlatNodeMap
+
+
+class FlatNodeMapTest(unittest.TestCase):
+    def setUp(self):
+        self.node_map = FlatNodeMap()
+        self.node_map.set_path_map(
+            [("a", "1"), ("b", "2"), ("c", "3")],
+            [("a", "1"), ("b", "2"), ("c", "3"), ("d", "4")],
+            identical=False,
+        )
+
+    def test_hideshow(self):
+        self.node_map.hide("2")
+        self.assertIsNone(self.node_map.get_path_from_handle("2"))
+        self.assertEqual(self.node_map.get_path_from_handle("3").get_indices(), [1])
+        self.assertEqual(self.node_map.show(("d", "4")).get_indices(), [2])
+        self.assertEqual(self.node_map.show(("b", "2")).get_indices(), [1])
+        self.assertEqual(self.node_map.get_path_from_handle("4").get_indices(), [3])
+
+    def test_delete(self):
+        self.assertEqual(self.node_map.delete("1").get_indices(), [0])
+        self.assertIsNone(self.node_map.delete("4"))
+        self.assertIsNone(self.node_map.insert(("e", "5"), allkeyonly=True))
+        self.assertEqual(
+            self.node_map.full_srtkey_hndl_map(), [("b", "2"), ("c", "3"), ("e", "5")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
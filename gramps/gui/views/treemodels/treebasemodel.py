@@ -361,6 +361,11 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         self.__total = 0
         self.__displayed = 0
 
+        # The handles matching the filter of the sidebar, kept up to date
+        # with the database, and the key of the filter they were built with.
+        self.filter_matches = None
+        self.filter_key = None
+
         self.set_search(search)
         if self.has_secondary:
             self.rebuild_data(self.current_filter, self.current_filter2, skip)
@@ -457,6 +462,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # you reattach the model to the treeview so that the treeview updates
           with the new entries
         """
+        self.cancel_filter_update()
         if search:
             if search[0] == 1:  # Filter
                 # following is None if no data given in filter sidebar
@@ -466,6 +472,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                     _LOG.debug("search2 filter %s %s" % (search[0], search[1]))
                 self._build_data = self._rebuild_filter
             elif search[0] == 0:  # Search
+                self.filter_matches = self.filter_key = None
                 if search[1]:
                     # we have search[1] = (index, text_unicode, inversion)
                     col, text, inv = search[1]
@@ -511,14 +518,32 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         should be None; set_search will already have been called to establish
         the filter functions. When called internally (from __init__) both
         data_filter and data_filter2 will have been set from set_search
+
+        When the filter has not changed since the data map was built, only
+        the rows whose match changed are added or removed.
         """
         cput = perf_counter()
-        self.clear_cache()
-        self._in_build = True
-
         if not ((self.db is not None) and self.db.is_open()):
             return
 
+        dfilter = self.current_filter2 if self.has_secondary else self.current_filter
+        filter_key = None
+        if self._build_data == self._rebuild_filter and dfilter and not skip:
+            filter_key = dfilter.get_cache_key(self.db)
+        self.cancel_filter_update()
+        if filter_key is not None and filter_key == self.filter_key:
+            if self.filter_matches is not None:
+                self.update_filter_rows()
+                self.current_filter = data_filter
+                if self.has_secondary:
+                    self.current_filter2 = data_filter2
+                return
+        self.filter_matches = None
+        self.filter_key = filter_key
+
+        self.clear_cache()
+        self._in_build = True
+
         self.clear()
         if self.has_secondary:
             self._build_data(self.current_filter, self.current_filter2, skip)
@@ -623,6 +648,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         assert not skip
         if dfilter:
             cdb = CacheProxyDb(self.db)
+            self.filter_matches = set()
             for handle in dfilter.apply(
                 cdb,
                 tree=True,
@@ -631,6 +657,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                 status_ppl.heartbeat()
                 data = data_map(handle)
                 add_func(handle, data)
+                self.filter_matches.add(handle)
                 self.__displayed += 1
         else:
             with gen_cursor() as cursor:
@@ -778,6 +805,34 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         self.clear_path_cache()
 
+    def get_filter(self):
+        """
+        Return the filter of the sidebar the rows are shown with.
+        """
+        return self.search2 if self.has_secondary else self.search
+
+    def update_filter_rows(self):
+        """
+        Apply the filter of the sidebar again, and add and remove the rows
+        whose match changed.
+        """
+        matches = set(
+            self.get_filter().apply(
+                CacheProxyDb(self.db),
+                user=User(parent=self.uistate.window, uistate=self.uistate),
+            )
+        )
+        for handle in self.filter_matches - matches:
+            self.delete_row_by_handle(handle)
+        for handle in matches - self.filter_matches:
+            if self._get_node(handle) is not None:
+                continue
+            if self.has_secondary:
+                self.add_row2(handle, self.map2(handle))
+            else:
+                self.add_row(handle, self.map(handle))
+        self.filter_matches = matches
+
     def add_row_by_handle(self, handle):
         """
         Add a row to the model.
@@ -788,7 +843,10 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             return  # row already exists
         cput = perf_counter()
         data = self.map(handle)
-        if data:
+        if self.filter_matches is not None and bool(data) != self.has_secondary:
+            # the row is added by the update of the filter if it matches
+            self.update_filter()
+        elif data:
             if not self.search or (self.search and self.search.match(handle, self.db)):
                 self.add_row(handle, data)
         else:
@@ -812,6 +870,8 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         assert isinstance(handle, str)
         cput = perf_counter()
         self.clear_cache(handle)
+        if self.filter_matches is not None:
+            self.filter_matches.discard(handle)
         node = self._get_node(handle)
         if node is None:
             return  # row not currently displayed
@@ -855,6 +915,9 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         assert isinstance(handle, str)
         self.clear_cache(handle)
         if self._get_node(handle) is None:
+            if self.filter_matches is not None:
+                # the row is added if the object now matches the filter
+                self.update_filter()
             return  # row not currently displayed
 
         self.dont_change_active = True
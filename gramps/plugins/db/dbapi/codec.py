@@ -0,0 +1,272 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Record codecs for the blob_data column of the DB-API tables.
+
+A record is stored either as a bare pickle (the original format) or in a
+frame of three bytes followed by the payload::
+
+    FRAME_MAGIC, codec id, flags
+
+The flags tell whether the payload is zlib compressed.  Pickles always
+start with the PROTO opcode, so both formats can be told apart and may
+coexist in the same table.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import pickle
+import zlib
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.lib import (
+    Person,
+    Family,
+    Event,
+    Place,
+    Repository,
+    Source,
+    Citation,
+    Media,
+    Note,
+    Tag,
+)
+
+# -------------------------------------------------------------------------
+#
+# Constants
+#
+# -------------------------------------------------------------------------
+FRAME_MAGIC = 0x47
+FLAG_ZLIB = 0x01
+
+# The pickle protocol of the schema codec, fixed so that records do not
+# depend on the default protocol of the version of Python.
+PICKLE_PROTOCOL = 4
+ZLIB_LEVEL = 6
+
+# Kinds of top-level values which may be left out of a record, with the
+# constructor of the value they stand for.  Three bits per field.
+_KIND_BITS = 3
+_KIND_MASK = (1 << _KIND_BITS) - 1
+_SCHEMA_KINDS = {"array": 1, "string": 2, "integer": 3, "boolean": 4}
+_DEFAULTS = (None, list, str, int, bool)
+_DEFAULT_TYPES = (None, list, str, int, bool)
+
+CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        Person,
+        Family,
+        Event,
+        Place,
+        Repository,
+        Source,
+        Citation,
+        Media,
+        Note,
+        Tag,
+    )
+}
+
+
+# -------------------------------------------------------------------------
+#
+# RecordCodec class
+#
+# -------------------------------------------------------------------------
+class RecordCodec:
+    """
+    Base class for the codecs used to store serialized primary objects.
+    """
+
+    codec_id = None
+    name = None
+
+    def __init__(self, compress=False):
+        self.compress = compress
+
+    def encode(self, class_name, data):
+        """
+        Return the payload for the serialized data of an object.
+
+        :param class_name: Name of the primary object class.
+        :type class_name: str
+        :param data: The data returned by the serialize method.
+        :type data: tuple
+        """
+        raise NotImplementedError
+
+    def decode(self, payload):
+        """
+        Return the serialized data stored in a payload.
+        """
+        raise NotImplementedError
+
+    def pack(self, class_name, data):
+        """
+        Return the framed record for the serialized data of an object.
+        """
+        payload = self.encode(class_name, data)
+        flags = 0
+        if self.compress:
+            payload = zlib.compress(payload, ZLIB_LEVEL)
+            flags |= FLAG_ZLIB
+        return bytes((FRAME_MAGIC, self.codec_id, flags)) + payload
+
+
+# -------------------------------------------------------------------------
+#
+# PickleCodec class
+#
+# -------------------------------------------------------------------------
+class PickleCodec(RecordCodec):
+    """
+    The original record format: the pickled serialized data.
+    """
+
+    codec_id = 0
+    name = "pickle"
+
+    def encode(self, class_name, data):
+        return pickle.dumps(data)
+
+    def decode(self, payload):
+        return pickle.loads(payload)
+
+    def pack(self, class_name, data):
+        if not self.compress:
+            # Keep bare pickles readable by older versions.
+            return pickle.dumps(data)
+        return super().pack(class_name, data)
+
+
+# -------------------------------------------------------------------------
+#
+# SchemaCodec class
+#
+# -------------------------------------------------------------------------
+class SchemaCodec(RecordCodec):
+    """
+    A compact record format derived from the schema of each class.
+
+    The JSON schema of a primary object lists its properties in the order
+    of the serialized tuple.  Top-level array, string, integer and boolean
+    fields that hold their empty value are left out of the record, and the
+    kind of each missing value is kept in a small bit field.  The record
+    is thus self-describing and can be decoded without the schema.  The
+    remaining values are pickled with a fixed protocol.
+    """
+
+    codec_id = 1
+    name = "schema"
+
+    def __init__(self, compress=False):
+        super().__init__(compress)
+        self.__layouts = {}
+
+    def get_layout(self, class_name):
+        """
+        Return the kind of empty value which may be left out for each field
+        of the serialized data of a class, or 0 if the field must be kept.
+        """
+        layout = self.__layouts.get(class_name)
+        if layout is None:
+            layout = []
+            properties = CLASSES[class_name].get_schema()["properties"]
+            for key, value in properties.items():
+                if key == "_class":
+                    continue
+                schema_type = value.get("type")
+                layout.append(
+                    _SCHEMA_KINDS.get(schema_type, 0)
+                    if isinstance(schema_type, str)
+                    else 0
+                )
+            layout = self.__layouts[class_name] = tuple(layout)
+        return layout
+
+    def encode(self, class_name, data):
+        layout = self.get_layout(class_name)
+        kinds = 0
+        values = []
+        for index, value in enumerate(data):
+            kind = layout[index] if index < len(layout) else 0
+            if (
+                kind
+                and type(value) is _DEFAULT_TYPES[kind]
+                and value == _DEFAULTS[kind]()
+            ):
+                kinds |= kind << (_KIND_BITS * index)
+            else:
+                values.append(value)
+        return pickle.dumps((kinds, tuple(values)), PICKLE_PROTOCOL)
+
+    def decode(self, payload):
+        kinds, values = pickle.loads(payload)
+        if not kinds:
+            return values
+        data = []
+        values = iter(values)
+        while kinds:
+            kind = kinds & _KIND_MASK
+            kinds >>= _KIND_BITS
+            data.append(_DEFAULTS[kind]() if kind else next(values))
+        data.extend(values)
+        return tuple(data)
+
+
+CODECS = {codec.codec_id: codec for codec in (PickleCodec(), SchemaCodec())}
+
+
+def get_codec(name, compress=False):
+    """
+    Return a new codec given its name.
+
+    :param name: Name of the codec, "pickle" or "schema".
+    :type name: str
+    :param compress: Whether records are zlib compressed.
+    :type compress: bool
+    """
+    for codec in CODECS.values():
+        if codec.name == name:
+            return codec.__class__(compress)
+    raise ValueError("Unknown record codec: %s" % name)
+
+
+def unpack(blob):
+    """
+    Return the serialized data stored in a record, whatever its codec.
+    """
+    if blob[0] != FRAME_MAGIC:
+        return pickle.loads(blob)
+    codec = CODECS[blob[1]]
+    payload = memoryview(blob)[3:]
+    if blob[2] & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return codec.decode(payload)
@@ -28,6 +28,9 @@ import os
 import time
 import pickle
 import logging
+from collections import OrderedDict
+from contextlib import nullcontext
+from itertools import count
 
 # ------------------------------------------------------------------------
 #
@@ -35,10 +38,13 @@ import logging
 #
 # ------------------------------------------------------------------------
 from gramps.gen.db.dbconst import (
+    ARRAYSIZE,
     DBLOGNAME,
+    DBMODE_W,
     DBBACKEND,
     KEY_TO_NAME_MAP,
     KEY_TO_CLASS_MAP,
+    CLASS_TO_KEY_MAP,
     TXNADD,
     TXNUPD,
     TXNDEL,
@@ -54,9 +60,11 @@ from gramps.gen.db.dbconst import (
     REPOSITORY_KEY,
     REFERENCE_KEY,
 )
+from gramps.gen.db.exceptions import DbRecordFormatError
 from gramps.gen.db.generic import DbGeneric
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.lib import (
+    Date,
     Tag,
     Media,
     Person,
@@ -69,20 +77,270 @@ from gramps.gen.lib import (
     Note,
 )
 from gramps.gen.lib.genderstats import GenderStats
+from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.plugins.db.dbapi.codec import get_codec, unpack
+
+_ = glocale.translation.gettext
 
 LOG = logging.getLogger(".dbapi")
 _LOG = logging.getLogger(DBLOGNAME)
 
+# Number of changed objects of each class remembered by the change log.
+CHANGE_LOG_SIZE = 10000
+
+# Sequence numbering the changes of all the databases, so that the change
+# counters of a database are never reused once it is loaded again.
+_CHANGE_SEQUENCE = count(1)
+
+# Added to the schema version of a database whose records are not in the
+# uncompressed pickle format, which previous versions of Gramps take
+# for a newer schema, and so refuse to open.
+RECORD_FORMAT_VERSION = 1000
+
+# Number of handles looked up per "WHERE handle IN (...)" query, below the
+# limit on host parameters of older SQLite versions.
+HANDLE_CHUNK_SIZE = 500
+
+# Number of generations kept in the closure table of ancestors, which bounds
+# its rows when the family links have loops.
+CLOSURE_DEPTH = 100
+
+# Secondary columns which are derived from the object, not read from one of
+# its fields.
+DERIVED_COLUMNS = {
+    "Person": ["given_name", "surname", "birth_handle", "death_handle"],
+    "Event": [
+        "date_sortval",
+        "date_stop",
+        "date_quality",
+        "date_modifier",
+        "date_year",
+        "date_month",
+        "date_day",
+    ],
+    "Place": ["enclosed_by"],
+}
+
+# Columns holding the dates of events, and the sort values of the birth and
+# death dates of people, which are copied from the event rows.
+DATE_COLUMNS = {
+    "event": [
+        ("date_sortval", "INTEGER"),
+        ("date_stop", "INTEGER"),
+        ("date_quality", "INTEGER"),
+        ("date_modifier", "INTEGER"),
+        ("date_year", "INTEGER"),
+        ("date_month", "INTEGER"),
+        ("date_day", "INTEGER"),
+    ],
+    "person": [
+        ("birth_handle", "VARCHAR(50)"),
+        ("death_handle", "VARCHAR(50)"),
+        ("birth_sortval", "INTEGER"),
+        ("death_sortval", "INTEGER"),
+    ],
+}
+
+# Indices dropped while objects are loaded in bulk, and created again when
+# the load ends.  The indices of the Gramps IDs, looked up by the importers,
+# are kept.
+BULK_INDICES = {
+    "person_surname": "person(surname)",
+    "person_given_name": "person(given_name)",
+    "source_title": "source(title)",
+    "citation_page": "citation(page)",
+    "media_desc": "media(desc)",
+    "place_title": "place(title)",
+    "place_enclosed_by": "place(enclosed_by)",
+    "reference_ref_handle": "reference(ref_handle)",
+    "reference_obj_handle": "reference(obj_handle)",
+}
+BULK_DATE_INDICES = {
+    "event_date_sortval": "event(date_sortval)",
+    "event_date_month_day": "event(date_month, date_day)",
+    "person_birth_handle": "person(birth_handle)",
+    "person_death_handle": "person(death_handle)",
+}
+
+
+def _get_name_values(person):
+    """
+    Return the parts of all the names of a person searched by the name rules.
+    """
+    values = []
+    for name in [person.get_primary_name()] + person.get_alternate_names():
+        values.extend(
+            (
+                name.first_name,
+                name.get_surname(),
+                name.suffix,
+                name.title,
+                name.nick,
+                name.famnick,
+                name.call,
+            )
+        )
+    return values
+
+
+# Fields of the full-text index of each class, with the function returning
+# the values of the field for an object.
+TEXT_FIELDS = {
+    "Note": {"text": lambda note: [note.get()]},
+    "Person": {"name": _get_name_values},
+    "Place": {"name": lambda place: [name.value for name in place.get_all_names()]},
+    "Source": {"title": lambda source: [source.get_title()]},
+    "Citation": {"page": lambda citation: [citation.get_page()]},
+}
+
 
 class DBAPI(DbGeneric):
     """
     Database backends class for DB-API 2.0 databases
     """
 
+    def __init__(self, directory=None):
+        # Objects committed in a batch transaction, waiting to be written,
+        # and their Gramps IDs.
+        # {obj_key: {handle: (blob, columns, values, references, text, id)}}
+        # {obj_key: {gramps_id: set of handles}}
+        self._batch_pending = {}
+        self._batch_ids = {}
+        self._batch_count = 0
+        self._batch_size = 0
+        # Number of rows fetched at a time by the streaming iterators.
+        self.chunk_size = ARRAYSIZE
+        # Secondary columns and upsert statement of each class, built once.
+        self._secondary_columns = {}
+        self._upsert_sql = {}
+        # Whether the event and person tables have the date columns.
+        self._date_index = False
+        # Whether the full-text index is kept up to date.
+        self._text_index = False
+        # Text rows of the objects flushed by a batch transaction, written
+        # to the full-text index in larger groups.  {handle: rows}
+        self._text_batch = {}
+        # The handles of the objects loaded in bulk, or None outside of a
+        # bulk load, and whether the reference table was empty before.
+        # {obj_key: set of handles}
+        self._bulk_handles = None
+        self._bulk_new = False
+        # Whether the closure table of ancestors is kept up to date, and the
+        # people and families committed since whose parent links may differ.
+        self._closure_table = False
+        self._closure_people = set()
+        self._closure_families = set()
+        # The last changes of the objects of each class, and the change
+        # before which the changed objects are no longer known.
+        # {obj_class: {handle: change}}, {obj_class: change}
+        self._change_log = {}
+        self._change_horizon = {}
+        self._reset_change_log()
+        # The codec of new databases, replaced by that of the records when a
+        # database is loaded.
+        self._codec = get_codec(*self._get_record_format_setting())
+        super().__init__(directory)
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
+    def load(
+        self,
+        directory,
+        callback=None,
+        mode=DBMODE_W,
+        force_schema_upgrade=False,
+        *args,
+        **kwargs,
+    ):
+        """
+        Load the database.
+
+        If the record format set in the preferences differs from the one of
+        the records, they are converted when a schema upgrade is forced,
+        otherwise DbRecordFormatError is raised, so that the user is asked
+        and a backup made first, as for schema upgrades.
+        """
+        super().load(directory, callback, mode, force_schema_upgrade, *args, **kwargs)
+        record_format = self._get_record_format_setting()
+        old_format = self._get_record_format()
+        if not self.readonly and record_format != old_format:
+            if not force_schema_upgrade:
+                self.close()
+                raise DbRecordFormatError(
+                    self._describe_record_format(old_format),
+                    self._describe_record_format(record_format),
+                )
+            from gramps.gen.db.upgrade import gramps_upgrade_codec
+
+            UpdateCallback.__init__(self, callback)
+            gramps_upgrade_codec(self, record_format)
+        self._check_date_columns()
+        self._check_text_index()
+        self._check_closure_table()
+        self._reset_change_log()
+
+    @staticmethod
+    def _get_record_format_setting():
+        """
+        Return the record format set in the preferences, as a list of the
+        codec name and whether records are compressed.
+        """
+        return [
+            config.get("database.blob-codec"),
+            config.get("database.compress-blobs"),
+        ]
+
+    def _get_record_format(self):
+        """
+        Return the record format of the database.
+        """
+        return self._get_metadata("record_format", default=["pickle", False])
+
+    @staticmethod
+    def _describe_record_format(record_format):
+        """
+        Return the name of a record format shown to the user.
+        """
+        name, compress = record_format
+        if compress:
+            return _("%s, compressed") % name
+        return name
+
+    def set_record_format(self, record_format, store=True):
+        """
+        Write the records that follow with the codec of a record format.
+
+        If store is True, the record format is stored in the metadata, and
+        the schema version marked for previous versions of Gramps if they
+        cannot read it.
+        """
+        self._codec = get_codec(*record_format)
+        if store:
+            version = self.get_schema_version()
+            self._set_metadata("record_format", list(record_format))
+            self.set_schema_version(version)
+
+    def get_schema_version(self):
+        """
+        Return the schema version of the database, without the mark of its
+        record format.
+        """
+        version = super().get_schema_version()
+        if version >= RECORD_FORMAT_VERSION:
+            version -= RECORD_FORMAT_VERSION
+        return version
+
+    def set_schema_version(self, value):
+        """
+        Store the schema version of the database, marked if previous
+        versions of Gramps cannot read its records.
+        """
+        if self._get_record_format() != ["pickle", False]:
+            value += RECORD_FORMAT_VERSION
+        super().set_schema_version(value)
+
     def _schema_exists(self):
         """
         Check to see if the schema exists.
@@ -207,6 +465,7 @@ class DBAPI(DbGeneric):
         )
 
         self._create_secondary_columns()
+        self._create_date_columns()
 
         ## Indices:
         self.dbapi.execute("CREATE INDEX person_gramps_id " "ON person(gramps_id)")
@@ -236,10 +495,65 @@ class DBAPI(DbGeneric):
         )
 
         self.dbapi.commit()
+        self._set_metadata("record_format", [self._codec.name, self._codec.compress])
+
+    def _check_schema(self):
+        """
+        Read the record format of the database, and whether it has the date
+        columns.
+        """
+        self._codec = get_codec(*self._get_record_format())
+        self._date_index = self.dbapi.column_exists("event", "date_sortval")
+
+    def _check_date_columns(self):
+        """
+        Add the date columns to a database created before they existed,
+        filling them from the events and people.
+
+        The records are read, so the schema of the database must be up to
+        date first.
+        """
+        if self._date_index or self.readonly:
+            return
+        LOG.info("Adding date columns...")
+        self.dbapi.begin()
+        self._create_date_columns()
+        batch_size = max(1, config.get("database.batch-size"))
+        for obj_class in (Event, Person):
+            self._rebuild_secondary_values(obj_class, batch_size)
+        self._date_index = True
+        self._update_person_sortvals()
+        self.dbapi.commit()
+
+    def _create_date_columns(self):
+        """
+        Create the date columns and their indices.
+        """
+        for table, columns in DATE_COLUMNS.items():
+            for column, sql_type in columns:
+                self.dbapi.execute(
+                    "ALTER TABLE %s ADD COLUMN %s %s" % (table, column, sql_type)
+                )
+        self.dbapi.execute("CREATE INDEX event_date_sortval ON event(date_sortval)")
+        self.dbapi.execute(
+            "CREATE INDEX event_date_month_day ON event(date_month, date_day)"
+        )
+        self.dbapi.execute("CREATE INDEX person_birth_handle ON person(birth_handle)")
+        self.dbapi.execute("CREATE INDEX person_death_handle ON person(death_handle)")
+        self._date_index = True
 
     def _close(self):
         self.dbapi.close()
 
+    def read_snapshot(self):
+        """
+        Return a context manager inside which the reads made by the calling
+        thread see a consistent snapshot of the database.
+
+        Backends which cannot provide one just run the reads.
+        """
+        return nullcontext()
+
     def _txn_begin(self):
         """
         Lowlevel interface to the backend transaction.
@@ -256,6 +570,7 @@ class DBAPI(DbGeneric):
         """
         if self.transaction == None:
             _LOG.debug("    DBAPI %s transaction commit", hex(id(self)))
+            self._update_closure()
             self.dbapi.commit()
 
     def _txn_abort(self):
@@ -264,6 +579,8 @@ class DBAPI(DbGeneric):
         Executes a db ROLLBACK;
         """
         if self.transaction == None:
+            self._closure_people.clear()
+            self._closure_families.clear()
             self.dbapi.rollback()
 
     def _collation(self, locale):
@@ -290,6 +607,7 @@ class DBAPI(DbGeneric):
             # A batch transaction does not store the commits
             # Aborting the session completely will become impossible.
             self.abort_possible = False
+            self._batch_size = max(1, config.get("database.batch-size"))
         self.transaction = transaction
         self.dbapi.begin()
         return transaction
@@ -306,6 +624,10 @@ class DBAPI(DbGeneric):
         )
 
         action = {TXNADD: "-add", TXNUPD: "-update", TXNDEL: "-delete", None: "-delete"}
+        self._finish_bulk_load()
+        self._flush_batch()
+        self._flush_text_batch()
+        self._update_closure()
         self.dbapi.commit()
         if not txn.batch:
             # Now, emit signals:
@@ -337,6 +659,13 @@ class DBAPI(DbGeneric):
         """
         Executed after a batch operation abort.
         """
+        self._batch_pending.clear()
+        self._batch_ids.clear()
+        self._batch_count = 0
+        self._text_batch.clear()
+        self._bulk_handles = None
+        self._closure_people.clear()
+        self._closure_families.clear()
         self.dbapi.rollback()
         self.transaction = None
         txn.clear()
@@ -414,6 +743,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM person "
@@ -435,6 +765,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             sql = (
                 "SELECT family.handle "
@@ -464,6 +795,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Event in the
         database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM event")
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
@@ -478,6 +810,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM citation "
@@ -499,6 +832,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM source "
@@ -520,6 +854,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM place "
@@ -536,6 +871,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Repository in
         the database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM repository")
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
@@ -550,6 +886,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM media "
@@ -566,6 +903,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Note in the
         database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM note")
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
@@ -580,6 +918,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM tag "
@@ -597,13 +936,15 @@ class DBAPI(DbGeneric):
 
         If no such Tag exists, None is returned.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT blob_data FROM tag WHERE name = ?", [name])
         row = self.dbapi.fetchone()
         if row:
-            return Tag.create(pickle.loads(row[0]))
+            return Tag.create(unpack(row[0]))
         return None
 
     def _get_number_of(self, obj_key):
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT count(1) FROM %s" % table
         self.dbapi.execute(sql)
@@ -646,29 +987,64 @@ class DBAPI(DbGeneric):
         Commit the specified object to the database, storing the changes as
         part of the transaction.
         """
-        old_data = None
         obj.change = int(change_time or time.time())
-        table = KEY_TO_NAME_MAP[obj_key]
 
-        if self._has_handle(obj_key, obj.handle):
-            old_data = self._get_raw_data(obj_key, obj.handle)
-            # update the object:
-            sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
-            self.dbapi.execute(sql, [pickle.dumps(obj.serialize()), obj.handle])
-        else:
-            # Insert the object:
-            sql = ("INSERT INTO %s (handle, blob_data) VALUES (?, ?)") % table
-            self.dbapi.execute(sql, [obj.handle, pickle.dumps(obj.serialize())])
-        self._update_secondary_values(obj)
+        if trans.batch:
+            return self._queue_batch(obj, obj_key)
+
+        # The old data is kept for undo, and tells whether the object is new.
+        old_data = self._get_raw_data(obj_key, obj.handle)
+        data = obj.serialize()
+        self._upsert(obj_key, obj, data)
         self._update_backlinks(obj, trans)
-        if not trans.batch:
-            if old_data:
-                trans.add(obj_key, TXNUPD, obj.handle, old_data, obj.serialize())
-            else:
-                trans.add(obj_key, TXNADD, obj.handle, None, obj.serialize())
+        self._mark_closure(obj_key, obj.handle, old_data, data)
+        self._log_change(obj_key, obj.handle)
+        if old_data:
+            trans.add(obj_key, TXNUPD, obj.handle, old_data, data)
+        else:
+            trans.add(obj_key, TXNADD, obj.handle, None, data)
 
         return old_data
 
+    def _upsert(self, obj_key, obj, data):
+        """
+        Write the blob and the secondary columns of an object with a single
+        statement, whether the object is new or not.
+        """
+        columns, values = self._get_secondary_values(obj)
+        blob = self._codec.pack(obj.__class__.__name__, data)
+        self.dbapi.execute(
+            self._get_upsert_sql(obj_key),
+            [obj.handle, blob] + self._sql_cast_list(values),
+        )
+        if obj_key == PERSON_KEY:
+            self._update_person_sortvals([obj.handle])
+        elif obj_key == EVENT_KEY:
+            self._update_event_sortvals([obj.handle])
+        if self._text_index and obj.__class__.__name__ in TEXT_FIELDS:
+            self._write_text_values([obj.handle], self._get_text_values(obj))
+
+    def _get_upsert_sql(self, obj_key):
+        """
+        Return the statement which inserts or updates an object of a class
+        together with its secondary columns.
+        """
+        sql = self._upsert_sql.get(obj_key)
+        if sql is None:
+            obj_class = self._get_table_func(KEY_TO_CLASS_MAP[obj_key], "class_func")
+            columns = self._get_secondary_columns(obj_class)[1]
+            sql = self._upsert_sql[obj_key] = (
+                "INSERT INTO %s (handle, blob_data, %s) VALUES (?, ?, %s) "
+                "ON CONFLICT (handle) DO UPDATE SET blob_data = excluded.blob_data, %s"
+                % (
+                    KEY_TO_NAME_MAP[obj_key],
+                    ", ".join(columns),
+                    ", ".join(["?"] * len(columns)),
+                    ", ".join("%s = excluded.%s" % (col, col) for col in columns),
+                )
+            )
+        return sql
+
     def _commit_raw(self, data, obj_key):
         """
         Commit a serialized primary object to the database, storing the
@@ -676,92 +1052,290 @@ class DBAPI(DbGeneric):
         """
         table = KEY_TO_NAME_MAP[obj_key]
         handle = data[0]
+        blob = self._codec.pack(KEY_TO_CLASS_MAP[obj_key], data)
+        sql = (
+            "INSERT INTO %s (handle, blob_data) VALUES (?, ?) "
+            "ON CONFLICT (handle) DO UPDATE SET blob_data = excluded.blob_data"
+        ) % table
+        self.dbapi.execute(sql, [handle, blob])
+        self._log_change(obj_key, handle)
 
-        if self._has_handle(obj_key, handle):
-            # update the object:
-            sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
-            self.dbapi.execute(sql, [pickle.dumps(data), handle])
+    def _queue_batch(self, obj, obj_key):
+        """
+        Queue an object committed as part of a batch transaction.
+
+        The object is serialized now, but only written to the database,
+        together with its secondary values and references, when the queue
+        is flushed.  The old data is only read for people, whose gender
+        statistics and surname list depend on it.
+        """
+        old_data = None
+        if obj_key == PERSON_KEY:
+            old_data = self._get_raw_data(obj_key, obj.handle)
+        pending = self._batch_pending.setdefault(obj_key, {})
+        ids = self._batch_ids.setdefault(obj_key, {})
+        if obj.handle not in pending:
+            self._batch_count += 1
+        else:
+            self._discard_batch_id(obj_key, obj.handle)
+        columns, values = self._get_secondary_values(obj)
+        data = obj.serialize()
+        self._log_change(obj_key, obj.handle)
+        gramps_id = getattr(obj, "gramps_id", None)
+        ids.setdefault(gramps_id, set()).add(obj.handle)
+        if self._bulk_handles is not None:
+            # The references and other derived rows are written when the
+            # bulk load ends.
+            self._bulk_handles[obj_key].add(obj.handle)
+            references = ()
+            text = []
         else:
-            # Insert the object:
-            sql = ("INSERT INTO %s (handle, blob_data) VALUES (?, ?)") % table
-            self.dbapi.execute(sql, [handle, pickle.dumps(data)])
+            self._mark_closure(obj_key, obj.handle, old_data, data)
+            references = set(obj.get_referenced_handles_recursively())
+            text = self._get_text_values(obj) if self._text_index else []
+        pending[obj.handle] = (
+            self._codec.pack(obj.__class__.__name__, data),
+            columns,
+            values,
+            references,
+            text,
+            gramps_id,
+        )
+        if self._batch_count >= self._batch_size:
+            self._flush_batch()
+        return old_data
 
-        return
+    def _discard_batch_id(self, obj_key, handle):
+        """
+        Forget the Gramps ID of an object waiting to be written.
+        """
+        ids = self._batch_ids[obj_key]
+        gramps_id = self._batch_pending[obj_key][handle][5]
+        ids[gramps_id].discard(handle)
+        if not ids[gramps_id]:
+            del ids[gramps_id]
 
-    def _update_backlinks(self, obj, transaction):
-        if not transaction.batch:
-            # Find existing references
-            sql = (
-                "SELECT ref_class, ref_handle " + "FROM reference WHERE obj_handle = ?"
+    def _flush_batch(self):
+        """
+        Write the objects queued by a batch transaction to the database.
+
+        Each table is written with a single upsert statement, followed by
+        the rebuild of the reference rows of the written objects, unless
+        they are loaded in bulk.
+        """
+        if not self._batch_count:
+            return
+        for obj_key, pending in self._batch_pending.items():
+            if not pending:
+                continue
+            obj_class = KEY_TO_CLASS_MAP[obj_key]
+            self.dbapi.executemany(
+                self._get_upsert_sql(obj_key),
+                [
+                    [handle, item[0]] + self._sql_cast_list(item[2])
+                    for handle, item in pending.items()
+                ],
             )
-            self.dbapi.execute(sql, [obj.handle])
-            existing_references = set(self.dbapi.fetchall())
-
-            # Once we have the list of rows that already have a reference
-            # we need to compare it with the list of objects that are
-            # still references from the primary object.
-            current_references = set(obj.get_referenced_handles_recursively())
-            no_longer_required_references = existing_references.difference(
-                current_references
+            self._batch_ids[obj_key].clear()
+            if self._bulk_handles is not None:
+                pending.clear()
+                continue
+            self.dbapi.executemany(
+                "DELETE FROM reference WHERE obj_handle = ?",
+                [[handle] for handle in pending],
             )
-            new_references = current_references.difference(existing_references)
-
-            # Delete the existing references
-            self.dbapi.execute(
-                "DELETE FROM reference WHERE obj_handle = ?", [obj.handle]
+            self.dbapi.executemany(
+                "INSERT INTO reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    [handle, obj_class, ref_handle, ref_class_name]
+                    for handle, item in pending.items()
+                    for ref_class_name, ref_handle in item[3]
+                ],
             )
+            if obj_key == PERSON_KEY:
+                self._update_person_sortvals(list(pending))
+            elif obj_key == EVENT_KEY:
+                self._update_event_sortvals(list(pending))
+            if self._text_index and obj_class in TEXT_FIELDS:
+                for handle, item in pending.items():
+                    self._text_batch[handle] = item[4]
+            pending.clear()
+        self._batch_count = 0
+        if len(self._text_batch) >= self._batch_size:
+            self._flush_text_batch()
+
+    def _flush_text_batch(self):
+        """
+        Write the text rows collected by a batch transaction to the
+        full-text index.
+
+        Writing to the index has a high fixed cost per statement, so the
+        rows are not written each time the batch queue is flushed.
+        """
+        if not self._text_batch:
+            return
+        self._write_text_values(
+            list(self._text_batch),
+            [row for rows in self._text_batch.values() for row in rows],
+        )
+        self._text_batch.clear()
 
-            # Now, add the current ones
-            for ref_class_name, ref_handle in current_references:
-                sql = (
-                    "INSERT INTO reference "
-                    + "(obj_handle, obj_class, ref_handle, ref_class)"
-                    + "VALUES(?, ?, ?, ?)"
-                )
-                self.dbapi.execute(
-                    sql,
-                    [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name],
-                )
+    def start_bulk_load(self):
+        """
+        Load the objects committed for the rest of the current batch
+        transaction in bulk.
+
+        The objects are written without their references, and the indices
+        of the secondary columns and of the reference table are dropped.
+        When the transaction is committed, or the references are first
+        read, the reference rows of all the loaded objects are written and
+        the indices created again, giving the same content as a normal load.
+
+        Return True if the objects are loaded in bulk.
+        """
+        if self.transaction is None or not self.transaction.batch:
+            return False
+        if self._bulk_handles is not None:
+            return True
+        self._flush_batch()
+        self.dbapi.execute("SELECT 1 FROM reference LIMIT 1")
+        self._bulk_new = self.dbapi.fetchone() is None
+        for name in self._get_bulk_indices():
+            self.dbapi.execute("DROP INDEX IF EXISTS %s" % name)
+        self._bulk_handles = {obj_key: set() for obj_key in KEY_TO_CLASS_MAP}
+        return True
+
+    def _get_bulk_indices(self):
+        """
+        Return the indices dropped during a bulk load, as {name: target}.
+        """
+        indices = dict(BULK_INDICES)
+        if self._date_index:
+            indices.update(BULK_DATE_INDICES)
+        return indices
+
+    def _finish_bulk_load(self):
+        """
+        End a bulk load: write the references and the derived rows of the
+        loaded objects in one pass, and create the dropped indices again.
 
-            # Add new references to the transaction
-            for ref_class_name, ref_handle in new_references:
-                key = (obj.handle, ref_handle)
-                data = (obj.handle, obj.__class__.__name__, ref_handle, ref_class_name)
-                transaction.add(REFERENCE_KEY, TXNADD, key, None, data)
-
-            # Add old references to the transaction
-            for ref_class_name, ref_handle in no_longer_required_references:
-                key = (obj.handle, ref_handle)
-                old_data = (
-                    obj.handle,
-                    obj.__class__.__name__,
-                    ref_handle,
-                    ref_class_name,
+        When the reference table was empty, its rows are written before its
+        indices are created.
+        """
+        if self._bulk_handles is None:
+            return
+        self._flush_batch()
+        loaded = self._bulk_handles
+        self._bulk_handles = None
+        if not self._bulk_new:
+            self._create_bulk_indices()
+            self.dbapi.executemany(
+                "DELETE FROM reference WHERE obj_handle = ?",
+                [[handle] for handles in loaded.values() for handle in handles],
+            )
+        sql = (
+            "INSERT INTO reference "
+            "(obj_handle, obj_class, ref_handle, ref_class) "
+            "VALUES (?, ?, ?, ?)"
+        )
+        for obj_key, handles in loaded.items():
+            obj_class = KEY_TO_CLASS_MAP[obj_key]
+            class_func = self._get_table_func(obj_class, "class_func")
+            text = self._text_index and obj_class in TEXT_FIELDS
+            rows = []
+            text_handles = []
+            text_rows = []
+            for handle, data in self._iter_raw_data_from_keys(obj_key, handles):
+                obj = class_func.create(data)
+                rows.extend(
+                    [handle, obj_class, ref_handle, ref_class_name]
+                    for ref_class_name, ref_handle in set(
+                        obj.get_referenced_handles_recursively()
+                    )
                 )
-                transaction.add(REFERENCE_KEY, TXNDEL, key, old_data, None)
-        else:  # batch mode
-            current_references = set(obj.get_referenced_handles_recursively())
+                if text:
+                    text_handles.append(handle)
+                    text_rows.extend(self._get_text_values(obj))
+                if len(rows) >= self._batch_size:
+                    self.dbapi.executemany(sql, rows)
+                    rows = []
+                if len(text_handles) >= self._batch_size:
+                    self._write_text_values(text_handles, text_rows)
+                    text_handles = []
+                    text_rows = []
+            if rows:
+                self.dbapi.executemany(sql, rows)
+            if text_handles:
+                self._write_text_values(text_handles, text_rows)
+        if self._bulk_new:
+            self._create_bulk_indices()
+        self._update_person_sortvals()
+        if self._closure_table:
+            self._closure_people.update(loaded[PERSON_KEY])
+            self._closure_families.update(loaded[FAMILY_KEY])
+
+    def _create_bulk_indices(self):
+        """
+        Create the indices dropped during a bulk load.
+        """
+        for name, target in self._get_bulk_indices().items():
+            self.dbapi.execute("CREATE INDEX IF NOT EXISTS %s ON %s" % (name, target))
+
+    def _update_backlinks(self, obj, transaction):
+        # Find existing references
+        sql = "SELECT ref_class, ref_handle " + "FROM reference WHERE obj_handle = ?"
+        self.dbapi.execute(sql, [obj.handle])
+        existing_references = set(self.dbapi.fetchall())
+
+        # Once we have the list of rows that already have a reference
+        # we need to compare it with the list of objects that are
+        # still references from the primary object.
+        current_references = set(obj.get_referenced_handles_recursively())
+        no_longer_required_references = existing_references.difference(
+            current_references
+        )
+        new_references = current_references.difference(existing_references)
+
+        # Delete the existing references
+        self.dbapi.execute("DELETE FROM reference WHERE obj_handle = ?", [obj.handle])
 
-            # Delete the existing references
+        # Now, add the current ones
+        for ref_class_name, ref_handle in current_references:
+            sql = (
+                "INSERT INTO reference "
+                + "(obj_handle, obj_class, ref_handle, ref_class)"
+                + "VALUES(?, ?, ?, ?)"
+            )
             self.dbapi.execute(
-                "DELETE FROM reference WHERE obj_handle = ?", [obj.handle]
+                sql,
+                [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name],
             )
 
-            # Now, add the current ones
-            for ref_class_name, ref_handle in current_references:
-                sql = (
-                    "INSERT INTO reference "
-                    + "(obj_handle, obj_class, ref_handle, ref_class)"
-                    + "VALUES(?, ?, ?, ?)"
-                )
-                self.dbapi.execute(
-                    sql,
-                    [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name],
-                )
+        # Add new references to the transaction
+        for ref_class_name, ref_handle in new_references:
+            key = (obj.handle, ref_handle)
+            data = (obj.handle, obj.__class__.__name__, ref_handle, ref_class_name)
+            transaction.add(REFERENCE_KEY, TXNADD, key, None, data)
+
+        # Add old references to the transaction
+        for ref_class_name, ref_handle in no_longer_required_references:
+            key = (obj.handle, ref_handle)
+            old_data = (
+                obj.handle,
+                obj.__class__.__name__,
+                ref_handle,
+                ref_class_name,
+            )
+            transaction.add(REFERENCE_KEY, TXNDEL, key, old_data, None)
 
     def _do_remove(self, handle, transaction, obj_key):
         if self.readonly or not handle:
             return
+        self._flush_batch()
+        if self._bulk_handles is not None:
+            self._bulk_handles[obj_key].discard(handle)
         if self._has_handle(obj_key, handle):
             data = self._get_raw_data(obj_key, handle)
             obj_class = KEY_TO_CLASS_MAP[obj_key]
@@ -769,6 +1343,13 @@ class DBAPI(DbGeneric):
             table = KEY_TO_NAME_MAP[obj_key]
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
+            if obj_key == EVENT_KEY:
+                self._update_event_sortvals([handle])
+            if self._text_index and obj_class in TEXT_FIELDS:
+                self._text_batch.pop(handle, None)
+                self._write_text_values([handle], [])
+            self._mark_closure(obj_key, handle)
+            self._log_change(obj_key, handle)
             if not transaction.batch:
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
@@ -807,20 +1388,27 @@ class DBAPI(DbGeneric):
         use in loops. If you want a list of the results use::
 
             result_list = list(find_backlink_handles(handle))
-        """
-        self.dbapi.execute(
-            "SELECT obj_class, obj_handle " "FROM reference " "WHERE ref_handle = ?",
-            [handle],
-        )
-        rows = self.dbapi.fetchall()
-        for row in rows:
-            if (include_classes is None) or (row[0] in include_classes):
-                yield (row[0], row[1])
+
+        The references are all read when the iteration starts, as callers
+        often commit the objects found, which rewrites their references.
+        """
+        self._finish_bulk_load()
+        self._flush_batch()
+        sql = "SELECT obj_class, obj_handle FROM reference WHERE ref_handle = ?"
+        args = [handle]
+        if include_classes is not None:
+            include_classes = list(include_classes)
+            sql += " AND obj_class IN (%s)" % ", ".join("?" * len(include_classes))
+            args += include_classes
+        self.dbapi.execute(sql, args)
+        for row in self.dbapi.fetchall():
+            yield (row[0], row[1])
 
     def find_initial_person(self):
         """
         Returns first person in the database
         """
+        self._flush_batch()
         handle = self.get_default_handle()
         person = None
         if handle:
@@ -836,45 +1424,741 @@ class DBAPI(DbGeneric):
         """
         Return an iterator over handles in the database
         """
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
-        sql = "SELECT handle FROM %s" % table
-        self.dbapi.execute(sql)
-        rows = self.dbapi.fetchall()
-        for row in rows:
+        for row in self._iter_table(table, "handle"):
             yield row[0]
 
+    def _get_scan_bound(self, table):
+        """
+        Return an SQL condition selecting the rows a table has now, which
+        rows added later do not meet, or None if the backend has none.
+
+        :param table: the name of the table.
+        :type table: str
+        """
+        return None
+
+    def _iter_table(self, table, columns):
+        """
+        Return an iterator over some columns of the rows of a table.
+
+        Only the rows the table had when the iteration started are returned,
+        so that a caller adding objects of the class it iterates over ends.
+        The scan is streamed if the backend can bound it, otherwise all the
+        rows are read at once.
+
+        :param table: the name of the table.
+        :type table: str
+        :param columns: the columns, separated by commas.
+        :type columns: str
+        """
+        sql = "SELECT %s FROM %s" % (columns, table)
+        bound = self._get_scan_bound(table)
+        if bound is None:
+            self.dbapi.execute(sql)
+            return iter(self.dbapi.fetchall())
+        return self._iter_rows(sql + " WHERE " + bound)
+
+    def _iter_rows(self, sql, args=None, chunk_size=None):
+        """
+        Return an iterator over the rows of a query.
+
+        The rows are read on a dedicated cursor, chunk_size rows at a time,
+        so other queries may be run while iterating.
+
+        :param sql: the SELECT statement.
+        :type sql: str
+        :param args: the parameters of the statement.
+        :type args: list
+        :param chunk_size: the number of rows fetched at a time, by default
+                           the chunk_size of the database.
+        :type chunk_size: int
+        """
+        if chunk_size is None:
+            chunk_size = self.chunk_size
+        with self.dbapi.cursor() as cursor:
+            if args is None:
+                cursor.execute(sql)
+            else:
+                cursor.execute(sql, args)
+            rows = cursor.fetchmany(chunk_size)
+            while rows:
+                yield from rows
+                rows = cursor.fetchmany(chunk_size)
+
     def _iter_raw_data(self, obj_key):
         """
         Return an iterator over raw data in the database.
         """
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
-        sql = "SELECT handle, blob_data FROM %s" % table
-        with self.dbapi.cursor() as cursor:
-            cursor.execute(sql)
-            rows = cursor.fetchmany()
-            while rows:
-                for row in rows:
-                    yield (row[0], pickle.loads(row[1]))
-                rows = cursor.fetchmany()
+        for row in self._iter_table(table, "handle, blob_data"):
+            yield (row[0], unpack(row[1]))
+
+    def _iter_raw_data_from_keys(self, obj_key, handles):
+        """
+        Return an iterator over raw data for the given handles, fetched with
+        one query per chunk of handles.
+        """
+        self._flush_batch()
+        table = KEY_TO_NAME_MAP[obj_key]
+        handles = list(dict.fromkeys(handles))
+        for start in range(0, len(handles), HANDLE_CHUNK_SIZE):
+            chunk = handles[start : start + HANDLE_CHUNK_SIZE]
+            sql = "SELECT handle, blob_data FROM %s WHERE handle IN (%s)" % (
+                table,
+                ", ".join("?" * len(chunk)),
+            )
+            for row in self._iter_rows(sql, chunk):
+                yield (row[0], unpack(row[1]))
 
     def _iter_raw_place_tree_data(self):
         """
         Return an iterator over raw data in the place hierarchy.
-        """
-        to_do = [""]
-        sql = "SELECT handle, blob_data FROM place WHERE enclosed_by = ?"
-        while to_do:
-            handle = to_do.pop()
-            self.dbapi.execute(sql, [handle])
+
+        The hierarchy is walked breadth first in a single query, so that a
+        place always comes after the place which encloses it.  As for the
+        other tables, places added while iterating are not returned.
+        """
+        self._flush_batch()
+        bound = self._get_scan_bound("place")
+        sql = (
+            "WITH RECURSIVE tree(handle, blob_data) AS ("
+            "SELECT handle, blob_data FROM place WHERE enclosed_by = '' %s"
+            "UNION ALL "
+            "SELECT place.handle, place.blob_data "
+            "FROM place JOIN tree ON place.enclosed_by = tree.handle %s) "
+            "SELECT handle, blob_data FROM tree"
+        )
+        if bound is None:
+            self.dbapi.execute(sql % ("", ""))
             rows = self.dbapi.fetchall()
-            for row in rows:
-                to_do.append(row[0])
-                yield (row[0], pickle.loads(row[1]))
+        else:
+            rows = self._iter_rows(sql % ("AND %s " % bound, "WHERE %s" % bound))
+        for row in rows:
+            yield (row[0], unpack(row[1]))
+
+    def get_place_ancestry(self, handles):
+        """
+        Return a list of the places with the passed handles, together with
+        all the places which enclose them, in one query per chunk of
+        handles.
+        """
+        return self._get_place_hierarchy(
+            "SELECT reference.ref_handle "
+            "FROM reference JOIN hierarchy "
+            "ON reference.obj_handle = hierarchy.handle "
+            "WHERE reference.ref_class = 'Place'",
+            handles,
+        )
+
+    def get_place_subtree(self, handles):
+        """
+        Return a list of the places with the passed handles, together with
+        all the places which they enclose, in one query per chunk of
+        handles.
+        """
+        return self._get_place_hierarchy(
+            "SELECT reference.obj_handle "
+            "FROM reference JOIN hierarchy "
+            "ON reference.ref_handle = hierarchy.handle "
+            "WHERE reference.obj_class = 'Place'",
+            handles,
+        )
+
+    def _get_place_hierarchy(self, step, handles):
+        """
+        Return the places reached from the given places with a recursive
+        query, where step selects the next places from the hierarchy table.
+        """
+        self._finish_bulk_load()
+        self._flush_batch()
+        handles = list(dict.fromkeys(handles))
+        places = {}
+        for start in range(0, len(handles), HANDLE_CHUNK_SIZE):
+            chunk = handles[start : start + HANDLE_CHUNK_SIZE]
+            sql = (
+                "WITH RECURSIVE hierarchy(handle) AS ("
+                "SELECT handle FROM place WHERE handle IN (%s) "
+                "UNION %s) "
+                "SELECT place.handle, place.blob_data "
+                "FROM hierarchy JOIN place ON place.handle = hierarchy.handle"
+            ) % (", ".join("?" * len(chunk)), step)
+            for row in self._iter_rows(sql, chunk):
+                if row[0] not in places:
+                    places[row[0]] = Place.create(unpack(row[1]))
+        return list(places.values())
+
+    def has_date_index(self):
+        """
+        Return True if the database keeps indexed copies of the event dates.
+        """
+        return self._date_index
+
+    def find_events_matching_date(self, date):
+        """
+        Return the set of handles of the events whose date matches a date,
+        as tested by :meth:`.Date.match`.
+
+        The date columns select the events whose date may match, which are
+        then tested one by one.  Imprecise dates are selected with the
+        widest of the before, after and about ranges.
+        """
+        if not self._date_index or date.modifier == Date.MOD_TEXTONLY:
+            return super().find_events_matching_date(date)
+        if date.sortval == 0:
+            return set()
+        self._flush_batch()
+        start, stop = date.get_start_stop_range()
+        low = Date(*start).sortval
+        high = Date(*stop).sortval
+        # The end of a date is only known to the year.
+        slack = 366
+        fuzzy = slack + 366 * max(
+            config.get("behavior.date-before-range"),
+            config.get("behavior.date-after-range"),
+            config.get("behavior.date-about-range"),
+        )
+        sql = (
+            "SELECT handle FROM event WHERE date_modifier = ? OR "
+            "(date_sortval != 0 AND date_modifier IN (?, ?, ?) "
+            "AND date_quality != ? AND date_sortval <= ? AND date_stop >= ?) OR "
+            "(date_sortval != 0 AND date_sortval <= ? AND date_stop >= ?)"
+        )
+        args = [
+            Date.MOD_TEXTONLY,
+            Date.MOD_NONE,
+            Date.MOD_RANGE,
+            Date.MOD_SPAN,
+            Date.QUAL_ESTIMATED,
+            high,
+            low - slack,
+            high + fuzzy,
+            low - fuzzy,
+        ]
+        handles = [row[0] for row in self._iter_rows(sql, args)]
+        return {
+            handle
+            for handle, data in self._iter_raw_data_from_keys(EVENT_KEY, handles)
+            if Event.create(data).get_date_object().match(date)
+        }
+
+    def find_events_in_date_range(self, start=None, stop=None):
+        """
+        Return the handles of the dated events whose date lies, at least in
+        part, between two dates, ordered by date.
+        """
+        if not self._date_index:
+            return super().find_events_in_date_range(start, stop)
+        self._flush_batch()
+        sql = "SELECT handle FROM event WHERE date_sortval != 0"
+        args = []
+        if start:
+            sql += " AND date_stop >= ?"
+            args.append(start.get_sort_value())
+        if stop:
+            sql += " AND date_sortval <= ?"
+            args.append(stop.get_sort_value())
+        sql += " ORDER BY date_sortval, handle"
+        return [row[0] for row in self._iter_rows(sql, args)]
+
+    def find_events_on_day(self, month, day=0):
+        """
+        Return the set of handles of the events which happened on a day of
+        the year, whatever the year, in the Gregorian calendar.
+        """
+        if not self._date_index:
+            return super().find_events_on_day(month, day)
+        self._flush_batch()
+        sql = "SELECT handle FROM event WHERE date_month = ? AND date_sortval != 0"
+        args = [month]
+        if day:
+            sql += " AND date_day = ?"
+            args.append(day)
+        return {row[0] for row in self._iter_rows(sql, args)}
+
+    def get_person_date_sortvals(self):
+        """
+        Return a dictionary of the sort values of the birth and death dates
+        of all the people, as {handle: (birth_sortval, death_sortval)}.
+        """
+        if not self._date_index:
+            return super().get_person_date_sortvals()
+        self._flush_batch()
+        return {
+            row[0]: (row[1], row[2])
+            for row in self._iter_rows(
+                "SELECT handle, birth_sortval, death_sortval FROM person"
+            )
+        }
+
+    def _update_person_sortvals(self, handles=None):
+        """
+        Copy the sort values of the birth and death dates of people, all of
+        them by default, from the event rows.
+        """
+        if not self._date_index:
+            return
+        sql = (
+            "UPDATE person SET "
+            "birth_sortval = CASE WHEN birth_handle IS NULL THEN 0 ELSE "
+            "(SELECT date_sortval FROM event WHERE handle = person.birth_handle) "
+            "END, "
+            "death_sortval = CASE WHEN death_handle IS NULL THEN 0 ELSE "
+            "(SELECT date_sortval FROM event WHERE handle = person.death_handle) "
+            "END"
+        )
+        if handles is None:
+            self.dbapi.execute(sql)
+        else:
+            self.dbapi.executemany(
+                sql + " WHERE handle = ?", [[handle] for handle in handles]
+            )
+
+    def _update_event_sortvals(self, handles):
+        """
+        Copy the sort values of the dates of events to the rows of the people
+        born or dead at them.  The sort value is NULL for a removed event.
+        """
+        if not self._date_index:
+            return
+        self.dbapi.executemany(
+            "UPDATE person SET "
+            "birth_sortval = CASE WHEN birth_handle = ? THEN "
+            "(SELECT date_sortval FROM event WHERE handle = ?) "
+            "ELSE birth_sortval END, "
+            "death_sortval = CASE WHEN death_handle = ? THEN "
+            "(SELECT date_sortval FROM event WHERE handle = ?) "
+            "ELSE death_sortval END "
+            "WHERE birth_handle = ? OR death_handle = ?",
+            [[handle] * 6 for handle in handles],
+        )
+
+    def has_sql_select(self):
+        """
+        Return True if the objects of the database can be selected with SQL
+        predicates over their tables, with :meth:`select_handles`.
+        """
+        return True
+
+    def select_handles(self, obj_class, where, args=None):
+        """
+        Return the list of handles of the objects of a class matching an SQL
+        predicate over the columns of their table.
+        """
+        self._flush_batch()
+        table = KEY_TO_NAME_MAP[CLASS_TO_KEY_MAP[obj_class]]
+        sql = "SELECT handle FROM %s WHERE %s" % (table, where)
+        return [row[0] for row in self._iter_rows(sql, args)]
+
+    def _reset_change_log(self):
+        """
+        Forget the changed objects, as if all the objects had changed.
+        """
+        change = next(_CHANGE_SEQUENCE)
+        for obj_class in KEY_TO_CLASS_MAP.values():
+            self._change_log[obj_class] = OrderedDict()
+            self._change_horizon[obj_class] = change
+
+    def _log_change(self, obj_key, handle):
+        """
+        Note an object added, changed or removed in the change log of its
+        class, forgetting the oldest change once the log is full.
+        """
+        obj_class = KEY_TO_CLASS_MAP[obj_key]
+        log = self._change_log[obj_class]
+        log.pop(handle, None)
+        log[handle] = next(_CHANGE_SEQUENCE)
+        while len(log) > CHANGE_LOG_SIZE:
+            self._change_horizon[obj_class] = log.popitem(last=False)[1]
+
+    def get_change_counter(self, obj_class):
+        """
+        Return a number which increases whenever an object of a class is
+        added, changed or removed.
+        """
+        log = self._change_log[obj_class]
+        if log:
+            return next(reversed(log.values()))
+        return self._change_horizon[obj_class]
+
+    def get_changed_handles(self, obj_class, since):
+        """
+        Return the set of handles of the objects of a class changed after
+        the change counter of the class was read as since, or None if the
+        change log no longer holds them all.
+        """
+        if since < self._change_horizon[obj_class]:
+            return None
+        handles = set()
+        for handle, change in reversed(self._change_log[obj_class].items()):
+            if change <= since:
+                break
+            handles.add(handle)
+        return handles
+
+    def has_text_index(self):
+        """
+        Return True if the database keeps a full-text index of the text of
+        its objects, which can be searched with :meth:`find_text`.
+        """
+        return self._text_index
+
+    def find_text(self, obj_class, field, text):
+        """
+        Return the set of handles of the objects of a class having a value
+        of a field which contains a substring, ignoring case.
+        """
+        self._flush_batch()
+        self._flush_text_batch()
+        upper = text.upper()
+        return {
+            handle
+            for handle, value in self._iter_text_candidates(obj_class, field, text)
+            if upper in value.upper()
+        }
+
+    def _iter_text_candidates(self, obj_class, field, text):
+        """
+        Return an iterator over the (handle, value) rows of the full-text
+        index which may contain a substring.
+
+        This scans all the values of the field.  Backends with a text search
+        engine narrow the rows down.
+        """
+        return self._iter_rows(
+            "SELECT handle, value FROM text_value WHERE obj_class = ? AND field = ?",
+            [obj_class, field],
+        )
+
+    def _get_text_values(self, obj):
+        """
+        Return the rows of the full-text index for an object.
+        """
+        obj_class = obj.__class__.__name__
+        return [
+            [obj_class, obj.handle, field, value]
+            for field, func in TEXT_FIELDS.get(obj_class, {}).items()
+            for value in func(obj)
+            if value
+        ]
+
+    def _write_text_values(self, handles, rows):
+        """
+        Replace the rows of the full-text index of some objects.
+        """
+        self.dbapi.executemany(
+            "DELETE FROM text_value WHERE handle = ?", [[handle] for handle in handles]
+        )
+        if rows:
+            self.dbapi.executemany(
+                "INSERT INTO text_value (obj_class, handle, field, value) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def _check_text_index(self):
+        """
+        Build or drop the full-text index, as set in the preferences.
+        """
+        exists = self.dbapi.table_exists("text_value")
+        if self.readonly:
+            self._text_index = exists
+            return
+        enabled = config.get("database.text-index")
+        if enabled and not exists:
+            self._rebuild_text_index()
+        elif exists and not enabled:
+            self._txn_begin()
+            self._drop_text_index()
+            self._txn_commit()
+        self._text_index = enabled
+
+    def _create_text_index(self):
+        """
+        Create the tables of the full-text index.
+        """
+        self.dbapi.execute(
+            "CREATE TABLE text_value "
+            "("
+            "id INTEGER PRIMARY KEY, "
+            "obj_class TEXT, "
+            "handle VARCHAR(50), "
+            "field TEXT, "
+            "value TEXT"
+            ")"
+        )
+        self.dbapi.execute("CREATE INDEX text_value_handle ON text_value(handle)")
+
+    def _drop_text_index(self):
+        """
+        Drop the tables of the full-text index.
+        """
+        self.dbapi.execute("DROP TABLE IF EXISTS text_value")
+
+    def _rebuild_text_index(self):
+        """
+        Rebuild the full-text index from the objects of the database.
+        """
+        self._flush_batch()
+        self._text_batch.clear()
+        self._txn_begin()
+        self._drop_text_index()
+        self._create_text_index()
+        batch_size = max(1, config.get("database.batch-size"))
+        for class_name in TEXT_FIELDS:
+            class_func = self._get_table_func(class_name, "class_func")
+            rows = []
+            for handle, data in self._iter_raw_data(CLASS_TO_KEY_MAP[class_name]):
+                rows.extend(self._get_text_values(class_func.create(data)))
+                if len(rows) >= batch_size:
+                    self._write_text_values([], rows)
+                    rows = []
+            self._write_text_values([], rows)
+        self._txn_commit()
+
+    def has_closure_table(self):
+        """
+        Return True if the database keeps a table of the ancestors of every
+        person with their generation distance.
+        """
+        return self._closure_table
+
+    def get_ancestor_handles(self, handle, min_generation=0, max_generation=None):
+        """
+        Return the set of handles of the ancestors of a person, through the
+        main parent family of each person, who are between min_generation
+        and max_generation generations away along some line.
+        """
+        if not self._closure_table:
+            return super().get_ancestor_handles(handle, min_generation, max_generation)
+        return self._get_closure_handles(
+            "ancestor", "descendant", handle, min_generation, max_generation, True
+        )
+
+    def get_descendant_handles(self, handle, min_generation=0, max_generation=None):
+        """
+        Return the set of handles of the descendants of a person, through
+        all the families, who are between min_generation and max_generation
+        generations away along some line.
+        """
+        if not self._closure_table:
+            return super().get_descendant_handles(
+                handle, min_generation, max_generation
+            )
+        return self._get_closure_handles(
+            "descendant", "ancestor", handle, min_generation, max_generation, False
+        )
+
+    def _get_closure_handles(
+        self, column, key, handle, min_generation, max_generation, main_only
+    ):
+        """
+        Return the people of a column of the closure table in the rows of a
+        person within a range of generations.  The person is generation 0.
+        """
+        self._flush_batch()
+        self._update_closure()
+        handles = set()
+        if max_generation is None or max_generation >= 1:
+            sql = (
+                "SELECT DISTINCT closure.{0} FROM closure "
+                "JOIN person ON person.handle = closure.{0} "
+                "WHERE closure.{1} = ? AND generation >= ?"
+            ).format(column, key)
+            args = [handle, max(min_generation, 1)]
+            if max_generation is not None:
+                sql += " AND generation <= ?"
+                args.append(max_generation)
+            if main_only:
+                sql += " AND main = 1"
+            handles.update(row[0] for row in self._iter_rows(sql, args))
+        if min_generation <= 0 and (max_generation is None or max_generation >= 0):
+            if self._has_handle(PERSON_KEY, handle):
+                handles.add(handle)
+        return handles
+
+    def _mark_closure(self, obj_key, handle, old_data=None, data=None):
+        """
+        Note a committed or removed object which may change the rows of the
+        closure table: a person whose parent families changed, or a family
+        whose parents changed.  The rows are rewritten when the transaction
+        is committed.
+        """
+        if not self._closure_table:
+            return
+        if obj_key == PERSON_KEY:
+            if old_data is None or data is None or list(old_data[9]) != list(data[9]):
+                self._closure_people.add(handle)
+        elif obj_key == FAMILY_KEY:
+            if (
+                old_data is None
+                or data is None
+                or tuple(old_data[2:4]) != tuple(data[2:4])
+            ):
+                self._closure_families.add(handle)
+
+    def _update_closure(self):
+        """
+        Rewrite the rows of the closure table of the people whose ancestors
+        may have changed: the marked people, the children of the marked
+        families and all their descendants.
+        """
+        if not (self._closure_people or self._closure_families):
+            return
+        people = self._closure_people
+        self._closure_people = set()
+        for handle in self._closure_families:
+            self.dbapi.execute(
+                "SELECT obj_handle FROM reference "
+                "WHERE ref_handle = ? AND obj_class = ?",
+                [handle, "Person"],
+            )
+            people.update(row[0] for row in self.dbapi.fetchall())
+        self._closure_families.clear()
+        self.dbapi.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS closure_dirty "
+            "(handle VARCHAR(50) PRIMARY KEY NOT NULL)"
+        )
+        self.dbapi.execute("DELETE FROM closure_dirty")
+        self.dbapi.executemany(
+            "INSERT INTO closure_dirty (handle) VALUES (?)",
+            [[handle] for handle in people],
+        )
+        self.dbapi.execute(
+            "INSERT INTO closure_dirty (handle) "
+            "SELECT DISTINCT descendant FROM closure "
+            "WHERE ancestor IN (SELECT handle FROM closure_dirty) "
+            "AND descendant NOT IN (SELECT handle FROM closure_dirty)"
+        )
+        self.dbapi.execute(
+            "DELETE FROM closure WHERE descendant IN (SELECT handle FROM closure_dirty)"
+        )
+        self.dbapi.execute("SELECT handle FROM closure_dirty")
+        handles = [row[0] for row in self.dbapi.fetchall()]
+        self._fill_closure(handles)
+
+    def _fill_closure(self, handles=None):
+        """
+        Write the rows of the closure table of some people, all of them by
+        default, whose rows were deleted.
+
+        The rows of the parents are written first, and each following pass
+        joins them with the rows of the previous generation.
+        """
+        batch_size = max(1, config.get("database.batch-size"))
+        if handles is None:
+            parents = {
+                handle: (data[2], data[3])
+                for handle, data in self._iter_raw_data(FAMILY_KEY)
+            }
+            people = self._iter_raw_data(PERSON_KEY)
+            dirty = ""
+        else:
+            parents = {}
+            people = (
+                (handle, self._get_raw_data(PERSON_KEY, handle)) for handle in handles
+            )
+            dirty = " AND e.descendant IN (SELECT handle FROM closure_dirty)"
+        upsert = (
+            " ON CONFLICT (descendant, generation, ancestor) "
+            "DO UPDATE SET main = excluded.main WHERE excluded.main = 1"
+        )
+        sql = (
+            "INSERT INTO closure (ancestor, descendant, generation, main) "
+            "VALUES (?, ?, 1, ?)" + upsert
+        )
+        rows = []
+        for handle, data in people:
+            if not data:
+                continue
+            for index, family_handle in enumerate(data[9]):
+                if family_handle not in parents:
+                    family = self._get_raw_data(FAMILY_KEY, family_handle)
+                    parents[family_handle] = (family[2], family[3]) if family else ()
+                for parent in parents[family_handle]:
+                    if parent:
+                        rows.append([parent, handle, int(index == 0)])
+            if len(rows) >= batch_size:
+                self.dbapi.executemany(sql, rows)
+                rows = []
+        if rows:
+            self.dbapi.executemany(sql, rows)
+        for generation in range(1, CLOSURE_DEPTH):
+            self.dbapi.execute(
+                "INSERT INTO closure (ancestor, descendant, generation, main) "
+                "SELECT c.ancestor, e.descendant, ?, c.main * e.main "
+                "FROM closure e JOIN closure c ON c.descendant = e.ancestor "
+                "WHERE e.generation = 1 AND c.generation = ?" + dirty + upsert,
+                [generation + 1, generation],
+            )
+            self.dbapi.execute(
+                "SELECT 1 FROM closure e WHERE e.generation = ?" + dirty + " LIMIT 1",
+                [generation + 1],
+            )
+            if self.dbapi.fetchone() is None:
+                break
+
+    def _check_closure_table(self):
+        """
+        Build or drop the closure table, as set in the preferences.
+        """
+        exists = self.dbapi.table_exists("closure")
+        if self.readonly:
+            self._closure_table = exists
+            return
+        enabled = config.get("database.closure-table")
+        if enabled and not exists:
+            self._rebuild_closure()
+        elif exists and not enabled:
+            self._txn_begin()
+            self._drop_closure_table()
+            self._txn_commit()
+        self._closure_table = enabled
+
+    def _create_closure_table(self):
+        """
+        Create the closure table and its indices.
+        """
+        self.dbapi.execute(
+            "CREATE TABLE closure "
+            "("
+            "ancestor VARCHAR(50) NOT NULL, "
+            "descendant VARCHAR(50) NOT NULL, "
+            "generation INTEGER NOT NULL, "
+            "main INTEGER, "
+            "PRIMARY KEY (descendant, generation, ancestor)"
+            ")"
+        )
+        self.dbapi.execute(
+            "CREATE INDEX closure_ancestor ON closure(ancestor, generation)"
+        )
+
+    def _drop_closure_table(self):
+        """
+        Drop the closure table.
+        """
+        self.dbapi.execute("DROP TABLE IF EXISTS closure")
+
+    def _rebuild_closure(self):
+        """
+        Rebuild the closure table from the people and families.
+        """
+        self._flush_batch()
+        self._closure_people.clear()
+        self._closure_families.clear()
+        self._txn_begin()
+        self._drop_closure_table()
+        self._create_closure_table()
+        self._fill_closure()
+        self._txn_commit()
 
     def reindex_reference_map(self, callback):
         """
         Reindex all primary records in the database.
         """
+        self._flush_batch()
         self._txn_begin()
         self.dbapi.execute("DELETE FROM reference")
         total = 0
@@ -905,28 +2189,36 @@ class DBAPI(DbGeneric):
             (self.get_note_cursor, Note),
             (self.get_tag_cursor, Tag),
         )
+        sql = (
+            "INSERT INTO reference "
+            "(obj_handle, obj_class, ref_handle, ref_class) "
+            "VALUES (?, ?, ?, ?)"
+        )
+        batch_size = max(1, config.get("database.batch-size"))
         # Now we use the functions and classes defined above
         # to loop through each of the primary object tables.
         for cursor_func, class_func in primary_table:
             logging.info("Rebuilding %s reference map", class_func.__name__)
+            rows = []
             with cursor_func() as cursor:
                 for found_handle, val in cursor:
                     obj = class_func.create(val)
                     references = set(obj.get_referenced_handles_recursively())
                     # handle addition of new references
                     for ref_class_name, ref_handle in references:
-                        self.dbapi.execute(
-                            "INSERT INTO reference "
-                            "(obj_handle, obj_class, ref_handle, ref_class) "
-                            "VALUES (?, ?, ?, ?)",
+                        rows.append(
                             [
                                 obj.handle,
                                 obj.__class__.__name__,
                                 ref_handle,
                                 ref_class_name,
-                            ],
+                            ]
                         )
+                    if len(rows) >= batch_size:
+                        self.dbapi.executemany(sql, rows)
+                        rows = []
                     self.update()
+            self.dbapi.executemany(sql, rows)
         self._txn_commit()
 
     def rebuild_secondary(self, callback=None):
@@ -952,44 +2244,80 @@ class DBAPI(DbGeneric):
             total += self.method("get_number_of_%s", tbl)()
         UpdateCallback.__init__(self, callback)
         self.set_total(total)
+        batch_size = max(1, config.get("database.batch-size"))
 
         # First, expand blob to individual fields:
+        self._flush_batch()
         self._txn_begin()
-        for obj_type in (
-            "Person",
-            "Family",
-            "Event",
-            "Place",
-            "Repository",
-            "Source",
-            "Citation",
-            "Media",
-            "Note",
-            "Tag",
+        for obj_class in (
+            Person,
+            Family,
+            Event,
+            Place,
+            Repository,
+            Source,
+            Citation,
+            Media,
+            Note,
+            Tag,
         ):
-            for handle in self.method("get_%s_handles", obj_type)():
-                obj = self.method("get_%s_from_handle", obj_type)(handle)
-                self._update_secondary_values(obj)
-                self.update()
+            self._rebuild_secondary_values(obj_class, batch_size, self.update)
+        self._update_person_sortvals()
         self._txn_commit()
 
+        if self._text_index:
+            self._rebuild_text_index()
+        if self._closure_table:
+            self._rebuild_closure()
+
         # Next, rebuild stats:
         gstats = self.get_gender_stats()
         self.genderStats = GenderStats(gstats)
 
+    def _rebuild_secondary_values(self, obj_class, batch_size, step=None):
+        """
+        Rewrite the secondary columns of all the objects of a class.
+        """
+        obj_key = CLASS_TO_KEY_MAP[obj_class.__name__]
+        sql = None
+        rows = []
+        for handle, data in self._iter_raw_data(obj_key):
+            obj = obj_class.create(data)
+            columns, values = self._get_secondary_values(obj)
+            if sql is None:
+                sql = "UPDATE %s SET %s WHERE handle = ?" % (
+                    KEY_TO_NAME_MAP[obj_key],
+                    ", ".join("%s = ?" % column for column in columns),
+                )
+            rows.append(self._sql_cast_list(values) + [handle])
+            if len(rows) >= batch_size:
+                self.dbapi.executemany(sql, rows)
+                rows = []
+            if step:
+                step()
+        if rows:
+            self.dbapi.executemany(sql, rows)
+
     def _has_handle(self, obj_key, handle):
+        if handle in self._batch_pending.get(obj_key, ()):
+            return True
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT 1 FROM %s WHERE handle = ?" % table
         self.dbapi.execute(sql, [handle])
         return self.dbapi.fetchone() is not None
 
     def _has_gramps_id(self, obj_key, gramps_id):
+        if self._batch_ids.get(obj_key, {}).get(gramps_id):
+            return True
+        # The objects waiting to be written may have another Gramps ID.
+        pending = self._batch_pending.get(obj_key, ())
         table = KEY_TO_NAME_MAP[obj_key]
-        sql = "SELECT 1 FROM %s WHERE gramps_id = ?" % table
+        sql = "SELECT handle FROM %s WHERE gramps_id = ?" % table
         self.dbapi.execute(sql, [gramps_id])
-        return self.dbapi.fetchone() != None
+        return any(row[0] not in pending for row in self.dbapi.fetchall())
 
     def _get_gramps_ids(self, obj_key):
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT gramps_id FROM %s" % table
         self.dbapi.execute(sql)
@@ -997,20 +2325,24 @@ class DBAPI(DbGeneric):
         return [row[0] for row in rows]
 
     def _get_raw_data(self, obj_key, handle):
+        pending = self._batch_pending.get(obj_key)
+        if pending and handle in pending:
+            return unpack(pending[handle][0])
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT blob_data FROM %s WHERE handle = ?" % table
         self.dbapi.execute(sql, [handle])
         row = self.dbapi.fetchone()
         if row:
-            return pickle.loads(row[0])
+            return unpack(row[0])
 
     def _get_raw_from_id_data(self, obj_key, gramps_id):
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT blob_data FROM %s WHERE gramps_id = ?" % table
         self.dbapi.execute(sql, [gramps_id])
         row = self.dbapi.fetchone()
         if row:
-            return pickle.loads(row[0])
+            return unpack(row[0])
 
     def get_gender_stats(self):
         """
@@ -1062,20 +2394,21 @@ class DBAPI(DbGeneric):
         if data is None:
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
+            if obj_key == EVENT_KEY:
+                self._update_event_sortvals([handle])
+            if self._text_index and cls in TEXT_FIELDS:
+                self._write_text_values([handle], [])
         else:
-            if self._has_handle(obj_key, handle):
-                sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
-                self.dbapi.execute(sql, [pickle.dumps(data), handle])
-            else:
-                sql = "INSERT INTO %s (handle, blob_data) VALUES (?, ?)" % table
-                self.dbapi.execute(sql, [handle, pickle.dumps(data)])
             obj = self._get_table_func(cls)["class_func"].create(data)
-            self._update_secondary_values(obj)
+            self._upsert(obj_key, obj, data)
+        self._mark_closure(obj_key, handle)
+        self._log_change(obj_key, handle)
 
     def get_surname_list(self):
         """
         Return the list of locale-sorted surnames contained in the database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT DISTINCT surname " "FROM person " "ORDER BY surname")
         surname_list = []
         for row in self.dbapi.fetchall():
@@ -1125,34 +2458,56 @@ class DBAPI(DbGeneric):
                         % (table_name, field, sql_type)
                     )
 
-    def _update_secondary_values(self, obj):
+    def _get_secondary_values(self, obj):
         """
-        Given a primary object update its secondary field values
-        in the database.
-        Does not commit.
+        Given a primary object return the names of its secondary columns
+        and their values, including the derived columns.
         """
         table = obj.__class__.__name__
-        fields = [field[0] for field in obj.get_secondary_fields()]
-        sets = []
-        values = []
-        for field in fields:
-            sets.append("%s = ?" % field)
-            values.append(getattr(obj, field))
+        fields, columns = self._get_secondary_columns(obj.__class__)
+        values = [getattr(obj, field) for field in fields]
 
         # Derived fields
         if table == "Person":
-            given_name, surname = self._get_person_data(obj)
-            sets.append("given_name = ?")
-            values.append(given_name)
-            sets.append("surname = ?")
-            values.append(surname)
-        if table == "Place":
-            handle = self._get_place_data(obj)
-            sets.append("enclosed_by = ?")
-            values.append(handle)
+            values.extend(self._get_person_data(obj))
+            values.extend(self._get_person_event_data(obj))
+        elif table == "Event":
+            values.extend(self._get_event_data(obj))
+        elif table == "Place":
+            values.append(self._get_place_data(obj))
+        return columns, values
+
+    def _get_secondary_columns(self, obj_class):
+        """
+        Return the secondary fields of a class, and the names of all its
+        secondary columns, including the derived ones.
+
+        The schema is only walked the first time a class is seen.
+        """
+        name = obj_class.__name__
+        result = self._secondary_columns.get(name)
+        if result is None:
+            fields = [
+                field[0]
+                for field in obj_class.get_secondary_fields()
+                if field[0] != "handle"
+            ]
+            result = self._secondary_columns[name] = (
+                fields,
+                fields + DERIVED_COLUMNS.get(name, []),
+            )
+        return result
 
+    def _update_secondary_values(self, obj):
+        """
+        Given a primary object update its secondary field values
+        in the database.
+        Does not commit.
+        """
+        columns, values = self._get_secondary_values(obj)
         if len(values) > 0:
-            table_name = table.lower()
+            table_name = obj.__class__.__name__.lower()
+            sets = ["%s = ?" % column for column in columns]
             self.dbapi.execute(
                 "UPDATE %s SET %s where handle = ?" % (table_name, ", ".join(sets)),
                 self._sql_cast_list(values) + [obj.handle],
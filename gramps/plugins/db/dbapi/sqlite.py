@@ -32,6 +32,9 @@ import sqlite3
 import os
 import re
 import logging
+import threading
+from contextlib import contextmanager
+from urllib.request import pathname2url
 
 # -------------------------------------------------------------------------
 #
@@ -40,12 +43,28 @@ import logging
 # -------------------------------------------------------------------------
 from gramps.plugins.db.dbapi.dbapi import DBAPI
 from gramps.gen.db.dbconst import ARRAYSIZE
+from gramps.gen.db.exceptions import DbException
+from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
 
 sqlite3.paramstyle = "qmark"
 
+LOG = logging.getLogger(".sqlite")
+
+# Pragmas set on every connection to a database file.  WAL lets readers
+# work on a snapshot while the primary connection writes, and NORMAL
+# synchronisation is safe in WAL mode.
+PRAGMAS = (
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA cache_size = -16384;",
+)
+
+# Seconds a thread waits for a read connection of the pool before giving up.
+READ_TIMEOUT = 60
+
 
 # -------------------------------------------------------------------------
 #
@@ -53,6 +72,11 @@ sqlite3.paramstyle = "qmark"
 #
 # -------------------------------------------------------------------------
 class SQLite(DBAPI):
+    def __init__(self, directory=None):
+        # Whether the values of the full-text index have an FTS5 index.
+        self._text_fts = False
+        super().__init__(directory)
+
     def get_summary(self):
         """
         Return a dictionary of information about this database backend.
@@ -72,7 +96,121 @@ class SQLite(DBAPI):
             path_to_db = ":memory:"
         else:
             path_to_db = os.path.join(directory, "sqlite.db")
-        self.dbapi = Connection(path_to_db)
+        self.dbapi = Connection(
+            path_to_db, pool_size=config.get("database.read-connections")
+        )
+
+    def read_snapshot(self):
+        """
+        Return a context manager inside which the reads made by the calling
+        thread see a consistent snapshot of the database.
+
+        Other threads read through a pooled read-only connection, so a long
+        running report can work on a snapshot without blocking editing.
+        """
+        return self.dbapi.read_snapshot()
+
+    def can_fork_readers(self):
+        """
+        Return True if a forked process can read the database through a
+        connection of its own, opened with :meth:`reopen_reader`.
+        """
+        return self._directory not in (None, ":memory:") and self.transaction is None
+
+    def reopen_reader(self):
+        """
+        Replace the connection inherited by a forked process, which it must
+        not use, with a read-only connection of its own to the database.
+        """
+        self.dbapi.reopen_reader()
+
+    def _check_text_index(self):
+        """
+        Build or drop the full-text index, as set in the preferences.
+        """
+        super()._check_text_index()
+        self._text_fts = self._text_index and self.dbapi.table_exists("text_index")
+
+    def _create_text_index(self):
+        """
+        Create the tables of the full-text index, with an FTS5 trigram index
+        of the values when SQLite provides it.
+        """
+        super()._create_text_index()
+        try:
+            self.dbapi.execute(
+                "CREATE VIRTUAL TABLE text_index USING fts5"
+                "(value, content='text_value', content_rowid='id', "
+                "tokenize='trigram')"
+            )
+        except sqlite3.OperationalError as err:
+            LOG.warning("full-text search is not available: %s", err)
+            self._text_fts = False
+        else:
+            self._text_fts = True
+
+    def _drop_text_index(self):
+        """
+        Drop the tables of the full-text index.
+        """
+        self.dbapi.execute("DROP TABLE IF EXISTS text_index")
+        super()._drop_text_index()
+        self._text_fts = False
+
+    def _write_text_values(self, handles, rows):
+        """
+        Replace the rows of the full-text index of some objects.
+
+        The FTS5 index is updated by statements working on all the rows at
+        once, which is twice as fast as from triggers.
+        """
+        if not self._text_fts:
+            super()._write_text_values(handles, rows)
+            return
+        self.dbapi.executemany(
+            "INSERT INTO text_index (text_index, rowid, value) "
+            "SELECT 'delete', id, value FROM text_value WHERE handle = ?",
+            [[handle] for handle in handles],
+        )
+        super()._write_text_values(handles, [])
+        if rows:
+            # New rows get the next ids.
+            self.dbapi.execute("SELECT MAX(id) FROM text_value")
+            last_id = self.dbapi.fetchone()[0] or 0
+            super()._write_text_values([], rows)
+            self.dbapi.execute(
+                "INSERT INTO text_index (rowid, value) "
+                "SELECT id, value FROM text_value WHERE id > ?",
+                [last_id],
+            )
+
+    def _get_scan_bound(self, table):
+        """
+        Return an SQL condition selecting the rows a table has now, by their
+        rowid.  Rows keep their rowid when updated, and new rows get one
+        larger than those of the rows the table has.
+        """
+        self.dbapi.execute("SELECT MAX(rowid) FROM %s" % table)
+        last = self.dbapi.fetchone()[0]
+        return "%s.rowid <= %d" % (table, last or 0)
+
+    def _iter_text_candidates(self, obj_class, field, text):
+        """
+        Return an iterator over the (handle, value) rows of the full-text
+        index which may contain a substring.
+
+        The trigram index finds the values containing substrings of at least
+        three characters.
+        """
+        if len(text) < 3 or not self._text_fts:
+            return super()._iter_text_candidates(obj_class, field, text)
+        return self._iter_rows(
+            "SELECT text_value.handle, text_value.value "
+            "FROM text_index JOIN text_value ON text_value.id = text_index.rowid "
+            "WHERE text_index MATCH ? "
+            "AND text_value.obj_class = ? AND text_value.field = ?",
+            ['value : "%s"' % text.replace('"', '""'), obj_class, field],
+        )
 
 
 # -------------------------------------------------------------------------
@@ -84,29 +222,105 @@ class Connection:
     """
     The Sqlite class is an interface between the DBAPI class which is the Gramps
     backend for the DBAPI interface and the sqlite3 python module.
+
+    Statements are run on the primary connection by the thread which opened
+    the database.  Database files are opened in WAL mode, and the other
+    threads read through a pool of read-only connections.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, path, pool_size=0, **kwargs):
         """
         Create a new Sqlite instance.
 
         This connects to a sqlite3 database and creates a cursor instance.
 
-        :param args: arguments to be passed to the sqlite3 connect class at
-                     creation.
-        :type args: list
+        :param path: path to the database file, or ":memory:".
+        :type path: str
+        :param pool_size: maximum number of read-only connections lent to
+                          other threads.
+        :type pool_size: int
         :param kwargs: arguments to be passed to the sqlite3 connect class at
                        creation.
         :type kwargs: list
         """
         self.log = logging.getLogger(".sqlite")
-        self.__connection = sqlite3.connect(*args, **kwargs)
+        self.__path = path
+        self.__inherited = []
+        self.__connection = sqlite3.connect(path, **kwargs)
         self.__cursor = self.__connection.cursor()
         self.__connection.create_function("regexp", 2, regexp)
-        self.__collations = []
+        self.__collations = {}
+        self.__registered = {self.__connection: set()}
         self.__tmap = str.maketrans("-.@=;", "_____")
+        self.__owner = threading.get_ident()
+        self.__pool = None
+        if path != ":memory:" and self.__set_wal():
+            if pool_size > 0:
+                self.__pool = ReadPool(path, pool_size, self.__setup_reader)
         self.check_collation(glocale)
 
+    def __set_wal(self):
+        """
+        Switch the database file to WAL mode and tune it.
+
+        Return True if the database is in WAL mode.  This fails on a read-only
+        directory, in which case the rollback journal is kept.
+        """
+        try:
+            self.__cursor.execute("PRAGMA journal_mode = WAL;")
+            mode = self.__cursor.fetchone()[0]
+            for pragma in PRAGMAS:
+                self.__cursor.execute(pragma)
+        except sqlite3.DatabaseError as err:
+            self.log.warning("unable to set WAL mode: %s", err)
+            return False
+        return mode.lower() == "wal"
+
+    def __setup_reader(self, connection):
+        """
+        Prepare a new read-only connection of the pool.
+        """
+        connection.create_function("regexp", 2, regexp)
+        connection.execute("PRAGMA query_only = ON;")
+        for pragma in PRAGMAS[1:]:
+            connection.execute(pragma)
+
+    def reopen_reader(self):
+        """
+        Replace the connections inherited by a forked process with a
+        read-only connection of its own to the database file.
+        """
+        # The inherited connections are kept, as closing them could disturb
+        # the locks of the parent process.
+        self.__inherited.append((self.__connection, self.__cursor, self.__pool))
+        connection = sqlite3.connect(
+            "file:%s?mode=ro" % pathname2url(self.__path), uri=True
+        )
+        self.__setup_reader(connection)
+        for collation, func in self.__collations.items():
+            connection.create_collation(collation, func)
+        self.__connection = connection
+        self.__cursor = connection.cursor()
+        self.__registered = {connection: set(self.__collations)}
+        self.__owner = threading.get_ident()
+        self.__pool = None
+
+    def __current(self):
+        """
+        Return the connection and cursor used by the calling thread.
+        """
+        if self.__pool is None or threading.get_ident() == self.__owner:
+            return self.__connection, self.__cursor
+        return self.__pool.get()
+
+    def __done(self):
+        """
+        Give back the connection of the pool used by the calling thread once
+        the result of its statement is fetched.
+        """
+        if self.__pool is not None and threading.get_ident() != self.__owner:
+            self.__pool.release()
+
     def check_collation(self, locale):
         """
         Checks that a collation exists and if not creates it.
@@ -118,9 +332,12 @@ class Connection:
         # collation names so first translate any old-style Unicode locale
         # delimiters to underscores.
         collation = locale.get_collation().translate(self.__tmap)
-        if collation not in self.__collations:
-            self.__connection.create_collation(collation, locale.strcoll)
-            self.__collations.append(collation)
+        self.__collations.setdefault(collation, locale.strcoll)
+        connection = self.__current()[0]
+        registered = self.__registered.setdefault(connection, set())
+        if collation not in registered:
+            connection.create_collation(collation, self.__collations[collation])
+            registered.add(collation)
         return collation
 
     def execute(self, *args, **kwargs):
@@ -133,21 +350,37 @@ class Connection:
         :type kwargs: list
         """
         self.log.debug(args)
-        self.__cursor.execute(*args, **kwargs)
+        self.__current()[1].execute(*args, **kwargs)
+
+    def executemany(self, sql, seq_of_params):
+        """
+        Executes an SQL statement once for each set of parameters.
+
+        :param sql: the SQL statement to be executed
+        :type sql: str
+        :param seq_of_params: the parameters for each execution
+        :type seq_of_params: list
+        """
+        self.log.debug(sql)
+        self.__cursor.executemany(sql, seq_of_params)
 
     def fetchone(self):
         """
         Fetches the next row of a query result set, returning a single sequence,
         or None when no more data is available.
         """
-        return self.__cursor.fetchone()
+        row = self.__current()[1].fetchone()
+        self.__done()
+        return row
 
     def fetchall(self):
         """
         Fetches the next set of rows of a query result, returning a list. An
         empty list is returned when no more rows are available.
         """
-        return self.__cursor.fetchall()
+        rows = self.__current()[1].fetchall()
+        self.__done()
+        return rows
 
     def begin(self):
         """
@@ -171,6 +404,26 @@ class Connection:
         self.log.debug("ROLLBACK;")
         self.__connection.rollback()
 
+    @contextmanager
+    def read_snapshot(self):
+        """
+        Run the reads of the calling thread in a single read transaction.
+
+        The owner thread keeps reading its own writes.  Another thread gets a
+        read-only connection from the pool for the duration of the block,
+        and gives it back afterwards.
+        """
+        if self.__pool is None or threading.get_ident() == self.__owner:
+            yield
+            return
+        connection, cursor = self.__pool.hold()
+        cursor.execute("BEGIN;")
+        try:
+            yield
+        finally:
+            connection.rollback()
+            self.__pool.unhold()
+
     def table_exists(self, table):
         """
         Test whether the specified SQL database table exists.
@@ -187,18 +440,148 @@ class Connection:
         )
         return self.fetchone()[0] != 0
 
+    def column_exists(self, table, column):
+        """
+        Test whether the specified SQL database table has a column.
+
+        :param table: table name to check.
+        :type table: str
+        :param column: column name to check.
+        :type column: str
+        :returns: True if the column exists, false otherwise.
+        :rtype: bool
+        """
+        self.execute("PRAGMA table_info(%s)" % table)
+        return any(row[1] == column for row in self.fetchall())
+
     def close(self):
         """
         Close the current database.
         """
         self.log.debug("closing database...")
+        if self.__pool is not None:
+            self.__pool.close()
         self.__connection.close()
 
     def cursor(self):
         """
         Return a new cursor.
         """
-        return Cursor(self.__connection)
+        if self.__pool is None or threading.get_ident() == self.__owner:
+            return Cursor(self.__connection)
+        return Cursor(None, self.__pool)
+
+
+# -------------------------------------------------------------------------
+#
+# ReadPool class
+#
+# -------------------------------------------------------------------------
+class ReadPool:
+    """
+    A bounded pool of read-only connections to a database file.
+
+    A thread keeps the connection it gets until it calls release, while it
+    does not hold it, or until it ends.  Threads wait when all the
+    connections are lent, and fail after READ_TIMEOUT seconds.
+    """
+
+    def __init__(self, path, size, setup):
+        self.__uri = "file:%s?mode=ro" % pathname2url(path)
+        self.__setup = setup
+        self.__slots = threading.BoundedSemaphore(size)
+        self.__idle = []
+        self.__readers = []
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+
+    def get(self):
+        """
+        Return the connection and cursor lent to the calling thread.
+        """
+        lease = getattr(self.__local, "lease", None)
+        if lease is None:
+            if not self.__slots.acquire(timeout=READ_TIMEOUT):
+                raise DbException(
+                    _("All the read connections to the database are in use.")
+                )
+            with self.__lock:
+                if self.__idle:
+                    reader = self.__idle.pop()
+                else:
+                    reader = self.__open()
+            lease = self.__local.lease = _Lease(self, reader)
+        return lease.reader
+
+    def hold(self):
+        """
+        Return the connection and cursor lent to the calling thread, kept
+        until unhold is called, for a cursor or a snapshot.
+        """
+        reader = self.get()
+        self.__local.lease.holds += 1
+        return reader
+
+    def unhold(self):
+        """
+        Stop holding the connection lent to the calling thread, and give it
+        back if nothing else holds it.
+        """
+        self.__local.lease.holds -= 1
+        self.release()
+
+    def release(self):
+        """
+        Give back the connection lent to the calling thread, unless it is
+        held.
+        """
+        lease = getattr(self.__local, "lease", None)
+        if lease is not None and not lease.holds:
+            del self.__local.lease
+
+    def put(self, reader):
+        """
+        Return a connection to the idle list.
+        """
+        with self.__lock:
+            if reader in self.__readers:
+                # Do not hand over an open snapshot to the next thread.
+                reader[0].rollback()
+                self.__idle.append(reader)
+        self.__slots.release()
+
+    def __open(self):
+        connection = sqlite3.connect(self.__uri, uri=True, check_same_thread=False)
+        self.__setup(connection)
+        cursor = connection.cursor()
+        reader = (connection, cursor)
+        self.__readers.append(reader)
+        return reader
+
+    def close(self):
+        """
+        Close all the connections of the pool.
+        """
+        with self.__lock:
+            for connection, cursor in self.__readers:
+                connection.close()
+            self.__readers = []
+            self.__idle = []
+
+
+class _Lease:
+    """
+    A connection lent to a thread, given back when the thread forgets it.
+    """
+
+    def __init__(self, pool, reader):
+        self.pool = pool
+        self.reader = reader
+        # The number of cursors and snapshots using the connection.
+        self.holds = 0
+
+    def __del__(self):
+        self.pool.put(self.reader)
 
 
 # -------------------------------------------------------------------------
@@ -207,16 +590,21 @@ class Connection:
 #
 # -------------------------------------------------------------------------
 class Cursor:
-    def __init__(self, connection):
+    def __init__(self, connection, pool=None):
         self.__connection = connection
+        self.__pool = pool
 
     def __enter__(self):
+        if self.__pool is not None:
+            self.__connection = self.__pool.hold()[0]
         self.__cursor = self.__connection.cursor()
         self.__cursor.arraysize = ARRAYSIZE
         return self
 
     def __exit__(self, *args, **kwargs):
         self.__cursor.close()
+        if self.__pool is not None:
+            self.__pool.unhold()
 
     def execute(self, *args, **kwargs):
         """
@@ -229,12 +617,17 @@ class Cursor:
         """
         self.__cursor.execute(*args, **kwargs)
 
-    def fetchmany(self):
+    def fetchmany(self, size=None):
         """
         Fetches the next set of rows of a query result, returning a list. An
         empty list is returned when no more rows are available.
+
+        :param size: the number of rows to fetch, by default the arraysize.
+        :type size: int
         """
-        return self.__cursor.fetchmany()
+        if size is None:
+            return self.__cursor.fetchmany()
+        return self.__cursor.fetchmany(size)
 
 
 def regexp(expr, value):
@@ -0,0 +1,214 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the record codecs """
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.config import config
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbRecordFormatError, DbTxn
+from gramps.gen.db.dbconst import DBMODE_R, DBMODE_W
+from gramps.gen.db.utils import import_as_dict, make_database
+from gramps.gen.lib import Person, Tag
+from gramps.gen.user import User
+from gramps.plugins.db.dbapi.codec import (
+    FRAME_MAGIC,
+    PICKLE_PROTOCOL,
+    PickleCodec,
+    SchemaCodec,
+    get_codec,
+    unpack,
+)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+CLASSES = (
+    "Person",
+    "Family",
+    "Event",
+    "Place",
+    "Repository",
+    "Source",
+    "Citation",
+    "Media",
+    "Note",
+    "Tag",
+)
+
+
+# -------------------------------------------------------------------------
+#
+# CodecTest class
+#
+# -------------------------------------------------------------------------
+class CodecTest(unittest.TestCase):
+    """
+    Round trip the records of the example tree through each codec.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        db = import_as_dict(EXAMPLE, User())
+        cls.records = []
+        for class_name in CLASSES:
+            cursor_func = db.method("get_%s_cursor", class_name)
+            with cursor_func() as cursor:
+                for handle, data in cursor:
+                    cls.records.append((class_name, data))
+        db.close()
+
+    def __round_trip(self, codec):
+        for class_name, data in self.records:
+            blob = codec.pack(class_name, data)
+            self.assertEqual(unpack(blob), data)
+
+    def test_pickle(self):
+        self.__round_trip(PickleCodec())
+
+    def test_pickle_compressed(self):
+        self.__round_trip(PickleCodec(compress=True))
+
+    def test_schema(self):
+        self.__round_trip(SchemaCodec())
+
+    def test_schema_compressed(self):
+        self.__round_trip(SchemaCodec(compress=True))
+
+    def test_bare_pickle(self):
+        data = Person().serialize()
+        blob = PickleCodec().pack("Person", data)
+        self.assertEqual(blob, pickle.dumps(data))
+        self.assertEqual(unpack(blob), data)
+
+    def test_frame(self):
+        blob = SchemaCodec(compress=True).pack("Tag", Tag().serialize())
+        self.assertEqual(blob[0], FRAME_MAGIC)
+        self.assertEqual(blob[1], SchemaCodec.codec_id)
+
+    def test_schema_payload(self):
+        data = Tag().serialize()
+        payload = SchemaCodec().pack("Tag", data)[3:]
+        self.assertEqual(payload[:2], pickle.PROTO + bytes((PICKLE_PROTOCOL,)))
+        self.assertEqual(unpack(SchemaCodec().pack("Tag", data)), data)
+
+    def test_empty_values(self):
+        data = Person().serialize()
+        decoded = unpack(SchemaCodec().pack("Person", data))
+        self.assertEqual(decoded, data)
+        for value, orig in zip(decoded, data):
+            self.assertIs(type(value), type(orig))
+
+    def test_fresh_lists(self):
+        blob = SchemaCodec().pack("Person", Person().serialize())
+        first = unpack(blob)
+        first[4].append("changed")
+        self.assertEqual(unpack(blob)[4], [])
+
+    def test_get_codec(self):
+        codec = get_codec("schema", True)
+        self.assertIsInstance(codec, SchemaCodec)
+        self.assertTrue(codec.compress)
+        self.assertRaises(ValueError, get_codec, "unknown")
+
+
+# -------------------------------------------------------------------------
+#
+# RecordFormatTest class
+#
+# -------------------------------------------------------------------------
+class RecordFormatTest(unittest.TestCase):
+    """
+    Converting the records of a tree to the record format of the
+    preferences.
+    """
+
+    def setUp(self):
+        self.settings = (
+            config.get("database.blob-codec"),
+            config.get("database.compress-blobs"),
+        )
+        self.directory = tempfile.mkdtemp()
+        self.set_format("pickle", False)
+        db = make_database("sqlite")
+        db.load(self.directory)
+        with DbTxn("Add person", db) as trans:
+            self.handle = db.add_person(Person(), trans)
+        self.data = db.get_raw_person_data(self.handle)
+        db.close()
+
+    def tearDown(self):
+        self.set_format(*self.settings)
+        shutil.rmtree(self.directory)
+
+    def set_format(self, name, compress):
+        config.set("database.blob-codec", name)
+        config.set("database.compress-blobs", compress)
+
+    def load(self, *args):
+        db = make_database("sqlite")
+        db.load(self.directory, None, *args)
+        return db
+
+    def check(self, db, frame, marked):
+        self.assertEqual(db.get_raw_person_data(self.handle), self.data)
+        db.dbapi.execute("SELECT blob_data FROM person")
+        self.assertEqual(db.dbapi.fetchone()[0][0] == FRAME_MAGIC, frame)
+        self.assertEqual(db.get_schema_version(), db.VERSION[0])
+        version = int(db._get_metadata("version"))
+        self.assertEqual(version > db.VERSION[0], marked)
+
+    def test_convert(self):
+        self.set_format("schema", True)
+        self.assertRaises(DbRecordFormatError, self.load)
+        db = self.load(DBMODE_R)
+        self.check(db, False, False)
+        db.close()
+        db = self.load(DBMODE_W, True)
+        self.check(db, True, True)
+        db.close()
+        db = self.load()
+        self.check(db, True, True)
+        db.close()
+
+        self.set_format("pickle", False)
+        self.assertRaises(DbRecordFormatError, self.load)
+        db = self.load(DBMODE_W, True)
+        self.check(db, False, False)
+        db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
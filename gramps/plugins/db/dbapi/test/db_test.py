@@ -23,16 +23,29 @@
 # Standard python modules
 #
 # -------------------------------------------------------------------------
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 # -------------------------------------------------------------------------
 #
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from gramps.gen.config import config
 from gramps.gen.db import DbTxn
+from gramps.gen.db.dbconst import ARRAYSIZE, DBMODE_R, DBMODE_W
+from gramps.gen.db.exceptions import DbUpgradeRequiredError
 from gramps.gen.db.utils import make_database
+from gramps.gen.errors import HandleError
+from gramps.gen.proxy import PrivateProxyDb
+from gramps.gen.proxy.cache import CacheProxyDb
+from gramps.gen.utils.location import get_location_list, located_in
 from gramps.gen.lib import (
+    ChildRef,
+    Date,
+    EventRef,
     Person,
     Family,
     Event,
@@ -45,7 +58,11 @@ from gramps.gen.lib import (
     Tag,
     Researcher,
     Surname,
+    PlaceName,
+    PlaceRef,
+    PlaceType,
 )
+from gramps.plugins.db.dbapi import dbapi
 
 
 # -------------------------------------------------------------------------
@@ -418,6 +435,154 @@ class DbRandomTest(unittest.TestCase):
             Tag, self.db.get_tag_handles, self.db.get_tag_from_handle
         )
 
+    ################################################################
+    #
+    # Test get_*_from_handles methods
+    #
+    ################################################################
+
+    def __get_from_handles_test(self, obj_class, handles_func, get_func):
+        handles = list(reversed(handles_func()))
+        objects = get_func(handles)
+        self.assertEqual(len(objects), len(handles))
+        for handle, obj in zip(handles, objects):
+            self.assertIsInstance(obj, obj_class)
+            self.assertEqual(obj.handle, handle)
+
+    def test_get_person_from_handles(self):
+        self.__get_from_handles_test(
+            Person, self.db.get_person_handles, self.db.get_person_from_handles
+        )
+
+    def test_get_event_from_handles(self):
+        self.__get_from_handles_test(
+            Event, self.db.get_event_handles, self.db.get_event_from_handles
+        )
+
+    def test_get_tag_from_handles(self):
+        self.__get_from_handles_test(
+            Tag, self.db.get_tag_handles, self.db.get_tag_from_handles
+        )
+
+    def test_get_from_handles_missing(self):
+        handles = self.db.get_note_handles() + ["unknown"]
+        self.assertRaises(HandleError, self.db.get_note_from_handles, handles)
+
+    def test_iter_raw_data(self):
+        handles = self.db.get_family_handles()
+        raw = dict(self.db.iter_raw_family_data(handles + ["unknown"]))
+        self.assertEqual(set(raw), set(handles))
+        for handle in handles:
+            self.assertEqual(raw[handle], self.db.get_raw_family_data(handle))
+
+    def test_get_from_handles_proxy(self):
+        person = self.db.get_person_from_handle(self.handles["Person"][0])
+        person.set_privacy(True)
+        with DbTxn("Set privacy", self.db) as trans:
+            self.db.commit_person(person, trans)
+        proxy = PrivateProxyDb(self.db)
+        people = proxy.get_person_from_handles(self.handles["Person"])
+        self.assertIsNone(people[0])
+        self.assertEqual(len([obj for obj in people if obj]), 9)
+        raw = dict(proxy.iter_raw_person_data(self.handles["Person"]))
+        self.assertNotIn(person.handle, raw)
+        self.assertEqual(len(raw), 9)
+        self.__get_from_handles_test(
+            Place, proxy.get_place_handles, proxy.get_place_from_handles
+        )
+
+    def test_get_from_handles_cache(self):
+        proxy = CacheProxyDb(self.db)
+        handles = self.db.get_source_handles()
+        first = proxy.get_source_from_handle(handles[0])
+        sources = proxy.get_source_from_handles(handles)
+        self.assertIs(sources[0], first)
+        self.assertEqual([obj.handle for obj in sources], handles)
+        self.assertIs(proxy.get_source_from_handle(handles[-1]), sources[-1])
+
+    ################################################################
+    #
+    # Test secondary columns
+    #
+    ################################################################
+
+    def __get_columns(self, handle):
+        self.db.dbapi.execute(
+            "SELECT gramps_id, surname FROM person WHERE handle = ?", [handle]
+        )
+        return self.db.dbapi.fetchone()
+
+    def test_commit_secondary_values(self):
+        handle = self.handles["Person"][0]
+        person = self.db.get_person_from_handle(handle)
+        old_columns = self.__get_columns(handle)
+        person.gramps_id = "I9999"
+        surname = Surname()
+        surname.surname = "Morgan"
+        person.primary_name.set_surname_list([surname])
+        with DbTxn("Edit person", self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.assertEqual(self.__get_columns(handle), ("I9999", "Morgan"))
+        self.db.undo()
+        self.assertEqual(self.__get_columns(handle), old_columns)
+        self.db.redo()
+        self.assertEqual(self.__get_columns(handle), ("I9999", "Morgan"))
+
+    ################################################################
+    #
+    # Test streaming iterators
+    #
+    ################################################################
+
+    def test_iter_handles_chunked(self):
+        self.db.chunk_size = 3
+        try:
+            handles = []
+            for handle in self.db.iter_person_handles():
+                # Other queries must not disturb the iteration.
+                self.assertEqual(self.db.get_number_of_people(), 10)
+                self.db.get_person_from_handle(handle)
+                handles.append(handle)
+        finally:
+            self.db.chunk_size = ARRAYSIZE
+        self.assertCountEqual(handles, self.handles["Person"])
+
+    def test_iter_while_adding(self):
+        # People added while iterating are not returned.
+        self.db.chunk_size = 3
+        try:
+            for iterate in (
+                self.db.iter_person_handles,
+                lambda: (handle for handle, data in self.db.get_person_cursor()),
+            ):
+                expected = list(self.handles["Person"])
+                handles = []
+                with DbTxn("Add people", self.db) as trans:
+                    for handle in iterate():
+                        handles.append(handle)
+                        self.handles["Person"].append(
+                            self.db.add_person(Person(), trans)
+                        )
+                self.assertCountEqual(handles, expected)
+        finally:
+            self.db.chunk_size = ARRAYSIZE
+
+    def test_find_backlink_handles_classes(self):
+        note_handle = self.handles["Note"][0]
+        event = self.db.get_event_from_handle(self.handles["Event"][0])
+        event.add_note(note_handle)
+        source = self.db.get_source_from_handle(self.handles["Source"][0])
+        source.add_note(note_handle)
+        with DbTxn("Add notes", self.db) as trans:
+            self.db.commit_event(event, trans)
+            self.db.commit_source(source, trans)
+        backlinks = list(self.db.find_backlink_handles(note_handle))
+        self.assertCountEqual(
+            backlinks, [("Event", event.handle), ("Source", source.handle)]
+        )
+        backlinks = list(self.db.find_backlink_handles(note_handle, ["Source"]))
+        self.assertEqual(backlinks, [("Source", source.handle)])
+
     ################################################################
     #
     # Test get_*_from_gramps_id methods
@@ -899,5 +1064,791 @@ class DbPersonTest(unittest.TestCase):
         self.assertEqual(saved["Mary"], (1, 3, 1))
 
 
+# -------------------------------------------------------------------------
+#
+# DbPlaceTest class
+#
+# -------------------------------------------------------------------------
+class DbPlaceTest(unittest.TestCase):
+    """
+    Tests of the place hierarchy queries.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def __add_place(self, name, place_type, trans, *parents):
+        place = Place()
+        place.set_name(PlaceName(value=name))
+        place.set_type(place_type)
+        for parent in parents:
+            placeref = PlaceRef()
+            placeref.ref = parent
+            place.add_placeref(placeref)
+        return self.db.add_place(place, trans)
+
+    def setUp(self):
+        with DbTxn("Add places", self.db) as trans:
+            self.country = self.__add_place("England", PlaceType.COUNTRY, trans)
+            self.county1 = self.__add_place(
+                "Kent", PlaceType.COUNTY, trans, self.country
+            )
+            self.county2 = self.__add_place(
+                "Surrey", PlaceType.COUNTY, trans, self.country
+            )
+            self.city = self.__add_place(
+                "London", PlaceType.CITY, trans, self.county1, self.county2
+            )
+            self.other = self.__add_place("Wales", PlaceType.COUNTRY, trans)
+
+    def tearDown(self):
+        with DbTxn("Remove places", self.db) as trans:
+            for handle in self.db.get_place_handles():
+                self.db.remove_place(handle, trans)
+
+    def __handles(self, places):
+        return sorted(place.handle for place in places)
+
+    def test_ancestry(self):
+        places = self.db.get_place_ancestry([self.city])
+        self.assertEqual(
+            self.__handles(places),
+            sorted([self.city, self.county1, self.county2, self.country]),
+        )
+        places = self.db.get_place_ancestry([self.county1, self.other])
+        self.assertEqual(
+            self.__handles(places), sorted([self.county1, self.country, self.other])
+        )
+
+    def test_subtree(self):
+        places = self.db.get_place_subtree([self.country])
+        self.assertEqual(
+            self.__handles(places),
+            sorted([self.city, self.county1, self.county2, self.country]),
+        )
+        places = self.db.get_place_subtree([self.county2])
+        self.assertEqual(self.__handles(places), sorted([self.county2, self.city]))
+
+    def test_ancestry_cycle(self):
+        country = self.db.get_place_from_handle(self.country)
+        placeref = PlaceRef()
+        placeref.ref = self.city
+        country.add_placeref(placeref)
+        with DbTxn("Add cycle", self.db) as trans:
+            self.db.commit_place(country, trans)
+        places = self.db.get_place_ancestry([self.county1])
+        self.assertEqual(len(places), 4)
+        self.assertTrue(located_in(self.db, self.city, self.city))
+
+    def test_tree_cursor(self):
+        order = []
+        with self.db.get_place_tree_cursor() as cursor:
+            for handle, data in cursor:
+                order.append(handle)
+        self.assertCountEqual(
+            order, [self.country, self.county1, self.county2, self.city, self.other]
+        )
+        self.assertLess(order.index(self.country), order.index(self.county1))
+        self.assertLess(order.index(self.county1), order.index(self.city))
+
+    def test_location_list(self):
+        city = self.db.get_place_from_handle(self.city)
+        names = [name for name, place_type in get_location_list(self.db, city)]
+        self.assertEqual(names, ["London", "Kent", "England"])
+        # An uncommitted change to the references is followed.
+        city.get_placeref_list().reverse()
+        names = [name for name, place_type in get_location_list(self.db, city)]
+        self.assertEqual(names, ["London", "Surrey", "England"])
+
+    def test_located_in(self):
+        self.assertTrue(located_in(self.db, self.city, self.country))
+        self.assertTrue(located_in(self.db, self.city, self.county2))
+        self.assertFalse(located_in(self.db, self.county1, self.city))
+        self.assertFalse(located_in(self.db, self.city, self.other))
+
+
+# -------------------------------------------------------------------------
+#
+# DbTextIndexTest class
+#
+# -------------------------------------------------------------------------
+class DbTextIndexTest(unittest.TestCase):
+    """
+    Tests of the full-text index.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def setUp(self):
+        with DbTxn("Add objects", self.db) as trans:
+            self.note1 = self.db.add_note(Note("The quick brown fox"), trans)
+            self.note2 = self.db.add_note(Note("Jumps over\nthe lazy dog"), trans)
+            source = Source()
+            source.set_title("Parish Register")
+            self.source = self.db.add_source(source, trans)
+            person = Person()
+            person.get_primary_name().set_first_name("Ada")
+            person.get_primary_name().get_primary_surname().set_surname("Lovelace")
+            self.person = self.db.add_person(person, trans)
+
+    def tearDown(self):
+        with DbTxn("Remove objects", self.db) as trans:
+            for handle in self.db.get_note_handles():
+                self.db.remove_note(handle, trans)
+            for handle in self.db.get_source_handles():
+                self.db.remove_source(handle, trans)
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+
+    def test_find_text(self):
+        self.assertTrue(self.db.has_text_index())
+        self.assertEqual(self.db.find_text("Note", "text", "QUICK"), {self.note1})
+        self.assertEqual(
+            self.db.find_text("Note", "text", "o"), {self.note1, self.note2}
+        )
+        self.assertEqual(self.db.find_text("Note", "text", "fox jumps"), set())
+        self.assertEqual(self.db.find_text("Source", "title", "regis"), {self.source})
+        self.assertEqual(self.db.find_text("Person", "name", "lace"), {self.person})
+        self.assertEqual(self.db.find_text("Person", "name", "ada love"), set())
+
+    def test_commit(self):
+        note = self.db.get_note_from_handle(self.note1)
+        note.set("A slow red fox")
+        with DbTxn("Edit note", self.db) as trans:
+            self.db.commit_note(note, trans)
+        self.assertEqual(self.db.find_text("Note", "text", "quick"), set())
+        self.assertEqual(self.db.find_text("Note", "text", "slow"), {self.note1})
+        self.db.undo()
+        self.assertEqual(self.db.find_text("Note", "text", "quick"), {self.note1})
+        self.assertEqual(self.db.find_text("Note", "text", "slow"), set())
+
+    def test_remove(self):
+        with DbTxn("Remove note", self.db) as trans:
+            self.db.remove_note(self.note2, trans)
+        self.assertEqual(self.db.find_text("Note", "text", "lazy"), set())
+        self.db.undo()
+        self.assertEqual(self.db.find_text("Note", "text", "lazy"), {self.note2})
+
+    def test_batch(self):
+        with DbTxn("Add notes", self.db, batch=True) as trans:
+            handle = self.db.add_note(Note("Batch note"), trans)
+            self.assertEqual(self.db.find_text("Note", "text", "batch"), {handle})
+
+    def test_proxy(self):
+        self.assertFalse(PrivateProxyDb(self.db).has_text_index())
+
+
+# -------------------------------------------------------------------------
+#
+# DbDateIndexTest class
+#
+# -------------------------------------------------------------------------
+class DbDateIndexTest(unittest.TestCase):
+    """
+    Tests of the date columns of events and people.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def setUp(self):
+        with DbTxn("Add objects", self.db) as trans:
+            self.birth = self.__add_event(Date(1850, 3, 12), trans)
+            self.death = self.__add_event(Date(1910, 7, 1), trans)
+            span = Date()
+            span.set(
+                modifier=Date.MOD_SPAN,
+                value=(0, 0, 1880, False, 0, 0, 1890, False),
+            )
+            self.span = self.__add_event(span, trans)
+            about = Date(1900)
+            about.set_modifier(Date.MOD_ABOUT)
+            self.about = self.__add_event(about, trans)
+            self.empty = self.__add_event(Date(), trans)
+            person = Person()
+            refs = []
+            for handle in (self.birth, self.death):
+                ref = EventRef()
+                ref.set_reference_handle(handle)
+                person.add_event_ref(ref)
+                refs.append(ref)
+            person.set_birth_ref(refs[0])
+            person.set_death_ref(refs[1])
+            self.person = self.db.add_person(person, trans)
+            self.nobody = self.db.add_person(Person(), trans)
+
+    def tearDown(self):
+        with DbTxn("Remove objects", self.db) as trans:
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+            for handle in self.db.get_event_handles():
+                self.db.remove_event(handle, trans)
+
+    def __add_event(self, date, trans):
+        event = Event()
+        event.set_date_object(date)
+        return self.db.add_event(event, trans)
+
+    def test_matching_date(self):
+        self.assertTrue(self.db.has_date_index())
+        self.assertEqual(
+            self.db.find_events_matching_date(Date(1850)), {self.birth, self.about}
+        )
+        self.assertEqual(
+            self.db.find_events_matching_date(Date(1885)), {self.span, self.about}
+        )
+        self.assertEqual(self.db.find_events_matching_date(Date(1930)), {self.about})
+        self.assertEqual(self.db.find_events_matching_date(Date(1700)), set())
+
+    def test_date_range(self):
+        self.assertEqual(
+            self.db.find_events_in_date_range(Date(1849), Date(1885)),
+            [self.birth, self.span],
+        )
+        self.assertEqual(
+            self.db.find_events_in_date_range(Date(1895)),
+            [self.about, self.death],
+        )
+        self.assertEqual(len(self.db.find_events_in_date_range()), 4)
+
+    def test_on_day(self):
+        self.assertEqual(self.db.find_events_on_day(3, 12), {self.birth})
+        self.assertEqual(self.db.find_events_on_day(7), {self.death})
+        self.assertEqual(self.db.find_events_on_day(7, 2), set())
+
+    def test_person_sortvals(self):
+        sortvals = self.db.get_person_date_sortvals()
+        self.assertEqual(
+            sortvals[self.person],
+            (Date(1850, 3, 12).sortval, Date(1910, 7, 1).sortval),
+        )
+        self.assertEqual(sortvals[self.nobody], (0, 0))
+
+    def test_commit(self):
+        event = self.db.get_event_from_handle(self.birth)
+        event.set_date_object(Date(1851, 4, 1))
+        with DbTxn("Edit event", self.db) as trans:
+            self.db.commit_event(event, trans)
+        self.assertEqual(self.db.find_events_on_day(4, 1), {self.birth})
+        self.assertEqual(
+            self.db.get_person_date_sortvals()[self.person][0],
+            Date(1851, 4, 1).sortval,
+        )
+        self.db.undo()
+        self.assertEqual(self.db.find_events_on_day(3, 12), {self.birth})
+        self.assertEqual(
+            self.db.get_person_date_sortvals()[self.person][0],
+            Date(1850, 3, 12).sortval,
+        )
+
+    def test_remove(self):
+        with DbTxn("Remove event", self.db) as trans:
+            self.db.remove_event(self.death, trans)
+        self.assertIsNone(self.db.get_person_date_sortvals()[self.person][1])
+        self.db.undo()
+        self.assertEqual(
+            self.db.get_person_date_sortvals()[self.person][1],
+            Date(1910, 7, 1).sortval,
+        )
+
+    def test_batch(self):
+        with DbTxn("Add objects", self.db, batch=True) as trans:
+            person = Person()
+            ref = EventRef()
+            ref.set_reference_handle("BATCHBIRTH")
+            person.add_event_ref(ref)
+            person.set_birth_ref(ref)
+            handle = self.db.add_person(person, trans)
+            event = Event()
+            event.set_handle("BATCHBIRTH")
+            event.set_date_object(Date(1700, 1, 2))
+            self.db.add_event(event, trans)
+            self.assertEqual(self.db.find_events_on_day(1, 2), {"BATCHBIRTH"})
+            self.assertEqual(
+                self.db.get_person_date_sortvals()[handle],
+                (Date(1700, 1, 2).sortval, 0),
+            )
+
+    def test_proxy(self):
+        proxy = PrivateProxyDb(self.db)
+        self.assertFalse(proxy.has_date_index())
+        self.assertEqual(proxy.find_events_on_day(3, 12), {self.birth})
+        self.assertEqual(
+            proxy.find_events_in_date_range(Date(1849), Date(1885)),
+            [self.birth, self.span],
+        )
+
+
+# -------------------------------------------------------------------------
+#
+# DbDateColumnsTest class
+#
+# -------------------------------------------------------------------------
+class DbDateColumnsTest(unittest.TestCase):
+    """
+    Tests of the date columns added to a database created without them.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def create(self, upgrade=0):
+        """
+        Create a database without the date columns, whose schema version is
+        behind by upgrade.
+        """
+        db = make_database("sqlite")
+        db.load(self.directory)
+        event = Event()
+        event.set_date_object(Date(1850, 3, 12))
+        with DbTxn("Add event", db) as trans:
+            self.event = db.add_event(event, trans)
+        for index in ("event_date_sortval", "event_date_month_day"):
+            db.dbapi.execute("DROP INDEX %s" % index)
+        for index in ("person_birth_handle", "person_death_handle"):
+            db.dbapi.execute("DROP INDEX %s" % index)
+        for table, columns in dbapi.DATE_COLUMNS.items():
+            for column, dummy in columns:
+                db.dbapi.execute("ALTER TABLE %s DROP COLUMN %s" % (table, column))
+        db.dbapi.commit()
+        db.set_schema_version(db.VERSION[0] - upgrade)
+        db.close()
+
+    def load(self, mode=DBMODE_W):
+        db = make_database("sqlite")
+        db.load(self.directory, mode=mode)
+        self.addCleanup(db.close)
+        return db
+
+    def test_add_columns(self):
+        self.create()
+        db = self.load()
+        self.assertTrue(db.has_date_index())
+        self.assertEqual(db.find_events_matching_date(Date(1850)), {self.event})
+
+    def test_upgrade_required(self):
+        self.create(upgrade=1)
+        db = make_database("sqlite")
+        with self.assertRaises(DbUpgradeRequiredError):
+            db.load(self.directory)
+        db = self.load(DBMODE_R)
+        self.assertFalse(db.dbapi.column_exists("event", "date_sortval"))
+
+
+# -------------------------------------------------------------------------
+#
+# DbClosureTableTest class
+#
+# -------------------------------------------------------------------------
+class DbClosureTableTest(unittest.TestCase):
+    """
+    Tests of the closure table of ancestors.
+
+    gf has a son fa, who has the children a and b. a has the child c.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.closure_table = config.get("database.closure-table")
+        config.set("database.closure-table", True)
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    @classmethod
+    def tearDownClass(cls):
+        config.set("database.closure-table", cls.closure_table)
+
+    def setUp(self):
+        with DbTxn("Add tree", self.db) as trans:
+            for name in ("gf", "fa", "a", "b", "c", "x"):
+                setattr(self, name, self.db.add_person(Person(), trans))
+            self.fam0 = self.__add_family(self.gf, [self.fa], trans)
+            self.fam1 = self.__add_family(self.fa, [self.a, self.b], trans)
+            self.fam2 = self.__add_family(self.a, [self.c], trans)
+
+    def tearDown(self):
+        with DbTxn("Remove tree", self.db) as trans:
+            for handle in self.db.get_family_handles():
+                self.db.remove_family(handle, trans)
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+
+    def __add_family(self, father, children, trans):
+        family = Family()
+        family.set_father_handle(father)
+        for child in children:
+            ref = ChildRef()
+            ref.set_reference_handle(child)
+            family.add_child_ref(ref)
+        handle = self.db.add_family(family, trans)
+        for child in children:
+            person = self.db.get_person_from_handle(child)
+            person.add_parent_family_handle(handle)
+            self.db.commit_person(person, trans)
+        return handle
+
+    def test_generations(self):
+        self.assertTrue(self.db.has_closure_table())
+        self.assertEqual(
+            self.db.get_ancestor_handles(self.c), {self.c, self.a, self.fa, self.gf}
+        )
+        self.assertEqual(self.db.get_ancestor_handles(self.c, 2), {self.fa, self.gf})
+        self.assertEqual(self.db.get_ancestor_handles(self.c, 1, 2), {self.a, self.fa})
+        self.assertEqual(
+            self.db.get_descendant_handles(self.gf, 2, 2), {self.a, self.b}
+        )
+        self.assertEqual(self.db.get_descendant_handles(self.gf, 0, 0), {self.gf})
+
+    def test_commit(self):
+        family = self.db.get_family_from_handle(self.fam0)
+        family.set_father_handle(self.x)
+        with DbTxn("Change father", self.db) as trans:
+            self.db.commit_family(family, trans)
+        self.assertEqual(self.db.get_ancestor_handles(self.c, 3), {self.x})
+        self.assertEqual(self.db.get_descendant_handles(self.gf, 1), set())
+        self.db.undo()
+        self.assertEqual(self.db.get_ancestor_handles(self.c, 3), {self.gf})
+
+    def test_remove(self):
+        with DbTxn("Remove person", self.db) as trans:
+            self.db.remove_person(self.fa, trans)
+        self.assertEqual(self.db.get_ancestor_handles(self.c, 1), {self.a})
+        self.assertEqual(self.db.get_descendant_handles(self.gf, 1), set())
+
+    def test_batch(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            self.__add_family(self.c, [self.x], trans)
+        self.assertEqual(self.db.get_descendant_handles(self.gf, 4), {self.x})
+
+    def test_rebuild(self):
+        self.db.rebuild_secondary()
+        self.assertEqual(self.db.get_ancestor_handles(self.c, 3), {self.gf})
+
+    def test_fallback(self):
+        proxy = PrivateProxyDb(self.db)
+        self.assertFalse(proxy.has_closure_table())
+        self.assertEqual(proxy.get_ancestor_handles(self.c, 2), {self.fa, self.gf})
+
+
+# -------------------------------------------------------------------------
+#
+# DbChangeLogTest class
+#
+# -------------------------------------------------------------------------
+class DbChangeLogTest(unittest.TestCase):
+    """
+    Tests of the change counters and the log of the changed objects.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add people", self.db) as trans:
+            self.handles = [self.db.add_person(Person(), trans) for dummy in "abc"]
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_changes(self):
+        since = self.db.get_change_counter("Person")
+        family = self.db.get_change_counter("Family")
+        self.assertEqual(self.db.get_changed_handles("Person", since), set())
+        person = self.db.get_person_from_handle(self.handles[0])
+        with DbTxn("Change people", self.db) as trans:
+            self.db.commit_person(person, trans)
+            self.db.remove_person(self.handles[1], trans)
+        self.assertGreater(self.db.get_change_counter("Person"), since)
+        self.assertEqual(self.db.get_change_counter("Family"), family)
+        self.assertEqual(
+            self.db.get_changed_handles("Person", since), set(self.handles[:2])
+        )
+        since = self.db.get_change_counter("Person")
+        self.db.undo()
+        self.assertEqual(
+            self.db.get_changed_handles("Person", since), set(self.handles[:2])
+        )
+
+    def test_batch(self):
+        since = self.db.get_change_counter("Person")
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            handle = self.db.add_person(Person(), trans)
+        self.assertEqual(self.db.get_changed_handles("Person", since), {handle})
+
+    def test_horizon(self):
+        since = self.db.get_change_counter("Person")
+        with mock.patch.object(dbapi, "CHANGE_LOG_SIZE", 2):
+            with DbTxn("Add people", self.db) as trans:
+                for dummy in range(3):
+                    self.db.add_person(Person(), trans)
+        self.assertIsNone(self.db.get_changed_handles("Person", since))
+
+    def test_load(self):
+        since = self.db.get_change_counter("Person")
+        self.db.close()
+        self.db.load(":memory:")
+        self.assertGreater(self.db.get_change_counter("Person"), since)
+        self.assertIsNone(self.db.get_changed_handles("Person", since))
+
+    def test_proxy(self):
+        proxy = PrivateProxyDb(self.db)
+        self.assertIsNone(proxy.get_change_counter("Person"))
+        cache = CacheProxyDb(self.db)
+        self.assertEqual(
+            cache.get_change_counter("Person"), self.db.get_change_counter("Person")
+        )
+
+
+# -------------------------------------------------------------------------
+#
+# DbBatchTest class
+#
+# -------------------------------------------------------------------------
+class DbBatchTest(unittest.TestCase):
+    """
+    Tests of commits made in a batch transaction.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+        cls.batch_size = config.get("database.batch-size")
+        config.set("database.batch-size", 3)
+
+    @classmethod
+    def tearDownClass(cls):
+        config.set("database.batch-size", cls.batch_size)
+
+    def tearDown(self):
+        with DbTxn("Remove test objects", self.db) as trans:
+            for handle in self.db.get_family_handles():
+                self.db.remove_family(handle, trans)
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+
+    def __add_person(self, first_name, surname, trans):
+        person = Person()
+        person.gender = Person.FEMALE
+        person.primary_name.first_name = first_name
+        surname1 = Surname()
+        surname1.surname = surname
+        person.primary_name.set_surname_list([surname1])
+        self.db.add_person(person, trans)
+        return person
+
+    def test_batch_commit(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            people = [self.__add_person("Mary", "Allen%d" % i, trans) for i in range(7)]
+            family = Family()
+            family.set_mother_handle(people[0].handle)
+            for person in people[1:]:
+                ref = ChildRef()
+                ref.ref = person.handle
+                family.add_child_ref(ref)
+            self.db.add_family(family, trans)
+        self.assertEqual(self.db.get_number_of_people(), 7)
+        for person in people:
+            stored = self.db.get_person_from_handle(person.handle)
+            self.assertEqual(stored.serialize(), person.serialize())
+            self.assertEqual(
+                list(self.db.find_backlink_handles(person.handle)),
+                [("Family", family.handle)],
+            )
+        self.assertIn("Allen6", self.db.get_surname_list())
+        self.assertEqual(
+            self.db.get_person_from_gramps_id(people[4].gramps_id).handle,
+            people[4].handle,
+        )
+
+    def test_batch_read_pending(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            person = self.__add_person("Agnes", "Baker", trans)
+            self.assertTrue(self.db.has_person_handle(person.handle))
+            stored = self.db.get_person_from_handle(person.handle)
+            stored.primary_name.first_name = "Jane"
+            self.db.commit_person(stored, trans)
+            self.assertTrue(self.db.has_person_gramps_id(person.gramps_id))
+        stored = self.db.get_person_from_handle(person.handle)
+        self.assertEqual(stored.primary_name.first_name, "Jane")
+        self.assertEqual(self.db.genderStats.name_stats("Jane"), (0, 1, 0))
+        self.assertEqual(self.db.genderStats.name_stats("Agnes"), (0, 0, 0))
+
+    def test_batch_abort(self):
+        try:
+            with DbTxn("Batch", self.db, batch=True) as trans:
+                self.__add_person("Mary", "Clark", trans)
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(self.db.get_number_of_people(), 0)
+
+
+# -------------------------------------------------------------------------
+#
+# DbBulkLoadTest class
+#
+# -------------------------------------------------------------------------
+class DbBulkLoadTest(unittest.TestCase):
+    """
+    Tests of objects loaded in bulk in a batch transaction.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.closure_table = config.get("database.closure-table")
+        config.set("database.closure-table", True)
+        cls.batch_size = config.get("database.batch-size")
+        config.set("database.batch-size", 3)
+
+    @classmethod
+    def tearDownClass(cls):
+        config.set("database.closure-table", cls.closure_table)
+        config.set("database.batch-size", cls.batch_size)
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def __load(self, db, trans, prefix=""):
+        """
+        Add a small family tree with fixed handles.
+        """
+        place = Place()
+        place.set_handle(prefix + "place0")
+        place.set_name(PlaceName(value="Town"))
+        db.add_place(place, trans)
+        event = Event()
+        event.set_handle(prefix + "event0")
+        event.set_date_object(Date(1900, 5, 1))
+        event.set_place_handle(place.handle)
+        db.add_event(event, trans)
+        note = Note("Born in town")
+        note.set_handle(prefix + "note0")
+        db.add_note(note, trans)
+        people = []
+        for index in range(5):
+            person = Person()
+            person.set_handle("%sperson%d" % (prefix, index))
+            person.primary_name.first_name = "Ann"
+            surname = Surname()
+            surname.surname = "Baker%d" % index
+            person.primary_name.set_surname_list([surname])
+            db.add_person(person, trans)
+            people.append(person)
+        ref = EventRef()
+        ref.ref = event.handle
+        people[1].add_event_ref(ref)
+        people[1].set_birth_ref(ref)
+        people[1].add_note(note.handle)
+        family = Family()
+        family.set_handle(prefix + "family0")
+        family.set_father_handle(people[0].handle)
+        for person in people[1:3]:
+            ref = ChildRef()
+            ref.ref = person.handle
+            family.add_child_ref(ref)
+            person.add_parent_family_handle(family.handle)
+        db.add_family(family, trans)
+        people[0].add_family_handle(family.handle)
+        for person in people[:3]:
+            db.commit_person(person, trans)
+        return people
+
+    def __dump(self, db):
+        """
+        Return the rows of the tables, without the serialized objects and
+        the row ids of the full-text index, and the names of the indices.
+        """
+        dump = {}
+        db.dbapi.execute("SELECT name, type FROM sqlite_master ORDER BY name")
+        tables = db.dbapi.fetchall()
+        dump["indices"] = [name for name, type_ in tables if type_ == "index"]
+        for name, type_ in tables:
+            if type_ != "table" or name == "metadata" or name.startswith("text_"):
+                continue
+            db.dbapi.execute("SELECT name FROM pragma_table_info(?)", [name])
+            columns = [row[0] for row in db.dbapi.fetchall()]
+            db.dbapi.execute("SELECT * FROM %s" % name)
+            dump[name] = sorted(
+                repr(
+                    [
+                        value
+                        for column, value in zip(columns, row)
+                        if column != "blob_data"
+                    ]
+                )
+                for row in db.dbapi.fetchall()
+            )
+        db.dbapi.execute("SELECT obj_class, handle, field, value FROM text_value")
+        dump["text_value"] = sorted(db.dbapi.fetchall())
+        return dump
+
+    def test_content(self):
+        expected = make_database("sqlite")
+        expected.load(":memory:")
+        with DbTxn("Load", expected, batch=True) as trans:
+            self.__load(expected, trans)
+        with DbTxn("Load", self.db, batch=True) as trans:
+            self.assertTrue(self.db.start_bulk_load())
+            self.__load(self.db, trans)
+        self.assertEqual(self.__dump(self.db), self.__dump(expected))
+        with DbTxn("Load", expected, batch=True) as trans:
+            self.__load(expected, trans, "new")
+        with DbTxn("Load", self.db, batch=True) as trans:
+            self.assertTrue(self.db.start_bulk_load())
+            self.__load(self.db, trans, "new")
+        self.assertEqual(self.__dump(self.db), self.__dump(expected))
+        expected.close()
+
+    def test_not_batch(self):
+        with DbTxn("Load", self.db) as trans:
+            self.assertFalse(self.db.start_bulk_load())
+
+    def test_has_gramps_id(self):
+        with DbTxn("Load", self.db, batch=True) as trans:
+            self.db.start_bulk_load()
+            people = self.__load(self.db, trans)
+            self.assertTrue(self.db.has_person_gramps_id(people[4].gramps_id))
+            people[4].set_gramps_id("X0")
+            self.db.commit_person(people[4], trans)
+            self.assertTrue(self.db.has_person_gramps_id("X0"))
+            self.assertFalse(self.db.has_person_gramps_id("I0004"))
+            self.assertEqual(list(self.db.find_backlink_handles(people[3].handle)), [])
+            self.assertEqual(
+                list(self.db.find_backlink_handles(people[1].handle)),
+                [("Family", "family0")],
+            )
+            self.db.remove_person(people[4].handle, trans)
+            self.assertFalse(self.db.has_person_gramps_id("X0"))
+        self.assertEqual(
+            self.db.get_ancestor_handles(people[2].handle, 1), {people[0].handle}
+        )
+        self.assertEqual(self.db.get_person_date_sortvals()["person1"][0], 2415141)
+        self.assertEqual(self.db.find_text("Note", "text", "town"), {"note0"})
+
+    def test_abort(self):
+        indices = self.__dump(self.db)["indices"]
+        try:
+            with DbTxn("Load", self.db, batch=True) as trans:
+                self.db.start_bulk_load()
+                self.__load(self.db, trans)
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(self.db.get_number_of_people(), 0)
+        self.assertEqual(self.__dump(self.db)["indices"], indices)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,184 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the SQLite read connection pool """
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.config import config
+from gramps.gen.db import DbTxn
+from gramps.gen.db.exceptions import DbException
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person
+
+
+# -------------------------------------------------------------------------
+#
+# ReadPoolTest class
+#
+# -------------------------------------------------------------------------
+class ReadPoolTest(unittest.TestCase):
+    """
+    Read a database file from other threads while it is being edited.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db = make_database("sqlite")
+        self.db.load(self.directory)
+        self.__add_person()
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.directory)
+
+    def __add_person(self):
+        with DbTxn("Add person", self.db) as trans:
+            return self.db.add_person(Person(), trans)
+
+    def __in_thread(self, func):
+        """
+        Run a function in another thread and return its result.
+        """
+        result = []
+        thread = threading.Thread(target=lambda: result.append(func()))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_wal_mode(self):
+        self.db.dbapi.execute("PRAGMA journal_mode;")
+        self.assertEqual(self.db.dbapi.fetchone()[0], "wal")
+
+    def test_read_in_thread(self):
+        handle = self.__add_person()
+        person = self.__in_thread(lambda: self.db.get_person_from_handle(handle))
+        self.assertEqual(person.handle, handle)
+        count = self.__in_thread(self.db.get_number_of_people)
+        self.assertEqual(count, 2)
+
+    def test_uncommitted_write(self):
+        with DbTxn("Add person", self.db) as trans:
+            self.db.add_person(Person(), trans)
+            count = self.__in_thread(self.db.get_number_of_people)
+            self.assertEqual(count, 1)
+        self.assertEqual(self.__in_thread(self.db.get_number_of_people), 2)
+
+    def test_snapshot(self):
+        started = threading.Event()
+        added = threading.Event()
+        counts = []
+
+        def report():
+            with self.db.read_snapshot():
+                counts.append(self.db.get_number_of_people())
+                started.set()
+                added.wait()
+                counts.append(self.db.get_number_of_people())
+            counts.append(self.db.get_number_of_people())
+
+        thread = threading.Thread(target=report)
+        thread.start()
+        started.wait()
+        self.__add_person()
+        added.set()
+        thread.join()
+        self.assertEqual(counts, [1, 1, 2])
+
+    def __start_readers(self, read):
+        """
+        Start as many threads as there are read connections, plus one, which
+        read and then wait until finish is set.
+        """
+        finish = threading.Event()
+        done = threading.Semaphore(0)
+        results = []
+
+        def reader():
+            results.append(read())
+            done.release()
+            finish.wait()
+
+        number = config.get("database.read-connections") + 1
+        threads = [threading.Thread(target=reader) for dummy in range(number)]
+        for thread in threads:
+            thread.start()
+        read_all = all(done.acquire(timeout=10) for thread in threads)
+        finish.set()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(read_all)
+        return results
+
+    def test_idle_threads(self):
+        handle = self.__add_person()
+        results = self.__start_readers(lambda: self.db.get_person_from_handle(handle))
+        self.assertEqual([person.handle for person in results], [handle] * len(results))
+
+    def test_timeout(self):
+        started = threading.Semaphore(0)
+        finish = threading.Event()
+
+        def snapshot():
+            with self.db.read_snapshot():
+                self.db.get_number_of_people()
+                started.release()
+                finish.wait()
+
+        def read():
+            try:
+                return self.db.get_number_of_people()
+            except DbException as err:
+                return err
+
+        number = config.get("database.read-connections")
+        threads = [threading.Thread(target=snapshot) for dummy in range(number)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            started.acquire()
+        # The backend is loaded as a plugin, under its own module name.
+        sqlite = sys.modules[type(self.db).__module__]
+        with mock.patch.object(sqlite, "READ_TIMEOUT", 0.1):
+            result = self.__in_thread(read)
+        finish.set()
+        for thread in threads:
+            thread.join()
+        self.assertIsInstance(result, DbException)
+        self.assertEqual(self.__in_thread(read), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+
+""" Unittest for the on-disk undo log """
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.config import config
+from gramps.gen.db import DbTxn, DBUNDOFN
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Note
+
+
+# -------------------------------------------------------------------------
+#
+# UndoLogTest class
+#
+# -------------------------------------------------------------------------
+class UndoLogTest(unittest.TestCase):
+    """
+    Undo and redo transactions of a database file with a small undo cache.
+    """
+
+    def setUp(self):
+        self.cache_size = config.get("database.undo-cache-size")
+        config.set("database.undo-cache-size", 1024)
+        self.directory = tempfile.mkdtemp()
+        self.db = make_database("sqlite")
+        self.db.load(self.directory)
+        self.undolog = os.path.join(self.directory, DBUNDOFN)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.directory)
+        config.set("database.undo-cache-size", self.cache_size)
+
+    def __add_notes(self, count):
+        handles = []
+        for index in range(count):
+            with DbTxn("Add note", self.db) as trans:
+                note = Note("note %d " % index * 20)
+                handles.append(self.db.add_note(note, trans))
+        return handles
+
+    def test_log_file(self):
+        self.assertTrue(os.path.exists(self.undolog))
+        self.__add_notes(1)
+        self.db.close()
+        self.assertFalse(os.path.exists(self.undolog))
+        self.db.load(self.directory)
+        self.assertEqual(len(self.db.undodb), 0)
+
+    def test_bounded_cache(self):
+        self.__add_notes(50)
+        undodb = self.db.undodb
+        self.assertEqual(len(undodb), 50)
+        self.assertLessEqual(undodb.cache_size, 1024)
+        self.assertLess(len(undodb.cache), 50)
+
+    def test_undo_redo(self):
+        handles = self.__add_notes(50)
+        for dummy in handles:
+            self.assertTrue(self.db.undo())
+        self.assertEqual(self.db.get_number_of_notes(), 0)
+        for dummy in handles:
+            self.assertTrue(self.db.redo())
+        self.assertEqual(self.db.get_number_of_notes(), 50)
+        note = self.db.get_note_from_handle(handles[0])
+        self.assertEqual(note.get(), "note 0 " * 20)
+
+    def test_update(self):
+        (handle,) = self.__add_notes(1)
+        for index in range(20):
+            with DbTxn("Edit note", self.db) as trans:
+                note = self.db.get_note_from_handle(handle)
+                note.set("edit %d " % index * 20)
+                self.db.commit_note(note, trans)
+        for dummy in range(20):
+            self.db.undo()
+        note = self.db.get_note_from_handle(handle)
+        self.assertEqual(note.get(), "note 0 " * 20)
+
+    def test_set_item(self):
+        self.__add_notes(2)
+        undodb = self.db.undodb
+        value = undodb[0]
+        undodb[1] = value
+        undodb.cache.clear()
+        self.assertEqual(undodb[1], value)
+        self.assertEqual(undodb[-1], value)
+        self.assertRaises(IndexError, undodb.__getitem__, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -38,8 +38,11 @@ Gramps' XML file format.
 import time
 import shutil
 import os
-import codecs
-from xml.sax.saxutils import escape
+import io
+import multiprocessing
+import queue
+import re
+import threading
 
 # ------------------------------------------------------------------------
 #
@@ -59,6 +62,7 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
 from gramps.gen.const import URL_HOMEPAGE
+from gramps.gen.config import config
 from gramps.gen.lib import Date, Person
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.db.exceptions import DbWriteFailure
@@ -82,23 +86,149 @@ except:
 
 # table for skipping control chars from XML except 09, 0A, 0D
 strip_dict = dict.fromkeys(list(range(9)) + list(range(11, 13)) + list(range(14, 32)))
+# The same control chars, found before the slower translation is done.
+STRIP_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Number of objects rendered together, and smallest number of objects for
+# which they are rendered by several processes.
+CHUNK_SIZE = 500
+PARALLEL_SIZE = 5000
+
+# Number of characters encoded and passed at once to the thread which
+# compresses and writes the file, and number of blocks waiting for it.
+BLOCK_SIZE = 1 << 20
+QUEUE_SIZE = 8
+
+# The tables of primary objects in the order of the file: the class of
+# their objects, their element and the method writing an object.
+TABLES = (
+    ("Tag", "tags", "write_tag"),
+    ("Event", "events", "write_event"),
+    ("Person", "people", "write_person"),
+    ("Family", "families", "write_family"),
+    ("Citation", "citations", "write_citation"),
+    ("Source", "sources", "write_source"),
+    ("Place", "places", "write_place_obj"),
+    ("Media", "objects", "write_object"),
+    ("Repository", "repositories", "write_repository"),
+    ("Note", "notes", "write_note"),
+)
+
+# The writer of the pool of processes rendering the objects, set before
+# the processes are forked.
+_pool_writer = None
 
 
 def escxml(d):
+    if not d:
+        return ""
+    # str.replace returns the same string at once when there is no match.
     return (
-        escape(
-            d,
-            {
-                '"': "&quot;",
-                "<": "&lt;",
-                ">": "&gt;",
-            },
-        )
-        if d
-        else ""
+        d.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
     )
 
 
+def strip_control(text):
+    """
+    Remove the control chars which are not allowed in XML from a text.
+    """
+    if STRIP_RE.search(text):
+        return text.translate(strip_dict)
+    return text
+
+
+def _init_worker():
+    """
+    Give a process of the pool its own connection to the database.
+    """
+    _pool_writer.db.reopen_reader()
+
+
+def _render_chunk(task):
+    """
+    Return the XML of a chunk of the objects of a table.
+    """
+    return _pool_writer.render_chunk(*task)
+
+
+# -------------------------------------------------------------------------
+#
+# BlockWriter
+#
+# -------------------------------------------------------------------------
+class BlockWriter:
+    """
+    Collect the text of the XML file, and pass it encoded in blocks to a
+    thread which writes it to the file, compressing it if it is a gzip
+    file, while the next objects are rendered.
+
+    The thread is only started once the first block is full, so that the
+    processes rendering the objects can be forked before.
+    """
+
+    def __init__(self, ofile):
+        self.ofile = ofile
+        self.parts = []
+        self.size = 0
+        self.queue = queue.Queue(QUEUE_SIZE)
+        self.thread = None
+        self.error = None
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= BLOCK_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Pass the text collected to the writing thread.
+        """
+        if not self.parts:
+            return
+        data = "".join(self.parts).encode("utf8")
+        self.parts = []
+        self.size = 0
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        self.queue.put(data)
+
+    def run(self):
+        """
+        Write the blocks to the file, until the end is queued.
+
+        After an error, the blocks are still taken from the queue so that
+        the rendering does not wait, and the error is raised by close.
+        """
+        while True:
+            data = self.queue.get()
+            if data is None:
+                break
+            if self.error is None:
+                try:
+                    self.ofile.write(data)
+                except Exception as err:
+                    self.error = err
+
+    def close(self):
+        """
+        Write the remaining text and wait for the thread to finish.
+
+        The file itself is not closed.
+        """
+        self.flush()
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.error is not None:
+            raise self.error
+
+
 # -------------------------------------------------------------------------
 #
 #
@@ -186,7 +316,11 @@ class GrampsXmlWriter(UpdateCallback):
             try:
                 if self.compress and _gzip_ok:
                     try:
-                        g = gzip.open(filename, "wb")
+                        g = gzip.open(
+                            filename,
+                            "wb",
+                            config.get("behavior.export-compress-level"),
+                        )
                     except:
                         g = open(filename, "wb")
                 else:
@@ -196,9 +330,11 @@ class GrampsXmlWriter(UpdateCallback):
                 raise DbWriteFailure(_("Failure writing %s") % filename, str(msg))
                 return 0
 
-        self.g = codecs.getwriter("utf8")(g)
-
-        self.write_xml_data()
+        self.g = BlockWriter(g)
+        try:
+            self.write_xml_data()
+        finally:
+            self.g.close()
         if filename != "-":
             g.close()
         return 1
@@ -210,15 +346,21 @@ class GrampsXmlWriter(UpdateCallback):
 
         if self.compress and _gzip_ok:
             try:
-                g = gzip.GzipFile(mode="wb", fileobj=handle)
+                g = gzip.GzipFile(
+                    mode="wb",
+                    fileobj=handle,
+                    compresslevel=config.get("behavior.export-compress-level"),
+                )
             except:
                 g = handle
         else:
             g = handle
 
-        self.g = codecs.getwriter("utf8")(g)
-
-        self.write_xml_data()
+        self.g = BlockWriter(g)
+        try:
+            self.write_xml_data()
+        finally:
+            self.g.close()
         g.close()
         return 1
 
@@ -252,150 +394,159 @@ class GrampsXmlWriter(UpdateCallback):
 
         self.set_total(total_steps)
 
-        self.g.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-        self.g.write(
-            "<!DOCTYPE database "
-            'PUBLIC "-//Gramps//DTD Gramps XML %s//EN"\n'
-            '"%sxml/%s/grampsxml.dtd">\n'
-            % (
-                libgrampsxml.GRAMPS_XML_VERSION,
-                URL_HOMEPAGE,
-                libgrampsxml.GRAMPS_XML_VERSION,
+        # The processes are forked before anything is written, and so before
+        # the writing thread is started.
+        pool = self.start_pool(total_steps)
+        try:
+            self.g.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            self.g.write(
+                "<!DOCTYPE database "
+                'PUBLIC "-//Gramps//DTD Gramps XML %s//EN"\n'
+                '"%sxml/%s/grampsxml.dtd">\n'
+                % (
+                    libgrampsxml.GRAMPS_XML_VERSION,
+                    URL_HOMEPAGE,
+                    libgrampsxml.GRAMPS_XML_VERSION,
+                )
+            )
+            self.g.write(
+                '<database xmlns="%sxml/%s/">\n'
+                % (URL_HOMEPAGE, libgrampsxml.GRAMPS_XML_VERSION)
+            )
+            self.g.write("  <header>\n")
+            self.g.write('    <created date="%04d-%02d-%02d"' % date[:3])
+            self.g.write(' version="' + self.version + '"')
+            self.g.write("/>\n")
+            self.g.write("    <researcher>\n")
+            self.write_line("resname", owner.get_name(), 3)
+            self.write_line("resaddr", owner.get_address(), 3)
+            self.write_line("reslocality", owner.get_locality(), 3)
+            self.write_line("rescity", owner.get_city(), 3)
+            self.write_line("resstate", owner.get_state(), 3)
+            self.write_line("rescountry", owner.get_country(), 3)
+            self.write_line("respostal", owner.get_postal_code(), 3)
+            self.write_line("resphone", owner.get_phone(), 3)
+            self.write_line("resemail", owner.get_email(), 3)
+            self.g.write("    </researcher>\n")
+            self.write_metadata()
+            self.g.write("  </header>\n")
+
+            # First write name formats: we need to know all formats
+            # by the time we get to person's names
+            self.write_name_formats()
+
+            # Write table objects, then primary objects
+            self.write_tables(
+                {
+                    "Tag": tag_len,
+                    "Event": event_len,
+                    "Person": person_len,
+                    "Family": family_len,
+                    "Citation": citation_len,
+                    "Source": source_len,
+                    "Place": place_len,
+                    "Media": obj_len,
+                    "Repository": repo_len,
+                    "Note": note_len,
+                },
+                pool,
             )
-        )
-        self.g.write(
-            '<database xmlns="%sxml/%s/">\n'
-            % (URL_HOMEPAGE, libgrampsxml.GRAMPS_XML_VERSION)
-        )
-        self.g.write("  <header>\n")
-        self.g.write('    <created date="%04d-%02d-%02d"' % date[:3])
-        self.g.write(' version="' + self.version + '"')
-        self.g.write("/>\n")
-        self.g.write("    <researcher>\n")
-        self.write_line("resname", owner.get_name(), 3)
-        self.write_line("resaddr", owner.get_address(), 3)
-        self.write_line("reslocality", owner.get_locality(), 3)
-        self.write_line("rescity", owner.get_city(), 3)
-        self.write_line("resstate", owner.get_state(), 3)
-        self.write_line("rescountry", owner.get_country(), 3)
-        self.write_line("respostal", owner.get_postal_code(), 3)
-        self.write_line("resphone", owner.get_phone(), 3)
-        self.write_line("resemail", owner.get_email(), 3)
-        self.g.write("    </researcher>\n")
-        self.write_metadata()
-        self.g.write("  </header>\n")
-
-        # First write name formats: we need to know all formats
-        # by the time we get to person's names
-        self.write_name_formats()
-
-        # Write table objects
-        if tag_len > 0:
-            self.g.write("  <tags>\n")
-            for key in sorted(self.db.get_tag_handles()):
-                tag = self.db.get_tag_from_handle(key)
-                if tag:
-                    self.write_tag(tag, 2)
-                self.update()
-            self.g.write("  </tags>\n")
-
-        # Write primary objects
-        if event_len > 0:
-            self.g.write("  <events>\n")
-            for handle in sorted(self.db.get_event_handles()):
-                event = self.db.get_event_from_handle(handle)
-                if event:
-                    self.write_event(event, 2)
-                self.update()
-            self.g.write("  </events>\n")
-
-        if person_len > 0:
-            self.g.write("  <people")
-            person = self.db.get_default_person()
-            if person:
-                self.g.write(' home="_%s"' % person.handle)
-            self.g.write(">\n")
 
-            for handle in sorted(self.db.get_person_handles()):
-                person = self.db.get_person_from_handle(handle)
-                if person:
-                    self.write_person(person, 2)
-                self.update()
-            self.g.write("  </people>\n")
-
-        if family_len > 0:
-            self.g.write("  <families>\n")
-            for handle in sorted(self.db.iter_family_handles()):
-                family = self.db.get_family_from_handle(handle)
-                if family:
-                    self.write_family(family, 2)
-                self.update()
-            self.g.write("  </families>\n")
-
-        if citation_len > 0:
-            self.g.write("  <citations>\n")
-            for handle in sorted(self.db.get_citation_handles()):
-                citation = self.db.get_citation_from_handle(handle)
-                if citation:
-                    self.write_citation(citation, 2)
-                self.update()
-            self.g.write("  </citations>\n")
-
-        if source_len > 0:
-            self.g.write("  <sources>\n")
-            for handle in sorted(self.db.get_source_handles()):
-                source = self.db.get_source_from_handle(handle)
-                if source:
-                    self.write_source(source, 2)
-                self.update()
-            self.g.write("  </sources>\n")
-
-        if place_len > 0:
-            self.g.write("  <places>\n")
-            for key in sorted(self.db.get_place_handles()):
-                # try:
-                place = self.db.get_place_from_handle(key)
-                if place:
-                    self.write_place_obj(place, 2)
-                self.update()
-            self.g.write("  </places>\n")
-
-        if obj_len > 0:
-            self.g.write("  <objects>\n")
-            for handle in sorted(self.db.get_media_handles()):
-                obj = self.db.get_media_from_handle(handle)
-                if obj:
-                    self.write_object(obj, 2)
-                self.update()
-            self.g.write("  </objects>\n")
-
-        if repo_len > 0:
-            self.g.write("  <repositories>\n")
-            for key in sorted(self.db.get_repository_handles()):
-                repo = self.db.get_repository_from_handle(key)
-                if repo:
-                    self.write_repository(repo, 2)
-                self.update()
-            self.g.write("  </repositories>\n")
-
-        if note_len > 0:
-            self.g.write("  <notes>\n")
-            for key in sorted(self.db.get_note_handles()):
-                note = self.db.get_note_from_handle(key)
-                if note:
-                    self.write_note(note, 2)
-                self.update()
-            self.g.write("  </notes>\n")
-
-        # Data is written, now write bookmarks.
-        self.write_bookmarks()
-        self.write_namemaps()
-
-        self.g.write("</database>\n")
+            # Data is written, now write bookmarks.
+            self.write_bookmarks()
+            self.write_namemaps()
+
+            self.g.write("</database>\n")
+        finally:
+            if pool is not None:
+                self.stop_pool(pool)
 
     #        self.status.end()
     #        self.status = None
 
+    def start_pool(self, total_steps):
+        """
+        Return a pool of processes rendering the objects, as set in the
+        preferences, each reading the database through a connection of its
+        own, or None if the objects are to be rendered by this process.
+        """
+        global _pool_writer
+        processes = config.get("behavior.export-processes")
+        if (
+            processes <= 1
+            or total_steps < PARALLEL_SIZE
+            or not self.db.can_fork_readers()
+        ):
+            return None
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            return None
+        _pool_writer = self
+        return context.Pool(processes, _init_worker)
+
+    def stop_pool(self, pool):
+        """
+        Stop the processes rendering the objects.
+        """
+        global _pool_writer
+        pool.terminate()
+        pool.join()
+        _pool_writer = None
+
+    def write_tables(self, lengths, pool=None):
+        """
+        Write the tables of primary objects with the given numbers of
+        objects, rendering their objects in chunks in order, by a pool of
+        processes if given.
+        """
+        tasks = []
+        for obj_class, element, write_name in TABLES:
+            if lengths[obj_class] > 0:
+                handles = sorted(self.db.method("get_%s_handles", obj_class)())
+                for start in range(0, max(len(handles), 1), CHUNK_SIZE):
+                    chunk = handles[start : start + CHUNK_SIZE]
+                    tasks.append((obj_class, write_name, chunk))
+        if pool is None:
+            fragments = (self.render_chunk(*task) for task in tasks)
+        else:
+            fragments = pool.imap(_render_chunk, tasks)
+
+        elements = {obj_class: element for obj_class, element, dummy in TABLES}
+        current = None
+        done = 0
+        for (obj_class, write_name, chunk), fragment in zip(tasks, fragments):
+            if obj_class != current:
+                if current is not None:
+                    self.g.write("  </%s>\n" % elements[current])
+                current = obj_class
+                self.g.write("  <%s" % elements[obj_class])
+                if obj_class == "Person":
+                    person = self.db.get_default_person()
+                    if person:
+                        self.g.write(' home="_%s"' % person.handle)
+                self.g.write(">\n")
+            self.g.write(fragment)
+            done += len(chunk)
+            self.update(done)
+        if current is not None:
+            self.g.write("  </%s>\n" % elements[current])
+
+    def render_chunk(self, obj_class, write_name, handles):
+        """
+        Return the XML of the objects of a table with the given handles.
+        """
+        write_obj = getattr(self, write_name)
+        output = io.StringIO()
+        g, self.g = self.g, output
+        try:
+            for obj in self.db.method("get_%s_from_handles", obj_class)(handles):
+                if obj:
+                    write_obj(obj, 2)
+        finally:
+            self.g = g
+        return output.getvalue()
+
     def write_metadata(self):
         """Method to write out metadata of the database"""
         mediapath = self.db.get_mediapath()
@@ -490,9 +641,7 @@ class GrampsXmlWriter(UpdateCallback):
         self.g.write("/>\n")
 
     def fix(self, line):
-        l = str(line)
-        l = l.strip().translate(strip_dict)
-        return escxml(l)
+        return escxml(strip_control(str(line).strip()))
 
     def write_note_list(self, note_list, indent=0):
         for handle in note_list:
@@ -551,7 +700,7 @@ class GrampsXmlWriter(UpdateCallback):
             self.g.write("  " * indent)
 
         self.g.write("<%s>" % val)
-        self.g.write(escxml(str(text).translate(strip_dict)))
+        self.g.write(escxml(strip_control(str(text))))
         self.g.write("</%s>\n" % val)
 
     def write_person(self, person, index=1):
@@ -0,0 +1,97 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest that tests the XML export rendered by a pool of processes
+"""
+import gzip
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ....gen.config import config
+from ....gen.const import DATA_DIR
+from ....gen.db.utils import make_database
+from ....gen.user import User
+from ...importer.importxml import importData
+from .. import exportxml
+from ..exportxml import XmlWriter, escxml
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class EscapeTest(unittest.TestCase):
+    def test_escxml(self):
+        self.assertEqual(escxml(None), "")
+        self.assertEqual(escxml('a<b> & "c"'), "a&lt;b&gt; &amp; &quot;c&quot;")
+
+    def test_fix(self):
+        writer = XmlWriter(None, User(), 0)
+        self.assertEqual(writer.fix(" a\x01b\x0c&\t\n"), "ab&amp;")
+
+
+@unittest.skipUnless(
+    "fork" in multiprocessing.get_all_start_methods(), "needs forked processes"
+)
+class ParallelExportTest(unittest.TestCase):
+    """
+    The XML written is the same whether the objects are rendered by a pool
+    of processes or not, compressed or not.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database into a database file.
+        """
+        cls.directory = tempfile.mkdtemp()
+        cls.db = make_database("sqlite")
+        cls.db.load(cls.directory)
+        importData(cls.db, EXAMPLE, User())
+        cls.processes = config.get("behavior.export-processes")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.directory)
+        config.set("behavior.export-processes", cls.processes)
+
+    def export(self, processes, compress):
+        config.set("behavior.export-processes", processes)
+        filename = os.path.join(self.directory, "export.gramps")
+        with mock.patch.multiple(exportxml, CHUNK_SIZE=100, PARALLEL_SIZE=1000):
+            XmlWriter(self.db, User(), 0, compress).write(filename)
+        with open(filename, "rb") as ofile:
+            data = ofile.read()
+        return gzip.decompress(data) if compress else data
+
+    def test_parallel(self):
+        expected = self.export(1, False)
+        self.assertIn(b"<people home=", expected)
+        self.assertEqual(self.export(3, False), expected)
+        self.assertEqual(self.export(3, True), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -127,6 +127,28 @@ plg.ptype = IMPORT
 plg.import_function = "importData"
 plg.extension = "gramps"
 
+# ------------------------------------------------------------------------
+#
+# Gramps backup delta
+#
+# ------------------------------------------------------------------------
+
+plg = newplugin()
+plg.id = "im_gramps_delta"
+plg.name = _("Gramps Backup Delta")
+plg.description = _(
+    "Restore a chain of incremental backups, the full "
+    "backup and the deltas up to this one, into an empty "
+    "Family Tree."
+)
+plg.version = "1.0"
+plg.gramps_target_version = MODULE_VERSION
+plg.status = STABLE
+plg.fname = "importbackup.py"
+plg.ptype = IMPORT
+plg.import_function = "importData"
+plg.extension = "gramps-delta"
+
 # ------------------------------------------------------------------------
 #
 # GRDB database
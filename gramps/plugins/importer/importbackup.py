@@ -0,0 +1,55 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"Restore a chain of incremental backups"
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.errors import GrampsImportError
+from gramps.gen.utils.libformatting import ImportInfo
+
+## we need absolute import as this is dynamically loaded:
+from gramps.plugins.lib.libbackup import restore_backup
+
+_ = glocale.translation.gettext
+
+
+# -------------------------------------------------------------------------
+#
+# importData
+#
+# -------------------------------------------------------------------------
+def importData(database, filename, user):
+    """
+    Restore the chain of backups ending with a delta into an empty tree.
+    """
+    try:
+        restore_backup(database, filename, user)
+    except GrampsImportError as err:
+        user.notify_error(*err.messages())
+        return None
+    except OSError as err:
+        user.notify_error(_("%s could not be opened") % filename, str(err))
+        return None
+    return ImportInfo({_("Results"): _("done")})
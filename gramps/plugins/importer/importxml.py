@@ -29,6 +29,8 @@
 #
 # -------------------------------------------------------------------------
 import os
+import pickle
+import sqlite3
 import sys
 import time
 from xml.parsers.expat import ExpatError, ParserCreate
@@ -135,8 +137,6 @@ try:
 except:
     GZIP_OK = False
 
-PERSON_RE = re.compile(r"\s*\<person\s(.*)$")
-
 CHILD_REL_MAP = {
     "Birth": ChildRefType(ChildRefType.BIRTH),
     "Adopted": ChildRefType(ChildRefType.ADOPTED),
@@ -154,6 +154,10 @@ EVENT_PERSON_STR = _("%(event_name)s of %(person)s")
 HANDLE = 0
 INSTANTIATED = 1
 
+# Number of items a SpillMap keeps in memory before it moves them to its
+# temporary table.
+SPILL_SIZE = 100000
+
 
 # -------------------------------------------------------------------------
 #
@@ -167,8 +171,6 @@ def importData(database, filename, user):
     database.smap = {}
     database.pmap = {}
     database.fmap = {}
-    line_cnt = 1
-    person_cnt = 0
 
     with ImportOpenFileContextManager(filename, user) as xml_file:
         if xml_file is None:
@@ -192,16 +194,11 @@ def importData(database, filename, user):
                 ),
             )
 
-        if filename != "-":
-            linecounter = LineParser(filename)
-            line_cnt = linecounter.get_count()
-            person_cnt = linecounter.get_person_count()
-
         read_only = database.readonly
         database.readonly = False
 
         try:
-            info = parser.parse(xml_file, line_cnt, person_cnt)
+            info = parser.parse(xml_file)
         except GrampsImportError as err:  # version error
             user.notify_error(*err.messages())
             return
@@ -408,59 +405,119 @@ class ImportInfo:
         return txt
 
 
-class LineParser:
-    def __init__(self, filename):
-        self.count = 0
-        self.person_count = 0
+class SpillMap(abc.MutableMapping):
+    """
+    Mapping with string keys, such as the maps from the handles and IDs of
+    the imported file to those of the database, whose size is bounded in
+    memory.
+
+    The items are kept in a dictionary until it holds more than `limit`
+    items, then they are moved to a table of a temporary SQLite database,
+    which is looked up for the keys not found in memory.  The values are
+    pickled in the table, so a value which is changed must be set again.
+    """
 
-        if GZIP_OK:
-            use_gzip = 1
-            try:
-                with gzip.open(filename, "r") as f:
-                    f.read(1)
-            except IOError as msg:
-                use_gzip = 0
-            except ValueError as msg:
-                use_gzip = 1
-        else:
-            use_gzip = 0
+    def __init__(self, limit=None):
+        self.limit = SPILL_SIZE if limit is None else limit
+        self._items = {}
+        self._conn = None
+
+    def _spill(self):
+        """
+        Move the items kept in memory to the temporary table.
+        """
+        if self._conn is None:
+            # An empty name opens a private database, removed when closed.
+            self._conn = sqlite3.connect("")
+            self._conn.execute("CREATE TABLE spill (key TEXT PRIMARY KEY, value BLOB)")
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO spill (key, value) VALUES (?, ?)",
+            [(key, pickle.dumps(value)) for key, value in self._items.items()],
+        )
+        self._items.clear()
+
+    def _fetch(self, key):
+        """
+        Return the pickled value of a key from the temporary table, or None.
+        """
+        if self._conn is None:
+            return None
+        row = self._conn.execute(
+            "SELECT value FROM spill WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
 
+    def __getitem__(self, key):
         try:
-            if use_gzip:
-                import io
-
-                # Bug 6255. TextIOWrapper is required for python3 to
-                #           present file contents as text, otherwise they
-                #           are read as binary. However due to a missing
-                #           method (read1) in early python3 versions this
-                #           try block will fail.
-                #           Gramps will still import XML files using python
-                #           versions < 3.3.0 but the file progress meter
-                #           will not work properly, going immediately to
-                #           100%.
-                #           It should work correctly from version 3.3.
-                ofile = io.TextIOWrapper(
-                    gzip.open(filename, "rb"), encoding="utf8", errors="replace"
-                )
-            else:
-                ofile = open(filename, "r", encoding="utf8", errors="replace")
+            return self._items[key]
+        except KeyError:
+            data = self._fetch(key)
+            if data is None:
+                raise
+            return pickle.loads(data)
 
-            for line in ofile:
-                self.count += 1
-                if PERSON_RE.match(line):
-                    self.person_count += 1
-        except:
-            self.count = 0
-            self.person_count = 0
-        finally:
-            # Ensure the file handle is always closed
-            ofile.close()
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
 
-    def get_count(self):
-        return self.count
+    def __contains__(self, key):
+        return key in self._items or self._fetch(key) is not None
 
-    def get_person_count(self):
-        return self.person_count
+    def __setitem__(self, key, value):
+        self._items[key] = value
+        if len(self._items) > self.limit:
+            self._spill()
+
+    def __delitem__(self, key):
+        if self._conn is None:
+            del self._items[key]
+            return
+        found = key in self._items
+        if found:
+            del self._items[key]
+        if self._conn.execute("DELETE FROM spill WHERE key = ?", (key,)).rowcount:
+            found = True
+        if not found:
+            raise KeyError(key)
+
+    def __iter__(self):
+        """
+        Iterate over the keys in order once they are in the table, reading
+        them in batches, so that the map may be changed meanwhile.
+        """
+        if self._conn is None:
+            yield from list(self._items)
+            return
+        self._spill()
+        size = max(1, self.limit)
+        cursor = self._conn.execute(
+            "SELECT key FROM spill ORDER BY key LIMIT ?", (size,)
+        )
+        keys = [row[0] for row in cursor]
+        while keys:
+            yield from keys
+            cursor = self._conn.execute(
+                "SELECT key FROM spill WHERE key > ? ORDER BY key LIMIT ?",
+                (keys[-1], size),
+            )
+            keys = [row[0] for row in cursor]
+
+    def __len__(self):
+        if self._conn is None:
+            return len(self._items)
+        self._spill()
+        return self._conn.execute("SELECT COUNT(*) FROM spill").fetchone()[0]
+
+    def close(self):
+        """
+        Forget all the items and remove the temporary table.
+        """
+        self._items.clear()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 
 # -------------------------------------------------------------------------
@@ -543,14 +600,14 @@ class GrampsParser(UpdateCallback):
         self.note_list = []
         self.tlist = []
         self.conf = 2
-        self.gid2id = {}
-        self.gid2fid = {}
-        self.gid2eid = {}
-        self.gid2pid = {}
-        self.gid2oid = {}
-        self.gid2sid = {}
-        self.gid2rid = {}
-        self.gid2nid = {}
+        self.gid2id = SpillMap()
+        self.gid2fid = SpillMap()
+        self.gid2eid = SpillMap()
+        self.gid2pid = SpillMap()
+        self.gid2oid = SpillMap()
+        self.gid2sid = SpillMap()
+        self.gid2rid = SpillMap()
+        self.gid2nid = SpillMap()
         self.childref_map = {}
         self.change = change
         self.dp = parser
@@ -637,17 +694,17 @@ class GrampsParser(UpdateCallback):
         self.func_index = 0
         self.func = None
         self.witness_comment = ""
-        self.idswap = {}
-        self.fidswap = {}
-        self.eidswap = {}
-        self.cidswap = {}
-        self.sidswap = {}
-        self.pidswap = {}
-        self.oidswap = {}
-        self.ridswap = {}
-        self.nidswap = {}
-        self.eidswap = {}
-        self.import_handles = {}
+        self.idswap = SpillMap()
+        self.fidswap = SpillMap()
+        self.eidswap = SpillMap()
+        self.cidswap = SpillMap()
+        self.sidswap = SpillMap()
+        self.pidswap = SpillMap()
+        self.oidswap = SpillMap()
+        self.ridswap = SpillMap()
+        self.nidswap = SpillMap()
+        # {original handle: {target: [handle, instantiated]}}
+        self.import_handles = SpillMap()
 
         if default_tag_format:
             name = time.strftime(default_tag_format)
@@ -819,11 +876,10 @@ class GrampsParser(UpdateCallback):
         """
         handle = str(handle.replace("_", ""))
         orig_handle = handle
-        if (
-            orig_handle in self.import_handles
-            and target in self.import_handles[orig_handle]
-        ):
-            handle = self.import_handles[handle][target][HANDLE]
+        # The targets are set again when changed, as the map may be spilled.
+        targets = self.import_handles.get(orig_handle)
+        if targets is not None and target in targets:
+            handle = targets[target][HANDLE]
             if not isinstance(prim_obj, abc.Callable):
                 # This method is called by a start_<primary_object> method.
                 get_raw_obj_data = {
@@ -840,9 +896,10 @@ class GrampsParser(UpdateCallback):
                 }[target]
                 raw = get_raw_obj_data(handle)
                 prim_obj.unserialize(raw)
-                self.import_handles[orig_handle][target][INSTANTIATED] = True
+                targets[target][INSTANTIATED] = True
+                self.import_handles[orig_handle] = targets
             return handle
-        elif handle in self.import_handles:
+        elif targets is not None:
             LOG.warning(
                 "The file you import contains duplicate handles "
                 "which is illegal and being fixed now."
@@ -850,7 +907,7 @@ class GrampsParser(UpdateCallback):
             handle = create_id()
             while handle in self.import_handles:
                 handle = create_id()
-            self.import_handles[orig_handle][target] = [handle, False]
+            targets[target] = [handle, False]
         else:
             orig_handle = handle
             if self.replace_import_handle:
@@ -872,12 +929,13 @@ class GrampsParser(UpdateCallback):
                 }[target]
                 while has_handle_func(handle):
                     handle = create_id()
-            self.import_handles[orig_handle] = {target: [handle, False]}
+            targets = {target: [handle, False]}
         # method is called by a reference
         if isinstance(prim_obj, abc.Callable):
             prim_obj = prim_obj()
         else:
-            self.import_handles[orig_handle][target][INSTANTIATED] = True
+            targets[target][INSTANTIATED] = True
+        self.import_handles[orig_handle] = targets
         prim_obj.set_handle(handle)
         if target == "tag":
             self.db.add_tag(prim_obj, self.trans)
@@ -1041,14 +1099,28 @@ class GrampsParser(UpdateCallback):
                 gramps_ids[id_] = gramps_id
         return gramps_ids[id_]
 
-    def parse(self, ifile, linecount=1, personcount=0):
+    def parse(self, ifile):
         """
         Parse the xml file
+
+        The file is read in a stream: the progress is the number of bytes
+        read from the file, compressed or not, and the maps from the handles
+        and IDs of the file are moved to temporary tables when they get
+        large.  The objects are written by the batch transaction in batches.
+
         :param ifile: must be a file handle that is already open, with position
                       at the start of the file
         """
+        # The progress is given by the position in the compressed file.
+        self.__raw_file = getattr(ifile, "fileobj", ifile)
+        try:
+            total = os.fstat(self.__raw_file.fileno()).st_size
+            self.__raw_file.tell()
+        except (AttributeError, OSError, ValueError):
+            total = 0
+            self.__raw_file = None
         with DbTxn(_("Gramps XML import"), self.db, batch=True) as self.trans:
-            self.set_total(linecount)
+            self.set_total(max(total, 1))
 
             self.db.disable_signals()
 
@@ -1097,16 +1169,46 @@ class GrampsParser(UpdateCallback):
 
             self.fix_not_instantiated()
             self.fix_families()
+            for spill_map in (
+                self.import_handles,
+                self.gid2id,
+                self.gid2fid,
+                self.gid2eid,
+                self.gid2pid,
+                self.gid2oid,
+                self.gid2sid,
+                self.gid2rid,
+                self.gid2nid,
+                self.idswap,
+                self.fidswap,
+                self.eidswap,
+                self.cidswap,
+                self.sidswap,
+                self.pidswap,
+                self.oidswap,
+                self.ridswap,
+                self.nidswap,
+            ):
+                spill_map.close()
             for key in list(self.func_map.keys()):
                 del self.func_map[key]
             del self.func_map
             del self.func_list
             del self.p
             del self.update
+            del self.__raw_file
         self.db.enable_signals()
         self.db.request_rebuild()
         return self.info
 
+    def __get_position(self):
+        """
+        Return the number of bytes read from the file, for the progress.
+        """
+        if self.__raw_file is None:
+            return self.p.CurrentByteIndex
+        return self.__raw_file.tell()
+
     def start_database(self, attrs):
         """
         Get the xml version of the file.
@@ -1289,7 +1391,7 @@ class GrampsParser(UpdateCallback):
         # Gramps LEGACY: title in the placeobj tag
         self.placeobj.title = attrs.get("title", "")
         self.locations = 0
-        self.update(self.p.CurrentLineNumber)
+        self.update(self.__get_position())
         if self.default_tag:
             self.placeobj.add_tag(self.default_tag.handle)
         return self.placeobj
@@ -1400,7 +1502,7 @@ class GrampsParser(UpdateCallback):
             self.info.add("new-object", EVENT_KEY, self.event)
         else:
             # This is new event, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
+            self.update(self.__get_position())
             self.event = Event()
             if "handle" in attrs:
                 orig_handle = attrs["handle"].replace("_", "")
@@ -1623,7 +1725,7 @@ class GrampsParser(UpdateCallback):
         Add a person to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
+        self.update(self.__get_position())
         self.person = Person()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -1759,7 +1861,7 @@ class GrampsParser(UpdateCallback):
         Add a family object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
+        self.update(self.__get_position())
         self.family = Family()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -2047,7 +2149,7 @@ class GrampsParser(UpdateCallback):
         self.in_note = 0
         if "handle" in attrs:
             # This is new note, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
+            self.update(self.__get_position())
             self.note = Note()
             if "handle" in attrs:
                 orig_handle = attrs["handle"].replace("_", "")
@@ -2252,7 +2354,7 @@ class GrampsParser(UpdateCallback):
         Add a citation object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
+        self.update(self.__get_position())
         self.citation = Citation()
         orig_handle = attrs["handle"].replace("_", "")
         is_merge_candidate = self.replace_import_handle and self.db.has_citation_handle(
@@ -2311,7 +2413,7 @@ class GrampsParser(UpdateCallback):
         Add a source object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
+        self.update(self.__get_position())
         self.source = Source()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -2471,7 +2573,7 @@ class GrampsParser(UpdateCallback):
         pass
 
     def stop_database(self, *tag):
-        self.update(self.p.CurrentLineNumber)
+        self.update(self.__get_position())
 
     def stop_media(self, *tag):
         self.db.commit_media(self.object, self.trans, self.object.get_change_time())
@@ -3389,14 +3491,10 @@ class GrampsParser(UpdateCallback):
 
     def fix_not_instantiated(self):
         uninstantiated = []
-        for orig_handle in self.import_handles.keys():
-            tglist = [
-                target
-                for target in self.import_handles[orig_handle].keys()
-                if not self.import_handles[orig_handle][target][INSTANTIATED]
-            ]
-            for target in tglist:
-                uninstantiated += [(orig_handle, target)]
+        for orig_handle, targets in self.import_handles.items():
+            for target, value in targets.items():
+                if not value[INSTANTIATED]:
+                    uninstantiated.append((orig_handle, target))
         if uninstantiated:
             expl_note = create_explanation_note(self.db)
             self.db.commit_note(expl_note, self.trans, time.time())
@@ -3455,10 +3553,10 @@ class GrampsParser(UpdateCallback):
         # Fix any imported families where there is a link from the family to an
         # individual, but no corresponding link from the individual to the
         # family.
-        for orig_handle in list(self.import_handles.keys()):
-            for target in list(self.import_handles[orig_handle].keys()):
+        for targets in self.import_handles.values():
+            for target in list(targets.keys()):
                 if target == "family":
-                    family_handle = self.import_handles[orig_handle][target][HANDLE]
+                    family_handle = targets[target][HANDLE]
                     family = self.db.get_family_from_handle(family_handle)
                     father_handle = family.get_father_handle()
                     mother_handle = family.get_mother_handle()
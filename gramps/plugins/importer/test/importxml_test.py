@@ -0,0 +1,114 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unit test of the streaming of the Gramps XML import
+"""
+import unittest
+import os
+from unittest import mock
+
+from .. import importxml
+from ..importxml import SpillMap
+from ....gen.const import DATA_DIR
+from ....gen.db.utils import import_as_dict
+from ....gen.user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+OBJ_CLASSES = (
+    "Person",
+    "Family",
+    "Event",
+    "Place",
+    "Source",
+    "Citation",
+    "Repository",
+    "Media",
+    "Note",
+    "Tag",
+)
+
+
+class SpillMapTest(unittest.TestCase):
+    """
+    A SpillMap behaves as a dictionary once its items are spilled.
+    """
+
+    def test_spill(self):
+        spill_map = SpillMap(3)
+        expected = {}
+        for index in range(10):
+            spill_map["k%d" % index] = [index]
+            expected["k%d" % index] = [index]
+        self.assertEqual(len(spill_map._items), 2)
+        self.assertEqual(dict(spill_map), expected)
+        self.assertIn("k1", spill_map)
+        self.assertNotIn("k10", spill_map)
+        self.assertEqual(spill_map.get("k10", 0), 0)
+
+        value = spill_map["k2"]
+        value.append(0)
+        self.assertEqual(spill_map["k2"], [2])
+        spill_map["k2"] = value
+        self.assertEqual(spill_map["k2"], [2, 0])
+
+        del spill_map["k3"]
+        self.assertNotIn("k3", spill_map)
+        with self.assertRaises(KeyError):
+            del spill_map["k3"]
+        self.assertEqual(len(spill_map), 9)
+        self.assertEqual(list(spill_map), sorted(expected.keys() - {"k3"}))
+        spill_map.close()
+        self.assertEqual(len(spill_map), 0)
+
+    def test_change_while_iterating(self):
+        spill_map = SpillMap(2)
+        for index in range(6):
+            spill_map["k%d" % index] = index
+        for key in spill_map:
+            spill_map[key] = spill_map[key] + 1
+        self.assertEqual(sorted(spill_map.values()), list(range(1, 7)))
+
+
+class StreamingImportTest(unittest.TestCase):
+    """
+    The content imported is the same whether the maps of the import are
+    spilled or not.
+    """
+
+    def dump(self, db):
+        return {
+            obj_class: sorted(
+                db.method("get_raw_%s_data", obj_class)(handle)
+                for handle in db.method("get_%s_handles", obj_class)()
+            )
+            for obj_class in OBJ_CLASSES
+        }
+
+    def test_spilled(self):
+        expected = self.dump(import_as_dict(EXAMPLE, User()))
+        with mock.patch.object(importxml, "SPILL_SIZE", 10):
+            db = import_as_dict(EXAMPLE, User())
+        self.assertEqual(self.dump(db), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
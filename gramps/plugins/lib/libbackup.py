@@ -0,0 +1,488 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Incremental backups of a family tree.
+
+A chain of backups starts with a full snapshot, a Gramps XML file, which
+is followed by deltas.  A delta holds the objects added or changed since
+the previous backup of the chain, the handles of the objects removed, and
+the metadata of the tree.  The objects changed are found by their change
+time, and the objects added or removed by comparing the handles of the
+tree with those it had at the previous backup, kept in a state file with
+the backups.  A full snapshot starts a new chain every few backups, as set
+in the preferences.
+
+A chain is restored into an empty tree by importing its last delta, which
+imports the full snapshot and replays the deltas in order.
+
+Deltas and state files are gzip compressed text files of JSON values, one
+per line, starting with a header.  The objects are written with
+:func:`~gramps.gen.lib.serialize.to_json`, so that reading a delta only
+creates Gramps objects.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import datetime
+import gzip
+import json
+import os
+import time
+from xml.parsers.expat import ExpatError
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.config import config
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.db import DbTxn
+from gramps.gen.db.dbconst import KEY_TO_CLASS_MAP
+from gramps.gen.errors import GrampsImportError
+from gramps.gen.lib import (
+    Citation,
+    Event,
+    Family,
+    Media,
+    Note,
+    Person,
+    Place,
+    Repository,
+    Researcher,
+    Source,
+    Tag,
+)
+from gramps.gen.lib.serialize import from_json, to_json
+
+_ = glocale.translation.gettext
+
+DELTA_EXT = ".gramps-delta"
+STATE_EXT = ".backup-state"
+BACKUP_FORMAT = 2
+DELTA_TYPE = "gramps-delta"
+STATE_TYPE = "gramps-backup-state"
+
+# Number of objects read and written together.
+CHUNK_SIZE = 500
+
+CLASSES = {
+    "Person": Person,
+    "Family": Family,
+    "Source": Source,
+    "Citation": Citation,
+    "Event": Event,
+    "Media": Media,
+    "Place": Place,
+    "Repository": Repository,
+    "Note": Note,
+    "Tag": Tag,
+}
+
+BOOKMARKS = (
+    "bookmarks",
+    "family_bookmarks",
+    "event_bookmarks",
+    "source_bookmarks",
+    "citation_bookmarks",
+    "place_bookmarks",
+    "media_bookmarks",
+    "repo_bookmarks",
+    "note_bookmarks",
+)
+
+# Identifies this process, whose change counters are only valid in it.
+_SESSION = "%d-%f" % (os.getpid(), time.time())
+
+
+# -------------------------------------------------------------------------
+#
+# Writing backups
+#
+# -------------------------------------------------------------------------
+def write_backup(db, directory, user, compress=True):
+    """
+    Write a backup of a tree in a directory, and return its file name, or
+    None if it could not be written.
+
+    A delta is written if a chain of the tree was started in the directory
+    and is shorter than set in the preferences, otherwise a full snapshot.
+    """
+    start = int(time.time())
+    state_name = os.path.join(directory, db.get_dbname() + STATE_EXT)
+    state = _read_state(state_name, db)
+    # The change counters are read before the objects, so that the objects
+    # changed meanwhile are in the next backup.
+    counters = {
+        obj_class: db.get_change_counter(obj_class)
+        for obj_class in KEY_TO_CLASS_MAP.values()
+    }
+    interval = config.get("database.backup-full-interval")
+    if state is None or state["deltas"] >= interval:
+        filename = _backup_name(db, directory, ".gramps")
+        from gramps.plugins.export.exportxml import XmlWriter
+
+        writer = XmlWriter(db, user, strip_photos=0, compress=compress)
+        if not writer.write(filename):
+            return None
+        deltas = 0
+        handles = None
+    else:
+        filename = _backup_name(db, directory, DELTA_EXT)
+        handles = _write_delta(db, filename, state, start)
+        deltas = state["deltas"] + 1
+    _write_state(state_name, db, filename, start, counters, deltas, handles)
+    return filename
+
+
+def _backup_name(db, directory, ext):
+    """
+    Return the name of a new backup file of a tree, from the time.
+    """
+    timestamp = "{0:%Y-%m-%d-%H-%M-%S}".format(datetime.datetime.now())
+    name = "%s-%s" % (db.get_dbname(), timestamp)
+    filename = os.path.join(directory, name + ext)
+    count = 0
+    while os.path.exists(filename):
+        count += 1
+        filename = os.path.join(directory, "%s-%d%s" % (name, count, ext))
+    return filename
+
+
+def _read_state(state_name, db):
+    """
+    Return the state of the chain of backups of a tree, without the handles
+    of its objects, or None if there is no chain to continue.
+
+    A chain is not continued if a file of it, from its full snapshot to its
+    last delta, is missing or cannot be read, as it could not be restored.
+    """
+    try:
+        with gzip.open(state_name, "rt", encoding="utf-8") as state_file:
+            state = _read_header(state_file, state_name, STATE_TYPE)
+    except (GrampsImportError, OSError, EOFError):
+        return None
+    if state["tree"] != db.get_dbid():
+        return None
+    last = os.path.join(os.path.dirname(state_name), state["last"])
+    if not os.path.isfile(last):
+        return None
+    try:
+        get_backup_chain(last)
+    except (GrampsImportError, OSError, EOFError):
+        return None
+    return state
+
+
+def _read_state_handles(state_name):
+    """
+    Iterate over the classes of the objects of the tree at the last backup,
+    with the sorted list of their handles.
+    """
+    with gzip.open(state_name, "rt", encoding="utf-8") as state_file:
+        _read_header(state_file, state_name, STATE_TYPE)
+        for line in state_file:
+            obj_class, handles = json.loads(line)
+            yield obj_class, handles
+
+
+def _write_state(state_name, db, filename, start, counters, deltas, handles):
+    """
+    Write the state of the chain of backups after a backup, with the
+    handles of the objects of the tree, given by an iterator of classes and
+    sorted lists of handles, or read from the tree if None.
+    """
+    if handles is None:
+        handles = (
+            (obj_class, sorted(db.method("get_%s_handles", obj_class)()))
+            for obj_class in KEY_TO_CLASS_MAP.values()
+        )
+    state = {
+        "type": STATE_TYPE,
+        "format": BACKUP_FORMAT,
+        "tree": db.get_dbid(),
+        "last": os.path.basename(filename),
+        "time": start,
+        "deltas": deltas,
+        "session": _SESSION,
+        "counters": counters,
+    }
+    temp_name = state_name + ".new"
+    with gzip.open(temp_name, "wt", encoding="utf-8", compresslevel=1) as state_file:
+        _write_line(state_file, state)
+        for item in handles:
+            _write_line(state_file, item)
+    os.replace(temp_name, state_name)
+
+
+def diff_handles(old, new):
+    """
+    Return the lists of the handles added and removed, given two sorted
+    lists of handles.
+    """
+    added = []
+    removed = []
+    index = 0
+    size = len(old)
+    for handle in new:
+        while index < size and old[index] < handle:
+            removed.append(old[index])
+            index += 1
+        if index < size and old[index] == handle:
+            index += 1
+        else:
+            added.append(handle)
+    removed.extend(old[index:])
+    return added, removed
+
+
+def get_changed_handles(db, obj_class, since):
+    """
+    Return the set of handles of the objects of a class whose change time
+    is not earlier than since.
+    """
+    if db.has_sql_select():
+        return set(db.select_handles(obj_class, "change >= ?", [since]))
+    get_raw_data = db.method("get_raw_%s_data", obj_class)
+    obj = CLASSES[obj_class]()
+    changed = set()
+    for handle in db.method("iter_%s_handles", obj_class)():
+        obj.unserialize(get_raw_data(handle))
+        if obj.get_change_time() >= since:
+            changed.add(handle)
+    return changed
+
+
+def _write_delta(db, filename, state, start):
+    """
+    Write a delta with the changes since the last backup, and return the
+    handles of the objects of the tree, as :func:`_write_state` takes them.
+    """
+    state_name = os.path.join(os.path.dirname(filename), db.get_dbname() + STATE_EXT)
+    old_handles = dict(_read_state_handles(state_name))
+    new_handles = []
+    header = {
+        "type": DELTA_TYPE,
+        "format": BACKUP_FORMAT,
+        "tree": db.get_dbid(),
+        "previous": state["last"],
+        "since": state["time"],
+        "time": start,
+    }
+    with gzip.open(filename, "wt", encoding="utf-8") as delta:
+        _write_line(delta, header)
+        for obj_class in KEY_TO_CLASS_MAP.values():
+            handles = sorted(db.method("get_%s_handles", obj_class)())
+            added, removed = diff_handles(old_handles.pop(obj_class, []), handles)
+            changed = get_changed_handles(db, obj_class, state["time"])
+            changed.update(added)
+            # Objects whose change time went back, as when an edit is
+            # undone, are found in the change log of the same session.
+            if state["session"] == _SESSION:
+                logged = db.get_changed_handles(obj_class, state["counters"][obj_class])
+                if logged is not None:
+                    changed.update(logged)
+            changed.difference_update(removed)
+            _write_line(delta, ["remove", obj_class, removed])
+            changed = sorted(changed.intersection(handles))
+            get_objects = db.method("get_%s_from_handles", obj_class)
+            for index in range(0, len(changed), CHUNK_SIZE):
+                for obj in get_objects(changed[index : index + CHUNK_SIZE]):
+                    delta.write(to_json(obj) + "\n")
+            new_handles.append((obj_class, handles))
+        _write_line(delta, ["metadata", get_metadata(db)])
+    return new_handles
+
+
+def _write_line(out_file, value):
+    """
+    Write a JSON value on a line of a delta or state file.
+    """
+    out_file.write(json.dumps(value, ensure_ascii=False) + "\n")
+
+
+def get_metadata(db):
+    """
+    Return the data of a tree which is not held by its objects.
+    """
+    return {
+        "researcher": db.get_researcher().serialize(),
+        "default_person": db.get_default_handle(),
+        "mediapath": db.get_mediapath(),
+        "name_formats": list(db.name_formats),
+        "name_groups": {
+            name: db.get_name_group_mapping(name) for name in db.get_name_group_keys()
+        },
+        "bookmarks": {
+            name: list(getattr(db, "get_" + name)().get()) for name in BOOKMARKS
+        },
+    }
+
+
+# -------------------------------------------------------------------------
+#
+# Restoring backups
+#
+# -------------------------------------------------------------------------
+def _read_header(in_file, filename, file_type):
+    """
+    Return the header of a delta or state file, raising GrampsImportError
+    if it is not a file of the type and format written by this version.
+    """
+    try:
+        header = json.loads(in_file.readline())
+    except ValueError:
+        header = None
+    if (
+        not isinstance(header, dict)
+        or header.get("type") != file_type
+        or header.get("format") != BACKUP_FORMAT
+    ):
+        raise GrampsImportError(
+            _("Unknown backup format"),
+            _("%s was not written by this version of Gramps.") % filename,
+        )
+    return header
+
+
+def read_header(filename):
+    """
+    Return the header of a delta.
+    """
+    with gzip.open(filename, "rt", encoding="utf-8") as delta:
+        return _read_header(delta, filename, DELTA_TYPE)
+
+
+def read_delta(filename):
+    """
+    Iterate over the records of a delta, once its header is checked.
+
+    The records are ("remove", class name, handles), ("commit", object) and
+    ("metadata", metadata) tuples.
+    """
+    with gzip.open(filename, "rt", encoding="utf-8") as delta:
+        _read_header(delta, filename, DELTA_TYPE)
+        for line in delta:
+            if line.startswith("{"):
+                obj = from_json(line)
+                if obj.__class__.__name__ not in CLASSES:
+                    raise GrampsImportError(
+                        _("Error reading %s") % filename,
+                        _("Unexpected %s object.") % obj.__class__.__name__,
+                    )
+                yield ("commit", obj)
+            else:
+                yield tuple(json.loads(line))
+
+
+def get_backup_chain(filename):
+    """
+    Return the list of the files of the chain of backups ending with a
+    file, starting with its full snapshot.
+    """
+    chain = [filename]
+    while filename.endswith(DELTA_EXT):
+        header = read_header(filename)
+        filename = os.path.join(os.path.dirname(filename), header["previous"])
+        if filename in chain or not os.path.isfile(filename):
+            raise GrampsImportError(
+                _("Incomplete chain of backups"),
+                _("The backup %s is missing.") % filename,
+            )
+        chain.append(filename)
+    chain.reverse()
+    return chain
+
+
+def restore_backup(db, filename, user):
+    """
+    Restore the chain of backups ending with a file into an empty tree.
+    """
+    from gramps.plugins.importer.importxml import (
+        GrampsParser,
+        ImportOpenFileContextManager,
+    )
+
+    if db.get_total() > 0:
+        raise GrampsImportError(
+            _("The Family Tree is not empty"),
+            _("A chain of backups can only be restored into an empty Family Tree."),
+        )
+    chain = get_backup_chain(filename)
+    with ImportOpenFileContextManager(chain[0], user) as xml_file:
+        if xml_file is None:
+            return
+        # The handles and IDs are kept, as the tree is empty, and no tag is
+        # added to the objects.
+        parser = GrampsParser(db, user, os.path.getmtime(chain[0]))
+        try:
+            parser.parse(xml_file)
+        except ExpatError as msg:
+            raise GrampsImportError(_("Error reading %s") % chain[0], str(msg))
+    for delta in chain[1:]:
+        replay_delta(db, delta)
+
+
+def replay_delta(db, filename):
+    """
+    Apply the changes of a delta to a tree.
+    """
+    db.disable_signals()
+    with DbTxn(_("Restore backup"), db, batch=True) as trans:
+        for kind, *record in read_delta(filename):
+            if kind == "remove":
+                obj_class, handles = record
+                has_handle = db.method("has_%s_handle", obj_class)
+                remove = db.method("remove_%s", obj_class)
+                for handle in handles:
+                    if has_handle(handle):
+                        remove(handle, trans)
+            elif kind == "commit":
+                obj = record[0]
+                commit = db.method("commit_%s", obj.__class__.__name__)
+                commit(obj, trans, obj.get_change_time())
+            elif kind == "metadata":
+                set_metadata(db, record[0])
+    db.enable_signals()
+    db.request_rebuild()
+
+
+def set_metadata(db, metadata):
+    """
+    Set the data of a tree which is not held by its objects.
+    """
+    researcher = Researcher()
+    researcher.unserialize(metadata["researcher"])
+    db.set_researcher(researcher)
+    db.set_default_person_handle(metadata["default_person"])
+    db.set_mediapath(metadata["mediapath"])
+    db.name_formats = [tuple(fmt) for fmt in metadata["name_formats"]]
+    groups = metadata["name_groups"]
+    for name in db.get_name_group_keys():
+        if name not in groups:
+            db.set_name_group_mapping(name, None)
+    for name, grouping in groups.items():
+        db.set_name_group_mapping(name, grouping)
+    for name, handles in metadata["bookmarks"].items():
+        getattr(db, "get_" + name)().set(handles)
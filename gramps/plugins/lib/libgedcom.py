@@ -93,7 +93,7 @@ import re
 import time
 
 # from xml.parsers.expat import ParserCreate
-from collections import defaultdict, OrderedDict
+from collections import defaultdict, deque, OrderedDict
 import string
 import mimetypes
 from io import StringIO, TextIOWrapper
@@ -755,10 +755,12 @@ CUSTOMEVENTTAGS = {
 # table for skipping illegal control chars in GEDCOM import
 # Only 09, 0A, 0D are allowed.
 STRIP_DICT = dict.fromkeys(list(range(9)) + list(range(11, 13)) + list(range(14, 32)))
+STRIP_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
 # The C1 Control characters are not treated in Latin-1 (ISO-8859-1) as
 # undefined, but if they have been used, the file is probably supposed to be
 # cp1252
 DEL_AND_C1 = dict.fromkeys(list(range(0x7F, 0x9F)))
+DEL_AND_C1_RE = re.compile("[\x7f-\x9e]")
 
 # -------------------------------------------------------------------------
 #
@@ -889,6 +891,11 @@ SPAN1 = re.compile(r"\s*FROM\s+\s*(.*)\s+TO\s+@#D?([^@]+)@\s*(.*)$")
 SPAN2 = re.compile(r"\s*FROM\s+@#D?([^@]+)@\s*(.*)\s+TO\s+\s*(.*)$")
 NAME_RE = re.compile(r"/?([^/]*)(/([^/]*)(/([^/]*))?)?")
 SURNAME_RE = re.compile(r"/([^/]*)/([^/]*)")
+# A GEDCOM line: the level, then an @xref@ and the rest of the line, or a tag
+# and its value.  The lines which do not match are split by Lexer.split_line.
+LINE_RE = re.compile(r" *([0-9]+) +(?:@([^@]*)@(.*)|([^ @][^ ]*)(?: (.*))?)", re.S)
+# Number of characters read at a time by the readers
+READ_SIZE = 1 << 16
 
 
 # -----------------------------------------------------------------------
@@ -931,15 +938,14 @@ class Lexer:
 
     def __init__(self, ifile, __add_msg):
         self.ifile = ifile
-        self.current_list = []
+        # The lines split ahead, last one first, and the lines read ahead,
+        # last one first
+        self.current_list = deque()
+        self.lines = []
         self.eof = False
         self.cnv = None
         self.cnt = 0
         self.index = 0
-        self.func_map = {
-            TOKEN_CONT: self.__fix_token_cont,
-            TOKEN_CONC: self.__fix_token_conc,
-        }
         self.__add_msg = __add_msg
 
     def readline(self):
@@ -972,66 +978,96 @@ class Lexer:
             new_value = line[2] + data[2]
         self.current_list[0] = (line[0], line[1], new_value, line[3], line[4])
 
+    @staticmethod
+    def split_line(line):
+        """
+        Split a line into its level, tag and value, the tag being the xref
+        if there is one.  Raise an exception if the line has no level.
+        """
+        # According to the GEDCOM 5.5 standard,
+        # Chapter 1 subsection Grammar "leading whitespace preceeding
+        # a GEDCOM line should be ignored"
+        # The terminator, any combination of carriage_return and
+        # line_feed, is already stripped.
+        match = LINE_RE.fullmatch(line)
+        if match:
+            level, xref, rest, tag, line_value = match.groups()
+            if tag is not None:
+                return int(level), tag, line_value or ""
+            return Lexer.__split_xref(int(level), xref, rest)
+        line = line.lstrip(" ")
+        # split into level+delim+rest
+        line = line.partition(" ")
+        level = int(line[0])
+        # there should only be one space after the level,
+        # but we can ignore more,
+        line = line[2].lstrip(" ")
+        # then split into tag+delim+line_value
+        # or xfef_id+delim+rest
+        # the xref_id can have spaces in it
+        if line.startswith("@"):
+            line = line.split("@", 2)
+            # line is now [None, alphanum+pointer_string, rest]
+            return Lexer.__split_xref(level, line[1], line[2])
+        line = line.partition(" ")
+        return level, line[0], line[2]
+
+    @staticmethod
+    def __split_xref(level, xref, rest):
+        tag = "@" + xref + "@"
+        line_value = rest.lstrip()
+        # Ignore meaningless @IDENT@ on CONT or CONC line
+        # as noted at http://www.tamurajones.net/IdentCONT.xhtml
+        if line_value.startswith("CONT ") or line_value.startswith("CONC "):
+            line = line_value.partition(" ")
+            tag = line[0]
+            line_value = line[2]
+        return level, tag, line_value
+
     def __readahead(self):
-        while len(self.current_list) < 5:
-            line = self.ifile.readline()
+        """
+        Split the lines read from the file, a block at a time, until five
+        lines are ready to be returned.  The last line may yet be continued
+        by CONT or CONC lines.
+        """
+        current_list = self.current_list
+        lines = self.lines
+        fullmatch = LINE_RE.fullmatch
+        while len(current_list) < 5:
+            if not lines:
+                lines.extend(self.ifile.readlines())
+                if not lines:
+                    self.eof = True
+                    return
+                lines.reverse()
+            line = lines.pop().rstrip("\n\r")
             self.index += 1
-            if not line:
-                self.eof = True
-                return
-
-            original_line = line
+            match = fullmatch(line)
             try:
-                # According to the GEDCOM 5.5 standard,
-                # Chapter 1 subsection Grammar "leading whitespace preceeding
-                # a GEDCOM line should be ignored"
-                # We will also strip the terminator which is any combination
-                # of carriage_return and line_feed
-                line = line.lstrip(" ").rstrip("\n\r")
-                # split into level+delim+rest
-                line = line.partition(" ")
-                level = int(line[0])
-                # there should only be one space after the level,
-                # but we can ignore more,
-                line = line[2].lstrip(" ")
-                # then split into tag+delim+line_value
-                # or xfef_id+delim+rest
-                # the xref_id can have spaces in it
-                if line.startswith("@"):
-                    line = line.split("@", 2)
-                    # line is now [None, alphanum+pointer_string, rest]
-                    tag = "@" + line[1] + "@"
-                    line_value = line[2].lstrip()
-                    # Ignore meaningless @IDENT@ on CONT or CONC line
-                    # as noted at http://www.tamurajones.net/IdentCONT.xhtml
-                    if line_value.lstrip().startswith(
-                        "CONT "
-                    ) or line_value.lstrip().startswith("CONC "):
-                        line = line_value.lstrip().partition(" ")
-                        tag = line[0]
-                        line_value = line[2]
+                if match and match[4] is not None:
+                    level = int(match[1])
+                    tag = match[4]
+                    line_value = match[5] or ""
                 else:
-                    line = line.partition(" ")
-                    tag = line[0]
-                    line_value = line[2]
+                    level, tag, line_value = self.split_line(line)
             except:
                 problem = _("Line ignored ")
-                text = original_line.rstrip("\n\r")
                 prob_width = 66
                 problem = problem.ljust(prob_width)[0 : (prob_width - 1)]
-                text = text.replace("\n", "\n".ljust(prob_width + 22))
+                text = line.replace("\n", "\n".ljust(prob_width + 22))
                 message = "%s              %s" % (problem, text)
                 self.__add_msg(message)
                 continue
 
             # Need to un-double '@' See Gedcom 5.5 spec 'any_char'
-            line_value = line_value.replace("@@", "@")
+            if "@@" in line_value:
+                line_value = line_value.replace("@@", "@")
             token = TOKENS.get(tag, TOKEN_UNKNOWN)
-            data = (level, token, line_value, tag, self.index)
 
-            func = self.func_map.get(data[1])
-            if func:
-                func(data)
+            if token == TOKEN_CONT:
+                self.__fix_token_cont((level, token, line_value))
+            elif token == TOKEN_CONC:
+                self.__fix_token_conc((level, token, line_value))
             else:
                 # There will normally only be one space between tag and
                 # line_value, but in case there is more then one, remove extra
@@ -1039,17 +1075,9 @@ class Lexer:
                 # Also, Gedcom spec says there should be no spaces at end of
                 # line, however some programs put them there (FTM), so let's
                 # leave them in place.
-                data = data[:2] + (data[2].lstrip(),) + data[3:]
-                self.current_list.insert(0, data)
-
-    def clean_up(self):
-        """
-        Break circular references to parsing methods stored in dictionaries
-        to aid garbage collection
-        """
-        for key in list(self.func_map.keys()):
-            del self.func_map[key]
-        del self.func_map
+                current_list.appendleft(
+                    (level, token, line_value.lstrip(), tag, self.index)
+                )
 
 
 # -----------------------------------------------------------------------
@@ -1335,6 +1363,44 @@ class BaseReader:
         """Read a single line"""
         raise NotImplementedError()
 
+    def readlines(self):
+        """
+        Read the next lines, without their terminators.  The list is empty
+        at the end of the file.
+        """
+        lines = []
+        size = 0
+        while size < READ_SIZE:
+            line = self.readline()
+            if not line:
+                break
+            lines.append(line.rstrip("\n"))
+            size += len(line)
+        return lines
+
+    def read_text(self):
+        """
+        Read the text of the next lines, ending with a line terminator
+        unless at the end of the file.
+        """
+        text = self.ifile.read(READ_SIZE)
+        if text and text[-1] != "\n":
+            text += self.ifile.readline()
+        return text
+
+    @staticmethod
+    def split_text(text):
+        """
+        Split text read by read_text into its lines, skipping the illegal
+        control characters.
+        """
+        if STRIP_RE.search(text):
+            text = text.translate(STRIP_DICT)
+        lines = text.split("\n")
+        if not lines[-1]:
+            lines.pop()
+        return lines
+
     def report_error(self, problem, line):
         """Create an error message"""
         line = line.rstrip("\n\r")
@@ -1364,6 +1430,9 @@ class UTF8Reader(BaseReader):
         line = self.ifile.readline()
         return line.translate(STRIP_DICT)
 
+    def readlines(self):
+        return self.split_text(self.read_text())
+
 
 class UTF16Reader(BaseReader):
     """The main UTF-16 reader, uses Python for char handling"""
@@ -1379,6 +1448,9 @@ class UTF16Reader(BaseReader):
         line = self.ifile.readline()
         return line.translate(STRIP_DICT)
 
+    def readlines(self):
+        return self.split_text(self.read_text())
+
 
 class AnsiReader(BaseReader):
     """The main ANSI (latin1) reader, uses Python for char handling"""
@@ -1397,6 +1469,17 @@ class AnsiReader(BaseReader):
             )
         return line.translate(STRIP_DICT)
 
+    def readlines(self):
+        text = self.read_text()
+        if DEL_AND_C1_RE.search(text):
+            for line in text.split("\n"):
+                if DEL_AND_C1_RE.search(line):
+                    self.report_error(
+                        "DEL or C1 control chars in line did you mean " "CHAR cp1252??",
+                        line,
+                    )
+        return self.split_text(text)
+
 
 class CP1252Reader(BaseReader):
     """The extra credit CP1252 reader, uses Python for char handling"""
@@ -1411,6 +1494,9 @@ class CP1252Reader(BaseReader):
         line = self.ifile.readline()
         return line.translate(STRIP_DICT)
 
+    def readlines(self):
+        return self.split_text(self.read_text())
+
 
 class AnselReader(BaseReader):
     """
@@ -2103,13 +2189,15 @@ class IdMapper:
         self.find_next = find_next
         self.id2user_format = id2user_format
         self.swap = {}
+        # The Gramps IDs which are the targets of a swap
+        self.targets = set()
 
     def __getitem__(self, gid):
         if gid == "":
             # We need to find the next gramps ID provided it is not already
             # the target of a swap
             new_val = self.find_next()
-            while new_val in list(self.swap.values()):
+            while new_val in self.targets:
                 new_val = self.find_next()
         else:
             # remove any @ signs
@@ -2124,17 +2212,16 @@ class IdMapper:
                 # have found it. If we had already encountered I0001 and we are
                 # now looking for I1, it wouldn't be in self.swap, and we now
                 # find that I0001 is in use, so we have to create a new id.
-                if self.has_gid(formatted_gid) or (
-                    formatted_gid in list(self.swap.values())
-                ):
+                if formatted_gid in self.targets or self.has_gid(formatted_gid):
                     new_val = self.find_next()
-                    while new_val in list(self.swap.values()):
+                    while new_val in self.targets:
                         new_val = self.find_next()
                 else:
                     new_val = formatted_gid
             # we need to distinguish between I1 and I0001, so we record the map
             # from the original format
             self.swap[gid] = new_val
+            self.targets.add(new_val)
         return new_val
 
     def clean(self, gid):
@@ -2167,6 +2254,7 @@ class GedcomParser(UpdateCallback):
 
     SyntaxError = "Syntax Error"
     BadFile = "Not a GEDCOM file"
+    __parse_tables_built = False
 
     @staticmethod
     def __find_from_handle(gramps_id, table):
@@ -2249,7 +2337,6 @@ class GedcomParser(UpdateCallback):
         self.genvers = ""
         self.subm = ""
         self.use_def_src = default_source
-        self.func_list = []
         if self.use_def_src:
             self.def_src = Source()
             fname = os.path.basename(filename).split("\\")[-1]
@@ -2311,6 +2398,53 @@ class GedcomParser(UpdateCallback):
 
         self.place_import = PlaceImport(self.dbase)
 
+        self.__init_parse_tables()
+
+        self.place_names = defaultdict(list)
+        cursor = dbase.get_place_cursor()
+        data = next(cursor)
+        while data:
+            (handle, val) = data
+            self.place_names[val[2]].append(handle)
+            data = next(cursor)
+        cursor.close()
+
+        enc = stage_one.get_encoding()
+
+        if enc == "ANSEL":
+            rdr = AnselReader(ifile, self.__add_msg)
+        elif enc in ("UTF-8", "UTF8", "UTF_8_SIG"):
+            rdr = UTF8Reader(ifile, self.__add_msg, enc)
+        elif enc in ("UTF-16LE", "UTF-16BE", "UTF16", "UNICODE"):
+            rdr = UTF16Reader(ifile, self.__add_msg)
+        elif enc in ("CP1252", "WINDOWS-1252"):
+            rdr = CP1252Reader(ifile, self.__add_msg)
+        else:
+            rdr = AnsiReader(ifile, self.__add_msg)
+
+        self.lexer = Lexer(rdr, self.__add_msg)
+        self.filename = filename
+        self.backoff = False
+
+        fullpath = os.path.normpath(os.path.abspath(filename))
+        self.geddir = os.path.dirname(fullpath)
+
+        self.error_count = 0
+        amap = PERSONALCONSTANTATTRIBUTES
+
+        self.attrs = list(amap.values())
+        self.gedattr = dict([key, val] for val, key in amap.items())
+
+    @classmethod
+    def __init_parse_tables(cls):
+        """
+        Build the tables mapping the tokens to the parsing methods, once for
+        the class.  The methods are called with the parser as first
+        argument.
+        """
+        if cls.__parse_tables_built:
+            return
+
         #
         # Parse table for <<SUBMITTER_RECORD>> below the level 0 SUBM tag
         #
@@ -2325,26 +2459,25 @@ class GedcomParser(UpdateCallback):
         #   +1 <<CHANGE_DATE>>                            {0:1}
 
         # (N.B. GEDCOM allows multiple SUBMitter records)
-        self.subm_parse_tbl = {
+        cls.subm_parse_tbl = {
             # +1 NAME <SUBMITTER_NAME>
-            TOKEN_NAME: self.__subm_name,
+            TOKEN_NAME: cls.__subm_name,
             # +1 <<ADDRESS_STRUCTURE>>
-            TOKEN_ADDR: self.__subm_addr,
-            TOKEN_PHON: self.__subm_phon,
-            TOKEN_EMAIL: self.__subm_email,
-            TOKEN_WWW: self.__repo_www,
-            TOKEN_FAX: self.__repo_fax,
+            TOKEN_ADDR: cls.__subm_addr,
+            TOKEN_PHON: cls.__subm_phon,
+            TOKEN_EMAIL: cls.__subm_email,
+            TOKEN_WWW: cls.__repo_www,
+            TOKEN_FAX: cls.__repo_fax,
             # +1 <<MULTIMEDIA_LINK>>
             # +1 LANG <LANGUAGE_PREFERENCE>
             # +1 <<NOTE_STRUCTURE>>
-            TOKEN_NOTE: self.__repo_note,
-            TOKEN_RNOTE: self.__repo_note,
+            TOKEN_NOTE: cls.__repo_note,
+            TOKEN_RNOTE: cls.__repo_note,
             # +1 RFN <SUBMITTER_REGISTERED_RFN>
             # +1 RIN <AUTOMATED_RECORD_ID>
             # +1 <<CHANGE_DATE>>
-            TOKEN_CHAN: self.__repo_chan,
+            TOKEN_CHAN: cls.__repo_chan,
         }
-        self.func_list.append(self.subm_parse_tbl)
 
         #
         # Parse table for <<INDIVIDUAL_RECORD>> below the level 0  INDI tag
@@ -2373,112 +2506,110 @@ class GedcomParser(UpdateCallback):
         #   +1 RIN <AUTOMATED_RECORD_ID>                  {0:1}
         #   +1 <<CHANGE_DATE>>                            {0:1}
 
-        self.indi_parse_tbl = {
+        cls.indi_parse_tbl = {
             # +1 RESN <RESTRICTION_NOTICE> {0:1}
-            TOKEN_RESN: self.__person_resn,
+            TOKEN_RESN: cls.__person_resn,
             # +1 <<PERSONAL_NAME_STRUCTURE>> {0:M}
-            TOKEN_NAME: self.__person_name,
+            TOKEN_NAME: cls.__person_name,
             # +1 SEX <SEX_VALUE> {0:1}
-            TOKEN_SEX: self.__person_sex,
+            TOKEN_SEX: cls.__person_sex,
             # +1 <<INDIVIDUAL_EVENT_STRUCTURE>> {0:M}
-            TOKEN_EVEN: self.__person_even,
-            TOKEN_GEVENT: self.__person_std_event,
-            TOKEN_BIRT: self.__person_birt,
-            TOKEN_RELI: self.__person_reli,
-            TOKEN_ADOP: self.__person_adop,
-            TOKEN_DEAT: self.__person_deat,
+            TOKEN_EVEN: cls.__person_even,
+            TOKEN_GEVENT: cls.__person_std_event,
+            TOKEN_BIRT: cls.__person_birt,
+            TOKEN_RELI: cls.__person_reli,
+            TOKEN_ADOP: cls.__person_adop,
+            TOKEN_DEAT: cls.__person_deat,
             # +1 <<INDIVIDUAL_ATTRIBUTE_STRUCTURE>> {0:M}
             # +1 AFN <ANCESTRAL_FILE_NUMBER> {0:1}
-            TOKEN_ATTR: self.__person_std_attr,
-            TOKEN_FACT: self.__person_fact,
+            TOKEN_ATTR: cls.__person_std_attr,
+            TOKEN_FACT: cls.__person_fact,
             # +1 <<LDS_INDIVIDUAL_ORDINANCE>> {0:M}
-            TOKEN_BAPL: self.__person_bapl,
-            TOKEN_CONL: self.__person_conl,
-            TOKEN_ENDL: self.__person_endl,
-            TOKEN_SLGC: self.__person_slgc,
+            TOKEN_BAPL: cls.__person_bapl,
+            TOKEN_CONL: cls.__person_conl,
+            TOKEN_ENDL: cls.__person_endl,
+            TOKEN_SLGC: cls.__person_slgc,
             # +1 <<CHILD_TO_FAMILY_LINK>> {0:M}
-            TOKEN_FAMC: self.__person_famc,
+            TOKEN_FAMC: cls.__person_famc,
             # +1 <<SPOUSE_TO_FAMILY_LINK>> {0:M}
-            TOKEN_FAMS: self.__person_fams,
+            TOKEN_FAMS: cls.__person_fams,
             # +1 SUBM @<XREF:SUBM>@ {0:M}
-            TOKEN_SUBM: self.__skip_record,
+            TOKEN_SUBM: cls.__skip_record,
             # +1 <<ASSOCIATION_STRUCTURE>> {0:M}
-            TOKEN_ASSO: self.__person_asso,
+            TOKEN_ASSO: cls.__person_asso,
             # +1 ALIA @<XREF:INDI>@ {0:M}
-            TOKEN_ALIA: self.__person_alt_name,
+            TOKEN_ALIA: cls.__person_alt_name,
             # +1 ANCI @<XREF:SUBM>@ {0:M}
-            TOKEN_ANCI: self.__skip_record,
+            TOKEN_ANCI: cls.__skip_record,
             # +1 DESI @<XREF:SUBM>@ {0:M}
-            TOKEN_DESI: self.__skip_record,
+            TOKEN_DESI: cls.__skip_record,
             # +1 <<SOURCE_CITATION>> {0:M}
-            TOKEN_SOUR: self.__person_sour,
+            TOKEN_SOUR: cls.__person_sour,
             # +1 <<MULTIMEDIA_LINK>> {0:M}
-            TOKEN_OBJE: self.__person_object,
+            TOKEN_OBJE: cls.__person_object,
             # +1 <<NOTE_STRUCTURE>> {0:M}
-            TOKEN_NOTE: self.__person_note,
-            TOKEN_RNOTE: self.__person_note,
-            TOKEN__COMM: self.__person_note,
+            TOKEN_NOTE: cls.__person_note,
+            TOKEN_RNOTE: cls.__person_note,
+            TOKEN__COMM: cls.__person_note,
             # +1 RFN <PERMANENT_RECORD_FILE_NUMBER> {0:1}
-            TOKEN_RFN: self.__person_attr,
+            TOKEN_RFN: cls.__person_attr,
             # +1 REFN <USER_REFERENCE_NUMBER> {0:M}
             # +2 TYPE <USER_REFERENCE_TYPE> {0:1}
-            TOKEN_REFN: self.__person_refn,
+            TOKEN_REFN: cls.__person_refn,
             # TYPE should be below REFN, but will work here anyway
-            TOKEN_TYPE: self.__person_attr,
+            TOKEN_TYPE: cls.__person_attr,
             # +1 RIN <AUTOMATED_RECORD_ID> {0:1}
-            TOKEN_RIN: self.__person_attr,
+            TOKEN_RIN: cls.__person_attr,
             # +1 <<CHANGE_DATE>> {0:1}
-            TOKEN_CHAN: self.__person_chan,
+            TOKEN_CHAN: cls.__person_chan,
             # The following tags are not part of Gedcom spec but are commonly
             # found here anyway
-            TOKEN_ADDR: self.__person_addr,
-            TOKEN_PHON: self.__person_phon,
-            TOKEN_FAX: self.__person_fax,
-            TOKEN_EMAIL: self.__person_email,
-            TOKEN_WWW: self.__person_www,
-            TOKEN__TODO: self.__skip_record,
-            TOKEN_TITL: self.__person_titl,
-            TOKEN__PHOTO: self.__person_photo,
+            TOKEN_ADDR: cls.__person_addr,
+            TOKEN_PHON: cls.__person_phon,
+            TOKEN_FAX: cls.__person_fax,
+            TOKEN_EMAIL: cls.__person_email,
+            TOKEN_WWW: cls.__person_www,
+            TOKEN__TODO: cls.__skip_record,
+            TOKEN_TITL: cls.__person_titl,
+            TOKEN__PHOTO: cls.__person_photo,
         }
-        self.func_list.append(self.indi_parse_tbl)
 
-        self.name_parse_tbl = {
+        cls.name_parse_tbl = {
             # +1 NPFX <NAME_PIECE_PREFIX> {0:1}
-            TOKEN_NPFX: self.__name_npfx,
+            TOKEN_NPFX: cls.__name_npfx,
             # +1 GIVN <NAME_PIECE_GIVEN> {0:1}
-            TOKEN_GIVN: self.__name_givn,
+            TOKEN_GIVN: cls.__name_givn,
             # NICK <NAME_PIECE_NICKNAME> {0:1}
-            TOKEN_NICK: self.__name_nick,
+            TOKEN_NICK: cls.__name_nick,
             # _RUFNAME <NAME_PIECE_CALLNAME> {0:1}
-            TOKEN__CALLNAME: self.__name_call,
+            TOKEN__CALLNAME: cls.__name_call,
             # +1 SPFX <NAME_PIECE_SURNAME_PREFIX {0:1}
-            TOKEN_SPFX: self.__name_spfx,
+            TOKEN_SPFX: cls.__name_spfx,
             # +1 SURN <NAME_PIECE_SURNAME> {0:1}
-            TOKEN_SURN: self.__name_surn,
+            TOKEN_SURN: cls.__name_surn,
             # +1 NSFX <NAME_PIECE_SUFFIX> {0:1}
-            TOKEN_NSFX: self.__name_nsfx,
+            TOKEN_NSFX: cls.__name_nsfx,
             # +1 <<SOURCE_CITATION>> {0:M}
-            TOKEN_SOUR: self.__name_sour,
+            TOKEN_SOUR: cls.__name_sour,
             # +1 <<NOTE_STRUCTURE>> {0:M}
-            TOKEN_NOTE: self.__name_note,
-            TOKEN_RNOTE: self.__name_note,
+            TOKEN_NOTE: cls.__name_note,
+            TOKEN_RNOTE: cls.__name_note,
             # Extensions
-            TOKEN_ALIA: self.__name_alia,
-            TOKEN__MARNM: self.__name_marnm,
-            TOKEN__MAR: self.__name_marnm,  # Generated by geni.com
-            TOKEN__MARN: self.__name_marnm,  # Gen'd by BROSKEEP 6.1.31 WIN
-            TOKEN__AKA: self.__name_aka,  # PAF and AncestQuest
-            TOKEN_TYPE: self.__name_type,  # This is legal GEDCOM 5.5.1
-            TOKEN_BIRT: self.__ignore,
-            TOKEN_DATE: self.__name_date,
+            TOKEN_ALIA: cls.__name_alia,
+            TOKEN__MARNM: cls.__name_marnm,
+            TOKEN__MAR: cls.__name_marnm,  # Generated by geni.com
+            TOKEN__MARN: cls.__name_marnm,  # Gen'd by BROSKEEP 6.1.31 WIN
+            TOKEN__AKA: cls.__name_aka,  # PAF and AncestQuest
+            TOKEN_TYPE: cls.__name_type,  # This is legal GEDCOM 5.5.1
+            TOKEN_BIRT: cls.__ignore,
+            TOKEN_DATE: cls.__name_date,
             # This handles date as a subsidiary of "1 ALIA" which might be used
             # by Family Tree Maker and Reunion, and by cheating (handling a
             # lower level from the current parse table) handles date as
             # subsidiary to "2 _MARN", "2 _AKAN" and "2 _ADPN" which has been
             # found in Brother's keeper.
-            TOKEN__ADPN: self.__name_adpn,
+            TOKEN__ADPN: cls.__name_adpn,
         }
-        self.func_list.append(self.name_parse_tbl)
 
         #
         # Parse table for <<REPOSITORY_RECORD>> below the level 0 REPO tag
@@ -2492,216 +2623,205 @@ class GedcomParser(UpdateCallback):
         #   +1 RIN <AUTOMATED_RECORD_ID>                  {0:1}
         #   +1 <<CHANGE_DATE>>                            {0:1}
 
-        self.repo_parse_tbl = {
-            TOKEN_NAME: self.__repo_name,
-            TOKEN_ADDR: self.__repo_addr,
-            TOKEN_RIN: self.__ignore,
-            TOKEN_NOTE: self.__repo_note,
-            TOKEN_RNOTE: self.__repo_note,
-            TOKEN_CHAN: self.__repo_chan,
-            TOKEN_PHON: self.__repo_phon,
-            TOKEN_EMAIL: self.__repo_email,
-            TOKEN_WWW: self.__repo_www,
-            TOKEN_FAX: self.__repo_fax,
+        cls.repo_parse_tbl = {
+            TOKEN_NAME: cls.__repo_name,
+            TOKEN_ADDR: cls.__repo_addr,
+            TOKEN_RIN: cls.__ignore,
+            TOKEN_NOTE: cls.__repo_note,
+            TOKEN_RNOTE: cls.__repo_note,
+            TOKEN_CHAN: cls.__repo_chan,
+            TOKEN_PHON: cls.__repo_phon,
+            TOKEN_EMAIL: cls.__repo_email,
+            TOKEN_WWW: cls.__repo_www,
+            TOKEN_FAX: cls.__repo_fax,
         }
-        self.func_list.append(self.repo_parse_tbl)
 
-        self.event_parse_tbl = {
+        cls.event_parse_tbl = {
             # n TYPE <EVENT_DESCRIPTOR> {0:1}
-            TOKEN_TYPE: self.__event_type,
+            TOKEN_TYPE: cls.__event_type,
             # n DATE <DATE_VALUE> {0:1} p.*/*
-            TOKEN_DATE: self.__event_date,
+            TOKEN_DATE: cls.__event_date,
             # n <<PLACE_STRUCTURE>> {0:1} p.*
-            TOKEN_PLAC: self.__event_place,
+            TOKEN_PLAC: cls.__event_place,
             # n <<ADDRESS_STRUCTURE>> {0:1} p.*
-            TOKEN_ADDR: self.__event_addr,
+            TOKEN_ADDR: cls.__event_addr,
             # n AGE <AGE_AT_EVENT> {0:1} p.*
-            TOKEN_AGE: self.__event_age,
+            TOKEN_AGE: cls.__event_age,
             # n AGNC <RESPONSIBLE_AGENCY> {0:1} p.*
-            TOKEN_AGNC: self.__event_agnc,
+            TOKEN_AGNC: cls.__event_agnc,
             # n CAUS <CAUSE_OF_EVENT> {0:1} p.*
-            TOKEN_CAUS: self.__event_cause,
+            TOKEN_CAUS: cls.__event_cause,
             # n <<SOURCE_CITATION>> {0:M} p.*
-            TOKEN_SOUR: self.__event_source,
+            TOKEN_SOUR: cls.__event_source,
             # n <<MULTIMEDIA_LINK>> {0:M} p.*, *
-            TOKEN_OBJE: self.__event_object,
+            TOKEN_OBJE: cls.__event_object,
             # n <<NOTE_STRUCTURE>> {0:M} p.
-            TOKEN_NOTE: self.__event_inline_note,
-            TOKEN_RNOTE: self.__event_note,
+            TOKEN_NOTE: cls.__event_inline_note,
+            TOKEN_RNOTE: cls.__event_note,
             # Other
-            TOKEN__PRIV: self.__event_privacy,
-            TOKEN_OFFI: self.__event_note,
-            TOKEN_PHON: self.__event_phon,
-            TOKEN__GODP: self.__event_witness,
-            TOKEN__WITN: self.__event_witness,
-            TOKEN__WTN: self.__event_witness,
-            TOKEN_RELI: self.__ignore,
+            TOKEN__PRIV: cls.__event_privacy,
+            TOKEN_OFFI: cls.__event_note,
+            TOKEN_PHON: cls.__event_phon,
+            TOKEN__GODP: cls.__event_witness,
+            TOKEN__WITN: cls.__event_witness,
+            TOKEN__WTN: cls.__event_witness,
+            TOKEN_RELI: cls.__ignore,
             # Not legal, but inserted by PhpGedView
-            TOKEN_TIME: self.__event_time,
-            TOKEN_ASSO: self.__ignore,
-            TOKEN_IGNORE: self.__ignore,
-            TOKEN_STAT: self.__ignore,
-            TOKEN_TEMP: self.__ignore,
-            TOKEN_HUSB: self.__event_husb,
-            TOKEN_WIFE: self.__event_wife,
-            TOKEN_FAMC: self.__person_birth_famc,
+            TOKEN_TIME: cls.__event_time,
+            TOKEN_ASSO: cls.__ignore,
+            TOKEN_IGNORE: cls.__ignore,
+            TOKEN_STAT: cls.__ignore,
+            TOKEN_TEMP: cls.__ignore,
+            TOKEN_HUSB: cls.__event_husb,
+            TOKEN_WIFE: cls.__event_wife,
+            TOKEN_FAMC: cls.__person_birth_famc,
             # Not legal, but inserted by Ultimate Family Tree
-            TOKEN_CHAN: self.__ignore,
-            TOKEN_QUAY: self.__ignore,
+            TOKEN_CHAN: cls.__ignore,
+            TOKEN_QUAY: cls.__ignore,
             # Not legal, but inserted by FamilyTreeBuilder
-            TOKEN_RIN: self.__event_rin,
-            TOKEN_ATTR: self.__event_attr,  # FTB for _UID
-            TOKEN_EMAIL: self.__event_email,  # FTB for RESI events
-            TOKEN_WWW: self.__event_www,  # FTB for RESI events
-            TOKEN_FAX: self.__event_fax,  # legal...
+            TOKEN_RIN: cls.__event_rin,
+            TOKEN_ATTR: cls.__event_attr,  # FTB for _UID
+            TOKEN_EMAIL: cls.__event_email,  # FTB for RESI events
+            TOKEN_WWW: cls.__event_www,  # FTB for RESI events
+            TOKEN_FAX: cls.__event_fax,  # legal...
         }
-        self.func_list.append(self.event_parse_tbl)
-
-        self.adopt_parse_tbl = {
-            TOKEN_TYPE: self.__event_type,
-            TOKEN__PRIV: self.__event_privacy,
-            TOKEN_DATE: self.__event_date,
-            TOKEN_SOUR: self.__event_source,
-            TOKEN_PLAC: self.__event_place,
-            TOKEN_ADDR: self.__event_addr,
-            TOKEN_PHON: self.__event_phon,
-            TOKEN_CAUS: self.__event_cause,
-            TOKEN_AGNC: self.__event_agnc,
-            TOKEN_AGE: self.__event_age,
-            TOKEN_NOTE: self.__event_note,
-            TOKEN_RNOTE: self.__event_note,
-            TOKEN_OFFI: self.__event_note,
-            TOKEN__GODP: self.__event_witness,
-            TOKEN__WITN: self.__event_witness,
-            TOKEN__WTN: self.__event_witness,
-            TOKEN_RELI: self.__ignore,
-            TOKEN_TIME: self.__ignore,
-            TOKEN_ASSO: self.__ignore,
-            TOKEN_IGNORE: self.__ignore,
-            TOKEN_STAT: self.__ignore,
-            TOKEN_TEMP: self.__ignore,
-            TOKEN_OBJE: self.__event_object,
-            TOKEN_FAMC: self.__person_adopt_famc,
+
+        cls.adopt_parse_tbl = {
+            TOKEN_TYPE: cls.__event_type,
+            TOKEN__PRIV: cls.__event_privacy,
+            TOKEN_DATE: cls.__event_date,
+            TOKEN_SOUR: cls.__event_source,
+            TOKEN_PLAC: cls.__event_place,
+            TOKEN_ADDR: cls.__event_addr,
+            TOKEN_PHON: cls.__event_phon,
+            TOKEN_CAUS: cls.__event_cause,
+            TOKEN_AGNC: cls.__event_agnc,
+            TOKEN_AGE: cls.__event_age,
+            TOKEN_NOTE: cls.__event_note,
+            TOKEN_RNOTE: cls.__event_note,
+            TOKEN_OFFI: cls.__event_note,
+            TOKEN__GODP: cls.__event_witness,
+            TOKEN__WITN: cls.__event_witness,
+            TOKEN__WTN: cls.__event_witness,
+            TOKEN_RELI: cls.__ignore,
+            TOKEN_TIME: cls.__ignore,
+            TOKEN_ASSO: cls.__ignore,
+            TOKEN_IGNORE: cls.__ignore,
+            TOKEN_STAT: cls.__ignore,
+            TOKEN_TEMP: cls.__ignore,
+            TOKEN_OBJE: cls.__event_object,
+            TOKEN_FAMC: cls.__person_adopt_famc,
             # Not legal, but inserted by Ultimate Family Tree
-            TOKEN_CHAN: self.__ignore,
-            TOKEN_QUAY: self.__ignore,
+            TOKEN_CHAN: cls.__ignore,
+            TOKEN_QUAY: cls.__ignore,
         }
-        self.func_list.append(self.adopt_parse_tbl)
 
-        self.famc_parse_tbl = {
+        cls.famc_parse_tbl = {
             # n FAMC @<XREF:FAM>@ {1:1}
             # +1 PEDI <PEDIGREE_LINKAGE_TYPE> {0:1} p.*
-            TOKEN_PEDI: self.__person_famc_pedi,
+            TOKEN_PEDI: cls.__person_famc_pedi,
             # +1 _FREL <Father PEDIGREE_LINKAGE_TYPE> {0:1}  non-standard
-            TOKEN__FREL: self.__person_famc_frel,
+            TOKEN__FREL: cls.__person_famc_frel,
             # +1 _MREL <Mother PEDIGREE_LINKAGE_TYPE> {0:1}  non-standard
-            TOKEN__MREL: self.__person_famc_mrel,
+            TOKEN__MREL: cls.__person_famc_mrel,
             # +1 <<NOTE_STRUCTURE>> {0:M} p.*
-            TOKEN_NOTE: self.__person_famc_note,
-            TOKEN_RNOTE: self.__person_famc_note,
+            TOKEN_NOTE: cls.__person_famc_note,
+            TOKEN_RNOTE: cls.__person_famc_note,
             # Extras
-            TOKEN__PRIMARY: self.__person_famc_primary,
-            TOKEN_SOUR: self.__person_famc_sour,
+            TOKEN__PRIMARY: cls.__person_famc_primary,
+            TOKEN_SOUR: cls.__person_famc_sour,
             # GEDit
-            TOKEN_STAT: self.__ignore,
+            TOKEN_STAT: cls.__ignore,
         }
-        self.func_list.append(self.famc_parse_tbl)
 
-        self.person_fact_parse_tbl = {
-            TOKEN_TYPE: self.__person_fact_type,
-            TOKEN_SOUR: self.__person_attr_source,
-            TOKEN_NOTE: self.__person_attr_note,
-            TOKEN_RNOTE: self.__person_attr_note,
+        cls.person_fact_parse_tbl = {
+            TOKEN_TYPE: cls.__person_fact_type,
+            TOKEN_SOUR: cls.__person_attr_source,
+            TOKEN_NOTE: cls.__person_attr_note,
+            TOKEN_RNOTE: cls.__person_attr_note,
         }
-        self.func_list.append(self.person_fact_parse_tbl)
-
-        self.person_attr_parse_tbl = {
-            TOKEN_TYPE: self.__person_attr_type,
-            TOKEN_CAUS: self.__ignore,
-            TOKEN_DATE: self.__ignore,
-            TOKEN_TIME: self.__ignore,
-            TOKEN_ADDR: self.__ignore,
-            TOKEN_IGNORE: self.__ignore,
-            TOKEN_STAT: self.__ignore,
-            TOKEN_TEMP: self.__ignore,
-            TOKEN_OBJE: self.__ignore,
-            TOKEN_SOUR: self.__person_attr_source,
-            TOKEN_PLAC: self.__person_attr_place,
-            TOKEN_NOTE: self.__person_attr_note,
-            TOKEN_RNOTE: self.__person_attr_note,
+
+        cls.person_attr_parse_tbl = {
+            TOKEN_TYPE: cls.__person_attr_type,
+            TOKEN_CAUS: cls.__ignore,
+            TOKEN_DATE: cls.__ignore,
+            TOKEN_TIME: cls.__ignore,
+            TOKEN_ADDR: cls.__ignore,
+            TOKEN_IGNORE: cls.__ignore,
+            TOKEN_STAT: cls.__ignore,
+            TOKEN_TEMP: cls.__ignore,
+            TOKEN_OBJE: cls.__ignore,
+            TOKEN_SOUR: cls.__person_attr_source,
+            TOKEN_PLAC: cls.__person_attr_place,
+            TOKEN_NOTE: cls.__person_attr_note,
+            TOKEN_RNOTE: cls.__person_attr_note,
         }
-        self.func_list.append(self.person_attr_parse_tbl)
-
-        self.lds_parse_tbl = {
-            TOKEN_TEMP: self.__lds_temple,
-            TOKEN_DATE: self.__lds_date,
-            TOKEN_FAMC: self.__lds_famc,
-            TOKEN_FORM: self.__lds_form,
-            TOKEN_PLAC: self.__lds_plac,
-            TOKEN_SOUR: self.__lds_sour,
-            TOKEN_NOTE: self.__lds_note,
-            TOKEN_RNOTE: self.__lds_note,
-            TOKEN_STAT: self.__lds_stat,
+
+        cls.lds_parse_tbl = {
+            TOKEN_TEMP: cls.__lds_temple,
+            TOKEN_DATE: cls.__lds_date,
+            TOKEN_FAMC: cls.__lds_famc,
+            TOKEN_FORM: cls.__lds_form,
+            TOKEN_PLAC: cls.__lds_plac,
+            TOKEN_SOUR: cls.__lds_sour,
+            TOKEN_NOTE: cls.__lds_note,
+            TOKEN_RNOTE: cls.__lds_note,
+            TOKEN_STAT: cls.__lds_stat,
         }
-        self.func_list.append(self.lds_parse_tbl)
 
-        self.asso_parse_tbl = {
-            TOKEN_RELA: self.__person_asso_rela,
-            TOKEN_SOUR: self.__person_asso_sour,
-            TOKEN_NOTE: self.__person_asso_note,
-            TOKEN_RNOTE: self.__person_asso_note,
+        cls.asso_parse_tbl = {
+            TOKEN_RELA: cls.__person_asso_rela,
+            TOKEN_SOUR: cls.__person_asso_sour,
+            TOKEN_NOTE: cls.__person_asso_note,
+            TOKEN_RNOTE: cls.__person_asso_note,
         }
-        self.func_list.append(self.asso_parse_tbl)
-
-        self.citation_parse_tbl = {
-            TOKEN_PAGE: self.__citation_page,
-            TOKEN_DATE: self.__citation_date,
-            TOKEN_DATA: self.__citation_data,
-            TOKEN_OBJE: self.__citation_obje,
-            TOKEN_REFN: self.__citation_refn,
-            TOKEN_EVEN: self.__citation_even,
-            TOKEN_IGNORE: self.__ignore,
-            TOKEN__LKD: self.__ignore,
-            TOKEN_QUAY: self.__citation_quay,
-            TOKEN_NOTE: self.__citation_note,
-            TOKEN_RNOTE: self.__citation_note,
-            TOKEN_TEXT: self.__citation_data_text,
-            TOKEN__LINK: self.__citation_link,
-            TOKEN__JUST: self.__citation__just,
-            TOKEN__APID: self.__citation__apid,
+
+        cls.citation_parse_tbl = {
+            TOKEN_PAGE: cls.__citation_page,
+            TOKEN_DATE: cls.__citation_date,
+            TOKEN_DATA: cls.__citation_data,
+            TOKEN_OBJE: cls.__citation_obje,
+            TOKEN_REFN: cls.__citation_refn,
+            TOKEN_EVEN: cls.__citation_even,
+            TOKEN_IGNORE: cls.__ignore,
+            TOKEN__LKD: cls.__ignore,
+            TOKEN_QUAY: cls.__citation_quay,
+            TOKEN_NOTE: cls.__citation_note,
+            TOKEN_RNOTE: cls.__citation_note,
+            TOKEN_TEXT: cls.__citation_data_text,
+            TOKEN__LINK: cls.__citation_link,
+            TOKEN__JUST: cls.__citation__just,
+            TOKEN__APID: cls.__citation__apid,
         }
-        self.func_list.append(self.citation_parse_tbl)
-
-        self.media_parse_tbl = {
-            TOKEN_FORM: self.__media_ref_form,
-            TOKEN_MEDI: self.__media_ref_medi,  # v5.5.1
-            TOKEN_TITL: self.__media_ref_titl,
-            TOKEN_FILE: self.__media_ref_file,
-            TOKEN_NOTE: self.__obje_note,  # illegal, but often there
-            TOKEN_RNOTE: self.__obje_note,  # illegal, but often there
-            TOKEN__PRIM: self.__media_ref_prim,  # LFT etc.
-            TOKEN_IGNORE: self.__ignore,
+
+        cls.media_parse_tbl = {
+            TOKEN_FORM: cls.__media_ref_form,
+            TOKEN_MEDI: cls.__media_ref_medi,  # v5.5.1
+            TOKEN_TITL: cls.__media_ref_titl,
+            TOKEN_FILE: cls.__media_ref_file,
+            TOKEN_NOTE: cls.__obje_note,  # illegal, but often there
+            TOKEN_RNOTE: cls.__obje_note,  # illegal, but often there
+            TOKEN__PRIM: cls.__media_ref_prim,  # LFT etc.
+            TOKEN_IGNORE: cls.__ignore,
         }
-        self.func_list.append(self.media_parse_tbl)
-
-        self.parse_loc_tbl = {
-            TOKEN_ADR1: self.__location_adr1,
-            TOKEN_ADR2: self.__location_adr2,
-            TOKEN_CITY: self.__location_city,
-            TOKEN_STAE: self.__location_stae,
-            TOKEN_POST: self.__location_post,
-            TOKEN_CTRY: self.__location_ctry,
+
+        cls.parse_loc_tbl = {
+            TOKEN_ADR1: cls.__location_adr1,
+            TOKEN_ADR2: cls.__location_adr2,
+            TOKEN_CITY: cls.__location_city,
+            TOKEN_STAE: cls.__location_stae,
+            TOKEN_POST: cls.__location_post,
+            TOKEN_CTRY: cls.__location_ctry,
             # Not legal GEDCOM - not clear why these are included at this level
-            TOKEN_ADDR: self.__ignore,
-            TOKEN_DATE: self.__ignore,  # there is nowhere to put a date
-            TOKEN_NOTE: self.__location_note,
-            TOKEN_RNOTE: self.__location_note,
-            TOKEN__LOC: self.__ignore,
-            TOKEN__NAME: self.__ignore,
-            TOKEN_PHON: self.__location_phone,
-            TOKEN_IGNORE: self.__ignore,
+            TOKEN_ADDR: cls.__ignore,
+            TOKEN_DATE: cls.__ignore,  # there is nowhere to put a date
+            TOKEN_NOTE: cls.__location_note,
+            TOKEN_RNOTE: cls.__location_note,
+            TOKEN__LOC: cls.__ignore,
+            TOKEN__NAME: cls.__ignore,
+            TOKEN_PHON: cls.__location_phone,
+            TOKEN_IGNORE: cls.__ignore,
         }
-        self.func_list.append(self.parse_loc_tbl)
 
         #
         # Parse table for <<FAM_RECORD>> below the level 0 FAM tag
@@ -2721,50 +2841,48 @@ class GedcomParser(UpdateCallback):
         #   +1 RIN <AUTOMATED_RECORD_ID>                  {0:1}
         #   +1 <<CHANGE_DATE>>                            {0:1}
 
-        self.family_func = {
+        cls.family_func = {
             # +1 <<FAMILY_EVENT_STRUCTURE>>  {0:M}
-            TOKEN_GEVENT: self.__family_std_event,
-            TOKEN_EVEN: self.__fam_even,
+            TOKEN_GEVENT: cls.__family_std_event,
+            TOKEN_EVEN: cls.__fam_even,
             # +1 HUSB @<XREF:INDI>@  {0:1}
-            TOKEN_HUSB: self.__family_husb,
+            TOKEN_HUSB: cls.__family_husb,
             # +1 WIFE @<XREF:INDI>@  {0:1}
-            TOKEN_WIFE: self.__family_wife,
+            TOKEN_WIFE: cls.__family_wife,
             # +1 CHIL @<XREF:INDI>@  {0:M}
-            TOKEN_CHIL: self.__family_chil,
+            TOKEN_CHIL: cls.__family_chil,
             # +1 NCHI <COUNT_OF_CHILDREN>  {0:1}
             # +1 SUBM @<XREF:SUBM>@  {0:M}
             # +1 <<LDS_SPOUSE_SEALING>>  {0:M}
-            TOKEN_SLGS: self.__family_slgs,
+            TOKEN_SLGS: cls.__family_slgs,
             # +1 <<SOURCE_CITATION>>  {0:M}
-            TOKEN_SOUR: self.__family_source,
+            TOKEN_SOUR: cls.__family_source,
             # +1 <<MULTIMEDIA_LINK>>  {0:M}
-            TOKEN_OBJE: self.__family_object,
+            TOKEN_OBJE: cls.__family_object,
             # +1 <<NOTE_STRUCTURE>>  {0:M}
-            TOKEN__COMM: self.__family_comm,
-            TOKEN_NOTE: self.__family_note,
-            TOKEN_RNOTE: self.__family_note,
+            TOKEN__COMM: cls.__family_comm,
+            TOKEN_NOTE: cls.__family_note,
+            TOKEN_RNOTE: cls.__family_note,
             # +1 REFN <USER_REFERENCE_NUMBER>  {0:M}
-            TOKEN_REFN: self.__family_refn,
+            TOKEN_REFN: cls.__family_refn,
             # TYPE should be below REFN, but will work here anyway
-            TOKEN_TYPE: self.__family_cust_attr,
+            TOKEN_TYPE: cls.__family_cust_attr,
             # +1 RIN <AUTOMATED_RECORD_ID>  {0:1}
             # +1 <<CHANGE_DATE>>  {0:1}
-            TOKEN_CHAN: self.__family_chan,
-            TOKEN_ENDL: self.__ignore,
-            TOKEN_ADDR: self.__ignore,
-            TOKEN_RIN: self.__family_cust_attr,
-            TOKEN_SUBM: self.__ignore,
-            TOKEN_ATTR: self.__family_attr,
+            TOKEN_CHAN: cls.__family_chan,
+            TOKEN_ENDL: cls.__ignore,
+            TOKEN_ADDR: cls.__ignore,
+            TOKEN_RIN: cls.__family_cust_attr,
+            TOKEN_SUBM: cls.__ignore,
+            TOKEN_ATTR: cls.__family_attr,
         }
-        self.func_list.append(self.family_func)
 
-        self.family_rel_tbl = {
-            TOKEN__FREL: self.__family_frel,
-            TOKEN__MREL: self.__family_mrel,
-            TOKEN_ADOP: self.__family_adopt,
-            TOKEN__STAT: self.__family_stat,
+        cls.family_rel_tbl = {
+            TOKEN__FREL: cls.__family_frel,
+            TOKEN__MREL: cls.__family_mrel,
+            TOKEN_ADOP: cls.__family_adopt,
+            TOKEN__STAT: cls.__family_stat,
         }
-        self.func_list.append(self.family_rel_tbl)
 
         #
         # Parse table for <<SOURCE_RECORD>> below the level 0 SOUR tag
@@ -2793,33 +2911,32 @@ class GedcomParser(UpdateCallback):
         #   +1 RIN <AUTOMATED_RECORD_ID>                  {0:1}
         #   +1 <<CHANGE_DATE>>                            {0:1}
 
-        self.source_func = {
-            TOKEN_TITL: self.__source_title,
-            TOKEN_TAXT: self.__source_taxt_peri,
-            TOKEN_PERI: self.__source_taxt_peri,
-            TOKEN_AUTH: self.__source_auth,
-            TOKEN_PUBL: self.__source_publ,
-            TOKEN_NOTE: self.__source_note,
-            TOKEN_RNOTE: self.__source_note,
-            TOKEN_TEXT: self.__source_text,
-            TOKEN_ABBR: self.__source_abbr,
-            TOKEN_REFN: self.__source_attr,
-            TOKEN_RIN: self.__source_attr,
-            TOKEN_REPO: self.__source_repo,
-            TOKEN_OBJE: self.__source_object,
-            TOKEN_CHAN: self.__source_chan,
-            TOKEN_MEDI: self.__source_attr,
-            TOKEN__NAME: self.__source_attr,
-            TOKEN_DATA: self.__ignore,
+        cls.source_func = {
+            TOKEN_TITL: cls.__source_title,
+            TOKEN_TAXT: cls.__source_taxt_peri,
+            TOKEN_PERI: cls.__source_taxt_peri,
+            TOKEN_AUTH: cls.__source_auth,
+            TOKEN_PUBL: cls.__source_publ,
+            TOKEN_NOTE: cls.__source_note,
+            TOKEN_RNOTE: cls.__source_note,
+            TOKEN_TEXT: cls.__source_text,
+            TOKEN_ABBR: cls.__source_abbr,
+            TOKEN_REFN: cls.__source_attr,
+            TOKEN_RIN: cls.__source_attr,
+            TOKEN_REPO: cls.__source_repo,
+            TOKEN_OBJE: cls.__source_object,
+            TOKEN_CHAN: cls.__source_chan,
+            TOKEN_MEDI: cls.__source_attr,
+            TOKEN__NAME: cls.__source_attr,
+            TOKEN_DATA: cls.__ignore,
             # TYPE should be below REFN, but will work here anyway
-            TOKEN_TYPE: self.__source_attr,
-            TOKEN_CALN: self.__ignore,
+            TOKEN_TYPE: cls.__source_attr,
+            TOKEN_CALN: cls.__ignore,
             # not legal, but Ultimate Family Tree does this
-            TOKEN_DATE: self.__ignore,
-            TOKEN_IGNORE: self.__ignore,
-            TOKEN__APID: self.__source_attr,
+            TOKEN_DATE: cls.__ignore,
+            TOKEN_IGNORE: cls.__ignore,
+            TOKEN__APID: cls.__source_attr,
         }
-        self.func_list.append(self.source_func)
 
         #
         # Parse table for <<MULTIMEDIA_RECORD>> below the level 0 OBJE tag
@@ -2851,102 +2968,92 @@ class GedcomParser(UpdateCallback):
         #   +1 <<SOURCE_CITATION>>            {0:M}
         #   +1 <<CHANGE_DATE>>                {0:1}
 
-        self.obje_func = {
-            TOKEN_FORM: self.__obje_form,
-            TOKEN_TYPE: self.__obje_type,  # v5.5.1
-            TOKEN_TITL: self.__obje_title,
-            TOKEN_FILE: self.__obje_file,  # de-facto extension
-            TOKEN_TEXT: self.__obje_text,  # FTM extension
-            TOKEN__TEXT: self.__obje_text,  # FTM 2017 extension
-            TOKEN_DATE: self.__obje_date,  # FTM extension
-            TOKEN__DATE: self.__obje_date,  # FTM 2017 extension
-            TOKEN_NOTE: self.__obje_note,
-            TOKEN_RNOTE: self.__obje_note,
-            TOKEN_SOUR: self.__obje_sour,
-            TOKEN_BLOB: self.__ignore,  # v5.5.1 deprecated
-            TOKEN_REFN: self.__obje_refn,
-            TOKEN_RIN: self.__obje_rin,
-            TOKEN_CHAN: self.__obje_chan,
+        cls.obje_func = {
+            TOKEN_FORM: cls.__obje_form,
+            TOKEN_TYPE: cls.__obje_type,  # v5.5.1
+            TOKEN_TITL: cls.__obje_title,
+            TOKEN_FILE: cls.__obje_file,  # de-facto extension
+            TOKEN_TEXT: cls.__obje_text,  # FTM extension
+            TOKEN__TEXT: cls.__obje_text,  # FTM 2017 extension
+            TOKEN_DATE: cls.__obje_date,  # FTM extension
+            TOKEN__DATE: cls.__obje_date,  # FTM 2017 extension
+            TOKEN_NOTE: cls.__obje_note,
+            TOKEN_RNOTE: cls.__obje_note,
+            TOKEN_SOUR: cls.__obje_sour,
+            TOKEN_BLOB: cls.__ignore,  # v5.5.1 deprecated
+            TOKEN_REFN: cls.__obje_refn,
+            TOKEN_RIN: cls.__obje_rin,
+            TOKEN_CHAN: cls.__obje_chan,
         }
-        self.func_list.append(self.obje_func)
-
-        self.parse_addr_tbl = {
-            TOKEN_DATE: self.__address_date,
-            TOKEN_ADR1: self.__address_adr1,
-            TOKEN_ADR2: self.__address_adr2,
-            TOKEN_CITY: self.__address_city,
-            TOKEN_STAE: self.__address_state,
-            TOKEN_POST: self.__address_post,
-            TOKEN_CTRY: self.__address_country,
-            TOKEN_PHON: self.__ignore,
-            TOKEN_SOUR: self.__address_sour,
-            TOKEN_NOTE: self.__address_note,
-            TOKEN_RNOTE: self.__address_note,
-            TOKEN__LOC: self.__ignore,
-            TOKEN__NAME: self.__ignore,
-            TOKEN_IGNORE: self.__ignore,
-            TOKEN_TYPE: self.__ignore,
-            TOKEN_CAUS: self.__ignore,
+
+        cls.parse_addr_tbl = {
+            TOKEN_DATE: cls.__address_date,
+            TOKEN_ADR1: cls.__address_adr1,
+            TOKEN_ADR2: cls.__address_adr2,
+            TOKEN_CITY: cls.__address_city,
+            TOKEN_STAE: cls.__address_state,
+            TOKEN_POST: cls.__address_post,
+            TOKEN_CTRY: cls.__address_country,
+            TOKEN_PHON: cls.__ignore,
+            TOKEN_SOUR: cls.__address_sour,
+            TOKEN_NOTE: cls.__address_note,
+            TOKEN_RNOTE: cls.__address_note,
+            TOKEN__LOC: cls.__ignore,
+            TOKEN__NAME: cls.__ignore,
+            TOKEN_IGNORE: cls.__ignore,
+            TOKEN_TYPE: cls.__ignore,
+            TOKEN_CAUS: cls.__ignore,
         }
-        self.func_list.append(self.parse_addr_tbl)
 
-        self.event_cause_tbl = {
-            TOKEN_SOUR: self.__event_cause_source,
+        cls.event_cause_tbl = {
+            TOKEN_SOUR: cls.__event_cause_source,
         }
-        self.func_list.append(self.event_cause_tbl)
 
-        self.event_place_map = {
-            TOKEN_NOTE: self.__event_place_note,
-            TOKEN_RNOTE: self.__event_place_note,
-            TOKEN_FORM: self.__event_place_form,
+        cls.event_place_map = {
+            TOKEN_NOTE: cls.__event_place_note,
+            TOKEN_RNOTE: cls.__event_place_note,
+            TOKEN_FORM: cls.__event_place_form,
             # Not legal.
-            TOKEN_OBJE: self.__event_place_object,
-            TOKEN_SOUR: self.__event_place_sour,
-            TOKEN__LOC: self.__ignore,
-            TOKEN_MAP: self.__place_map,
+            TOKEN_OBJE: cls.__event_place_object,
+            TOKEN_SOUR: cls.__event_place_sour,
+            TOKEN__LOC: cls.__ignore,
+            TOKEN_MAP: cls.__place_map,
             # Not legal,  but generated by Ultimate Family Tree
-            TOKEN_QUAY: self.__ignore,
+            TOKEN_QUAY: cls.__ignore,
         }
-        self.func_list.append(self.event_place_map)
 
-        self.place_map_tbl = {
-            TOKEN_LATI: self.__place_lati,
-            TOKEN_LONG: self.__place_long,
+        cls.place_map_tbl = {
+            TOKEN_LATI: cls.__place_lati,
+            TOKEN_LONG: cls.__place_long,
         }
-        self.func_list.append(self.place_map_tbl)
-
-        self.repo_ref_tbl = {
-            TOKEN_CALN: self.__repo_ref_call,
-            TOKEN_NOTE: self.__repo_ref_note,
-            TOKEN_RNOTE: self.__repo_ref_note,
-            TOKEN_MEDI: self.__repo_ref_medi,
-            TOKEN_IGNORE: self.__ignore,
+
+        cls.repo_ref_tbl = {
+            TOKEN_CALN: cls.__repo_ref_call,
+            TOKEN_NOTE: cls.__repo_ref_note,
+            TOKEN_RNOTE: cls.__repo_ref_note,
+            TOKEN_MEDI: cls.__repo_ref_medi,
+            TOKEN_IGNORE: cls.__ignore,
         }
-        self.func_list.append(self.repo_ref_tbl)
 
-        self.parse_person_adopt = {
-            TOKEN_ADOP: self.__person_adopt_famc_adopt,
+        cls.parse_person_adopt = {
+            TOKEN_ADOP: cls.__person_adopt_famc_adopt,
         }
-        self.func_list.append(self.parse_person_adopt)
 
-        self.opt_note_tbl = {
-            TOKEN_RNOTE: self.__optional_note,
-            TOKEN_NOTE: self.__optional_note,
+        cls.opt_note_tbl = {
+            TOKEN_RNOTE: cls.__optional_note,
+            TOKEN_NOTE: cls.__optional_note,
         }
-        self.func_list.append(self.opt_note_tbl)
 
-        self.citation_data_tbl = {
-            TOKEN_DATE: self.__citation_data_date,
-            TOKEN_TEXT: self.__citation_data_text,
-            TOKEN_RNOTE: self.__citation_data_note,
-            TOKEN_NOTE: self.__citation_data_note,
+        cls.citation_data_tbl = {
+            TOKEN_DATE: cls.__citation_data_date,
+            TOKEN_TEXT: cls.__citation_data_text,
+            TOKEN_RNOTE: cls.__citation_data_note,
+            TOKEN_NOTE: cls.__citation_data_note,
         }
-        self.func_list.append(self.citation_data_tbl)
 
-        self.citation_even_tbl = {
-            TOKEN_ROLE: self.__citation_even_role,
+        cls.citation_even_tbl = {
+            TOKEN_ROLE: cls.__citation_even_role,
         }
-        self.func_list.append(self.citation_even_tbl)
 
         #
         # Parse table for <<HEADER>> record below the level 0 HEAD tag
@@ -2982,60 +3089,54 @@ class GedcomParser(UpdateCallback):
         #  File submission or for clearing temple ordinances must use a
         #  DESTination of ANSTFILE or TempleReady.
 
-        self.head_parse_tbl = {
-            TOKEN_SOUR: self.__header_sour,
-            TOKEN_NAME: self.__header_sour_name,  # This should be below SOUR
-            TOKEN_VERS: self.__header_sour_vers,  # This should be below SOUR
-            TOKEN_FILE: self.__header_file,
-            TOKEN_COPR: self.__header_copr,
-            TOKEN_SUBM: self.__header_subm,
-            TOKEN_CORP: self.__ignore,  # This should be below SOUR
-            TOKEN_DATA: self.__ignore,  # This should be below SOUR
-            TOKEN_SUBN: self.__header_subn,
-            TOKEN_LANG: self.__header_lang,
-            TOKEN_TIME: self.__ignore,  # This should be below DATE
-            TOKEN_DEST: self.__header_dest,
-            TOKEN_CHAR: self.__header_char,
-            TOKEN_GEDC: self.__header_gedc,
-            TOKEN_PLAC: self.__header_plac,
-            TOKEN_DATE: self.__header_date,
-            TOKEN_NOTE: self.__header_note,
-            TOKEN__SCHEMA: self.__ignore,
+        cls.head_parse_tbl = {
+            TOKEN_SOUR: cls.__header_sour,
+            TOKEN_NAME: cls.__header_sour_name,  # This should be below SOUR
+            TOKEN_VERS: cls.__header_sour_vers,  # This should be below SOUR
+            TOKEN_FILE: cls.__header_file,
+            TOKEN_COPR: cls.__header_copr,
+            TOKEN_SUBM: cls.__header_subm,
+            TOKEN_CORP: cls.__ignore,  # This should be below SOUR
+            TOKEN_DATA: cls.__ignore,  # This should be below SOUR
+            TOKEN_SUBN: cls.__header_subn,
+            TOKEN_LANG: cls.__header_lang,
+            TOKEN_TIME: cls.__ignore,  # This should be below DATE
+            TOKEN_DEST: cls.__header_dest,
+            TOKEN_CHAR: cls.__header_char,
+            TOKEN_GEDC: cls.__header_gedc,
+            TOKEN_PLAC: cls.__header_plac,
+            TOKEN_DATE: cls.__header_date,
+            TOKEN_NOTE: cls.__header_note,
+            TOKEN__SCHEMA: cls.__ignore,
         }
-        self.func_list.append(self.head_parse_tbl)
 
-        self.header_sour_parse_tbl = {
-            TOKEN_VERS: self.__header_sour_vers,
-            TOKEN_NAME: self.__header_sour_name,
-            TOKEN_CORP: self.__header_sour_corp,
-            TOKEN_DATA: self.__header_sour_data,
+        cls.header_sour_parse_tbl = {
+            TOKEN_VERS: cls.__header_sour_vers,
+            TOKEN_NAME: cls.__header_sour_name,
+            TOKEN_CORP: cls.__header_sour_corp,
+            TOKEN_DATA: cls.__header_sour_data,
         }
-        self.func_list.append(self.header_sour_parse_tbl)
 
-        self.header_sour_data = {
-            TOKEN_DATE: self.__header_sour_date,
-            TOKEN_COPR: self.__header_sour_copr,
+        cls.header_sour_data = {
+            TOKEN_DATE: cls.__header_sour_date,
+            TOKEN_COPR: cls.__header_sour_copr,
         }
-        self.func_list.append(self.header_sour_data)
-
-        self.header_corp_addr = {
-            TOKEN_ADDR: self.__repo_addr,
-            TOKEN_PHON: self.__repo_phon,
-            TOKEN_FAX: self.__repo_fax,
-            TOKEN_WWW: self.__repo_www,
-            TOKEN_EMAIL: self.__repo_email,
+
+        cls.header_corp_addr = {
+            TOKEN_ADDR: cls.__repo_addr,
+            TOKEN_PHON: cls.__repo_phon,
+            TOKEN_FAX: cls.__repo_fax,
+            TOKEN_WWW: cls.__repo_www,
+            TOKEN_EMAIL: cls.__repo_email,
         }
-        self.func_list.append(self.header_corp_addr)
 
-        self.header_subm = {
-            TOKEN_NAME: self.__header_subm_name,
+        cls.header_subm = {
+            TOKEN_NAME: cls.__header_subm_name,
         }
-        self.func_list.append(self.header_subm)
 
-        self.place_form = {
-            TOKEN_FORM: self.__place_form,
+        cls.place_form = {
+            TOKEN_FORM: cls.__place_form,
         }
-        self.func_list.append(self.place_form)
 
         #
         # Parse table for <<NOTE_RECORD>> below the level 0 NOTE tag
@@ -3048,49 +3149,15 @@ class GedcomParser(UpdateCallback):
         #   +1 RIN <AUTOMATED_RECORD_ID>                  {0:1}
         #   +1 <<CHANGE_DATE>>                            {0:1}
 
-        self.note_parse_tbl = {
-            TOKEN_SOUR: self.__ignore,
-            TOKEN_REFN: self.__ignore,
-            TOKEN_RIN: self.__ignore,
-            TOKEN_CHAN: self.__note_chan,
+        cls.note_parse_tbl = {
+            TOKEN_SOUR: cls.__ignore,
+            TOKEN_REFN: cls.__ignore,
+            TOKEN_RIN: cls.__ignore,
+            TOKEN_CHAN: cls.__note_chan,
         }
-        self.func_list.append(self.note_parse_tbl)
 
         # look for existing place titles, build a map
-        self.place_names = defaultdict(list)
-        cursor = dbase.get_place_cursor()
-        data = next(cursor)
-        while data:
-            (handle, val) = data
-            self.place_names[val[2]].append(handle)
-            data = next(cursor)
-        cursor.close()
-
-        enc = stage_one.get_encoding()
-
-        if enc == "ANSEL":
-            rdr = AnselReader(ifile, self.__add_msg)
-        elif enc in ("UTF-8", "UTF8", "UTF_8_SIG"):
-            rdr = UTF8Reader(ifile, self.__add_msg, enc)
-        elif enc in ("UTF-16LE", "UTF-16BE", "UTF16", "UNICODE"):
-            rdr = UTF16Reader(ifile, self.__add_msg)
-        elif enc in ("CP1252", "WINDOWS-1252"):
-            rdr = CP1252Reader(ifile, self.__add_msg)
-        else:
-            rdr = AnsiReader(ifile, self.__add_msg)
-
-        self.lexer = Lexer(rdr, self.__add_msg)
-        self.filename = filename
-        self.backoff = False
-
-        fullpath = os.path.normpath(os.path.abspath(filename))
-        self.geddir = os.path.dirname(fullpath)
-
-        self.error_count = 0
-        amap = PERSONALCONSTANTATTRIBUTES
-
-        self.attrs = list(amap.values())
-        self.gedattr = dict([key, val] for val, key in amap.items())
+        cls.__parse_tables_built = True
 
     def parse_gedcom_file(self, use_trans=False):
         """
@@ -3105,6 +3172,8 @@ class GedcomParser(UpdateCallback):
         """
         with DbTxn(_("GEDCOM import"), self.dbase, not use_trans) as self.trans:
             self.dbase.disable_signals()
+            # The references and indices are built once all records are read
+            self.dbase.start_bulk_load()
             self.__parse_header_head()
             self.want_parse_warnings = False
             self.want_parse_warnings = True
@@ -3144,16 +3213,10 @@ class GedcomParser(UpdateCallback):
 
     def __clean_up(self):
         """
-        Break circular references to parsing methods stored in dictionaries
-        to aid garbage collection
+        Break the circular reference to the update method to aid garbage
+        collection
         """
-        for func_map in self.func_list:
-            for key in list(func_map.keys()):
-                del func_map[key]
-            del func_map
-        del self.func_list
         del self.update
-        self.lexer.clean_up()
 
     def __find_person_handle(self, gramps_id):
         """
@@ -4040,9 +4103,11 @@ class GedcomParser(UpdateCallback):
             if line.level < state.level:
                 self.backoff = True
                 return
+            func = __map.get(line.token)
+            if func is None:
+                default(line, state)
             else:
-                func = __map.get(line.token, default)
-                func(line, state)
+                func(self, line, state)
 
     # ----------------------------------------------------------------------
     #
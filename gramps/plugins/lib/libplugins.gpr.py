@@ -44,6 +44,24 @@ register(
     # load_on_reg = True
 )
 
+# ------------------------------------------------------------------------
+#
+# libbackup
+#
+# ------------------------------------------------------------------------
+register(
+    GENERAL,
+    id="libbackup",
+    name="Backup library",
+    description=_("Provides incremental backups of Family Trees"),
+    version="1.0",
+    gramps_target_version=MODULE_VERSION,
+    status=STABLE,
+    fname="libbackup.py",
+    authors=["The Gramps project"],
+    authors_email=["http://gramps-project.org"],
+)
+
 # ------------------------------------------------------------------------
 #
 # libgedcom
@@ -0,0 +1,172 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the incremental backups of a tree.
+"""
+
+import gzip
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from gramps.gen.config import config
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.dbconst import KEY_TO_CLASS_MAP
+from gramps.gen.db.utils import import_from_filename, make_database
+from gramps.gen.errors import GrampsImportError
+from gramps.gen.lib import Note
+from gramps.gen.user import User
+from gramps.plugins.lib.libbackup import (
+    DELTA_EXT,
+    diff_handles,
+    get_backup_chain,
+    get_metadata,
+    write_backup,
+)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class BackupTest(unittest.TestCase):
+    """
+    A chain of backups restores the tree as it was at its last backup.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.backups = os.path.join(self.tmpdir, "backups")
+        os.mkdir(self.backups)
+        self.db = self.make_tree("tree")
+        import_from_filename(self.db, EXAMPLE, User())
+        self.interval = config.get("database.backup-full-interval")
+
+    def tearDown(self):
+        config.set("database.backup-full-interval", self.interval)
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def make_tree(self, name):
+        """
+        Return a new empty tree.
+        """
+        directory = os.path.join(self.tmpdir, name)
+        os.mkdir(directory)
+        with open(os.path.join(directory, "name.txt"), "w") as name_file:
+            name_file.write(name)
+        db = make_database("sqlite")
+        db.load(directory)
+        return db
+
+    def dump(self, db):
+        """
+        Return the data of a tree.
+        """
+        data = {}
+        for obj_class in KEY_TO_CLASS_MAP.values():
+            get_raw_data = db.method("get_raw_%s_data", obj_class)
+            data[obj_class] = {
+                handle: get_raw_data(handle)
+                for handle in db.method("get_%s_handles", obj_class)()
+            }
+        data["metadata"] = get_metadata(db)
+        return data
+
+    def restore(self, filename):
+        """
+        Restore a chain of backups into a new tree and return its data.
+        """
+        db = self.make_tree(os.path.basename(filename))
+        self.assertTrue(import_from_filename(db, filename, User()))
+        data = self.dump(db)
+        db.close()
+        return data
+
+    def test_diff_handles(self):
+        self.assertEqual(
+            diff_handles(["a", "c", "d"], ["b", "c", "e"]), (["b", "e"], ["a", "d"])
+        )
+
+    def test_chain(self):
+        full = write_backup(self.db, self.backups, User())
+        self.assertTrue(full.endswith(".gramps"))
+
+        person = self.db.get_person_from_gramps_id("I0044")
+        note = self.db.get_note_from_handle(self.db.get_note_handles()[0])
+        with DbTxn("Edit", self.db) as trans:
+            person.set_privacy(True)
+            self.db.commit_person(person, trans)
+            self.db.remove_note(note.handle, trans)
+            new_note = Note("Added")
+            self.db.add_note(new_note, trans)
+        self.db.get_bookmarks().set([person.handle])
+        delta = write_backup(self.db, self.backups, User())
+        self.assertTrue(delta.endswith(DELTA_EXT))
+        self.assertEqual(get_backup_chain(delta), [full, delta])
+        self.assertEqual(self.restore(delta), self.dump(self.db))
+
+        # An undone edit gets back an earlier change time.
+        with DbTxn("Edit", self.db) as trans:
+            person.set_privacy(False)
+            self.db.commit_person(person, trans, person.change + 1)
+        write_backup(self.db, self.backups, User())
+        self.db.undo()
+        delta = write_backup(self.db, self.backups, User())
+        self.assertEqual(len(get_backup_chain(delta)), 4)
+        self.assertEqual(self.restore(delta), self.dump(self.db))
+
+    def test_broken_chain(self):
+        full = write_backup(self.db, self.backups, User())
+        write_backup(self.db, self.backups, User())
+        os.remove(full)
+        full = write_backup(self.db, self.backups, User())
+        self.assertTrue(full.endswith(".gramps"))
+        delta = write_backup(self.db, self.backups, User())
+        self.assertEqual(get_backup_chain(delta), [full, delta])
+
+    def test_full_interval(self):
+        config.set("database.backup-full-interval", 1)
+        for ext in (".gramps", DELTA_EXT, ".gramps"):
+            self.assertTrue(write_backup(self.db, self.backups, User()).endswith(ext))
+
+    def test_unknown_format(self):
+        write_backup(self.db, self.backups, User())
+        delta = write_backup(self.db, self.backups, User())
+        with gzip.open(delta, "rt", encoding="utf-8") as delta_file:
+            header = json.loads(delta_file.readline())
+
+        # A delta of an earlier version is a stream of pickles.
+        with gzip.open(delta, "wb") as delta_file:
+            pickle.dump(dict(header, format=1), delta_file)
+        self.assertRaises(GrampsImportError, get_backup_chain, delta)
+
+        for wrong in (dict(header, format=1), dict(header, type="gramps"), []):
+            with gzip.open(delta, "wt", encoding="utf-8") as delta_file:
+                delta_file.write(json.dumps(wrong) + "\n")
+            self.assertRaises(GrampsImportError, get_backup_chain, delta)
+
+
+if __name__ == "__main__":
+    unittest.main()
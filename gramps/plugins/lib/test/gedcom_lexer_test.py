@@ -0,0 +1,105 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the GEDCOM lexer """
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import io
+import os
+import unittest
+from unittest import mock
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import DATA_DIR
+from gramps.plugins.lib import libgedcom
+from gramps.plugins.lib.libgedcom import Lexer, UTF8Reader
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+
+
+# -------------------------------------------------------------------------
+#
+# LexerTest class
+#
+# -------------------------------------------------------------------------
+class LexerTest(unittest.TestCase):
+    """
+    Split GEDCOM lines into their level, tag and value.
+    """
+
+    def read(self, data):
+        messages = []
+        reader = UTF8Reader(io.BytesIO(data), messages.append, "UTF-8")
+        lexer = Lexer(reader, messages.append)
+        lines = []
+        while True:
+            line = lexer.readline()
+            if line is None:
+                return lines, messages
+            data = line.data
+            if hasattr(data, "serialize"):
+                data = data.serialize()
+            lines.append((line.line, line.level, line.token_text, data))
+
+    def test_split_line(self):
+        for line, result in (
+            ("1 NAME John /Doe/", (1, "NAME", "John /Doe/")),
+            ("  2  GIVN  John ", (2, "GIVN", " John ")),
+            ("1 BIRT", (1, "BIRT", "")),
+            ("0 @I1@ INDI", (0, "@I1@", "INDI")),
+            ("0 @I 1@  INDI ", (0, "@I 1@", "INDI ")),
+            ("2 @N1@ CONT text", (2, "CONT", "text")),
+            ("1", (1, "", "")),
+        ):
+            self.assertEqual(Lexer.split_line(line), result)
+        for line in ("", "NAME x", "1\tNAME x", "1 @I1"):
+            self.assertRaises(Exception, Lexer.split_line, line)
+
+    def test_readline(self):
+        lines, messages = self.read(
+            b"0 HEAD\r\n1 NOTE a@@b\n2 CONT two\n2 CONC \x01three\n\n0 TRLR\n"
+        )
+        self.assertEqual(
+            lines,
+            [(1, 0, "HEAD", ""), (2, 1, "NOTE", "a@b\ntwothree"), (6, 0, "TRLR", "")],
+        )
+        self.assertEqual(len(messages), 1)
+
+    def test_blocks(self):
+        """
+        Lines are read the same whatever the size of the blocks read.
+        """
+        with open(os.path.join(TEST_DIR, "imp_sample.ged"), "rb") as ifile:
+            data = ifile.read()
+        expected = self.read(data)
+        with mock.patch.object(libgedcom, "READ_SIZE", 7):
+            self.assertEqual(self.read(data), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
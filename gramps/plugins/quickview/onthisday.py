@@ -53,6 +53,27 @@ def get_ref(db, objclass, handle):
     return ref
 
 
+def get_events(database, main_date):
+    """
+    Return the events which may be on the day, the month and day, or the
+    year of a date.  The date columns of the database are used when it has
+    them, else all the events are returned.
+    """
+    if not database.has_date_index() or main_date.get_calendar() != Date.CAL_GREGORIAN:
+        return database.iter_events()
+    handles = set()
+    if main_date.get_month():
+        handles = database.find_events_on_day(
+            main_date.get_month(), main_date.get_day()
+        )
+    year = main_date.get_year()
+    if year:
+        handles.update(
+            database.find_events_in_date_range(Date(year, 1, 1), Date(year, 12, 31))
+        )
+    return database.get_event_from_handles(sorted(handles))
+
+
 def run(database, document, main_event):
     """
     Displays events on a specific date of an event (or date)
@@ -83,7 +104,7 @@ def run(database, document, main_event):
     yeartab.columns(_("Date"), _("Type"), _("Place"), _("Reference"))
     histab.columns(_("Date"), _("Type"), _("Place"), _("Reference"))
 
-    for event in database.iter_events():
+    for event in get_events(database, main_date):
         date = event.get_date_object()
         date.convert_calendar(cal)
         if date.get_year() == 0:
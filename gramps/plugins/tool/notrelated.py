@@ -50,7 +50,7 @@ from gramps.gui.utils import ProgressMeter
 from gramps.gui.display import display_help
 from gramps.gui.glade import Glade
 from gramps.gen.lib import Tag
-from gramps.gen.db import DbTxn
+from gramps.gen.db import DbTxn, get_pedigree_graph
 
 # -------------------------------------------------------------------------
 #
@@ -307,76 +307,11 @@ class NotRelated(tool.ActivePersonTool, ManagedWindow):
             self.numberOfPeopleInDatabase,
         )
 
-        # as long as we have people we haven't processed yet, keep looping
-        while len(self.handlesOfPeopleToBeProcessed) > 0:
-            handle = self.handlesOfPeopleToBeProcessed.pop()
-
-            ### DEBUG DEBUG DEBUG
-            #            if len(self.handlesOfPeopleAlreadyProcessed) > 50:
-            #                break
-            ###
-
-            # see if we've already processed this person
-            if handle in self.handlesOfPeopleAlreadyProcessed:
-                continue
-
-            person = self.db.get_person_from_handle(handle)
-
-            # if we get here, then we're dealing with someone new
-            self.progress.step()
-
-            # remember that we've now seen this person
-            self.handlesOfPeopleAlreadyProcessed.add(handle)
-
-            # we have 4 things to do:  find (1) spouses, (2) parents, siblings(3), and (4) children
-
-            # step 1 -- spouses
-            for familyHandle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(familyHandle)
-                spouseHandle = utils.find_spouse(person, family)
-                if (
-                    spouseHandle
-                    and spouseHandle not in self.handlesOfPeopleAlreadyProcessed
-                ):
-                    self.handlesOfPeopleToBeProcessed.add(spouseHandle)
-
-            # step 2 -- parents
-            for familyHandle in person.get_parent_family_handle_list():
-                family = self.db.get_family_from_handle(familyHandle)
-                fatherHandle = family.get_father_handle()
-                motherHandle = family.get_mother_handle()
-                if (
-                    fatherHandle
-                    and fatherHandle not in self.handlesOfPeopleAlreadyProcessed
-                ):
-                    self.handlesOfPeopleToBeProcessed.add(fatherHandle)
-                if (
-                    motherHandle
-                    and motherHandle not in self.handlesOfPeopleAlreadyProcessed
-                ):
-                    self.handlesOfPeopleToBeProcessed.add(motherHandle)
-
-            # step 3 -- siblings
-            for familyHandle in person.get_parent_family_handle_list():
-                family = self.db.get_family_from_handle(familyHandle)
-                for childRef in family.get_child_ref_list():
-                    childHandle = childRef.ref
-                    if (
-                        childHandle
-                        and childHandle not in self.handlesOfPeopleAlreadyProcessed
-                    ):
-                        self.handlesOfPeopleToBeProcessed.add(childHandle)
-
-            # step 4 -- children
-            for familyHandle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(familyHandle)
-                for childRef in family.get_child_ref_list():
-                    childHandle = childRef.ref
-                    if (
-                        childHandle
-                        and childHandle not in self.handlesOfPeopleAlreadyProcessed
-                    ):
-                        self.handlesOfPeopleToBeProcessed.add(childHandle)
+        # everybody reached through spouses, parents, siblings and children
+        self.handlesOfPeopleAlreadyProcessed.update(
+            get_pedigree_graph(self.db).get_relatives(self.handlesOfPeopleToBeProcessed)
+        )
+        self.handlesOfPeopleToBeProcessed.clear()
 
     def findUnrelatedPeople(self):
         # update our numbers
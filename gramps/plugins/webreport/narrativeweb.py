@@ -98,7 +98,7 @@ from gramps.gen.config import config
 from gramps.gen.datehandler import displayer as _dd
 from gramps.gen.display.name import displayer as _nd
 from gramps.gen.display.place import displayer as _pd
-from gramps.gen.proxy import CacheProxyDb
+from gramps.gen.proxy import ExportProxyDb
 from gramps.plugins.lib.libhtmlconst import _CHARACTER_SETS, _CC, _COPY_OPTIONS
 from gramps.gen.relationship import get_relationship_calculator
 
@@ -180,7 +180,7 @@ class NavWebReport(Report):
 
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu)
-        self.database = CacheProxyDb(self.database)
+        self.database = ExportProxyDb(self.database)
         self._db = self.database
 
         filters_option = menu.get_option_by_name("filter")
@@ -0,0 +1,103 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+# test/codec_benchmark.py
+
+"""
+Compare the size and decode time of the DB-API record codecs.
+
+Run from the root directory with a command line like:
+
+    python3 test/codec_benchmark.py [file.gramps ...]
+
+The example trees are used when no file is given.
+"""
+import os
+import sys
+import time
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.user import User
+from gramps.plugins.db.dbapi.codec import PickleCodec, SchemaCodec, unpack
+
+EXAMPLES = (
+    os.path.join(DATA_DIR, "tests", "example.gramps"),
+    os.path.join(DATA_DIR, "tests", "data.gramps"),
+)
+CLASSES = (
+    "Person",
+    "Family",
+    "Event",
+    "Place",
+    "Repository",
+    "Source",
+    "Citation",
+    "Media",
+    "Note",
+    "Tag",
+)
+CODECS = (
+    ("pickle", PickleCodec()),
+    ("pickle+zlib", PickleCodec(compress=True)),
+    ("schema", SchemaCodec()),
+    ("schema+zlib", SchemaCodec(compress=True)),
+)
+ROUNDS = 5
+
+
+def load_records(filename):
+    """
+    Return the serialized data of all the primary objects in a tree.
+    """
+    db = import_as_dict(filename, User())
+    records = []
+    for class_name in CLASSES:
+        with db.method("get_%s_cursor", class_name)() as cursor:
+            for handle, data in cursor:
+                records.append((class_name, data))
+    db.close()
+    return records
+
+
+def benchmark(filename):
+    """
+    Print the size and decode time of the records of a tree per codec.
+    """
+    records = load_records(filename)
+    print("%s: %d records" % (os.path.basename(filename), len(records)))
+    print("%-12s %12s %12s %12s" % ("codec", "bytes", "encode (s)", "decode (s)"))
+    for name, codec in CODECS:
+        start = time.perf_counter()
+        blobs = [codec.pack(class_name, data) for class_name, data in records]
+        encode_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for dummy in range(ROUNDS):
+            for blob in blobs:
+                unpack(blob)
+        decode_time = (time.perf_counter() - start) / ROUNDS
+        size = sum(len(blob) for blob in blobs)
+        print("%-12s %12d %12.4f %12.4f" % (name, size, encode_time, decode_time))
+    print()
+
+
+if __name__ == "__main__":
+    for filename in sys.argv[1:] or EXAMPLES:
+        benchmark(filename)
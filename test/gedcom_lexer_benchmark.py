@@ -0,0 +1,96 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+# test/gedcom_lexer_benchmark.py
+
+"""
+Measure the number of lines read per second by the GEDCOM lexer.
+
+Run from the root directory with a command line like:
+
+    python3 test/gedcom_lexer_benchmark.py [copies]
+
+The records of example/gedcom/sample.ged are copied the given number of
+times, 100 by default, with distinct xrefs.
+"""
+import io
+import os
+import re
+import sys
+import time
+
+from gramps.plugins.lib.libgedcom import Lexer, UTF8Reader
+
+SAMPLE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "example",
+    "gedcom",
+    "sample.ged",
+)
+XREF_RE = re.compile(rb"@([^@\s]+)@")
+ROUNDS = 3
+
+
+def scale_up(data, copies):
+    """
+    Return a GEDCOM file with the records of another one copied.
+    """
+    body_start = data.index(b"\n0 ") + 1
+    body_end = data.rindex(b"0 TRLR")
+    body = data[body_start:body_end]
+    parts = [data[:body_start]]
+    for copy in range(copies):
+        parts.append(XREF_RE.sub(rb"@\1_%d@" % copy, body))
+    parts.append(data[body_end:])
+    return b"".join(parts)
+
+
+def read_all(data):
+    """
+    Read all the lines of a GEDCOM file with the lexer, and return their
+    number.
+    """
+    messages = []
+    reader = UTF8Reader(io.BytesIO(data), messages.append, "UTF-8")
+    lexer = Lexer(reader, messages.append)
+    count = 0
+    while lexer.readline() is not None:
+        count += 1
+    return count
+
+
+def benchmark(copies):
+    """
+    Print the number of lines read per second.
+    """
+    with open(SAMPLE, "rb") as ifile:
+        data = scale_up(ifile.read(), copies)
+    best = None
+    for dummy in range(ROUNDS):
+        start = time.perf_counter()
+        count = read_all(data)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    print("%d bytes, %d lines" % (len(data), count))
+    print("%.3f s, %d lines per second" % (best, count / best))
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100)